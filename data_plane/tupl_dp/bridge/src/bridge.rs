@@ -2,8 +2,8 @@ use crate::families::DesignBoundaryRule;
 use crate::rule_vector::RuleVector;
 use crate::storage::db_infra::{DbInfraClient, PrismRuleRecord};
 use crate::types::{now_ms, RuleInstance, RuleMetadata};
-use parking_lot::RwLock;
-use std::collections::HashMap;
+use parking_lot::{Mutex, RwLock};
+use std::collections::{HashMap, HashSet};
 use std::sync::Arc;
 
 // ================================================================================================
@@ -44,6 +44,40 @@ pub struct Bridge {
     rules: Arc<RwLock<HashMap<String, (Arc<dyn RuleInstance>, RuleVector)>>>,
     /// db_infra client for persistence
     db_client: Arc<DbInfraClient>,
+    /// Serializes every rule mutation (storage write, map swap and version bump)
+    /// so version checks, swaps and the versions they report do not interleave
+    write_lock: Arc<Mutex<()>>,
+}
+
+/// Outcome of a versioned rule-set replacement.
+#[derive(Debug, Clone)]
+pub struct ReplaceOutcome {
+    pub rules_installed: usize,
+    pub rules_removed: usize,
+    pub previous_version: u64,
+    pub version: u64,
+}
+
+/// Why a versioned rule-set replacement was rejected.
+#[derive(Debug, Clone)]
+pub enum ReplaceError {
+    /// The caller's expected bridge version is stale.
+    VersionConflict { expected: u64, actual: u64 },
+    /// Persisting the new rule set failed; the in-memory set is unchanged.
+    Storage(String),
+}
+
+impl std::fmt::Display for ReplaceError {
+    fn fmt(&self, f: &mut std::fmt::Formatter<'_>) -> std::fmt::Result {
+        match self {
+            ReplaceError::VersionConflict { expected, actual } => write!(
+                f,
+                "Bridge version conflict: expected {}, current {}",
+                expected, actual
+            ),
+            ReplaceError::Storage(err) => write!(f, "{}", err),
+        }
+    }
 }
 
 impl Bridge {
@@ -63,6 +97,7 @@ impl Bridge {
             created_at: now_ms(),
             rules,
             db_client,
+            write_lock: Arc::new(Mutex::new(())),
         };
 
         bridge.rebuild_from_db()?;
@@ -142,6 +177,7 @@ impl Bridge {
 
     /// Public wrapper for rebuild_from_db — called by RefreshService.
     pub fn rebuild_from_db_public(&self) -> Result<(), String> {
+        let _guard = self.write_lock.lock();
         self.rebuild_from_db()
     }
 
@@ -196,62 +232,182 @@ impl Bridge {
         rule: Arc<dyn RuleInstance>,
         anchors: RuleVector,
     ) -> Result<(), String> {
-        let rule_id = rule.rule_id().to_string();
-        let metadata = RuleMetadata::from_rule(rule.as_ref());
-
-        let rule_json = serde_json::to_string(&metadata)
-            .map_err(|e| format!("Failed to serialize rule metadata: {}", e))?;
-
-        let anchors_bin = serialize_rule_vector(&anchors);
-        let anchors_json = serde_json::to_string(&anchors_bin)
-            .map_err(|e| format!("Failed to serialize rule anchors: {}", e))?;
-
-        let tenant_id = metadata
-            .scope
-            .agent_ids
-            .first()
-            .cloned()
-            .unwrap_or_default();
-
-        let layer: Option<&str> = metadata.layer.as_deref();
-        let updated_at = (now_ms() as f64) / 1000.0;
-
-        self.db_client.upsert_rule(&PrismRuleRecord {
-            rule_id: rule_id.clone(),
-            tenant_id,
-            layer: layer.map(|value| value.to_string()),
-            priority: metadata.priority as i64,
-            rule_json,
-            anchors_json,
-            status: "active".to_string(),
-            updated_at,
-        })?;
-
-        self.rules
-            .write()
-            .insert(rule_id, (Arc::clone(&rule), anchors));
+        let _guard = self.write_lock.lock();
+        let record = rule_record(rule.as_ref(), &anchors)?;
+        self.db_client.upsert_rule(&record)?;
 
+        let mut map = self.rules.write();
+        map.insert(record.rule_id, (Arc::clone(&rule), anchors));
         self.increment_version();
         Ok(())
     }
 
+    /// Replaces a set of rules as one bridge version.
+    ///
+    /// `upserts` are installed and `remove_ids` dropped; with `remove_scope`, every other
+    /// non-global rule scoped to that agent is dropped as well, except those in `keep_ids`
+    /// (rules the caller could not convert, whose installed version stays). The whole call holds the
+    /// bridge write lock, so no other mutation can land between the version check, the
+    /// storage writes and the swap. The new set is persisted first and then swapped into
+    /// the HashMap under a single map write lock, so enforcement sees either the old or
+    /// the new rules, never a gap. The version is bumped once.
+    /// A non-`None` `expected_version` that differs from the current version is rejected.
+    ///
+    /// db_infra has no multi-row transaction, so when a storage write fails the rows
+    /// already written are restored from the in-memory set before returning the error.
+    pub fn replace_rules(
+        &self,
+        upserts: Vec<(Arc<dyn RuleInstance>, RuleVector)>,
+        remove_ids: &[String],
+        remove_scope: Option<&str>,
+        keep_ids: &[String],
+        expected_version: Option<u64>,
+    ) -> Result<ReplaceOutcome, ReplaceError> {
+        let _guard = self.write_lock.lock();
+        let previous_version = self.version();
+        if let Some(expected) = expected_version {
+            if expected != previous_version {
+                return Err(ReplaceError::VersionConflict {
+                    expected,
+                    actual: previous_version,
+                });
+            }
+        }
+
+        let upsert_ids: HashSet<&str> = upserts.iter().map(|(rule, _)| rule.rule_id()).collect();
+        let to_remove: Vec<String> = {
+            let map = self.rules.read();
+            let mut ids: Vec<String> = remove_ids
+                .iter()
+                .filter(|id| map.contains_key(id.as_str()))
+                .cloned()
+                .collect();
+            if let Some(agent_id) = remove_scope {
+                ids.extend(
+                    map.iter()
+                        .filter(|(_, (rule, _))| {
+                            !rule.scope().is_global && rule.scope().applies_to(agent_id)
+                        })
+                        .map(|(id, _)| id.clone()),
+                );
+            }
+            ids.retain(|id| !upsert_ids.contains(id.as_str()) && !keep_ids.contains(id));
+            ids.sort();
+            ids.dedup();
+            ids
+        };
+
+        let records = upserts
+            .iter()
+            .map(|(rule, anchors)| rule_record(rule.as_ref(), anchors))
+            .collect::<Result<Vec<_>, _>>()
+            .map_err(ReplaceError::Storage)?;
+        self.persist_replacement(&records, &to_remove)
+            .map_err(ReplaceError::Storage)?;
+
+        let rules_installed = upserts.len();
+        let version = {
+            let mut map = self.rules.write();
+            for rule_id in &to_remove {
+                map.remove(rule_id);
+            }
+            for (rule, anchors) in upserts {
+                map.insert(rule.rule_id().to_string(), (rule, anchors));
+            }
+            // Bumped and read while the map is still locked so version and contents
+            // move together.
+            self.increment_version();
+            self.version()
+        };
+
+        Ok(ReplaceOutcome {
+            rules_installed,
+            rules_removed: to_remove.len(),
+            previous_version,
+            version,
+        })
+    }
+
+    /// Writes a replacement to db_infra, restoring the rows already written if a
+    /// later write fails. Must be called with `write_lock` held.
+    fn persist_replacement(
+        &self,
+        records: &[PrismRuleRecord],
+        to_remove: &[String],
+    ) -> Result<(), String> {
+        // Rows as they were before this replacement; `None` means the row did not exist.
+        let previous: HashMap<String, Option<PrismRuleRecord>> = {
+            let map = self.rules.read();
+            records
+                .iter()
+                .map(|record| record.rule_id.as_str())
+                .chain(to_remove.iter().map(String::as_str))
+                .map(|id| -> Result<(String, Option<PrismRuleRecord>), String> {
+                    let record = match map.get(id) {
+                        Some((rule, anchors)) => Some(rule_record(rule.as_ref(), anchors)?),
+                        None => None,
+                    };
+                    Ok((id.to_string(), record))
+                })
+                .collect::<Result<_, String>>()?
+        };
+
+        let mut written: Vec<&str> = Vec::with_capacity(records.len() + to_remove.len());
+        let result = records
+            .iter()
+            .try_for_each(|record| -> Result<(), String> {
+                self.db_client.upsert_rule(record)?;
+                written.push(record.rule_id.as_str());
+                Ok(())
+            })
+            .and_then(|()| {
+                to_remove.iter().try_for_each(|rule_id| -> Result<(), String> {
+                    self.db_client.delete_rule(rule_id)?;
+                    written.push(rule_id.as_str());
+                    Ok(())
+                })
+            });
+
+        if let Err(err) = result {
+            for rule_id in written.into_iter().rev() {
+                let restored = match previous.get(rule_id) {
+                    Some(Some(record)) => self.db_client.upsert_rule(record),
+                    _ => self.db_client.delete_rule(rule_id),
+                };
+                if let Err(undo_err) = restored {
+                    log::error!(
+                        "Failed to restore rule {} after a failed replacement: {}",
+                        rule_id,
+                        undo_err
+                    );
+                }
+            }
+            return Err(err);
+        }
+        Ok(())
+    }
+
     /// Removes a rule by ID. Returns true if the rule was present.
     pub fn remove_rule(&self, rule_id: &str) -> Result<bool, String> {
-        let removed = self.rules.write().remove(rule_id).is_some();
-        if !removed {
+        let _guard = self.write_lock.lock();
+        if !self.rules.read().contains_key(rule_id) {
             return Ok(false);
         }
 
         self.db_client.delete_rule(rule_id)?;
 
+        let mut map = self.rules.write();
+        map.remove(rule_id);
         self.increment_version();
         Ok(true)
     }
 
     /// Clears all rules and storage state.
     pub fn clear_all(&self) {
-        self.rules.write().clear();
+        let _guard = self.write_lock.lock();
         let _ = self.db_client.clear_rules();
+        let mut map = self.rules.write();
+        map.clear();
         self.increment_version();
     }
 
@@ -306,6 +462,7 @@ impl Bridge {
 
     /// Promotes staged version to active (atomic hot-reload)
     pub fn promote_staged(&self) -> Result<(), String> {
+        let _guard = self.write_lock.lock();
         let staged = *self.staged_version.read();
 
         match staged {
@@ -323,6 +480,39 @@ impl Bridge {
 // SERIALIZATION HELPERS
 // ================================================================================================
 
+/// Builds the db_infra row for a rule and its anchors.
+fn rule_record(rule: &dyn RuleInstance, anchors: &RuleVector) -> Result<PrismRuleRecord, String> {
+    let metadata = RuleMetadata::from_rule(rule);
+
+    let rule_json = serde_json::to_string(&metadata)
+        .map_err(|e| format!("Failed to serialize rule metadata: {}", e))?;
+
+    let anchors_bin = serialize_rule_vector(anchors);
+    let anchors_json = serde_json::to_string(&anchors_bin)
+        .map_err(|e| format!("Failed to serialize rule anchors: {}", e))?;
+
+    let tenant_id = metadata
+        .scope
+        .agent_ids
+        .first()
+        .cloned()
+        .unwrap_or_default();
+
+    let layer: Option<&str> = metadata.layer.as_deref();
+    let updated_at = (now_ms() as f64) / 1000.0;
+
+    Ok(PrismRuleRecord {
+        rule_id: rule.rule_id().to_string(),
+        tenant_id,
+        layer: layer.map(|value| value.to_string()),
+        priority: metadata.priority as i64,
+        rule_json,
+        anchors_json,
+        status: "active".to_string(),
+        updated_at,
+    })
+}
+
 /// Serialize a RuleVector to raw little-endian f32 bytes.
 ///
 /// Layout: action_anchors (16×32 f32s) + action_count (u64 LE) +
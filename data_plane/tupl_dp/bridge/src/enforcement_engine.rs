@@ -391,11 +391,26 @@ impl EnforcementEngine {
         request_id: &str,
         drift_score: f32,
     ) -> Result<EnforcementResult, String> {
-        let session_start = Instant::now();
-
         // Parse IntentEvent JSON
         let intent: IntentEvent = serde_json::from_str(intent_json)
             .map_err(|e| format!("Failed to parse IntentEvent: {}", e))?;
+        self.enforce_intent(intent, Some(intent_json), vector_override, request_id, drift_score)
+            .await
+    }
+
+    /// Enforce an already-decoded IntentEvent (typed gRPC requests).
+    ///
+    /// `intent_json` is the caller's original document, if there was one. Without
+    /// it the intent is only serialized when telemetry or remote encoding needs it.
+    pub async fn enforce_intent(
+        &self,
+        intent: IntentEvent,
+        intent_json: Option<&str>,
+        vector_override: Option<[f32; 128]>,
+        request_id: &str,
+        drift_score: f32,
+    ) -> Result<EnforcementResult, String> {
+        let session_start = Instant::now();
 
         // Layer is optional — default to "" which get_rules_for_layer treats as "match all".
         let layer = intent.layer_str().unwrap_or("");
@@ -408,7 +423,13 @@ impl EnforcementEngine {
         let session_id = self
             .telemetry
             .as_ref()
-            .and_then(|t| t.start_session(layer.to_string(), intent_json.to_string(), request_id));
+            .and_then(|t| {
+                t.start_session(
+                    layer.to_string(),
+                    Self::intent_document(&intent, intent_json),
+                    request_id,
+                )
+            });
 
         // Populate agent_id and tenant_id from IntentEvent
         if let (Some(ref telemetry), Some(ref sid)) = (&self.telemetry, &session_id) {
@@ -673,7 +694,10 @@ impl EnforcementEngine {
                 let norm = vector.iter().map(|v| v * v).sum::<f32>().sqrt();
                 (Some(vector), 0u64, norm)
             } else {
-                match self.encode_intent(intent_json).await {
+                match self
+                    .encode_intent(&Self::intent_document(&intent, intent_json))
+                    .await
+                {
                     Ok(vector) => {
                         let duration = encoding_start.elapsed().as_micros() as u64;
                         let norm = vector.iter().map(|v| v * v).sum::<f32>().sqrt();
@@ -1302,6 +1326,14 @@ impl EnforcementEngine {
         ))
     }
 
+    /// The intent as JSON: the original document if there is one.
+    fn intent_document(intent: &IntentEvent, intent_json: Option<&str>) -> String {
+        match intent_json {
+            Some(raw) => raw.to_string(),
+            None => serde_json::to_string(intent).unwrap_or_default(),
+        }
+    }
+
     /// Encode intent to 128d vector by calling Management Plane
     async fn encode_intent(&self, intent_json: &str) -> Result<[f32; 128], String> {
         let url = self.endpoint("/encode/intent");
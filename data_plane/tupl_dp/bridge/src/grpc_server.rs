@@ -6,19 +6,69 @@
 //!
 //! This server provides the data plane side of the control/data plane integration.
 
-use crate::bridge::Bridge;
+use crate::api_types::{Actor, Data, IntentEvent, Resource, Risk};
+use crate::bridge::{Bridge, ReplaceError};
 use crate::enforcement_engine::EnforcementEngine;
 use crate::families::DesignBoundaryRule;
 use crate::refresh::{RefreshScheduler, RefreshService, SchedulerConfig};
 use crate::rule_converter::{ControlPlaneRule, ParamValue};
 use crate::rule_vector::{convert_anchor_block, RuleVector};
 use crate::types::{RuleInstance, RuleScope};
+use serde::Deserialize;
 use serde_json::Value;
 use std::collections::HashMap;
 use std::convert::TryInto;
 use std::sync::Arc;
 use tonic::{transport::Server, Request, Response, Status};
 
+/// Decode packed little-endian vector bytes into f32 values.
+fn decode_packed_vector(bytes: &[u8], encoding: i32) -> Result<Vec<f32>, String> {
+    match VectorEncoding::try_from(encoding) {
+        Ok(VectorEncoding::Float32) => {
+            if bytes.len() % 4 != 0 {
+                return Err(format!("packed float32 vector has {} bytes", bytes.len()));
+            }
+            Ok(bytes
+                .chunks_exact(4)
+                .map(|c| f32::from_le_bytes([c[0], c[1], c[2], c[3]]))
+                .collect())
+        }
+        Ok(VectorEncoding::Float16) => {
+            if bytes.len() % 2 != 0 {
+                return Err(format!("packed float16 vector has {} bytes", bytes.len()));
+            }
+            Ok(bytes
+                .chunks_exact(2)
+                .map(|c| f16_to_f32(u16::from_le_bytes([c[0], c[1]])))
+                .collect())
+        }
+        Err(_) => Err(format!("unknown vector encoding {}", encoding)),
+    }
+}
+
+/// IEEE 754 half precision to single precision.
+fn f16_to_f32(bits: u16) -> f32 {
+    let sign = ((bits >> 15) as u32) << 31;
+    let exponent = ((bits >> 10) & 0x1f) as u32;
+    let mantissa = (bits & 0x3ff) as u32;
+    let out = match (exponent, mantissa) {
+        (0, 0) => sign,
+        (0, _) => {
+            // Subnormal: shift the mantissa up until it is normalised.
+            let mut e = 127 - 14;
+            let mut m = mantissa;
+            while m & 0x400 == 0 {
+                m <<= 1;
+                e -= 1;
+            }
+            sign | (e << 23) | ((m & 0x3ff) << 13)
+        }
+        (0x1f, _) => sign | 0x7f80_0000 | (mantissa << 13),
+        _ => sign | ((exponent + 127 - 15) << 23) | (mantissa << 13),
+    };
+    f32::from_bits(out)
+}
+
 fn convert_proto_rule_anchors(payload: RuleAnchorsPayload) -> Result<RuleVector, String> {
     fn convert_block(
         slot: &str,
@@ -37,6 +87,35 @@ fn convert_proto_rule_anchors(payload: RuleAnchorsPayload) -> Result<RuleVector,
         convert_anchor_block(slot, &vectors, count as usize)
     }
 
+    /// Rows for one slot: the AnchorVector list, or the packed populated rows
+    /// padded back to MAX_ANCHORS_PER_SLOT.
+    fn slot_rows(
+        slot: &str,
+        anchors: Vec<rule_installation::AnchorVector>,
+        packed: &[u8],
+        encoding: i32,
+        count: i32,
+    ) -> Result<Vec<Vec<f32>>, String> {
+        if !anchors.is_empty() {
+            return Ok(anchors.into_iter().map(|v| v.values).collect());
+        }
+        let width = crate::rule_vector::SLOT_WIDTH;
+        let values = decode_packed_vector(packed, encoding)
+            .map_err(|e| format!("Slot '{}': {}", slot, e))?;
+        if count < 0 || values.len() != count as usize * width {
+            return Err(format!(
+                "Slot '{}' packed anchors hold {} values, expected {} x {}",
+                slot,
+                values.len(),
+                count,
+                width
+            ));
+        }
+        let mut rows: Vec<Vec<f32>> = values.chunks(width).map(|row| row.to_vec()).collect();
+        rows.resize(crate::rule_vector::MAX_ANCHORS_PER_SLOT, vec![0.0; width]);
+        Ok(rows)
+    }
+
     let RuleAnchorsPayload {
         action_anchors,
         action_count,
@@ -46,12 +125,18 @@ fn convert_proto_rule_anchors(payload: RuleAnchorsPayload) -> Result<RuleVector,
         data_count,
         risk_anchors,
         risk_count,
+        action_packed,
+        resource_packed,
+        data_packed,
+        risk_packed,
+        encoding,
     } = payload;
 
-    let action_vecs: Vec<Vec<f32>> = action_anchors.into_iter().map(|v| v.values).collect();
-    let resource_vecs: Vec<Vec<f32>> = resource_anchors.into_iter().map(|v| v.values).collect();
-    let data_vecs: Vec<Vec<f32>> = data_anchors.into_iter().map(|v| v.values).collect();
-    let risk_vecs: Vec<Vec<f32>> = risk_anchors.into_iter().map(|v| v.values).collect();
+    let action_vecs = slot_rows("action", action_anchors, &action_packed, encoding, action_count)?;
+    let resource_vecs =
+        slot_rows("resource", resource_anchors, &resource_packed, encoding, resource_count)?;
+    let data_vecs = slot_rows("data", data_anchors, &data_packed, encoding, data_count)?;
+    let risk_vecs = slot_rows("risk", risk_anchors, &risk_packed, encoding, risk_count)?;
 
     let (action_block, action_count) = convert_block("action", action_vecs, action_count)?;
     let (resource_block, resource_count) =
@@ -106,7 +191,8 @@ use rule_installation::{
     GetRuleStatsResponse, GetSessionRequest, GetSessionResponse, InstallRulesRequest,
     InstallRulesResponse, QueryTelemetryRequest, QueryTelemetryResponse, RefreshRulesRequest,
     RefreshRulesResponse, RemoveAgentRulesRequest, RemoveAgentRulesResponse, RemovePolicyRequest,
-    RemovePolicyResponse, RuleAnchorsPayload, RuleEvidence,
+    PolicyEvaluation, RemovePolicyResponse, ReplacePoliciesRequest, ReplacePoliciesResponse,
+    RuleAnchorsPayload, RuleEvidence, VectorEncoding,
 };
 
 // ================================================================================================
@@ -193,134 +279,24 @@ impl DataPlane for DataPlaneService {
         let mut failed_rules = Vec::new();
 
         for proto_rule in req.rules {
-            let anchor_payload = proto_rule.anchors.clone();
-            // Convert proto RuleInstance to ControlPlaneRule
-            let cp_rule = ControlPlaneRule {
-                rule_id: proto_rule.rule_id.clone(),
-                family_id: proto_rule.family_id.clone(),
-                layer: proto_rule.layer.clone(),
-                agent_id: proto_rule.agent_id.clone(),
-                priority: proto_rule.priority,
-                enabled: proto_rule.enabled,
-                created_at_ms: proto_rule.created_at_ms,
-                policy_type: proto_rule.policy_type.clone(),
-                drift_threshold: proto_rule.drift_threshold,
-                modification_spec: proto_rule.modification_spec.clone(),
-                slice_weights: {
-                    let w = &proto_rule.slice_weights;
-                    if w.len() == 4 {
-                        [w[0], w[1], w[2], w[3]]
-                    } else {
-                        [0.25, 0.25, 0.25, 0.25]
-                    }
-                },
-                params: proto_rule
-                    .params
-                    .into_iter()
-                    .map(|(k, v)| {
-                        let param_value = if let Some(value) = v.value {
-                            match value {
-                                rule_installation::param_value::Value::StringValue(s) => {
-                                    ParamValue::String(s)
-                                }
-                                rule_installation::param_value::Value::IntValue(i) => {
-                                    ParamValue::Int(i)
-                                }
-                                rule_installation::param_value::Value::FloatValue(f) => {
-                                    ParamValue::Float(f)
-                                }
-                                rule_installation::param_value::Value::BoolValue(b) => {
-                                    ParamValue::Bool(b)
-                                }
-                                rule_installation::param_value::Value::StringList(list) => {
-                                    ParamValue::StringList(list.values)
-                                }
-                            }
-                        } else {
-                            ParamValue::String(String::new())
-                        };
-                        (k, param_value)
-                    })
-                    .collect(),
-            };
-
-            let rule_type = cp_rule
-                .params
-                .get("rule_type")
-                .and_then(|value| value.as_string())
-                .unwrap_or_default();
-
-            let layer_label = if cp_rule.layer.is_empty() {
-                "global"
-            } else {
-                cp_rule.layer.as_str()
-            };
-
-            log::info!(
-                "Processing rule: {} (type: {}, layer: {})",
-                cp_rule.rule_id,
-                rule_type,
-                layer_label
-            );
-
-            if rule_type != "design_boundary" {
-                let error_msg = format!(
-                    "Unsupported rule_type '{}' for rule {}",
-                    rule_type, cp_rule.rule_id
-                );
-                log::error!("  ✗ {}\n", error_msg);
-                failed_rules.push(error_msg);
-                continue;
-            }
-
-            let bridge_rule = match convert_design_boundary_rule(&cp_rule) {
-                Ok(rule) => rule,
-                Err(e) => {
-                    let error_msg = format!("Failed to convert rule {}: {}", cp_rule.rule_id, e);
-                    log::error!("  ✗ {}\n", error_msg);
-                    failed_rules.push(error_msg);
-                    continue;
-                }
-            };
-
-            // Design boundary rules must always include anchor payloads
-            let payload = match anchor_payload.clone() {
-                Some(payload) => payload,
-                None => {
-                    let error_msg = format!(
-                        "Design boundary '{}' missing pre-encoded anchors",
-                        cp_rule.rule_id
-                    );
-                    log::error!("  ✗ {}\n", error_msg);
-                    failed_rules.push(error_msg);
-                    continue;
-                }
-            };
-
-            let rule_vector = match convert_proto_rule_anchors(payload) {
-                Ok(vector) => vector,
-                Err(err) => {
-                    let error_msg = format!("Invalid anchors for {}: {}", cp_rule.rule_id, err);
+            let (bridge_rule, rule_vector, layer_key) = match convert_proto_rule(proto_rule) {
+                Ok(converted) => converted,
+                Err(error_msg) => {
                     log::error!("  ✗ {}\n", error_msg);
                     failed_rules.push(error_msg);
                     continue;
                 }
             };
+            let rule_id = bridge_rule.rule_id().to_string();
 
             match self.bridge.add_rule_with_anchors(bridge_rule, rule_vector) {
                 Ok(_) => {
                     installed_count += 1;
-                    let layer_key = if cp_rule.layer.is_empty() {
-                        "global".to_string()
-                    } else {
-                        cp_rule.layer.clone()
-                    };
                     *rules_by_layer.entry(layer_key).or_insert(0) += 1;
                     log::info!("  ✓ Successfully installed\n");
                 }
                 Err(e) => {
-                    let error_msg =
-                        format!("Failed to add rule {} to bridge: {}", cp_rule.rule_id, e);
+                    let error_msg = format!("Failed to add rule {} to bridge: {}", rule_id, e);
                     log::error!("  ✗ {}\n", error_msg);
                     failed_rules.push(error_msg);
                 }
@@ -406,11 +382,15 @@ impl DataPlane for DataPlaneService {
             req.agent_id
         );
 
+        let previous_version = self.bridge.version() as i64;
+
         let Some(rule) = self.bridge.get_rule(&req.policy_id) else {
             return Ok(Response::new(RemovePolicyResponse {
                 success: false,
                 message: format!("Policy not found: {}", req.policy_id),
                 rules_removed: 0,
+                bridge_version: previous_version,
+                previous_bridge_version: previous_version,
             }));
         };
 
@@ -422,6 +402,8 @@ impl DataPlane for DataPlaneService {
                     req.policy_id, req.agent_id
                 ),
                 rules_removed: 0,
+                bridge_version: previous_version,
+                previous_bridge_version: previous_version,
             }));
         }
 
@@ -430,11 +412,15 @@ impl DataPlane for DataPlaneService {
                 success: true,
                 message: format!("Removed policy {}", req.policy_id),
                 rules_removed: 1,
+                bridge_version: self.bridge.version() as i64,
+                previous_bridge_version: previous_version,
             })),
             Ok(false) => Ok(Response::new(RemovePolicyResponse {
                 success: false,
                 message: format!("Policy not found: {}", req.policy_id),
                 rules_removed: 0,
+                bridge_version: self.bridge.version() as i64,
+                previous_bridge_version: previous_version,
             })),
             Err(err) => Err(Status::internal(format!(
                 "Failed to remove policy {}: {}",
@@ -443,6 +429,105 @@ impl DataPlane for DataPlaneService {
         }
     }
 
+    /// Swap an agent's rules in the bridge as one version
+    async fn replace_policies(
+        &self,
+        request: Request<ReplacePoliciesRequest>,
+    ) -> Result<Response<ReplacePoliciesResponse>, Status> {
+        let req = request.into_inner();
+
+        log::info!(
+            "Replacing rules for agent {} (config {}, owner {}): {} upserts, {} removals, replace_all={}",
+            req.agent_id,
+            req.config_id,
+            req.owner,
+            req.rules.len(),
+            req.remove_rule_ids.len(),
+            req.replace_all
+        );
+
+        // Convert everything up front. Like InstallRules, a rule that fails conversion
+        // is skipped and reported; the rest of the swap still goes through.
+        let mut upserts = Vec::with_capacity(req.rules.len());
+        let mut rules_by_layer: HashMap<String, i32> = HashMap::new();
+        let mut failed_rule_ids = Vec::new();
+        let mut failed_rules = Vec::new();
+        for proto_rule in req.rules {
+            let rule_id = proto_rule.rule_id.clone();
+            match convert_proto_rule(proto_rule) {
+                Ok((bridge_rule, rule_vector, layer_key)) => {
+                    *rules_by_layer.entry(layer_key).or_insert(0) += 1;
+                    upserts.push((bridge_rule, rule_vector));
+                }
+                Err(error_msg) => {
+                    log::error!("  ✗ {}", error_msg);
+                    failed_rule_ids.push(rule_id);
+                    failed_rules.push(error_msg);
+                }
+            }
+        }
+
+        let remove_scope = if req.replace_all {
+            Some(req.agent_id.as_str())
+        } else {
+            None
+        };
+        let expected_version = if req.expected_bridge_version > 0 {
+            Some(req.expected_bridge_version as u64)
+        } else {
+            None
+        };
+
+        let outcome = self
+            .bridge
+            .replace_rules(
+                upserts,
+                &req.remove_rule_ids,
+                remove_scope,
+                &failed_rule_ids,
+                expected_version,
+            )
+            .map_err(|err| match err {
+                ReplaceError::VersionConflict { .. } => Status::aborted(err.to_string()),
+                ReplaceError::Storage(_) => {
+                    Status::internal(format!("Failed to replace rules: {}", err))
+                }
+            })?;
+
+        log::info!(
+            "  ✓ Replaced rules for agent {}: {} installed, {} removed, {} failed, version {} -> {}",
+            req.agent_id,
+            outcome.rules_installed,
+            outcome.rules_removed,
+            failed_rules.len(),
+            outcome.previous_version,
+            outcome.version
+        );
+
+        let mut message = format!(
+            "Replaced rules for agent {}: {} installed, {} removed",
+            req.agent_id, outcome.rules_installed, outcome.rules_removed
+        );
+        if !failed_rules.is_empty() {
+            message.push_str(&format!(
+                "; failed to convert {} rules: {:?}",
+                failed_rules.len(),
+                failed_rules
+            ));
+        }
+
+        Ok(Response::new(ReplacePoliciesResponse {
+            success: failed_rules.is_empty(),
+            message,
+            rules_installed: outcome.rules_installed as i32,
+            rules_removed: outcome.rules_removed as i32,
+            rules_by_layer,
+            bridge_version: outcome.version as i64,
+            previous_bridge_version: outcome.previous_version as i64,
+            failed_rule_ids,
+        }))
+    }
+
     /// Get current rule statistics from the bridge
     async fn get_rule_stats(
         &self,
@@ -457,6 +542,7 @@ impl DataPlane for DataPlaneService {
             total_global_rules: stats.global_rules as i32,
             total_scoped_rules: stats.scoped_rules as i32,
             table_stats: Vec::new(),
+            bridge_created_at_ms: stats.created_at as i64,
         }))
     }
 
@@ -465,22 +551,29 @@ impl DataPlane for DataPlaneService {
         &self,
         request: Request<EnforceRequest>,
     ) -> Result<Response<EnforceResponse>, Status> {
-        let req = request.into_inner();
+        let mut req = request.into_inner();
         let request_id = req.request_id.clone();
 
         log::info!("================================================");
         log::info!("  Enforcing Intent");
         log::info!("================================================");
 
-        let vector_override = if req.intent_vector.is_empty() {
+        let intent_vector = if req.intent_vector_packed.is_empty() {
+            std::mem::take(&mut req.intent_vector)
+        } else {
+            decode_packed_vector(&req.intent_vector_packed, req.intent_vector_encoding).map_err(
+                |e| Status::invalid_argument(format!("Invalid intent_vector_packed: {}", e)),
+            )?
+        };
+        let vector_override = if intent_vector.is_empty() {
             None
-        } else if req.intent_vector.len() == 128 {
-            match req.intent_vector.clone().try_into() {
+        } else if intent_vector.len() == 128 {
+            match intent_vector.clone().try_into() {
                 Ok(arr) => Some(arr),
                 Err(_) => {
                     log::error!(
                         "Invalid intent_vector length {} (expected 128). Ignoring override.",
-                        req.intent_vector.len()
+                        intent_vector.len()
                     );
                     None
                 }
@@ -488,24 +581,35 @@ impl DataPlane for DataPlaneService {
         } else {
             log::error!(
                 "Invalid intent_vector length {} (expected 128). Ignoring override.",
-                req.intent_vector.len()
+                intent_vector.len()
             );
             None
         };
 
         let drift_score = req.drift_score;
 
-        // Call enforcement engine
-        let result = self
-            .enforcement_engine
-            .enforce(
-                &req.intent_event_json,
-                vector_override,
-                &request_id,
-                drift_score,
-            )
-            .await
-            .map_err(|e| Status::internal(format!("Enforcement failed: {}", e)))?;
+        // Call enforcement engine. Typed intents skip JSON parsing; the JSON
+        // document remains the fallback for older callers.
+        let result = match req.intent.take() {
+            Some(proto_intent) => {
+                let intent = convert_proto_intent(proto_intent)
+                    .map_err(|e| Status::invalid_argument(format!("Invalid intent: {}", e)))?;
+                self.enforcement_engine
+                    .enforce_intent(intent, None, vector_override, &request_id, drift_score)
+                    .await
+            }
+            None => {
+                self.enforcement_engine
+                    .enforce(
+                        &req.intent_event_json,
+                        vector_override,
+                        &request_id,
+                        drift_score,
+                    )
+                    .await
+            }
+        }
+        .map_err(|e| Status::internal(format!("Enforcement failed: {}", e)))?;
 
         // Derive legacy 0/1 decision from EnforcementDecision for backward compat
         let legacy_decision = if let Some(ref ed) = result.enforcement_decision {
@@ -543,28 +647,64 @@ impl DataPlane for DataPlaneService {
                 (String::new(), String::new(), false)
             };
 
-        Ok(Response::new(EnforceResponse {
-            decision: legacy_decision,
-            slice_similarities: result.slice_similarities.to_vec(),
-            rules_evaluated: result.rules_evaluated as i32,
-            evidence: result
+        // Only the response is trimmed; the engine has already written the full
+        // evidence to the hitlog. Below "full" the typed policy evaluation
+        // replaces the JSON details. "decision" keeps only each rule's id,
+        // decision and policy evaluation, so the management plane still sees
+        // policy drift and mode.
+        let evidence = match req.evidence_level.as_str() {
+            "decision" => result
                 .evidence
-                .iter()
+                .into_iter()
                 .map(|ev| RuleEvidence {
-                    rule_id: ev.rule_id.clone(),
-                    rule_name: ev.rule_name.clone(),
+                    policy: Some(policy_evaluation(&ev.connection_result_json)),
+                    rule_id: ev.rule_id,
                     decision: ev.decision as i32,
-                    similarities: ev.similarities.to_vec(),
-                    triggering_slice: ev.triggering_slice.clone(),
-                    anchor_matched: ev.anchor_matched.clone(),
-                    thresholds: ev.thresholds.to_vec(),
-                    scoring_mode: ev.scoring_mode.clone(),
-                    evaluation_mode: ev.evaluation_mode.clone(),
-                    connection_result_json: ev.connection_result_json.clone(),
-                    deterministic_results_json: ev.deterministic_results_json.clone(),
-                    semantic_results_json: ev.semantic_results_json.clone(),
+                    ..Default::default()
                 })
                 .collect(),
+            level => {
+                let full = level != "summary";
+                result
+                    .evidence
+                    .into_iter()
+                    .map(|ev| {
+                        let policy = policy_evaluation(&ev.connection_result_json);
+                        let (connection_result_json, deterministic_results_json, semantic_results_json) =
+                            if full {
+                                (
+                                    ev.connection_result_json,
+                                    ev.deterministic_results_json,
+                                    ev.semantic_results_json,
+                                )
+                            } else {
+                                (String::new(), String::new(), String::new())
+                            };
+                        RuleEvidence {
+                            rule_id: ev.rule_id,
+                            rule_name: ev.rule_name,
+                            decision: ev.decision as i32,
+                            similarities: ev.similarities.to_vec(),
+                            triggering_slice: ev.triggering_slice,
+                            anchor_matched: ev.anchor_matched,
+                            thresholds: ev.thresholds.to_vec(),
+                            scoring_mode: ev.scoring_mode,
+                            evaluation_mode: ev.evaluation_mode,
+                            connection_result_json,
+                            deterministic_results_json,
+                            semantic_results_json,
+                            policy: Some(policy),
+                        }
+                    })
+                    .collect()
+            }
+        };
+
+        Ok(Response::new(EnforceResponse {
+            decision: legacy_decision,
+            slice_similarities: result.slice_similarities.to_vec(),
+            rules_evaluated: result.rules_evaluated as i32,
+            evidence,
             request_id: result.session_id.clone(),
             decision_name,
             modified_params,
@@ -729,6 +869,213 @@ fn extract_intent_summary(intent_json: &str) -> String {
     "unknown".to_string()
 }
 
+/// Convert a typed proto intent into the IntentEvent the engine evaluates.
+fn convert_proto_intent(intent: rule_installation::Intent) -> Result<IntentEvent, String> {
+    fn json_field(name: &str, raw: &str) -> Result<Option<Value>, String> {
+        if raw.is_empty() {
+            return Ok(None);
+        }
+        serde_json::from_str(raw)
+            .map(Some)
+            .map_err(|e| format!("{} is not valid JSON: {}", name, e))
+    }
+
+    let actor = intent.actor.unwrap_or_default();
+    let resource = intent.resource.unwrap_or_default();
+    let data = intent.data.unwrap_or_default();
+    let risk = intent.risk.unwrap_or_default();
+    Ok(IntentEvent {
+        id: intent.id,
+        schema_version: intent.schema_version,
+        tenant_id: intent.tenant_id,
+        timestamp: intent.timestamp,
+        actor: Actor {
+            id: actor.id,
+            actor_type: actor.r#type,
+        },
+        action: intent.action,
+        source_agent: intent.source_agent,
+        source_layer: intent.source_layer,
+        destination_agent: intent.destination_agent,
+        destination_layer: intent.destination_layer,
+        llm_tool_intent: intent.llm_tool_intent,
+        tool_call_count: intent.tool_call_count,
+        resource: Resource {
+            resource_type: resource.r#type,
+            name: resource.name,
+            location: resource.location,
+        },
+        data: Data {
+            sensitivity: data.sensitivity,
+            pii: data.pii,
+            volume: data.volume,
+            content: data.content,
+            size_bytes: data.size_bytes,
+            input_token_count: data.input_token_count,
+            record_count: data.record_count,
+        },
+        risk: Risk {
+            authn: risk.authn,
+            channel: risk.channel,
+        },
+        context: json_field("context_json", &intent.context_json)?,
+        layer: intent.layer,
+        tool_name: intent.tool_name,
+        tool_method: intent.tool_method,
+        tool_params: json_field("tool_params_json", &intent.tool_params_json)?,
+        rag_source_id: intent.rag_source_id,
+        rag_source_name: intent.rag_source_name,
+        resource_identity_type: intent.resource_identity_type,
+        resource_identity_key: intent.resource_identity_key,
+        resource_identity_name: intent.resource_identity_name,
+        rate_limit_context: None,
+    })
+}
+
+/// Connection result fields the management plane reads on every call.
+#[derive(Deserialize, Default)]
+struct ConnectionResultSummary {
+    policy_mode: Option<String>,
+    policy_type: Option<String>,
+    policy_drift_score: Option<f32>,
+    policy_similarity_score: Option<f32>,
+    baseline_drift_score: Option<f32>,
+}
+
+fn policy_evaluation(connection_result_json: &str) -> PolicyEvaluation {
+    let summary: ConnectionResultSummary = if connection_result_json.is_empty() {
+        ConnectionResultSummary::default()
+    } else {
+        serde_json::from_str(connection_result_json).unwrap_or_default()
+    };
+    PolicyEvaluation {
+        policy_mode: summary.policy_mode.unwrap_or_default(),
+        policy_type: summary.policy_type.unwrap_or_default(),
+        policy_drift_score: summary.policy_drift_score,
+        policy_similarity_score: summary.policy_similarity_score,
+        baseline_drift_score: summary.baseline_drift_score,
+    }
+}
+
+/// Convert a proto rule into the bridge rule, its anchors and the layer key
+/// used for per-layer counts.
+fn convert_proto_rule(
+    proto_rule: rule_installation::RuleInstance,
+) -> Result<(Arc<dyn RuleInstance>, RuleVector, String), String> {
+    let anchor_payload = proto_rule.anchors.clone();
+    // Convert proto RuleInstance to ControlPlaneRule
+    let cp_rule = ControlPlaneRule {
+        rule_id: proto_rule.rule_id.clone(),
+        family_id: proto_rule.family_id.clone(),
+        layer: proto_rule.layer.clone(),
+        agent_id: proto_rule.agent_id.clone(),
+        priority: proto_rule.priority,
+        enabled: proto_rule.enabled,
+        created_at_ms: proto_rule.created_at_ms,
+        policy_type: proto_rule.policy_type.clone(),
+        drift_threshold: proto_rule.drift_threshold,
+        modification_spec: proto_rule.modification_spec.clone(),
+        slice_weights: {
+            let w = &proto_rule.slice_weights;
+            if w.len() == 4 {
+                [w[0], w[1], w[2], w[3]]
+            } else {
+                [0.25, 0.25, 0.25, 0.25]
+            }
+        },
+        params: proto_rule
+            .params
+            .into_iter()
+            .map(|(k, v)| {
+                let param_value = if let Some(value) = v.value {
+                    match value {
+                        rule_installation::param_value::Value::StringValue(s) => {
+                            ParamValue::String(s)
+                        }
+                        rule_installation::param_value::Value::IntValue(i) => {
+                            ParamValue::Int(i)
+                        }
+                        rule_installation::param_value::Value::FloatValue(f) => {
+                            ParamValue::Float(f)
+                        }
+                        rule_installation::param_value::Value::BoolValue(b) => {
+                            ParamValue::Bool(b)
+                        }
+                        rule_installation::param_value::Value::StringList(list) => {
+                            ParamValue::StringList(list.values)
+                        }
+                    }
+                } else {
+                    ParamValue::String(String::new())
+                };
+                (k, param_value)
+            })
+            .collect(),
+    };
+
+    let rule_type = cp_rule
+        .params
+        .get("rule_type")
+        .and_then(|value| value.as_string())
+        .unwrap_or_default();
+
+    let layer_label = if cp_rule.layer.is_empty() {
+        "global"
+    } else {
+        cp_rule.layer.as_str()
+    };
+
+    log::info!(
+        "Processing rule: {} (type: {}, layer: {})",
+        cp_rule.rule_id,
+        rule_type,
+        layer_label
+    );
+
+    if rule_type != "design_boundary" {
+        let error_msg = format!(
+            "Unsupported rule_type '{}' for rule {}",
+            rule_type, cp_rule.rule_id
+        );
+        return Err(error_msg);
+    }
+
+    let bridge_rule = match convert_design_boundary_rule(&cp_rule) {
+        Ok(rule) => rule,
+        Err(e) => {
+            let error_msg = format!("Failed to convert rule {}: {}", cp_rule.rule_id, e);
+            return Err(error_msg);
+        }
+    };
+
+    // Design boundary rules must always include anchor payloads
+    let payload = match anchor_payload.clone() {
+        Some(payload) => payload,
+        None => {
+            let error_msg = format!(
+                "Design boundary '{}' missing pre-encoded anchors",
+                cp_rule.rule_id
+            );
+            return Err(error_msg);
+        }
+    };
+
+    let rule_vector = match convert_proto_rule_anchors(payload) {
+        Ok(vector) => vector,
+        Err(err) => {
+            let error_msg = format!("Invalid anchors for {}: {}", cp_rule.rule_id, err);
+            return Err(error_msg);
+        }
+    };
+
+    let layer_key = if cp_rule.layer.is_empty() {
+        "global".to_string()
+    } else {
+        cp_rule.layer.clone()
+    };
+    Ok((bridge_rule, rule_vector, layer_key))
+}
+
 fn convert_design_boundary_rule(
     cp_rule: &ControlPlaneRule,
 ) -> Result<Arc<dyn RuleInstance>, String> {
@@ -85,6 +85,14 @@ class PrismCallback(BaseCallbackHandler):
                 return "ALLOW", {}
             raise
 
+        if response.status_code == 503 and self.fail_open:
+            # Prism sheds load with 503 + Retry-After; treat it like unreachable.
+            logger.warning(
+                "Prism overloaded (Retry-After %s); failing open with ALLOW",
+                response.headers.get("Retry-After"),
+            )
+            return "ALLOW", {}
+
         if not response.is_success:
             raise RuntimeError(
                 f"Prism enforcement request failed with status {response.status_code}"
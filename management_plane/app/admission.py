@@ -0,0 +1,248 @@
+"""
+Adaptive admission control for the enforcement pipeline.
+
+An AIMD concurrency limiter sits in front of /api/v2/enforce and the
+WebSocket channel. Each completed request reports its pipeline latency: a
+sample over the target shrinks the limit multiplicatively, and a sample within
+target grows it by roughly one per limit's worth of completions while the
+limiter is actually in use. Requests over the limit wait in a bounded FIFO
+queue; when the queue is full, or the wait runs out, they are shed at once
+with ``Overloaded`` so callers can answer 503 instead of piling up latency
+for every tenant.
+
+Dry-run traffic from the policy editor has its own, smaller limiter
+(``dry_run_limiter``) that yields to live enforcement; see app.lanes.
+
+The limiters are per process and only touched from the event loop, so they need
+no locking.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable
+
+from app.metrics import registry
+from app.settings import config
+
+ADMISSION_LIMIT = registry.gauge(
+    "prism_admission_limit",
+    "Current adaptive concurrency limit for enforcement, per lane.",
+    ("lane",),
+)
+ADMISSION_INFLIGHT = registry.gauge(
+    "prism_admission_inflight",
+    "Enforcement requests currently admitted, per lane.",
+    ("lane",),
+)
+ADMISSION_QUEUE_DEPTH = registry.gauge(
+    "prism_admission_queue_depth",
+    "Enforcement requests waiting for admission, per lane.",
+    ("lane",),
+)
+ADMISSION_SHED_TOTAL = registry.counter(
+    "prism_admission_shed_total",
+    "Enforcement requests rejected by admission control.",
+    ("lane", "reason"),
+)
+ADMISSION_QUEUE_WAIT_SECONDS = registry.histogram(
+    "prism_admission_queue_wait_seconds",
+    "Time enforcement requests spent waiting for admission.",
+    ("lane",),
+)
+
+
+class Overloaded(Exception):
+    """
+    Admission was refused.
+
+    ``reason`` is "queue_full", "queue_timeout" or, for a lane that yields to
+    another, "yielding".
+    """
+
+    def __init__(self, reason: str, retry_after_seconds: int) -> None:
+        super().__init__(f"Enforcement overloaded: {reason}")
+        self.reason = reason
+        self.retry_after_seconds = retry_after_seconds
+
+    def detail(self) -> dict[str, object]:
+        return {
+            "code": "overloaded",
+            "reason": self.reason,
+            "retry_after_seconds": self.retry_after_seconds,
+        }
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    AIMD concurrency limit with a bounded wait queue.
+
+    A limiter constructed with ``yields_to`` refuses new work with reason
+    "yielding" while that limiter has requests queued, so a low-priority
+    lane backs off as soon as the lane it serves is saturated.
+    """
+
+    def __init__(
+        self,
+        *,
+        lane: str = "live",
+        yields_to: "AdaptiveConcurrencyLimiter | None" = None,
+        initial_limit: int,
+        min_limit: int,
+        max_limit: int,
+        target_latency_ms: float,
+        backoff: float,
+        max_queue: int,
+        max_queue_wait_ms: float,
+        retry_after_seconds: int,
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        self.lane = lane
+        self.yields_to = yields_to
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.target_latency_ms = target_latency_ms
+        self.backoff = min(max(backoff, 0.1), 0.99)
+        self.max_queue = max(0, max_queue)
+        self.max_queue_wait_ms = max_queue_wait_ms
+        self.retry_after_seconds = max(1, retry_after_seconds)
+        self._clock = clock
+        self._limit = float(min(max(initial_limit, self.min_limit), self.max_limit))
+        self._inflight = 0
+        self._waiters: deque[asyncio.Future[None]] = deque()
+        self._publish()
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    @property
+    def inflight(self) -> int:
+        return self._inflight
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._waiters)
+
+    def _publish(self) -> None:
+        ADMISSION_LIMIT.set(self.limit, lane=self.lane)
+        ADMISSION_INFLIGHT.set(self._inflight, lane=self.lane)
+        ADMISSION_QUEUE_DEPTH.set(len(self._waiters), lane=self.lane)
+
+    def _shed(self, reason: str) -> Overloaded:
+        ADMISSION_SHED_TOTAL.inc(lane=self.lane, reason=reason)
+        return Overloaded(reason, self.retry_after_seconds)
+
+    async def acquire(self, max_wait_ms: float | None = None) -> None:
+        """Take a slot, waiting at most ``max_wait_ms`` (default: the configured wait)."""
+        if self.yields_to is not None and self.yields_to.queue_depth:
+            raise self._shed("yielding")
+        if self._inflight < self.limit and not self._waiters:
+            self._inflight += 1
+            self._publish()
+            return
+        if len(self._waiters) >= self.max_queue:
+            raise self._shed("queue_full")
+
+        wait_ms = self.max_queue_wait_ms if max_wait_ms is None else min(
+            max_wait_ms, self.max_queue_wait_ms
+        )
+        waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self._publish()
+        started = self._clock()
+        try:
+            await asyncio.wait_for(waiter, timeout=max(wait_ms, 0.0) / 1000.0)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as exc:
+            if waiter.done() and not waiter.cancelled():
+                # Granted a slot just as the wait ended; hand it on.
+                self._release_slot()
+            elif waiter in self._waiters:
+                self._waiters.remove(waiter)
+                self._publish()
+            if isinstance(exc, asyncio.CancelledError):
+                raise
+            raise self._shed("queue_timeout") from None
+        finally:
+            ADMISSION_QUEUE_WAIT_SECONDS.observe(self._clock() - started, lane=self.lane)
+
+    def _release_slot(self) -> None:
+        self._inflight -= 1
+        while self._waiters and self._inflight < self.limit:
+            waiter = self._waiters.popleft()
+            if waiter.done():
+                continue
+            self._inflight += 1
+            waiter.set_result(None)
+        self._publish()
+
+    def release(self, latency_ms: float) -> None:
+        """Return a slot and adjust the limit from the request's latency."""
+        if latency_ms > self.target_latency_ms:
+            self._limit = max(self.min_limit, self._limit * self.backoff)
+        elif self._inflight * 2 >= self._limit:
+            self._limit = min(self.max_limit, self._limit + 1.0 / self._limit)
+        self._release_slot()
+
+    @asynccontextmanager
+    async def admit(self, max_wait_ms: float | None = None) -> AsyncIterator[None]:
+        await self.acquire(max_wait_ms)
+        started = self._clock()
+        try:
+            yield
+        finally:
+            self.release((self._clock() - started) * 1000.0)
+
+
+class UnlimitedLimiter:
+    """Stand-in used when admission control is disabled."""
+
+    queue_depth = 0
+
+    @asynccontextmanager
+    async def admit(self, max_wait_ms: float | None = None) -> AsyncIterator[None]:
+        yield
+
+
+def _build_live_limiter() -> AdaptiveConcurrencyLimiter | UnlimitedLimiter:
+    if not config.ENFORCEMENT_ADMISSION_ENABLED:
+        return UnlimitedLimiter()
+    return AdaptiveConcurrencyLimiter(
+        lane="live",
+        initial_limit=config.ENFORCEMENT_ADMISSION_INITIAL_LIMIT,
+        min_limit=config.ENFORCEMENT_ADMISSION_MIN_LIMIT,
+        max_limit=config.ENFORCEMENT_ADMISSION_MAX_LIMIT,
+        target_latency_ms=config.ENFORCEMENT_ADMISSION_TARGET_LATENCY_MS,
+        backoff=config.ENFORCEMENT_ADMISSION_BACKOFF,
+        max_queue=config.ENFORCEMENT_ADMISSION_MAX_QUEUE,
+        max_queue_wait_ms=config.ENFORCEMENT_ADMISSION_MAX_QUEUE_WAIT_MS,
+        retry_after_seconds=math.ceil(config.ENFORCEMENT_ADMISSION_RETRY_AFTER_SECONDS),
+    )
+
+
+def _build_dry_run_limiter(
+    live: AdaptiveConcurrencyLimiter | UnlimitedLimiter,
+) -> AdaptiveConcurrencyLimiter:
+    # Always bounded, even with live admission control disabled: dry runs
+    # must never be able to crowd out agents.
+    cap = max(1, config.ENFORCEMENT_DRY_RUN_MAX_CONCURRENCY)
+    return AdaptiveConcurrencyLimiter(
+        lane="dry_run",
+        yields_to=live if isinstance(live, AdaptiveConcurrencyLimiter) else None,
+        initial_limit=cap,
+        min_limit=1,
+        max_limit=cap,
+        target_latency_ms=config.ENFORCEMENT_ADMISSION_TARGET_LATENCY_MS,
+        backoff=config.ENFORCEMENT_ADMISSION_BACKOFF,
+        max_queue=config.ENFORCEMENT_DRY_RUN_MAX_QUEUE,
+        max_queue_wait_ms=config.ENFORCEMENT_DRY_RUN_MAX_QUEUE_WAIT_MS,
+        retry_after_seconds=math.ceil(config.ENFORCEMENT_ADMISSION_RETRY_AFTER_SECONDS),
+    )
+
+
+enforcement_limiter = _build_live_limiter()
+dry_run_limiter = _build_dry_run_limiter(enforcement_limiter)
@@ -75,6 +75,22 @@ def upsert_rule_payload(
     logger.info("Upserted rule '%s' into Chroma collection %s", rule_id, collection.name)
 
 
+def upsert_rule_payloads(
+    tenant_id: str,
+    entries: list[tuple[str, dict[str, Any], Optional[dict[str, Any]]]],
+) -> None:
+    """Persist several ``(rule_id, payload, metadata)`` anchor payloads in one Chroma upsert."""
+    if not entries:
+        return
+    collection = get_rules_collection(tenant_id)
+    collection.upsert(
+        ids=[rule_id for rule_id, _, _ in entries],
+        documents=[json.dumps(payload) for _, payload, _ in entries],
+        metadatas=[{"rule_id": rule_id, **(metadata or {})} for rule_id, _, metadata in entries],
+    )
+    logger.info("Upserted %d rules into Chroma collection %s", len(entries), collection.name)
+
+
 def delete_tenant_collection(tenant_id: str) -> None:
     """Delete the entire Chroma collection for a tenant. No-op if it does not exist."""
     client = get_chroma_client()
@@ -98,3 +114,23 @@ def fetch_rule_payload(tenant_id: str, rule_id: str) -> Optional[dict[str, Any]]
     except (json.JSONDecodeError, TypeError) as exc:
         logger.warning("Failed to decode Chroma payload for %s: %s", rule_id, exc)
         return None
+
+
+def fetch_rule_payloads(tenant_id: str, rule_ids: list[str]) -> dict[str, dict[str, Any]]:
+    """Fetch stored anchor payloads for several rules in one Chroma get.
+
+    Rules with no stored (or undecodable) payload are left out of the result.
+    """
+    if not rule_ids:
+        return {}
+    collection = get_rules_collection(tenant_id)
+    result = collection.get(ids=list(rule_ids))
+    if not result:
+        return {}
+    payloads: dict[str, dict[str, Any]] = {}
+    for rule_id, document in zip(result.get("ids") or [], result.get("documents") or []):
+        try:
+            payloads[rule_id] = json.loads(document)
+        except (json.JSONDecodeError, TypeError) as exc:
+            logger.warning("Failed to decode Chroma payload for %s: %s", rule_id, exc)
+    return payloads
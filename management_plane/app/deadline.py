@@ -0,0 +1,135 @@
+"""
+Per-request enforcement deadlines.
+
+A Deadline is created when an enforcement request arrives and made current
+with ``deadline_scope``. Downstream clients (db_infra over HTTP, the Data Plane
+over gRPC) read it through ``current_deadline`` and shrink their own timeouts
+to the remaining budget, so a single enforcement cannot wait on several
+serial 5 s timeouts. The context variable follows ``asyncio.to_thread`` and
+task creation, so blocking calls made off the event loop see it too.
+"""
+
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Iterator
+
+from app.settings import config
+
+
+class DeadlineExceeded(TimeoutError):
+    """The enforcement budget ran out before ``stage`` could run."""
+
+    def __init__(self, stage: str, budget_ms: float) -> None:
+        super().__init__(f"Enforcement deadline of {budget_ms:.0f} ms exceeded during {stage}")
+        self.stage = stage
+        self.budget_ms = budget_ms
+
+
+def parse_tenant_budgets(raw: str) -> dict[str, float]:
+    """Parse "tenant-a=500,tenant-b=2000" into per-tenant budgets in ms."""
+    budgets: dict[str, float] = {}
+    for item in raw.split(","):
+        tenant_id, sep, value = item.partition("=")
+        if not sep or not tenant_id.strip():
+            continue
+        try:
+            budget = float(value)
+        except ValueError:
+            continue
+        if budget > 0:
+            budgets[tenant_id.strip()] = budget
+    return budgets
+
+
+_TENANT_BUDGETS_MS = parse_tenant_budgets(config.ENFORCEMENT_TENANT_DEADLINES_MS)
+
+
+def budget_ms_for_tenant(tenant_id: str | None) -> float:
+    return _TENANT_BUDGETS_MS.get(tenant_id or "", config.ENFORCEMENT_DEADLINE_MS)
+
+
+class Deadline:
+    """
+    Remaining time budget for one enforcement request.
+
+    ``reserve_ms`` is the headroom kept for the decision itself: once less
+    than that remains, optional stages are skipped (see ``skip``) and
+    recorded in ``skipped_stages``.
+    """
+
+    __slots__ = ("budget_ms", "reserve_ms", "started_at", "skipped_stages", "_clock")
+
+    def __init__(
+        self,
+        budget_ms: float,
+        *,
+        reserve_ms: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._clock = clock
+        self.started_at = clock()
+        self.budget_ms = budget_ms
+        self.reserve_ms = (
+            config.ENFORCEMENT_DEADLINE_RESERVE_MS if reserve_ms is None else reserve_ms
+        )
+        self.skipped_stages: list[str] = []
+
+    @classmethod
+    def for_tenant(cls, tenant_id: str | None = None) -> "Deadline":
+        return cls(budget_ms_for_tenant(tenant_id))
+
+    def apply_tenant(self, tenant_id: str | None) -> None:
+        """Switch to the tenant's budget, still measured from the original start."""
+        self.budget_ms = budget_ms_for_tenant(tenant_id)
+
+    def remaining_ms(self) -> float:
+        return self.budget_ms - (self._clock() - self.started_at) * 1000.0
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining_ms() <= 0.0
+
+    def check(self, stage: str) -> None:
+        if self.expired:
+            raise DeadlineExceeded(stage, self.budget_ms)
+
+    def timeout(self, default_seconds: float, stage: str) -> float:
+        """Timeout for a downstream call: the smaller of its default and what is left."""
+        remaining_ms = self.remaining_ms()
+        if remaining_ms <= 0.0:
+            raise DeadlineExceeded(stage, self.budget_ms)
+        return min(default_seconds, remaining_ms / 1000.0)
+
+    def skip(self, stage: str) -> bool:
+        """Return True (and record it) when ``stage`` should be skipped to save budget."""
+        if self.remaining_ms() < self.reserve_ms:
+            self.skipped_stages.append(stage)
+            return True
+        return False
+
+    def summary(self) -> dict[str, object]:
+        return {
+            "budget_ms": self.budget_ms,
+            "remaining_ms": round(max(self.remaining_ms(), 0.0), 3),
+            "skipped_stages": list(self.skipped_stages),
+        }
+
+
+_current_deadline: ContextVar[Deadline | None] = ContextVar("enforcement_deadline", default=None)
+
+
+def current_deadline() -> Deadline | None:
+    return _current_deadline.get()
+
+
+@contextmanager
+def deadline_scope(deadline: Deadline | None) -> Iterator[Deadline | None]:
+    """Make ``deadline`` current for the block; ``None`` detaches any outer deadline."""
+    token = _current_deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current_deadline.reset(token)
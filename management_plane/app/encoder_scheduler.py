@@ -0,0 +1,338 @@
+"""
+Per-tenant fair scheduling of intent encoding.
+
+The embedding model is shared by every tenant, so one tenant sending large
+``p`` payloads could otherwise take all of its capacity. Encodes are queued
+per tenant and handed to a fixed number of encoder threads by deficit round
+robin, with DRR cost counted in encoder CPU milliseconds. Each visit credits a
+tenant ``quantum_ms * weight``. Each encode is charged an estimate (the
+tenant's moving average) up front and trued up with the measured thread CPU
+time when it finishes. A tenant with expensive payloads therefore gets fewer
+encodes per round instead of more CPU.
+
+An optional per-tenant token bucket (CPU ms per second, scaled by weight)
+caps a tenant's sustained encoder use even when nobody else is waiting.
+Per-tenant CPU ms, queue wait and queue depth are exported as metrics.
+
+Scheduling state is only touched from the event loop, like app.admission;
+the encoder threads only run the encode and time it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import functools
+import math
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, TypeVar
+
+from app.admission import Overloaded
+from app.deadline import DeadlineExceeded, current_deadline, parse_tenant_budgets
+from app.metrics import registry
+from app.settings import config
+
+T = TypeVar("T")
+
+ENCODER_CPU_MS_TOTAL = registry.counter(
+    "prism_encoder_cpu_ms_total",
+    "Encoder thread CPU time spent on intent encoding, per lane and tenant.",
+    ("lane", "tenant"),
+)
+ENCODER_QUEUE_WAIT_SECONDS = registry.histogram(
+    "prism_encoder_queue_wait_seconds",
+    "Time encodes waited for an encoder thread, per lane and tenant.",
+    ("lane", "tenant"),
+)
+ENCODER_QUEUE_DEPTH = registry.gauge(
+    "prism_encoder_queue_depth",
+    "Encodes waiting for an encoder thread, per lane and tenant.",
+    ("lane", "tenant"),
+)
+ENCODER_THROTTLED_TOTAL = registry.counter(
+    "prism_encoder_throttled_total",
+    "Times a tenant's encode was held back by its token bucket.",
+    ("lane", "tenant"),
+)
+
+
+@dataclass
+class _Job:
+    fn: Callable[..., Any]
+    args: tuple[Any, ...]
+    context: contextvars.Context
+    future: asyncio.Future[Any]
+    submitted_at: float
+    started: bool = False
+
+
+@dataclass
+class _TenantState:
+    weight: float
+    tokens_ms: float
+    refilled_at: float
+    jobs: deque[_Job] = field(default_factory=deque)
+    deficit_ms: float = 0.0
+    avg_cost_ms: float = 0.0
+
+
+class FairEncoderScheduler:
+    """
+    Deficit-round-robin encoder queue, one FIFO per tenant.
+
+    ``tenant_cpu_ms_per_second`` of 0 disables the token buckets; otherwise a
+    tenant may bank up to ``burst_ms`` (both scaled by its weight).
+    """
+
+    def __init__(
+        self,
+        *,
+        lane: str,
+        workers: int,
+        quantum_ms: float,
+        weights: dict[str, float] | None = None,
+        default_weight: float = 1.0,
+        tenant_cpu_ms_per_second: float = 0.0,
+        burst_ms: float = 0.0,
+        max_queue_per_tenant: int,
+        retry_after_seconds: int,
+        initial_cost_ms: float = 5.0,
+        executor: ThreadPoolExecutor | None = None,
+        clock: Callable[[], float] = time.perf_counter,
+        cpu_clock: Callable[[], float] = time.thread_time,
+    ) -> None:
+        self.lane = lane
+        self.workers = max(1, workers)
+        self.quantum_ms = max(quantum_ms, 0.1)
+        self.weights = dict(weights or {})
+        self.default_weight = max(default_weight, 0.01)
+        self.tenant_cpu_ms_per_second = max(tenant_cpu_ms_per_second, 0.0)
+        self.burst_ms = max(burst_ms, self.quantum_ms)
+        self.max_queue_per_tenant = max(1, max_queue_per_tenant)
+        self.retry_after_seconds = max(1, retry_after_seconds)
+        self.initial_cost_ms = initial_cost_ms
+        self._executor = executor or ThreadPoolExecutor(
+            max_workers=self.workers,
+            thread_name_prefix=f"prism-encode-{lane}",
+        )
+        self._clock = clock
+        self._cpu_clock = cpu_clock
+        self._tenants: dict[str, _TenantState] = {}
+        # Tenants with queued work, in round-robin order.
+        self._active: deque[str] = deque()
+        self._running = 0
+        self._wakeup: asyncio.TimerHandle | None = None
+
+    @property
+    def running(self) -> int:
+        return self._running
+
+    def queue_depth(self, tenant_id: str | None = None) -> int:
+        if tenant_id is not None:
+            state = self._tenants.get(tenant_id)
+            return len(state.jobs) if state else 0
+        return sum(len(state.jobs) for state in self._tenants.values())
+
+    def cost_ms(self, tenant_id: str) -> float:
+        """Current per-encode cost estimate for ``tenant_id``."""
+        state = self._tenants.get(tenant_id)
+        return state.avg_cost_ms if state and state.avg_cost_ms else self.initial_cost_ms
+
+    def _weight(self, tenant_id: str) -> float:
+        return max(self.weights.get(tenant_id, self.default_weight), 0.01)
+
+    def _state(self, tenant_id: str) -> _TenantState:
+        state = self._tenants.get(tenant_id)
+        if state is None:
+            weight = self._weight(tenant_id)
+            state = _TenantState(
+                weight=weight,
+                tokens_ms=self.burst_ms * weight,
+                refilled_at=self._clock(),
+            )
+            self._tenants[tenant_id] = state
+        return state
+
+    async def submit(self, tenant_id: str | None, fn: Callable[..., T], *args: Any) -> T:
+        """
+        Queue ``fn(*args)`` for ``tenant_id`` and wait for its result.
+
+        Raises ``Overloaded`` when the tenant's queue is full and
+        ``DeadlineExceeded`` if the request deadline runs out while queued.
+        """
+        tenant = tenant_id or ""
+        state = self._state(tenant)
+        if len(state.jobs) >= self.max_queue_per_tenant:
+            raise Overloaded("tenant_encoder_queue_full", self.retry_after_seconds)
+
+        loop = asyncio.get_running_loop()
+        job = _Job(
+            fn=fn,
+            args=args,
+            context=contextvars.copy_context(),
+            future=loop.create_future(),
+            submitted_at=self._clock(),
+        )
+        state.jobs.append(job)
+        if len(state.jobs) == 1:
+            self._active.append(tenant)
+        ENCODER_QUEUE_DEPTH.set(len(state.jobs), lane=self.lane, tenant=tenant)
+        self._dispatch()
+
+        deadline = current_deadline()
+        timeout = deadline.remaining_ms() / 1000.0 if deadline is not None else None
+        try:
+            return await asyncio.wait_for(asyncio.shield(job.future), timeout=timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as exc:
+            if not job.started:
+                self._withdraw(tenant, job)
+            if isinstance(exc, asyncio.CancelledError):
+                raise
+            raise DeadlineExceeded("encode", deadline.budget_ms) from None
+
+    def _withdraw(self, tenant: str, job: _Job) -> None:
+        state = self._tenants.get(tenant)
+        if state is None or job not in state.jobs:
+            return
+        state.jobs.remove(job)
+        ENCODER_QUEUE_DEPTH.set(len(state.jobs), lane=self.lane, tenant=tenant)
+        if not state.jobs:
+            self._deactivate(tenant)
+
+    def _deactivate(self, tenant: str) -> None:
+        if tenant in self._active:
+            self._active.remove(tenant)
+        state = self._tenants.get(tenant)
+        if state is not None:
+            # Standard DRR: an idle tenant does not bank credit.
+            state.deficit_ms = min(state.deficit_ms, 0.0)
+
+    def _refill(self, state: _TenantState, now: float) -> None:
+        if not self.tenant_cpu_ms_per_second:
+            return
+        elapsed = max(now - state.refilled_at, 0.0)
+        state.refilled_at = now
+        state.tokens_ms = min(
+            self.burst_ms * state.weight,
+            state.tokens_ms + elapsed * self.tenant_cpu_ms_per_second * state.weight,
+        )
+
+    def _next_tenant(self) -> str | None:
+        """Pick the tenant whose head job runs next, or None if all are throttled."""
+        now = self._clock()
+        throttled = 0
+        # Bounded: every full rotation adds a quantum to each eligible tenant.
+        while self._active and throttled < len(self._active):
+            tenant = self._active[0]
+            state = self._tenants[tenant]
+            self._refill(state, now)
+            if self.tenant_cpu_ms_per_second and state.tokens_ms <= 0:
+                ENCODER_THROTTLED_TOTAL.inc(lane=self.lane, tenant=tenant)
+                throttled += 1
+                self._active.rotate(-1)
+                continue
+            throttled = 0
+            cost = self.cost_ms(tenant)
+            if state.deficit_ms >= cost:
+                state.deficit_ms -= cost
+                return tenant
+            state.deficit_ms += self.quantum_ms * state.weight
+            self._active.rotate(-1)
+        return None
+
+    def _dispatch(self) -> None:
+        loop = asyncio.get_running_loop()
+        while self._running < self.workers and self._active:
+            tenant = self._next_tenant()
+            if tenant is None:
+                self._schedule_wakeup(loop)
+                return
+            state = self._tenants[tenant]
+            job = state.jobs.popleft()
+            ENCODER_QUEUE_DEPTH.set(len(state.jobs), lane=self.lane, tenant=tenant)
+            if not state.jobs:
+                self._deactivate(tenant)
+            if job.future.done():
+                continue
+            job.started = True
+            self._running += 1
+            ENCODER_QUEUE_WAIT_SECONDS.observe(
+                self._clock() - job.submitted_at, lane=self.lane, tenant=tenant
+            )
+            estimate = self.cost_ms(tenant)
+            task = loop.run_in_executor(self._executor, self._run_timed, job)
+            task.add_done_callback(functools.partial(self._finish, tenant, job, estimate))
+
+    def _schedule_wakeup(self, loop: asyncio.AbstractEventLoop) -> None:
+        if self._wakeup is not None or not self.tenant_cpu_ms_per_second:
+            return
+        # Earliest point at which some throttled tenant has a positive balance.
+        wait_s = min(
+            -self._tenants[tenant].tokens_ms
+            / (self.tenant_cpu_ms_per_second * self._tenants[tenant].weight)
+            for tenant in self._active
+        )
+
+        def wake() -> None:
+            self._wakeup = None
+            self._dispatch()
+
+        self._wakeup = loop.call_later(max(wait_s, 0.001), wake)
+
+    def _run_timed(self, job: _Job) -> tuple[Any, float]:
+        started = self._cpu_clock()
+        result = job.context.run(job.fn, *job.args)
+        return result, (self._cpu_clock() - started) * 1000.0
+
+    def _finish(
+        self,
+        tenant: str,
+        job: _Job,
+        estimate_ms: float,
+        done: asyncio.Future[tuple[Any, float]],
+    ) -> None:
+        self._running -= 1
+        state = self._state(tenant)
+        exc = done.exception()
+        if exc is None:
+            result, cpu_ms = done.result()
+            ENCODER_CPU_MS_TOTAL.inc(cpu_ms, lane=self.lane, tenant=tenant)
+            # True up the DRR charge and the bucket with the measured cost.
+            state.deficit_ms += estimate_ms - cpu_ms
+            if tenant not in self._active:
+                state.deficit_ms = min(state.deficit_ms, 0.0)
+            if self.tenant_cpu_ms_per_second:
+                self._refill(state, self._clock())
+                state.tokens_ms -= cpu_ms
+            state.avg_cost_ms = (
+                cpu_ms if not state.avg_cost_ms else 0.8 * state.avg_cost_ms + 0.2 * cpu_ms
+            )
+            if not job.future.done():
+                job.future.set_result(result)
+        elif not job.future.done():
+            job.future.set_exception(exc)
+        self._dispatch()
+
+
+def build_encoder_scheduler(
+    *,
+    lane: str,
+    workers: int,
+    max_queue_per_tenant: int,
+    executor: ThreadPoolExecutor | None = None,
+) -> FairEncoderScheduler:
+    return FairEncoderScheduler(
+        lane=lane,
+        workers=workers,
+        quantum_ms=config.ENCODER_DRR_QUANTUM_MS,
+        weights=parse_tenant_budgets(config.ENCODER_TENANT_WEIGHTS),
+        default_weight=config.ENCODER_DEFAULT_WEIGHT,
+        tenant_cpu_ms_per_second=config.ENCODER_TENANT_CPU_MS_PER_SECOND,
+        burst_ms=config.ENCODER_TENANT_BURST_MS,
+        max_queue_per_tenant=max_queue_per_tenant,
+        retry_after_seconds=math.ceil(config.ENFORCEMENT_ADMISSION_RETRY_AFTER_SECONDS),
+        executor=executor,
+    )
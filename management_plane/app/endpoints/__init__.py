@@ -6,4 +6,5 @@ This package contains route handlers for:
 - /api/v1/boundaries - Boundary management
 - /api/v1/telemetry - Telemetry data ingestion
 - /health - Health checks
+- /metrics - Prometheus metrics
 """
@@ -3,30 +3,43 @@ API v2 Enforcement Endpoints.
 
 Endpoints:
 - POST /api/v2/enforce - Enforce intent against active policies
+- WS   /api/v2/enforce/ws - Persistent enforcement channel for long-lived agents
 
 Features:
 - Direct NL intent encoding (no canonicalization step)
 - Drift computation and session tracking
 - AARM policy decision: ALLOW, DENY, MODIFY, STEP_UP, DEFER
+- Live and dry-run traffic on separate execution lanes (app.lanes)
 """
 
 from fencio_logger import get_logger
 
 import asyncio
 import json
-import os
 import time
 import uuid
+from dataclasses import dataclass
 from functools import lru_cache
-from typing import Optional, Any
-
-from fastapi import APIRouter, Header, HTTPException, Request, status
+from typing import Optional, Any, get_args
+
+from fastapi import (
+    APIRouter,
+    Header,
+    HTTPException,
+    Request,
+    Response,
+    WebSocket,
+    WebSocketDisconnect,
+    status,
+)
+from pydantic import ValidationError
 
 from app.auth import User, get_current_user_from_headers
 from app.models import (
     BoundaryEvidence,
     ComparisonResult,
     EnforcementResponse,
+    EvidenceLevel,
     IntentEvent,
 )
 from app.services import (
@@ -36,15 +49,28 @@ from app.services import (
     PolicyEncoder,
 )
 from app.services import session_store
-from app.services.data_intel_client import emit_enforcement_completed
+from app.services.dataplane_channels import get_dataplane_pool
+from app.services.data_intel_client import (
+    emit_enforcement_completed,
+    enforcement_completed_event,
+)
+from app.services.dry_run_recorder import dry_run_recorder
 from app.services.db_infra_client import DbInfraClientError, db_infra_client
 from app.services.policies import list_policy_records
+from app.admission import Overloaded
+from app.deadline import Deadline, DeadlineExceeded, current_deadline, deadline_scope
 from app.enforcement_identity import normalize_enforcement_identity
+from app.enforcement_logging import EnforcementLog, log_enforcement_payload
+from app.lanes import DRY_RUN, select_lane
+from app.metrics import StageTimer
+from app.settings import config
 
 logger = get_logger(__name__, service_name="prism")
 
 router = APIRouter(prefix="", tags=["enforcement-v2"])
 
+RUNTIME_KEY_AUDIENCE = "runtime-workspace-key"
+
 
 def _allow_without_enforcement(reason: str) -> EnforcementResponse:
     return EnforcementResponse(
@@ -234,7 +260,7 @@ async def _resolve_current_user_and_agent(
         return (
             User(
                 id=tenant_id,
-                aud="runtime-workspace-key",
+                aud=RUNTIME_KEY_AUDIENCE,
                 role="runtime",
                 email=None,
             ),
@@ -276,7 +302,7 @@ def get_intent_encoder() -> Optional[IntentEncoder]:
         logger.info("Intent encoder initialized")
         return encoder
     except Exception as e:
-        logger.error(f"Failed to initialize intent encoder: {e}")
+        logger.error("Failed to initialize intent encoder: %s", e)
         return None
 
 
@@ -292,15 +318,14 @@ def get_policy_encoder() -> Optional[PolicyEncoder]:
         logger.info("Policy encoder initialized")
         return encoder
     except Exception as e:
-        logger.error(f"Failed to initialize policy encoder: {e}")
+        logger.error("Failed to initialize policy encoder: %s", e)
         return None
 
 
 @lru_cache(maxsize=1)
 def get_data_plane_client():
-    """Get singleton Data Plane gRPC client."""
-    url = os.getenv("DATA_PLANE_URL", "localhost:50051")
-    return DataPlaneClient(url=url, insecure=True)
+    """Get singleton Data Plane gRPC client (backed by the shared channel pool)."""
+    return DataPlaneClient(pool=get_dataplane_pool())
 
 
 def _persist_enforcement_record(
@@ -311,39 +336,134 @@ def _persist_enforcement_record(
     decision_name: str,
     dry_run: bool,
     agent_call_id: str,
+    request_id: str,
+    timer: StageTimer,
+    dry_run_telemetry: bool = True,
 ) -> None:
     """
     Persist enforcement output for telemetry and session history.
+
+    Dry runs are queued for the batched background flush instead (or dropped
+    when ``dry_run_telemetry`` is off).
     """
-    try:
-        session_store.update_call_decision(
-            agent_id,
-            event.id,
-            decision_name,
-            decision_name,
+    if dry_run:
+        with timer.stage("persist"):
+            _queue_dry_run_record(
+                agent_id=agent_id,
+                event=event,
+                enforcement_response=enforcement_response,
+                decision_name=decision_name,
+                agent_call_id=agent_call_id,
+                request_id=request_id,
+                dry_run_telemetry=dry_run_telemetry,
+            )
+        return
+    with timer.stage("persist"):
+        _write_enforcement_record(
+            agent_id=agent_id,
+            event=event,
+            enforcement_response=enforcement_response,
+            decision_name=decision_name,
+            dry_run=dry_run,
+            agent_call_id=agent_call_id,
+            request_id=request_id,
         )
-    except Exception as exc:
-        logger.error("session_store update_call_decision failed: %s", exc)
 
-    try:
-        session_store.insert_call(
-            event_id=event.id,
+
+def _queue_dry_run_record(
+    *,
+    agent_id: str,
+    event: IntentEvent,
+    enforcement_response: EnforcementResponse,
+    decision_name: str,
+    agent_call_id: str,
+    request_id: str,
+    dry_run_telemetry: bool,
+) -> None:
+    log_enforcement_payload(event, request_id=request_id, decision=decision_name)
+    if not dry_run_telemetry:
+        dry_run_recorder.skip()
+        return
+    dry_run_recorder.record(
+        call={
+            "event_id": event.id,
+            "agent_id": agent_id,
+            "agent_call_id": agent_call_id,
+            "ts_ms": int(event.ts * 1000),
+            "prism_decision": decision_name,
+            "enforced_decision": decision_name,
+            "op": event.op,
+            "t": event.t,
+            "enforcement_result_json": json.dumps(enforcement_response.model_dump(mode="json")),
+            "intent_event_json": json.dumps(event.model_dump(mode="json")),
+            "is_dry_run": True,
+        },
+        intel_event=enforcement_completed_event(
             agent_id=agent_id,
+            event=event,
+            enforcement_response=enforcement_response,
+            decision_name=decision_name,
+            dry_run=True,
             agent_call_id=agent_call_id,
-            ts_ms=int(event.ts * 1000),
-            prism_decision=decision_name,
-            enforced_decision=decision_name,
-            op=event.op,
-            t=event.t,
-            enforcement_result_json=json.dumps(
-                enforcement_response.model_dump(mode="json")
-            ),
-            intent_event_json=json.dumps(event.model_dump(mode="json")),
-            is_dry_run=dry_run,
-        )
+        ),
+    )
+
+
+def _write_enforcement_record(
+    *,
+    agent_id: str,
+    event: IntentEvent,
+    enforcement_response: EnforcementResponse,
+    decision_name: str,
+    dry_run: bool,
+    agent_call_id: str,
+    request_id: str,
+) -> None:
+    log_enforcement_payload(event, request_id=request_id, decision=decision_name)
+    deadline = current_deadline()
+
+    # Settles the PENDING row written before evaluation; dropping it to save
+    # budget would leave the row PENDING, so like insert_call below it runs on
+    # the client's own timeout. If the pending write was skipped there is no
+    # row to settle.
+    if deadline is None or "pending_write" not in deadline.skipped_stages:
+        try:
+            with deadline_scope(None):
+                session_store.update_call_decision(
+                    agent_id,
+                    event.id,
+                    decision_name,
+                    decision_name,
+                )
+        except Exception as exc:
+            logger.error("session_store update_call_decision failed: %s", exc)
+
+    # The call row is the audit record of the decision, fail-closed ones
+    # included, so it is written with the client's own timeout rather than
+    # whatever is left of the request budget.
+    try:
+        with deadline_scope(None):
+            session_store.insert_call(
+                event_id=event.id,
+                agent_id=agent_id,
+                agent_call_id=agent_call_id,
+                ts_ms=int(event.ts * 1000),
+                prism_decision=decision_name,
+                enforced_decision=decision_name,
+                op=event.op,
+                t=event.t,
+                enforcement_result_json=json.dumps(
+                    enforcement_response.model_dump(mode="json")
+                ),
+                intent_event_json=json.dumps(event.model_dump(mode="json")),
+                is_dry_run=dry_run,
+            )
     except Exception as exc:
         logger.error("session_store insert_call failed: %s", exc)
 
+    if deadline is not None and deadline.skip("intel_emit"):
+        return
+
     try:
         emit_enforcement_completed(
             agent_id=agent_id,
@@ -357,76 +477,119 @@ def _persist_enforcement_record(
         logger.error("data_intel enforcement emit failed: %s", exc)
 
 
-# ============================================================================
-# V2 Endpoints
-# ============================================================================
-
-
-@router.post("/enforce", response_model=EnforcementResponse, status_code=status.HTTP_200_OK)
-async def enforce_v2(
-    event: IntentEvent,
-    request: Request,
-    dry_run: bool = False,
-    authorization: str | None = Header(default=None),
-    x_fencio_api_key: str | None = Header(default=None),
-    x_prism_api_key: str | None = Header(default=None),
-    x_tenant_id: str | None = Header(default=None),
-    x_user_id: str | None = Header(default=None),
-    x_prism_integration_type: str | None = Header(default=None),
-    x_prism_runtime_instance_id: str | None = Header(default=None),
-    x_prism_integration_agent_ref: str | None = Header(default=None),
-    x_prism_endpoint_fingerprint: str | None = Header(default=None),
+def _finalize_response(
+    enforcement_response: EnforcementResponse,
+    *,
+    request_id: str,
+    timer: StageTimer,
+    deadline: Deadline | None = None,
+    evidence_level: EvidenceLevel = "full",
 ) -> EnforcementResponse:
     """
-    Enforce intent against active policies.
+    Record end-to-end latency and attach it, with stage timings, to the response.
 
-    Flow:
-    1. Validate IntentEvent (FastAPI handles via request body type)
-    2. Extract agent_id from identity.agent_id
-    3. Encode intent to 128d current_vector
-    4. Ensure session row exists (write_call with decision="pending")
-    5. Initialize baseline vector if first call for this agent
-    6. Compute drift BEFORE gRPC call
-    7. Call gRPC enforce with session-baseline drift and namespace
-    8. Derive decision_name from result
-    9. Return EnforcementResponse
+    Evidence is trimmed to ``evidence_level`` here, after the record has been
+    persisted with whatever the data plane returned.
+    """
+    _trim_evidence(enforcement_response, evidence_level)
+    total_ms = timer.finish(enforcement_response.decision)
+    enforcement_response.enforcement_latency_ms = round(total_ms, 3)
+    enforcement_response.metadata = {
+        **enforcement_response.metadata,
+        "request_id": request_id,
+        "stage_timings_ms": timer.stage_ms(),
+    }
+    if deadline is not None:
+        enforcement_response.metadata["deadline"] = deadline.summary()
+    return enforcement_response
+
+
+def _trim_evidence(enforcement_response: EnforcementResponse, level: EvidenceLevel) -> None:
+    if level == "decision":
+        enforcement_response.evidence = []
+    elif level == "summary":
+        enforcement_response.evidence = [
+            evidence.model_copy(
+                update={
+                    "connection_result": None,
+                    "deterministic_results": [],
+                    "semantic_results": [],
+                }
+            )
+            for evidence in enforcement_response.evidence
+        ]
 
-    Args:
-        event: IntentEvent (AARM action tuple)
-        current_user: Authenticated user
 
-    Returns:
-        EnforcementResponse with decision, drift, and evidence
+def _dataplane_evidence_level(level: EvidenceLevel) -> EvidenceLevel:
+    """Level to request from the data plane; full when persistence wants it."""
+    return "full" if config.ENFORCEMENT_PERSIST_FULL_EVIDENCE else level
+
+
+def _deny_for_deadline(
+    exc: DeadlineExceeded,
+    *,
+    baseline_drift_score: float | None = None,
+) -> EnforcementResponse:
+    logger.warning("Enforcement failed closed: %s", exc)
+    return _deny_for_enforcement_error(
+        reason=str(exc),
+        baseline_drift_score=baseline_drift_score,
+    )
+
+
+def _overloaded_exception(exc: Overloaded) -> HTTPException:
+    """503 with Retry-After; SDKs fail open or closed on ``detail.code == "overloaded"``."""
+    logger.warning("Enforcement request shed: %s", exc.reason)
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail=exc.detail(),
+        headers={"Retry-After": str(exc.retry_after_seconds)},
+    )
 
-    Raises:
-        HTTPException: On encoding, enforcement, or service errors
-    """
-    request_id = str(uuid.uuid4())
-    _ = request
 
+def _prism_module_disabled(request_id: str) -> bool:
     try:
         prism_enablement = db_infra_client.get_module_enablement("prism")
         if not prism_enablement.get("enabled", False):
             logger.info("Prism disabled. Allowing request %s without enforcement.", request_id)
-            return _allow_without_enforcement("Prism module is disabled")
+            return True
     except DbInfraClientError as exc:
         logger.warning("Failed to read Prism enablement, continuing enforcement: %s", exc)
+    return False
 
-    current_user, agent_id = await _resolve_current_user_and_agent(
-        event=event,
-        authorization=authorization,
-        x_fencio_api_key=x_fencio_api_key,
-        x_prism_api_key=x_prism_api_key,
-        x_tenant_id=x_tenant_id,
-        x_user_id=x_user_id,
-        x_prism_integration_type=x_prism_integration_type,
-        x_prism_runtime_instance_id=x_prism_runtime_instance_id,
-        x_prism_integration_agent_ref=x_prism_integration_agent_ref,
-        x_prism_endpoint_fingerprint=x_prism_endpoint_fingerprint,
-    )
 
-    identity = normalize_enforcement_identity(event, fallback_request_id=request_id)
-    logger.info(
+async def _enforce_for_agent(
+    event: IntentEvent,
+    *,
+    current_user: User,
+    agent_id: str,
+    dry_run: bool,
+    request_id: str,
+    timer: StageTimer,
+    deadline: Deadline,
+    dry_run_telemetry: bool = True,
+    evidence_level: EvidenceLevel = "full",
+) -> EnforcementResponse:
+    """
+    Run the enforcement pipeline for an event whose caller is already resolved.
+
+    Shared by the HTTP endpoint and the persistent WebSocket channel. Stage
+    durations are recorded on ``timer``. Must run inside
+    ``deadline_scope(deadline)``: optional stages are skipped when the budget
+    runs low and an exhausted budget fails closed with DENY.
+
+    Dry runs (``dry_run`` or ``dry_run_rule_ids``) take a read-only path: no
+    PENDING row, drift computed against the stored baseline without updating
+    it, and telemetry batched in the background or skipped.
+    """
+    request_log = EnforcementLog(logger, request_id)
+    lane = select_lane(event, dry_run)
+    dry_run = lane.name == DRY_RUN
+
+    with timer.stage("identity"):
+        identity = normalize_enforcement_identity(event, fallback_request_id=request_id)
+    request_log.sample_for_tenant(event.tenant_id or current_user.id)
+    request_log.info(
         "Assigned Prism enforcement identity: request_id=%s, agent_call_id=%s, event_id=%s, missing=%s",
         request_id,
         identity.agent_call_id,
@@ -448,35 +611,39 @@ async def enforce_v2(
             decision_name="DENY",
             dry_run=dry_run,
             agent_call_id=agent_call_id,
+            request_id=request_id,
+            timer=timer,
+            dry_run_telemetry=dry_run_telemetry,
         )
         return enforcement_response
 
     if agent_id:
-        try:
-            integration = db_infra_client.get_prism_agent_integration(agent_id)
-        except DbInfraClientError as exc:
-            logger.warning(
-                "Failed to read Prism integration for agent %s, continuing enforcement: %s",
-                agent_id,
-                exc,
-            )
-            integration = {}
+        with timer.stage("enablement"):
+            try:
+                integration = db_infra_client.get_prism_agent_integration(agent_id)
+            except DbInfraClientError as exc:
+                logger.warning(
+                    "Failed to read Prism integration for agent %s, continuing enforcement: %s",
+                    agent_id,
+                    exc,
+                )
+                integration = {}
         if not integration:
-            logger.info(
+            request_log.info(
                 "Prism integration missing for agent %s. Allowing request %s without enforcement.",
                 agent_id,
                 request_id,
             )
             return _allow_without_enforcement("Prism is not enabled for this agent")
         if not bool(integration.get("enabled")):
-            logger.info(
+            request_log.info(
                 "Prism integration disabled for agent %s. Allowing request %s without enforcement.",
                 agent_id,
                 request_id,
             )
             return _allow_without_enforcement("Prism is disabled for this agent")
 
-    logger.info(
+    request_log.info(
         "V2 enforce request: %s, op=%s, t=%s, agent_id=%s, "
         "source_layer=%s, destination_layer=%s",
         request_id,
@@ -486,49 +653,47 @@ async def enforce_v2(
         event.source_layer,
         event.destination_layer,
     )
-    logger.info(
-        "V2 enforce intent payload for %s: %s",
-        request_id,
-        json.dumps(
-            event.model_dump(mode="json", exclude_none=False),
-            ensure_ascii=False,
-        ),
-    )
 
     action = event.op or ""
 
-    try:
-        session_store.write_call(agent_id, event.id, action, "PENDING", "PENDING")
-    except Exception as exc:
-        logger.error("session_store write_call failed: %s", exc)
+    if not dry_run and not deadline.skip("pending_write"):
+        try:
+            session_store.write_call(agent_id, event.id, action, "PENDING", "PENDING")
+        except Exception as exc:
+            logger.error("session_store write_call failed: %s", exc)
+
+    baseline_drift_score: float | None = None
 
     try:
         # ====================================================================
         # STAGE 0: NETWORK POLICY ENFORCEMENT (if enabled)
         # ====================================================================
         if event.enforce_network and event.network_context:
-            logger.info(f"Network policy enforcement enabled for agent {agent_id}")
+            request_log.info("Network policy enforcement enabled for agent %s", agent_id)
 
             try:
                 from app.services.network_policy_evaluator import evaluate_network_policies
 
-                network_result = evaluate_network_policies(
-                    tenant_id=event.tenant_id,
-                    agent_id=agent_id,
-                    network_ctx=event.network_context,
-                    selected_policy_ids=event.dry_run_rule_ids,
-                )
+                with timer.stage("network"):
+                    network_result = evaluate_network_policies(
+                        tenant_id=event.tenant_id,
+                        agent_id=agent_id,
+                        network_ctx=event.network_context,
+                        selected_policy_ids=event.dry_run_rule_ids,
+                    )
 
-                logger.info(
-                    f"Network policy result: {network_result.decision} - "
-                    f"{network_result.reason}"
+                request_log.info(
+                    "Network policy result: %s - %s",
+                    network_result.decision,
+                    network_result.reason,
                 )
 
                 # If network policy denies and mode is Enforce, block immediately
                 if network_result.decision == "DENY":
                     logger.warning(
-                        f"Network policy DENIED: "
-                        f"{event.network_context.method} {event.network_context.url}"
+                        "Network policy DENIED: %s %s",
+                        event.network_context.method,
+                        event.network_context.url,
                     )
 
                     # Build evidence for network policy denial
@@ -576,17 +741,23 @@ async def enforce_v2(
                         decision_name="DENY",
                         dry_run=dry_run,
                         agent_call_id=agent_call_id,
+                        request_id=request_id,
+                        timer=timer,
+                        dry_run_telemetry=dry_run_telemetry,
                     )
                     return enforcement_response
 
-                logger.info(
-                    f"Network policy check passed, proceeding to semantic enforcement"
+                request_log.info(
+                    "Network policy check passed, proceeding to semantic enforcement"
                 )
 
+            except DeadlineExceeded:
+                raise
             except Exception as e:
                 logger.error(
-                    f"Network policy evaluation failed: {e}",
-                    exc_info=True
+                    "Network policy evaluation failed: %s",
+                    e,
+                    exc_info=True,
                 )
                 # On evaluation error, log and continue to semantic
                 # (fail-open for network policy errors to avoid blocking)
@@ -603,58 +774,74 @@ async def enforce_v2(
             raise HTTPException(status_code=500, detail="Service initialization failed")
 
         # Step 3: Encode intent to current_vector
+        deadline.check("encode")
         try:
-            vector = intent_encoder.encode(event)
+            with timer.stage("encode"):
+                vector = await lane.encode(current_user.id, intent_encoder.encode, event)
+        except (DeadlineExceeded, Overloaded):
+            raise
         except Exception as e:
-            logger.error(f"Intent encoding failed: {e}", exc_info=True)
+            logger.error("Intent encoding failed: %s", e, exc_info=True)
+            log_enforcement_payload(event, request_id=request_id, decision="ERROR", error=True)
             raise HTTPException(status_code=503, detail="Intent encoding failed")
 
         current_vector = vector.tolist()
 
-        # Step 5: Initialize baseline vector (first call only, no-op after)
-        if agent_id:
-            try:
-                session_store.initialize_session_vector(agent_id, current_vector)
-            except Exception as exc:
-                logger.error("session_store initialize_session_vector failed: %s", exc)
-
-        # Step 6: Compute legacy session-baseline drift before gRPC.
-        # Rust returns the policy-relative drift that is used for enforcement.
-        if agent_id:
-            try:
-                baseline_drift_score = session_store.compute_and_update_drift(agent_id, current_vector)
-            except Exception as exc:
-                logger.error("session_store compute_and_update_drift failed: %s", exc)
-                baseline_drift_score = 0.0
-        else:
-            baseline_drift_score = 0.0
+        # Session-baseline drift is advisory (the Data Plane returns the
+        # policy-relative drift that is enforced), so it is skipped when the
+        # budget runs low.
+        baseline_drift_score = 0.0
+        if agent_id and dry_run:
+            with timer.stage("drift"):
+                baseline_drift_score = session_store.peek_drift(agent_id, current_vector)
+        elif agent_id and not deadline.skip("baseline_drift"):
+            with timer.stage("drift"):
+                # Step 5: Initialize baseline vector (first call only, no-op after)
+                try:
+                    session_store.initialize_session_vector(agent_id, current_vector)
+                except Exception as exc:
+                    logger.error("session_store initialize_session_vector failed: %s", exc)
+
+                # Step 6: Compute legacy session-baseline drift before gRPC.
+                # Rust returns the policy-relative drift that is used for enforcement.
+                try:
+                    baseline_drift_score = session_store.compute_and_update_drift(
+                        agent_id, current_vector
+                    )
+                except Exception as exc:
+                    logger.error("session_store compute_and_update_drift failed: %s", exc)
+                    baseline_drift_score = 0.0
 
         # Step 7: Call gRPC enforce
         # Determine which policy namespace to enforce against:
         # prefer per-agent policies; fall back to tenant-wide policies.
         enforce_namespace = event.tenant_id
         if agent_id:
-            per_agent_policies = list_policy_records(event.tenant_id, agent_id=agent_id)
+            with timer.stage("namespace"):
+                per_agent_policies = list_policy_records(event.tenant_id, agent_id=agent_id)
             if per_agent_policies:
                 enforce_namespace = agent_id
         client = get_data_plane_client()
 
         try:
-            result: ComparisonResult = await asyncio.to_thread(
-                client.enforce,
-                event,
-                current_vector,
-                event.event_id or event.id,
-                baseline_drift_score,
-                agent_call_id,
-            )
+            with timer.stage("grpc"):
+                result: ComparisonResult = await lane.run(
+                    client.enforce,
+                    event,
+                    vector,
+                    event.event_id or event.id,
+                    baseline_drift_score,
+                    agent_call_id,
+                    _dataplane_evidence_level(evidence_level),
+                )
         except Exception as e:
-            logger.error(f"Data Plane enforcement failed: {e}", exc_info=True)
-            reason = (
-                f"Data Plane error: {e}"
-                if isinstance(e, DataPlaneError)
-                else f"Enforcement failed: {e}"
-            )
+            logger.error("Data Plane enforcement failed: %s", e, exc_info=True)
+            if isinstance(e, DeadlineExceeded):
+                reason = str(e)
+            elif isinstance(e, DataPlaneError):
+                reason = f"Data Plane error: {e}"
+            else:
+                reason = f"Enforcement failed: {e}"
             enforcement_response = _deny_for_enforcement_error(
                 reason=reason,
                 baseline_drift_score=baseline_drift_score,
@@ -666,6 +853,9 @@ async def enforce_v2(
                 decision_name="DENY",
                 dry_run=dry_run,
                 agent_call_id=agent_call_id,
+                request_id=request_id,
+                timer=timer,
+                dry_run_telemetry=dry_run_telemetry,
             )
             return enforcement_response
 
@@ -701,12 +891,391 @@ async def enforce_v2(
             decision_name=decision_name,
             dry_run=dry_run,
             agent_call_id=agent_call_id,
+            request_id=request_id,
+            timer=timer,
+            dry_run_telemetry=dry_run_telemetry,
         )
 
         return enforcement_response
 
-    except HTTPException:
+    except DeadlineExceeded as exc:
+        enforcement_response = _deny_for_deadline(
+            exc,
+            baseline_drift_score=baseline_drift_score,
+        )
+        _persist_enforcement_record(
+            agent_id=agent_id,
+            event=event,
+            enforcement_response=enforcement_response,
+            decision_name="DENY",
+            dry_run=dry_run,
+            agent_call_id=agent_call_id,
+            request_id=request_id,
+            timer=timer,
+            dry_run_telemetry=dry_run_telemetry,
+        )
+        return enforcement_response
+    except (HTTPException, Overloaded):
         raise
     except Exception as e:
-        logger.error(f"Unhandled error in V2 enforce: {e}", exc_info=True)
+        logger.error("Unhandled error in V2 enforce: %s", e, exc_info=True)
+        log_enforcement_payload(event, request_id=request_id, decision="ERROR", error=True)
         raise HTTPException(status_code=500, detail="Internal server error") from e
+
+
+# ============================================================================
+# V2 Endpoints
+# ============================================================================
+
+
+@router.post("/enforce", response_model=EnforcementResponse, status_code=status.HTTP_200_OK)
+async def enforce_v2(
+    event: IntentEvent,
+    request: Request,
+    response: Response,
+    dry_run: bool = False,
+    dry_run_telemetry: bool = True,
+    evidence: EvidenceLevel | None = None,
+    authorization: str | None = Header(default=None),
+    x_fencio_api_key: str | None = Header(default=None),
+    x_prism_api_key: str | None = Header(default=None),
+    x_tenant_id: str | None = Header(default=None),
+    x_user_id: str | None = Header(default=None),
+    x_prism_integration_type: str | None = Header(default=None),
+    x_prism_runtime_instance_id: str | None = Header(default=None),
+    x_prism_integration_agent_ref: str | None = Header(default=None),
+    x_prism_endpoint_fingerprint: str | None = Header(default=None),
+) -> EnforcementResponse:
+    """
+    Enforce intent against active policies.
+
+    Flow:
+    1. Validate IntentEvent (FastAPI handles via request body type)
+    2. Extract agent_id from identity.agent_id
+    3. Encode intent to 128d current_vector
+    4. Ensure session row exists (write_call with decision="pending")
+    5. Initialize baseline vector if first call for this agent
+    6. Compute drift BEFORE gRPC call
+    7. Call gRPC enforce with session-baseline drift and namespace
+    8. Derive decision_name from result
+    9. Return EnforcementResponse
+
+    Dry runs (``dry_run=true`` or ``dry_run_rule_ids``) skip steps 4-5, read
+    drift without updating the session, and batch their telemetry in the
+    background; pass ``dry_run_telemetry=false`` to skip recording entirely.
+
+    ``evidence`` (decision, summary or full; default
+    ENFORCEMENT_EVIDENCE_DEFAULT_LEVEL) sets how much per-boundary evidence the
+    response carries. Lower levels are also requested from the data plane, so
+    the evidence is never built or decoded, unless
+    ENFORCEMENT_PERSIST_FULL_EVIDENCE keeps it for the persisted record.
+
+    The whole flow shares one per-tenant deadline (ENFORCEMENT_DEADLINE_MS).
+    Steps 4-6 are skipped when the budget runs low, and an exhausted budget
+    returns a fail-closed DENY naming the stage that ran out of time.
+
+    Args:
+        event: IntentEvent (AARM action tuple)
+        current_user: Authenticated user
+
+    Returns:
+        EnforcementResponse with decision, drift, and evidence
+
+    Raises:
+        HTTPException: On encoding, enforcement, or service errors
+    """
+    request_id = str(uuid.uuid4())
+    evidence_level = evidence or config.ENFORCEMENT_EVIDENCE_DEFAULT_LEVEL
+    lane = select_lane(event, dry_run)
+    timer = StageTimer(lane=lane.name)
+    # Starts on the default budget; switched to the tenant's once auth resolves it.
+    deadline = Deadline.for_tenant(x_tenant_id)
+    _ = request
+
+    try:
+        async with lane.limiter.admit(max_wait_ms=deadline.remaining_ms()):
+            with deadline_scope(deadline):
+                with timer.stage("enablement"):
+                    prism_disabled = _prism_module_disabled(request_id)
+                if prism_disabled:
+                    enforcement_response = _allow_without_enforcement("Prism module is disabled")
+                else:
+                    with timer.stage("auth"):
+                        current_user, agent_id = await _resolve_current_user_and_agent(
+                            event=event,
+                            authorization=authorization,
+                            x_fencio_api_key=x_fencio_api_key,
+                            x_prism_api_key=x_prism_api_key,
+                            x_tenant_id=x_tenant_id,
+                            x_user_id=x_user_id,
+                            x_prism_integration_type=x_prism_integration_type,
+                            x_prism_runtime_instance_id=x_prism_runtime_instance_id,
+                            x_prism_integration_agent_ref=x_prism_integration_agent_ref,
+                            x_prism_endpoint_fingerprint=x_prism_endpoint_fingerprint,
+                        )
+                    deadline.apply_tenant(current_user.id)
+
+                    enforcement_response = await _enforce_for_agent(
+                        event,
+                        current_user=current_user,
+                        agent_id=agent_id,
+                        dry_run=dry_run,
+                        request_id=request_id,
+                        timer=timer,
+                        deadline=deadline,
+                        dry_run_telemetry=dry_run_telemetry,
+                        evidence_level=evidence_level,
+                    )
+    except DeadlineExceeded as exc:
+        enforcement_response = _deny_for_deadline(exc)
+    except Overloaded as exc:
+        timer.finish("OVERLOADED")
+        raise _overloaded_exception(exc) from exc
+    except HTTPException:
+        timer.finish("ERROR")
+        raise
+
+    _finalize_response(
+        enforcement_response,
+        request_id=request_id,
+        timer=timer,
+        deadline=deadline,
+        evidence_level=evidence_level,
+    )
+    response.headers["Server-Timing"] = timer.server_timing(
+        enforcement_response.enforcement_latency_ms
+    )
+    return enforcement_response
+
+
+# ============================================================================
+# Persistent WebSocket Channel
+# ============================================================================
+
+# Handshake headers forwarded to _resolve_current_user_and_agent.
+_WS_AUTH_HEADERS = {
+    "authorization": "authorization",
+    "x_fencio_api_key": "x-fencio-api-key",
+    "x_prism_api_key": "x-prism-api-key",
+    "x_tenant_id": "x-tenant-id",
+    "x_user_id": "x-user-id",
+    "x_prism_integration_type": "x-prism-integration-type",
+    "x_prism_runtime_instance_id": "x-prism-runtime-instance-id",
+    "x_prism_integration_agent_ref": "x-prism-integration-agent-ref",
+    "x_prism_endpoint_fingerprint": "x-prism-endpoint-fingerprint",
+}
+_EVIDENCE_LEVELS = get_args(EvidenceLevel)
+
+
+@dataclass
+class _PinnedCaller:
+    """Caller identity resolved once and reused for every frame on a connection."""
+
+    user: User
+    agent_id: str
+
+    def apply(self, event: IntentEvent) -> str:
+        if self.user.aud == RUNTIME_KEY_AUDIENCE:
+            _canonicalize_event_agent(event, self.agent_id, self.user.id)
+            return self.agent_id
+        event.tenant_id = self.user.id
+        return event.identity.agent_id or ""
+
+
+class _EnforcementChannel:
+    """
+    Serve one WebSocket connection.
+
+    Frames are enforced concurrently (bounded by ENFORCEMENT_WS_MAX_INFLIGHT)
+    and answered as soon as they finish, so responses may arrive out of order;
+    clients correlate them by event_id.
+    """
+
+    def __init__(self, websocket: WebSocket, *, default_dry_run: bool) -> None:
+        self._websocket = websocket
+        self._default_dry_run = default_dry_run
+        self._auth_headers = {
+            name: websocket.headers.get(header)
+            for name, header in _WS_AUTH_HEADERS.items()
+        }
+        self._caller: _PinnedCaller | None = None
+        self._resolve_lock = asyncio.Lock()
+        self._send_lock = asyncio.Lock()
+        self._inflight = asyncio.Semaphore(max(1, config.ENFORCEMENT_WS_MAX_INFLIGHT))
+        self._tasks: set[asyncio.Task] = set()
+        self._closed = False
+
+    async def serve(self) -> None:
+        try:
+            while not self._closed:
+                message = await self._websocket.receive()
+                if message["type"] == "websocket.disconnect":
+                    break
+                raw = message.get("text")
+                if raw is None:
+                    # Binary frames are not part of the protocol.
+                    await self._send({"event_id": None, "status": 400, "error": "invalid_frame"})
+                    continue
+                await self._inflight.acquire()
+                task = asyncio.create_task(self._handle_frame(raw))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+        except (WebSocketDisconnect, RuntimeError):
+            # RuntimeError: the channel closed itself after a failed handshake.
+            pass
+        finally:
+            for task in list(self._tasks):
+                task.cancel()
+
+    async def _resolve(self, event: IntentEvent) -> tuple[User, str]:
+        async with self._resolve_lock:
+            if self._caller is None:
+                user, agent_id = await _resolve_current_user_and_agent(
+                    event=event, **self._auth_headers
+                )
+                self._caller = _PinnedCaller(user=user, agent_id=agent_id)
+                return user, agent_id
+        return self._caller.user, self._caller.apply(event)
+
+    async def _handle_frame(self, raw: str) -> None:
+        event_id: str | None = None
+        try:
+            try:
+                frame = json.loads(raw)
+            except json.JSONDecodeError:
+                await self._send({"event_id": None, "status": 400, "error": "invalid_json"})
+                return
+            if not isinstance(frame, dict):
+                await self._send({"event_id": None, "status": 400, "error": "invalid_frame"})
+                return
+
+            payload = frame.get("event", frame)
+            if isinstance(payload, dict):
+                event_id = payload.get("event_id") or payload.get("id")
+            dry_run = bool(frame.get("dry_run", self._default_dry_run))
+            dry_run_telemetry = bool(frame.get("dry_run_telemetry", True))
+            evidence_level = frame.get("evidence", config.ENFORCEMENT_EVIDENCE_DEFAULT_LEVEL)
+            if evidence_level not in _EVIDENCE_LEVELS:
+                await self._send(
+                    {"event_id": event_id, "status": 422, "error": "invalid_evidence_level"}
+                )
+                return
+
+            try:
+                event = IntentEvent.model_validate(payload)
+            except ValidationError as exc:
+                await self._send(
+                    {
+                        "event_id": event_id,
+                        "status": 422,
+                        "error": json.loads(exc.json()),
+                    }
+                )
+                return
+
+            request_id = str(uuid.uuid4())
+            lane = select_lane(event, dry_run)
+            timer = StageTimer(lane=lane.name)
+            deadline = Deadline.for_tenant(
+                self._caller.user.id if self._caller else self._auth_headers["x_tenant_id"]
+            )
+            try:
+                async with lane.limiter.admit(max_wait_ms=deadline.remaining_ms()):
+                    with deadline_scope(deadline):
+                        with timer.stage("enablement"):
+                            prism_disabled = _prism_module_disabled(request_id)
+                        if prism_disabled:
+                            response = _allow_without_enforcement("Prism module is disabled")
+                        else:
+                            pinned = self._caller is not None
+                            try:
+                                with timer.stage("auth"):
+                                    current_user, agent_id = await self._resolve(event)
+                            except HTTPException as exc:
+                                await self._send(
+                                    {
+                                        "event_id": event_id,
+                                        "status": exc.status_code,
+                                        "error": exc.detail,
+                                    }
+                                )
+                                if not pinned:
+                                    await self._close(status.WS_1008_POLICY_VIOLATION)
+                                return
+                            deadline.apply_tenant(current_user.id)
+                            response = await _enforce_for_agent(
+                                event,
+                                current_user=current_user,
+                                agent_id=agent_id,
+                                dry_run=dry_run,
+                                request_id=request_id,
+                                timer=timer,
+                                deadline=deadline,
+                                dry_run_telemetry=dry_run_telemetry,
+                                evidence_level=evidence_level,
+                            )
+            except DeadlineExceeded as exc:
+                response = _deny_for_deadline(exc)
+            except Overloaded as exc:
+                timer.finish("OVERLOADED")
+                raise _overloaded_exception(exc) from exc
+            _finalize_response(
+                response,
+                request_id=request_id,
+                timer=timer,
+                deadline=deadline,
+                evidence_level=evidence_level,
+            )
+            await self._send(
+                {
+                    "event_id": event_id,
+                    "status": 200,
+                    "response": response.model_dump(mode="json"),
+                }
+            )
+        except HTTPException as exc:
+            await self._send({"event_id": event_id, "status": exc.status_code, "error": exc.detail})
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            logger.error("WebSocket enforcement frame failed: %s", exc, exc_info=True)
+            await self._send({"event_id": event_id, "status": 500, "error": "Internal server error"})
+        finally:
+            self._inflight.release()
+
+    async def _send(self, message: dict[str, Any]) -> None:
+        if self._closed:
+            return
+        async with self._send_lock:
+            try:
+                await self._websocket.send_text(json.dumps(message))
+            except (WebSocketDisconnect, RuntimeError):
+                self._closed = True
+
+    async def _close(self, code: int) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        async with self._send_lock:
+            try:
+                await self._websocket.close(code=code)
+            except RuntimeError:
+                pass
+
+
+@router.websocket("/enforce/ws")
+async def enforce_ws(websocket: WebSocket, dry_run: bool = False) -> None:
+    """
+    Persistent enforcement channel for long-lived agents.
+
+    Authenticate once with the same headers accepted by POST /enforce, then
+    send frames of the form {"event": <IntentEvent>, "dry_run": false} (a bare
+    IntentEvent is accepted too; "dry_run_telemetry": false skips recording a
+    dry run; "evidence" picks decision, summary or full evidence). Each frame is answered with
+    {"event_id", "status", "response"} or {"event_id", "status", "error"}.
+    Credential and agent resolution from the first frame is pinned for the
+    lifetime of the connection; a failed first resolution closes it with 1008.
+    """
+    await websocket.accept()
+    channel = _EnforcementChannel(websocket, default_dry_run=dry_run)
+    await channel.serve()
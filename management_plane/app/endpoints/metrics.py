@@ -0,0 +1,20 @@
+"""
+Metrics endpoint.
+
+Provides GET /metrics in the Prometheus text exposition format.
+"""
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from ..metrics import registry
+
+router = APIRouter(tags=["metrics"])
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics() -> PlainTextResponse:
+    """Expose enforcement latency histograms and counters for scraping."""
+    return PlainTextResponse(registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
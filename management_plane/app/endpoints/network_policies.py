@@ -8,15 +8,22 @@ semantic policies for fast, fail-closed enforcement.
 
 from fencio_logger import get_logger
 
+import asyncio
 import time
 import uuid
-from typing import Literal
+from typing import Any, Literal, Optional
 
 from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel, Field
 
 from app.models import NetworkEndpointRule, NetworkPolicy
 from app.services import network_policies as network_policy_service
+from app.services.network_policy_evaluator import (
+    get_network_policy_matcher,
+    invalidate_network_policy_matchers,
+)
+from app.services.openapi_whitelist import OpenAPIImportError, whitelist_from_openapi
+from app.settings import config
 
 logger = get_logger(__name__, service_name="prism")
 
@@ -71,6 +78,54 @@ class NetworkPolicyListResponse(BaseModel):
     total: int
 
 
+class NetworkPolicyImportItem(BaseModel):
+    """
+    One policy in a bulk import. An existing policy_id is overwritten.
+    """
+    policy_id: Optional[str] = None
+    agent_id: str
+    name: str
+    status: Literal["active", "inactive"] = "active"
+    mode: Literal["Monitor", "Enforce"] = "Enforce"
+    whitelist: list[NetworkEndpointRule]
+
+
+class NetworkPolicyOpenAPISource(BaseModel):
+    """
+    An OpenAPI 3.x / Swagger 2.0 document (JSON) imported as one policy.
+
+    protocol and base_path override the document's servers/basePath.
+    """
+    policy_id: Optional[str] = None
+    agent_id: str
+    name: str
+    status: Literal["active", "inactive"] = "active"
+    mode: Literal["Monitor", "Enforce"] = "Enforce"
+    document: dict[str, Any]
+    protocol: Optional[Literal["HTTP", "HTTPS"]] = None
+    base_path: Optional[str] = None
+
+
+class NetworkPolicyImportRequest(BaseModel):
+    """
+    Request model for bulk network policy import.
+    """
+    tenant_id: str
+    policies: list[NetworkPolicyImportItem] = Field(default_factory=list)
+    openapi: list[NetworkPolicyOpenAPISource] = Field(default_factory=list)
+
+
+class NetworkPolicyImportResponse(BaseModel):
+    """
+    Response model for bulk network policy import.
+    """
+    success: bool
+    policy_ids: list[str]
+    rule_count: int
+    skipped_operations: int
+    message: str
+
+
 # ============================================================================
 # CRUD Endpoints
 # ============================================================================
@@ -120,6 +175,7 @@ async def create_network_policy(
 
         # Store in database
         network_policy_service.create_network_policy(policy)
+        invalidate_network_policy_matchers(policy.tenant_id, policy.agent_id)
 
         logger.info(
             f"Successfully created network policy: {policy_id} "
@@ -138,6 +194,120 @@ async def create_network_policy(
         raise HTTPException(status_code=500, detail=error_msg) from e
 
 
+def _dedupe_rules(rules: list[NetworkEndpointRule]) -> list[NetworkEndpointRule]:
+    seen: set[tuple[str, str, str]] = set()
+    unique = []
+    for rule in rules:
+        key = (rule.protocol, rule.method, rule.url)
+        if key not in seen:
+            seen.add(key)
+            unique.append(rule)
+    return unique
+
+
+def _import_policies(policies: list[NetworkPolicy]) -> None:
+    network_policy_service.create_network_policies(policies)
+    # Rebuild each affected agent's matcher once, instead of per policy.
+    tenant_id = policies[0].tenant_id
+    for agent_id in sorted({policy.agent_id for policy in policies}):
+        invalidate_network_policy_matchers(tenant_id, agent_id)
+        get_network_policy_matcher(tenant_id, agent_id)
+
+
+@router.post("/import", response_model=NetworkPolicyImportResponse, status_code=201)
+async def import_network_policies(
+    request: NetworkPolicyImportRequest,
+) -> NetworkPolicyImportResponse:
+    """
+    Create or overwrite many network policies in one call.
+
+    Accepts explicit policies and/or OpenAPI documents (one policy per
+    document, one whitelist rule per operation). Everything is validated
+    before anything is written; the policies are then written to db_infra in
+    batches and each affected agent's matcher is rebuilt once.
+
+    Raises:
+        HTTPException: 400 if the import is empty, too large, has duplicate
+            policy IDs or an unusable OpenAPI document; 500 if the write fails
+    """
+    timestamp = time.time()
+    policies: list[NetworkPolicy] = []
+    skipped_operations = 0
+
+    def add(item: NetworkPolicyImportItem | NetworkPolicyOpenAPISource, rules) -> None:
+        policies.append(
+            NetworkPolicy(
+                policy_id=item.policy_id or str(uuid.uuid4()),
+                tenant_id=request.tenant_id,
+                agent_id=item.agent_id,
+                name=item.name,
+                status=item.status,
+                mode=item.mode,
+                whitelist=_dedupe_rules(rules),
+                created_at=timestamp,
+                updated_at=timestamp,
+            )
+        )
+
+    for item in request.policies:
+        add(item, item.whitelist)
+    for source in request.openapi:
+        try:
+            derived = whitelist_from_openapi(
+                source.document,
+                protocol=source.protocol,
+                base_path=source.base_path,
+            )
+        except OpenAPIImportError as e:
+            raise HTTPException(
+                status_code=400,
+                detail=f"OpenAPI document for '{source.name}': {e}",
+            ) from e
+        if not derived.rules:
+            raise HTTPException(
+                status_code=400,
+                detail=f"OpenAPI document for '{source.name}' has no importable operations",
+            )
+        skipped_operations += derived.skipped_operations
+        add(source, derived.rules)
+
+    if not policies:
+        raise HTTPException(status_code=400, detail="Nothing to import")
+    if len(policies) > config.NETWORK_POLICY_IMPORT_MAX_POLICIES:
+        raise HTTPException(
+            status_code=400,
+            detail=(
+                f"Import of {len(policies)} policies exceeds the limit of "
+                f"{config.NETWORK_POLICY_IMPORT_MAX_POLICIES}"
+            ),
+        )
+    policy_ids = [policy.policy_id for policy in policies]
+    if len(set(policy_ids)) != len(policy_ids):
+        raise HTTPException(status_code=400, detail="Duplicate policy_id in import")
+
+    rule_count = sum(len(policy.whitelist) for policy in policies)
+
+    logger.info(
+        f"Importing {len(policies)} network policies ({rule_count} rules) "
+        f"for tenant {request.tenant_id}"
+    )
+
+    try:
+        await asyncio.to_thread(_import_policies, policies)
+    except Exception as e:
+        error_msg = f"Failed to import network policies: {str(e)}"
+        logger.error(error_msg, exc_info=True)
+        raise HTTPException(status_code=500, detail=error_msg) from e
+
+    return NetworkPolicyImportResponse(
+        success=True,
+        policy_ids=policy_ids,
+        rule_count=rule_count,
+        skipped_operations=skipped_operations,
+        message=f"Imported {len(policies)} network policies",
+    )
+
+
 @router.get("", response_model=NetworkPolicyListResponse)
 async def list_network_policies(
     tenant_id: str = Query(..., description="Tenant identifier"),
@@ -266,6 +436,8 @@ async def update_network_policy(
 
         # Save to database
         network_policy_service.update_network_policy(updated_policy)
+        invalidate_network_policy_matchers(tenant_id, existing.agent_id)
+        invalidate_network_policy_matchers(tenant_id, updated_policy.agent_id)
 
         logger.info(f"Successfully updated network policy: {policy_id}")
 
@@ -314,6 +486,8 @@ async def delete_network_policy(
                 status_code=404,
                 detail=f"Network policy not found: {policy_id}",
             )
+        # The owning agent is not known here, so drop the tenant's matchers.
+        invalidate_network_policy_matchers(tenant_id)
 
         logger.info(f"Successfully deleted network policy: {policy_id}")
 
@@ -3,12 +3,15 @@
 from fencio_logger import get_logger
 
 import asyncio
+import contextvars
 import json
 import os
 import time
 import uuid
 from functools import lru_cache
-from typing import cast
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, TypeVar, cast
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 
@@ -17,6 +20,9 @@ from app.settings import config
 from app.endpoints.enforcement_v2 import get_policy_encoder
 from app.models import (
     DesignBoundary,
+    PolicyBatchResult,
+    PolicyBatchWriteRequest,
+    PolicyBatchWriteResponse,
     PolicyClearResponse,
     PolicyDeleteResponse,
     PolicyListResponse,
@@ -26,40 +32,66 @@ from app.models import (
 )
 from app.services import DataPlaneClient, DataPlaneError
 from app.chroma_client import delete_tenant_collection
-from app.services.data_intel_client import emit_policy_deleted, emit_policy_event
+from app.services.data_intel_client import (
+    data_intel_client,
+    emit_policy_deleted,
+    emit_policy_event,
+    policy_event,
+)
+from app.services.dataplane_channels import get_dataplane_pool
+from app.services.dataplane_sync_state import sync_state
 from app.services.policies import (
     build_anchor_payload,
     create_policy_record,
     delete_all_policy_records,
     delete_policy_payload,
     delete_policy_record,
+    fetch_policy_anchors,
     fetch_policy_record,
     list_policy_records,
     update_policy_record,
     upsert_policy_payload,
+    upsert_policy_payloads,
+    seed_anchor_cache,
+    write_policy_records,
 )
 
 logger = get_logger(__name__, service_name="prism")
 
 router = APIRouter(prefix="/policies", tags=["policies-v2"])
 
+T = TypeVar("T")
+
+# Policy writes encode anchors on their own pool, so saving a policy neither
+# blocks the event loop nor takes encoder threads from the enforcement lanes.
+_policy_encoder_executor = ThreadPoolExecutor(
+    max_workers=max(1, config.POLICY_ENCODER_WORKERS),
+    thread_name_prefix="prism-policy-encode",
+)
+
+# Background data_intel batch sends, referenced until they finish.
+_intel_tasks: set[asyncio.Task] = set()
+
 
 def _write_policy_audit(entry: dict) -> None:
+    _write_policy_audit_entries([entry])
+
+
+def _write_policy_audit_entries(entries: list[dict]) -> None:
     from datetime import date
     log_dir = config.POLICY_AUDIT_LOG_DIR
     os.makedirs(log_dir, exist_ok=True)
     path = os.path.join(log_dir, f"{date.today().isoformat()}.jsonl")
     try:
         with open(path, "a") as f:
-            f.write(json.dumps(entry) + "\n")
+            f.write("".join(json.dumps(entry) + "\n" for entry in entries))
     except Exception as exc:
         logger.error("policy audit log write failed: %s", exc)
 
 
 @lru_cache(maxsize=1)
 def get_data_plane_client() -> DataPlaneClient:
-    url = os.getenv("DATA_PLANE_URL", "localhost:50051")
-    return DataPlaneClient(url=url, insecure=True)
+    return DataPlaneClient(pool=get_dataplane_pool())
 
 
 def _boundary_from_request(
@@ -127,15 +159,20 @@ def _semantic_condition_role(condition: SemanticCondition) -> str:
     return "allow"
 
 
-def _compile_semantic_condition_anchors(boundary: DesignBoundary) -> DesignBoundary:
-    if not boundary.semantic_conditions:
-        return boundary
+# (condition, normalized parameters, anchor texts to encode) per semantic condition
+_PlannedConditions = list[tuple[SemanticCondition, dict[str, Any], list[str]]]
 
-    policy_encoder = get_policy_encoder()
-    if not policy_encoder:
-        raise HTTPException(status_code=500, detail="Service initialization failed")
 
-    compiled_conditions: list[SemanticCondition] = []
+def _plan_semantic_conditions(
+    boundary: DesignBoundary,
+) -> _PlannedConditions:
+    """
+    Validate a boundary's semantic conditions and normalize their parameters.
+
+    Returns (condition, parameters, anchors to encode) per condition; the
+    anchor vectors are filled in by ``_apply_condition_anchors``.
+    """
+    planned: _PlannedConditions = []
     for condition in boundary.semantic_conditions:
         params = dict(condition.parameters or {})
         condition_role = _semantic_condition_role(condition)
@@ -164,26 +201,7 @@ def _compile_semantic_condition_anchors(boundary: DesignBoundary) -> DesignBound
                 ),
             )
 
-        if anchors:
-            try:
-                anchor_vectors, anchor_count = policy_encoder.encode_condition_anchors(
-                    anchors,
-                    str(target_slot),
-                )
-            except Exception as exc:
-                logger.error(
-                    "Semantic condition anchor encoding failed: %s",
-                    exc,
-                    exc_info=True,
-                )
-                raise HTTPException(
-                    status_code=500,
-                    detail="Semantic condition anchor encoding failed",
-                ) from exc
-
-            params["anchor_vectors"] = anchor_vectors
-            params["anchor_count"] = anchor_count
-        else:
+        if not anchors:
             params["anchor_count"] = (
                 len(existing_vectors) if isinstance(existing_vectors, list) else 0
             )
@@ -194,17 +212,76 @@ def _compile_semantic_condition_anchors(boundary: DesignBoundary) -> DesignBound
         if condition_role == "guard":
             params["guard_action"] = params.get("guard_action") or "deny"
             params["trigger_when"] = params.get("trigger_when") or "gte_threshold"
-        params["target_slot"] = target_slot
-        compiled_conditions.append(condition.model_copy(update={"parameters": params}))
+        params["target_slot"] = str(target_slot)
+        planned.append((condition, params, anchors))
+
+    return planned
+
+
+def _condition_anchor_requests(
+    planned: _PlannedConditions,
+) -> list[tuple[list[str], str]]:
+    """(anchor texts, slot) for each planned condition that has anchors to encode."""
+    return [(anchors, params["target_slot"]) for _, params, anchors in planned if anchors]
+
 
+def _apply_condition_anchors(
+    boundary: DesignBoundary,
+    planned: _PlannedConditions,
+    encoded: list[tuple[list[list[float]], int]],
+) -> DesignBoundary:
+    """Build the compiled boundary from planned conditions and their encoded anchors."""
+    if not planned:
+        return boundary
+    encoded_anchors = iter(encoded)
+    compiled_conditions: list[SemanticCondition] = []
+    for condition, params, anchors in planned:
+        if anchors:
+            params["anchor_vectors"], params["anchor_count"] = next(encoded_anchors)
+        compiled_conditions.append(condition.model_copy(update={"parameters": params}))
     return boundary.model_copy(update={"semantic_conditions": compiled_conditions})
 
 
-def _persist_anchor_payload(
-    tenant_id: str,
+def _compile_semantic_condition_anchors(boundary: DesignBoundary) -> DesignBoundary:
+    if not boundary.semantic_conditions:
+        return boundary
+
+    policy_encoder = get_policy_encoder()
+    if not policy_encoder:
+        raise HTTPException(status_code=500, detail="Service initialization failed")
+
+    planned = _plan_semantic_conditions(boundary)
+    encoded = []
+    try:
+        for anchors, target_slot in _condition_anchor_requests(planned):
+            encoded.append(policy_encoder.encode_condition_anchors(anchors, target_slot))
+    except Exception as exc:
+        logger.error(
+            "Semantic condition anchor encoding failed: %s",
+            exc,
+            exc_info=True,
+        )
+        raise HTTPException(
+            status_code=500,
+            detail="Semantic condition anchor encoding failed",
+        ) from exc
+
+    return _apply_condition_anchors(boundary, planned, encoded)
+
+
+def _encode_policy(
     boundary: DesignBoundary,
-) -> "RuleVector":
-    from app.services.policy_encoder import RuleVector
+    stored_anchors: dict | None = None,
+) -> tuple[DesignBoundary, "RuleVector"]:
+    """
+    Compile semantic-condition anchors and encode the rule vector (CPU-bound).
+
+    Anchors from the policy's stored payload seed the anchor cache first, so
+    only anchors whose text changed are run through the model.
+    """
+    if stored_anchors:
+        seed_anchor_cache(stored_anchors)
+    boundary = _compile_semantic_condition_anchors(boundary)
     policy_encoder = get_policy_encoder()
 
     if not policy_encoder:
@@ -216,9 +293,36 @@ def _persist_anchor_payload(
         logger.error("Policy encoding failed: %s", exc, exc_info=True)
         raise HTTPException(status_code=500, detail="Policy encoding failed") from exc
 
+    return boundary, rule_vector
+
+
+async def _run_policy_encoder(fn: Callable[..., T], *args: Any) -> T:
+    """Run ``fn`` on the policy encoder pool, keeping context vars."""
+    context = contextvars.copy_context()
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_policy_encoder_executor, context.run, fn, *args)
+
+
+def _stored_anchors(tenant_id: str, policy_id: str) -> dict | None:
+    try:
+        return fetch_policy_anchors(tenant_id, [policy_id]).get(policy_id)
+    except Exception as exc:
+        logger.warning("Stored anchor lookup failed for policy %s: %s", policy_id, exc)
+        return None
+
+
+def _anchors_unchanged(stored_anchors: dict | None, anchors: dict[str, object]) -> bool:
+    return bool(stored_anchors) and stored_anchors.get("hash") == anchors["hash"]
+
+
+def _persist_anchor_payload(
+    tenant_id: str,
+    boundary: DesignBoundary,
+    anchors: dict[str, object],
+) -> None:
     payload = {
         "boundary": boundary.model_dump(),
-        "anchors": build_anchor_payload(rule_vector),
+        "anchors": anchors,
     }
     metadata = cast(
         dict[str, object],
@@ -237,18 +341,79 @@ def _persist_anchor_payload(
         logger.error("Failed to persist policy payload: %s", exc, exc_info=True)
         raise HTTPException(status_code=500, detail="Policy payload storage failed") from exc
 
-    return rule_vector
+
+async def _save_policy(
+    tenant_id: str,
+    boundary: DesignBoundary,
+    *,
+    create: bool,
+) -> DesignBoundary:
+    """
+    Encode, store and install one policy without blocking the event loop.
+
+    Encoding runs on the policy encoder pool; db_infra, Chroma and data
+    plane calls run in worker threads. On updates, anchors are reused from
+    the stored payload where their text is unchanged, and the Chroma upsert
+    is skipped when the anchor payload hash matches the stored one.
+    """
+    stored_anchors = None
+    if not create:
+        stored_anchors = await asyncio.to_thread(_stored_anchors, tenant_id, boundary.id)
+    boundary, rule_vector = await _run_policy_encoder(_encode_policy, boundary, stored_anchors)
+
+    if create:
+        try:
+            await asyncio.to_thread(create_policy_record, boundary, tenant_id)
+        except ValueError as exc:
+            raise HTTPException(status_code=409, detail=str(exc)) from exc
+    else:
+        try:
+            await asyncio.to_thread(update_policy_record, boundary, tenant_id)
+        except ValueError as exc:
+            raise HTTPException(status_code=404, detail=str(exc)) from exc
+
+    anchors = build_anchor_payload(rule_vector)
+    if _anchors_unchanged(stored_anchors, anchors):
+        logger.debug("Anchors for policy %s unchanged; skipping Chroma upsert", boundary.id)
+    else:
+        try:
+            await asyncio.to_thread(_persist_anchor_payload, tenant_id, boundary, anchors)
+        except HTTPException:
+            if create:
+                await asyncio.to_thread(delete_policy_record, tenant_id, boundary.id)
+            raise
+
+    installed = await asyncio.to_thread(_install_to_dataplane, boundary, rule_vector)
+    _emit_policy_upsert_intel_events(
+        tenant_id=tenant_id,
+        boundary=boundary,
+        rule_vector=rule_vector,
+        installed=installed,
+    )
+    return boundary
 
 
 def _install_to_dataplane(boundary: DesignBoundary, rule_vector: "RuleVector") -> bool:
     client = get_data_plane_client()
     try:
-        client.install_policies([boundary], [rule_vector])
+        result = client.install_policies([boundary], [rule_vector])
+        failed = boundary.id in result.get("failed_policy_ids", ())
+        sync_state.record_installed(
+            [] if failed else [boundary],
+            result.get("previous_bridge_version"),
+            result.get("bridge_version"),
+        )
+        if failed:
+            logger.warning(
+                "Data plane rejected policy %s (background reconciliation will retry): %s",
+                boundary.id, result.get("message"),
+            )
+            return False
         logger.info("Installed policy %s into data plane", boundary.id)
         return True
     except DataPlaneError as exc:
         logger.warning(
-            "Data plane install failed for policy %s (startup sync is recovery path): %s",
+            "Data plane install failed for policy %s (background reconciliation will retry): %s",
             boundary.id, exc,
         )
         return False
@@ -260,41 +425,286 @@ def _install_to_dataplane(boundary: DesignBoundary, rule_vector: "RuleVector") -
         return False
 
 
-def _emit_policy_upsert_intel_events(
+def _install_batch_to_dataplane(
+    boundaries: list[DesignBoundary],
+    rule_vectors: list["RuleVector"],
+) -> set[str]:
+    """Install a batch with one RPC per agent; returns the ids that were installed."""
+    if not boundaries:
+        return set()
+    by_agent: dict[str, list[int]] = defaultdict(list)
+    for index, boundary in enumerate(boundaries):
+        by_agent[boundary.agent_id or boundary.tenant_id].append(index)
+
+    client = get_data_plane_client()
+    installed: set[str] = set()
+    for agent_id, indexes in by_agent.items():
+        agent_boundaries = [boundaries[index] for index in indexes]
+        try:
+            result = client.install_policies(
+                agent_boundaries,
+                [rule_vectors[index] for index in indexes],
+            )
+        except Exception as exc:
+            logger.warning(
+                "Data plane install of %d policies for agent %s failed "
+                "(background reconciliation will retry): %s",
+                len(agent_boundaries), agent_id, exc,
+            )
+            continue
+        failed = set(result.get("failed_policy_ids", ()))
+        if failed:
+            logger.warning(
+                "Data plane rejected %d of %d policies for agent %s "
+                "(background reconciliation will retry): %s",
+                len(failed), len(agent_boundaries), agent_id, result.get("message"),
+            )
+        agent_installed = [boundary for boundary in agent_boundaries if boundary.id not in failed]
+        sync_state.record_installed(
+            agent_installed,
+            result.get("previous_bridge_version"),
+            result.get("bridge_version"),
+        )
+        installed.update(boundary.id for boundary in agent_installed)
+    logger.info(
+        "Installed %d of %d batch policies into data plane (%d agents)",
+        len(installed), len(boundaries), len(by_agent),
+    )
+    return installed
+
+
+def _write_policy_batch(
+    policies: list[PolicyWriteRequest],
+    tenant_id: str,
+) -> tuple[PolicyBatchWriteResponse, list[dict[str, Any]]]:
+    """
+    Write a batch of policies; blocking, run on a worker thread.
+
+    Returns the response and the data_intel events built for it, which the
+    caller sends in one request from the event loop.
+    """
+    request_id = str(uuid.uuid4())
+    now = time.time()
+    existing = {policy.id: policy for policy in list_policy_records(tenant_id)}
+
+    # Stored anchors of the policies being updated: seeds the anchor cache
+    # and lets unchanged payloads skip the Chroma upsert.
+    stored_anchors: dict[str, dict] = {}
+    updated_ids = list(dict.fromkeys(item.id for item in policies if item.id in existing))
+    if updated_ids:
+        try:
+            stored_anchors = fetch_policy_anchors(tenant_id, updated_ids)
+        except Exception as exc:
+            logger.warning("Stored anchor lookup failed for batch: %s", exc)
+    for anchors in stored_anchors.values():
+        seed_anchor_cache(anchors)
+
+    results: list[PolicyBatchResult] = []
+    pending: list[tuple[PolicyBatchResult, DesignBoundary, _PlannedConditions]] = []
+    seen: set[str] = set()
+    for item in policies:
+        previous = existing.get(item.id)
+        result = PolicyBatchResult(
+            policy_id=item.id,
+            status="updated" if previous else "created",
+        )
+        results.append(result)
+        if item.id in seen:
+            result.status, result.error = "error", "Duplicate policy id in batch"
+            continue
+        seen.add(item.id)
+        try:
+            boundary = _boundary_from_request(
+                item,
+                tenant_id,
+                previous.created_at if previous else now,
+                now,
+            )
+            planned = _plan_semantic_conditions(boundary)
+        except HTTPException as exc:
+            result.status, result.error = "error", str(exc.detail)
+            continue
+        pending.append((result, boundary, planned))
+
+    encoded: list[tuple[PolicyBatchResult, DesignBoundary, "RuleVector"]] = []
+    if pending:
+        policy_encoder = get_policy_encoder()
+        if not policy_encoder:
+            raise HTTPException(status_code=500, detail="Service initialization failed")
+        condition_requests = [
+            _condition_anchor_requests(planned) for _, _, planned in pending
+        ]
+        try:
+            # This runs in a worker thread; the encode itself still goes
+            # through the policy encoder pool, rule and semantic condition
+            # anchors of the whole batch in one model call.
+            rule_vectors, condition_anchors = _policy_encoder_executor.submit(
+                policy_encoder.encode_many_with_conditions,
+                [boundary for _, boundary, _ in pending],
+                [request for requests in condition_requests for request in requests],
+            ).result()
+        except Exception as exc:
+            logger.error("Batch policy encoding failed: %s", exc, exc_info=True)
+            raise HTTPException(status_code=500, detail="Policy encoding failed") from exc
+        offset = 0
+        for (result, boundary, planned), requests, rule_vector in zip(
+            pending, condition_requests, rule_vectors
+        ):
+            boundary = _apply_condition_anchors(
+                boundary, planned, condition_anchors[offset : offset + len(requests)]
+            )
+            offset += len(requests)
+            encoded.append((result, boundary, rule_vector))
+
+    write_errors = write_policy_records([boundary for _, boundary, _ in encoded])
+    for result, boundary, _ in encoded:
+        if boundary.id in write_errors:
+            logger.error("Policy record write failed for %s: %s", boundary.id, write_errors[boundary.id])
+            result.status, result.error = "error", "Policy record write failed"
+    encoded = [entry for entry in encoded if entry[1].id not in write_errors]
+
+    anchor_payloads = {
+        boundary.id: build_anchor_payload(rule_vector) for _, boundary, rule_vector in encoded
+    }
+    try:
+        upsert_policy_payloads(
+            tenant_id,
+            [
+                (
+                    boundary.id,
+                    {
+                        "boundary": boundary.model_dump(),
+                        "anchors": anchor_payloads[boundary.id],
+                    },
+                    {
+                        "policy_id": boundary.id,
+                        "boundary_name": boundary.name,
+                        "status": boundary.status,
+                        "mode": boundary.mode,
+                        "policy_type": boundary.policy_type,
+                    },
+                )
+                for _, boundary, _ in encoded
+                if not _anchors_unchanged(
+                    stored_anchors.get(boundary.id), anchor_payloads[boundary.id]
+                )
+            ],
+        )
+    except Exception as exc:
+        logger.error("Failed to persist batch policy payloads: %s", exc, exc_info=True)
+        for result, boundary, _ in encoded:
+            if result.status == "created":
+                delete_policy_record(tenant_id, boundary.id)
+            result.status, result.error = "error", "Policy payload storage failed"
+        encoded = []
+
+    installed = _install_batch_to_dataplane(
+        [boundary for _, boundary, _ in encoded],
+        [rule_vector for _, _, rule_vector in encoded],
+    )
+    audit_entries = []
+    intel_events: list[dict[str, Any]] = []
+    for result, boundary, rule_vector in encoded:
+        result.policy = boundary
+        result.installed = boundary.id in installed
+        try:
+            intel_events.extend(
+                data_intel_client.build_event(**policy_event(**event))
+                for event in _policy_upsert_intel_events(
+                    tenant_id=tenant_id,
+                    boundary=boundary,
+                    rule_vector=rule_vector,
+                    installed=result.installed,
+                )
+            )
+        except Exception as exc:
+            logger.error("data_intel policy event build failed for %s: %s", boundary.id, exc)
+        audit_entries.append({
+            "ts": now,
+            "request_id": request_id,
+            "operation": f"batch_{'create' if result.status == 'created' else 'update'}_policy",
+            "policy_id": boundary.id,
+            "tenant_id": tenant_id,
+            "result": "ok",
+        })
+    if audit_entries:
+        _write_policy_audit_entries(audit_entries)
+
+    response = PolicyBatchWriteResponse(
+        results=results,
+        created=sum(result.status == "created" for result in results),
+        updated=sum(result.status == "updated" for result in results),
+        failed=sum(result.status == "error" for result in results),
+    )
+    return response, intel_events
+
+
+def _policy_upsert_intel_events(
     *,
     tenant_id: str,
     boundary: DesignBoundary,
     rule_vector: "RuleVector",
     installed: bool,
-) -> None:
-    try:
-        emit_policy_event(
-            event_type="prism.policy.upserted",
-            tenant_id=tenant_id,
-            boundary=boundary,
-        )
-        emit_policy_event(
-            event_type="prism.policy.anchors.encoded",
-            tenant_id=tenant_id,
-            boundary=boundary,
-            payload_extra={
+) -> list[dict[str, Any]]:
+    """Keyword arguments for ``emit_policy_event`` per intel event of a policy upsert."""
+    events: list[dict[str, Any]] = [
+        {
+            "event_type": "prism.policy.upserted",
+            "tenant_id": tenant_id,
+            "boundary": boundary,
+        },
+        {
+            "event_type": "prism.policy.anchors.encoded",
+            "tenant_id": tenant_id,
+            "boundary": boundary,
+            "payload_extra": {
                 "anchor_counts": dict(rule_vector.anchor_counts),
                 "embedding_profile_id": os.getenv(
                     "PRISM_EMBEDDING_PROFILE_ID",
                     "redis-langcache-embed-v3-small-rp-v1",
                 ),
             },
-        )
-        if installed:
-            emit_policy_event(
-                event_type="prism.policy.installed",
-                tenant_id=tenant_id,
-                boundary=boundary,
-            )
+        },
+    ]
+    if installed:
+        events.append({
+            "event_type": "prism.policy.installed",
+            "tenant_id": tenant_id,
+            "boundary": boundary,
+        })
+    return events
+
+
+def _emit_policy_upsert_intel_events(
+    *,
+    tenant_id: str,
+    boundary: DesignBoundary,
+    rule_vector: "RuleVector",
+    installed: bool,
+) -> None:
+    try:
+        for event in _policy_upsert_intel_events(
+            tenant_id=tenant_id,
+            boundary=boundary,
+            rule_vector=rule_vector,
+            installed=installed,
+        ):
+            emit_policy_event(**event)
     except Exception as exc:
         logger.error("data_intel policy emit failed for %s: %s", boundary.id, exc)
 
 
+def _emit_intel_batch_in_background(events: list[dict[str, Any]]) -> None:
+    """Send built intel events in one data_intel request without blocking the response."""
+    if not events:
+        return
+    task = asyncio.get_running_loop().create_task(
+        asyncio.to_thread(data_intel_client.emit_batch_best_effort, events)
+    )
+    _intel_tasks.add(task)
+    task.add_done_callback(_intel_tasks.discard)
+
+
 @router.post("", response_model=DesignBoundary, status_code=status.HTTP_201_CREATED)
 async def create_policy(
     request: PolicyWriteRequest,
@@ -303,28 +713,9 @@ async def create_policy(
     request_id = str(uuid.uuid4())
     now = time.time()
     boundary = _boundary_from_request(request, current_user.id, now, now)
-    boundary = _compile_semantic_condition_anchors(boundary)
-
-    try:
-        create_policy_record(boundary, current_user.id)
-    except ValueError as exc:
-        raise HTTPException(status_code=409, detail=str(exc)) from exc
-
-    try:
-        rule_vector = _persist_anchor_payload(current_user.id, boundary)
-    except HTTPException:
-        delete_policy_record(current_user.id, boundary.id)
-        raise
-
-    installed = _install_to_dataplane(boundary, rule_vector)
-    _emit_policy_upsert_intel_events(
-        tenant_id=current_user.id,
-        boundary=boundary,
-        rule_vector=rule_vector,
-        installed=installed,
-    )
+    boundary = await _save_policy(current_user.id, boundary, create=True)
 
-    _write_policy_audit({
+    await asyncio.to_thread(_write_policy_audit, {
         "ts": now,
         "request_id": request_id,
         "operation": "create_policy",
@@ -335,12 +726,46 @@ async def create_policy(
     return boundary
 
 
+@router.post("/batch", response_model=PolicyBatchWriteResponse, status_code=status.HTTP_200_OK)
+async def batch_write_policies(
+    request: PolicyBatchWriteRequest,
+    current_user: User = Depends(get_current_tenant),
+) -> PolicyBatchWriteResponse:
+    """
+    Create or update many policies in one call.
+
+    All boundaries are validated first, every anchor is encoded in one
+    batched pass, db_infra rows and Chroma payloads are written in bulk and
+    each agent's policies are installed with a single data plane RPC.
+    Results and errors are reported per policy.
+
+    Raises:
+        HTTPException: 400 if the batch is empty or exceeds
+            POLICY_BATCH_MAX_POLICIES, 500 if encoding fails
+    """
+    if not request.policies:
+        raise HTTPException(status_code=400, detail="No policies to write")
+    if len(request.policies) > config.POLICY_BATCH_MAX_POLICIES:
+        raise HTTPException(
+            status_code=400,
+            detail=(
+                f"Batch of {len(request.policies)} policies exceeds the limit of "
+                f"{config.POLICY_BATCH_MAX_POLICIES}"
+            ),
+        )
+    response, intel_events = await asyncio.to_thread(
+        _write_policy_batch, request.policies, current_user.id
+    )
+    _emit_intel_batch_in_background(intel_events)
+    return response
+
+
 @router.get("", response_model=PolicyListResponse, status_code=status.HTTP_200_OK)
 async def list_policies(
     agent_id: str = Query(default=""),
     current_user: User = Depends(get_current_tenant),
 ) -> PolicyListResponse:
-    policies = list_policy_records(current_user.id, agent_id=agent_id)
+    policies = await asyncio.to_thread(list_policy_records, current_user.id, agent_id=agent_id)
     return PolicyListResponse(policies=policies)
 
 
@@ -349,7 +774,7 @@ async def get_policy(
     policy_id: str,
     current_user: User = Depends(get_current_tenant),
 ) -> DesignBoundary:
-    policy = fetch_policy_record(current_user.id, policy_id)
+    policy = await asyncio.to_thread(fetch_policy_record, current_user.id, policy_id)
     if not policy:
         raise HTTPException(status_code=404, detail="Policy not found")
     return policy
@@ -362,7 +787,7 @@ async def update_policy(
     current_user: User = Depends(get_current_tenant),
 ) -> DesignBoundary:
     request_id = str(uuid.uuid4())
-    existing = fetch_policy_record(current_user.id, policy_id)
+    existing = await asyncio.to_thread(fetch_policy_record, current_user.id, policy_id)
     if not existing:
         raise HTTPException(status_code=404, detail="Policy not found")
 
@@ -370,22 +795,9 @@ async def update_policy(
     boundary = _boundary_from_request(request, current_user.id, existing.created_at, now)
     if boundary.id != policy_id:
         raise HTTPException(status_code=400, detail="Policy ID mismatch")
-    boundary = _compile_semantic_condition_anchors(boundary)
+    boundary = await _save_policy(current_user.id, boundary, create=False)
 
-    try:
-        update_policy_record(boundary, current_user.id)
-    except ValueError as exc:
-        raise HTTPException(status_code=404, detail=str(exc)) from exc
-
-    rule_vector = _persist_anchor_payload(current_user.id, boundary)
-    installed = _install_to_dataplane(boundary, rule_vector)
-    _emit_policy_upsert_intel_events(
-        tenant_id=current_user.id,
-        boundary=boundary,
-        rule_vector=rule_vector,
-        installed=installed,
-    )
-    _write_policy_audit({
+    await asyncio.to_thread(_write_policy_audit, {
         "ts": now,
         "request_id": request_id,
         "operation": "update_policy",
@@ -402,29 +814,15 @@ async def update_policy_mode(
     request: PolicyModePatchRequest,
     current_user: User = Depends(get_current_tenant),
 ) -> DesignBoundary:
-    existing = fetch_policy_record(current_user.id, policy_id)
+    existing = await asyncio.to_thread(fetch_policy_record, current_user.id, policy_id)
     if not existing:
         raise HTTPException(status_code=404, detail="Policy not found")
 
     now = time.time()
     updated = existing.model_copy(update={"mode": request.mode, "updated_at": now})
-    updated = _compile_semantic_condition_anchors(updated)
-
-    try:
-        update_policy_record(updated, current_user.id)
-    except ValueError as exc:
-        raise HTTPException(status_code=404, detail=str(exc)) from exc
-
-    rule_vector = _persist_anchor_payload(current_user.id, updated)
-    installed = _install_to_dataplane(updated, rule_vector)
-    _emit_policy_upsert_intel_events(
-        tenant_id=current_user.id,
-        boundary=updated,
-        rule_vector=rule_vector,
-        installed=installed,
-    )
+    updated = await _save_policy(current_user.id, updated, create=False)
 
-    _write_policy_audit({
+    await asyncio.to_thread(_write_policy_audit, {
         "ts": now,
         "request_id": str(uuid.uuid4()),
         "operation": "update_policy_mode",
@@ -440,30 +838,16 @@ async def toggle_policy_status(
     policy_id: str,
     current_user: User = Depends(get_current_tenant),
 ) -> DesignBoundary:
-    existing = fetch_policy_record(current_user.id, policy_id)
+    existing = await asyncio.to_thread(fetch_policy_record, current_user.id, policy_id)
     if not existing:
         raise HTTPException(status_code=404, detail="Policy not found")
 
     now = time.time()
     new_status = "disabled" if existing.status == "active" else "active"
     updated = existing.model_copy(update={"status": new_status, "updated_at": now})
-    updated = _compile_semantic_condition_anchors(updated)
-
-    try:
-        update_policy_record(updated, current_user.id)
-    except ValueError as exc:
-        raise HTTPException(status_code=404, detail=str(exc)) from exc
+    updated = await _save_policy(current_user.id, updated, create=False)
 
-    rule_vector = _persist_anchor_payload(current_user.id, updated)
-    installed = _install_to_dataplane(updated, rule_vector)
-    _emit_policy_upsert_intel_events(
-        tenant_id=current_user.id,
-        boundary=updated,
-        rule_vector=rule_vector,
-        installed=installed,
-    )
-
-    _write_policy_audit({
+    await asyncio.to_thread(_write_policy_audit, {
         "ts": now,
         "request_id": str(uuid.uuid4()),
         "operation": "toggle_policy_status",
@@ -480,7 +864,7 @@ async def delete_policy(
     current_user: User = Depends(get_current_tenant),
 ) -> PolicyDeleteResponse:
     request_id = str(uuid.uuid4())
-    policy = fetch_policy_record(current_user.id, policy_id)
+    policy = await asyncio.to_thread(fetch_policy_record, current_user.id, policy_id)
     if not policy:
         raise HTTPException(status_code=404, detail="Policy not found")
 
@@ -500,13 +884,19 @@ async def delete_policy(
     if not result.get("success"):
         message = result.get("message", "Policy uninstall failed")
         raise HTTPException(status_code=502, detail=message)
+    await asyncio.to_thread(
+        sync_state.record_removed,
+        [policy_id],
+        result.get("previous_bridge_version"),
+        result.get("bridge_version"),
+    )
 
-    removed = delete_policy_record(current_user.id, policy_id)
+    removed = await asyncio.to_thread(delete_policy_record, current_user.id, policy_id)
     if not removed:
         raise HTTPException(status_code=404, detail="Policy not found")
 
     try:
-        delete_policy_payload(current_user.id, policy_id)
+        await asyncio.to_thread(delete_policy_payload, current_user.id, policy_id)
     except Exception as exc:
         raise HTTPException(status_code=500, detail="Policy payload deletion failed") from exc
 
@@ -516,7 +906,7 @@ async def delete_policy(
         agent_id=policy.agent_id,
     )
 
-    _write_policy_audit({
+    await asyncio.to_thread(_write_policy_audit, {
         "ts": time.time(),
         "request_id": request_id,
         "operation": "delete_policy",
@@ -539,12 +929,13 @@ async def clear_all_policies(
     """Remove every policy for the authenticated tenant across all three stores."""
     request_id = str(uuid.uuid4())
     client = get_data_plane_client()
-    policies_before_delete = list_policy_records(current_user.id)
+    policies_before_delete = await asyncio.to_thread(list_policy_records, current_user.id)
 
     # 1. Evict all rules from the Data Plane (cold_storage)
     try:
         dp_result = await asyncio.to_thread(client.remove_agent_rules, current_user.id)
         rules_removed = dp_result.get("rules_removed", 0)
+        await asyncio.to_thread(sync_state.record_agent_cleared, current_user.id)
     except DataPlaneError as exc:
         raise HTTPException(status_code=502, detail=f"Data Plane error: {exc}") from exc
     except Exception as exc:
@@ -552,15 +943,15 @@ async def clear_all_policies(
         raise HTTPException(status_code=500, detail="Data Plane rule removal failed") from exc
 
     # 2. Wipe policies_v2 SQLite rows
-    policies_deleted = delete_all_policy_records(current_user.id)
+    policies_deleted = await asyncio.to_thread(delete_all_policy_records, current_user.id)
 
     # 3. Best-effort: drop the tenant's ChromaDB collection
     try:
-        delete_tenant_collection(current_user.id)
+        await asyncio.to_thread(delete_tenant_collection, current_user.id)
     except Exception as exc:
         logger.warning("ChromaDB collection teardown failed (non-fatal): %s", exc)
 
-    _write_policy_audit({
+    await asyncio.to_thread(_write_policy_audit, {
         "ts": time.time(),
         "request_id": request_id,
         "operation": "clear_all_policies",
@@ -0,0 +1,154 @@
+"""Sampled, lazily formatted logging for the enforcement hot path."""
+
+from __future__ import annotations
+
+from fencio_logger import get_logger
+
+import json
+import logging
+import random
+from dataclasses import dataclass
+from typing import Any, Callable
+
+from pydantic import BaseModel
+
+from app.settings import config
+
+payload_logger = get_logger("app.enforcement.payload", service_name="prism")
+
+ALWAYS_LOGGED_DECISIONS = frozenset({"DENY"})
+
+
+class Lazy:
+    """
+    Defer building a log argument until the record is actually formatted.
+
+    Pass instances as %-style arguments; the callable only runs when a handler
+    emits the record, so dropped records cost a single object allocation.
+    """
+
+    __slots__ = ("_fn", "_args")
+
+    def __init__(self, fn: Callable[..., Any], *args: Any) -> None:
+        self._fn = fn
+        self._args = args
+
+    def __str__(self) -> str:
+        return str(self._fn(*self._args))
+
+    __repr__ = __str__
+
+
+def _dump_model_json(model: BaseModel) -> str:
+    return json.dumps(model.model_dump(mode="json", exclude_none=False), ensure_ascii=False)
+
+
+def lazy_json(model: BaseModel) -> Lazy:
+    """Lazily serialize a pydantic model to JSON for logging."""
+    return Lazy(_dump_model_json, model)
+
+
+def parse_tenant_rates(raw: str) -> dict[str, float]:
+    """Parse "tenant-a=0.1,tenant-b=1.0" into clamped per-tenant rates."""
+    rates: dict[str, float] = {}
+    for item in raw.split(","):
+        tenant_id, sep, value = item.partition("=")
+        if not sep or not tenant_id.strip():
+            continue
+        try:
+            rate = float(value)
+        except ValueError:
+            continue
+        rates[tenant_id.strip()] = min(max(rate, 0.0), 1.0)
+    return rates
+
+
+class EnforcementLogSampler:
+    """Decides which enforcement requests produce per-request log lines."""
+
+    def __init__(
+        self,
+        *,
+        mode: str,
+        default_rate: float,
+        tenant_rates: dict[str, float],
+        payload_rate: float,
+        rng: Callable[[], float] = random.random,
+    ) -> None:
+        self.mode = mode
+        self.default_rate = min(max(default_rate, 0.0), 1.0)
+        self.tenant_rates = tenant_rates
+        self.payload_rate = min(max(payload_rate, 0.0), 1.0)
+        self._rng = rng
+
+    def rate_for(self, tenant_id: str | None) -> float:
+        if tenant_id and tenant_id in self.tenant_rates:
+            return self.tenant_rates[tenant_id]
+        return self.default_rate
+
+    def sample(self, tenant_id: str | None) -> bool:
+        if self.mode != "hot_path":
+            return True
+        rate = self.rate_for(tenant_id)
+        return rate >= 1.0 or (rate > 0.0 and self._rng() < rate)
+
+    def sample_payload(self) -> bool:
+        rate = self.payload_rate
+        return rate >= 1.0 or (rate > 0.0 and self._rng() < rate)
+
+
+enforcement_log_sampler = EnforcementLogSampler(
+    mode=config.ENFORCEMENT_LOG_MODE,
+    default_rate=config.ENFORCEMENT_LOG_SAMPLE_RATE,
+    tenant_rates=parse_tenant_rates(config.ENFORCEMENT_LOG_TENANT_SAMPLE_RATES),
+    payload_rate=config.ENFORCEMENT_PAYLOAD_LOG_SAMPLE_RATE,
+)
+
+
+@dataclass
+class EnforcementLog:
+    """Per-request log handle; INFO lines are emitted only when sampled."""
+
+    logger: Any
+    request_id: str
+    sampled: bool = True
+
+    def info(self, msg: str, *args: Any) -> None:
+        if self.sampled:
+            self.logger.info(msg, *args)
+
+    def sample_for_tenant(self, tenant_id: str | None) -> None:
+        self.sampled = enforcement_log_sampler.sample(tenant_id)
+
+
+def log_enforcement_payload(
+    event: BaseModel,
+    *,
+    request_id: str,
+    decision: str,
+    error: bool = False,
+) -> None:
+    """
+    Log the full intent payload on the dedicated payload channel.
+
+    DENY and error outcomes are always logged at INFO; everything else is
+    sampled at DEBUG and only serialized when the channel is enabled.
+    """
+    if error or decision in ALWAYS_LOGGED_DECISIONS:
+        payload_logger.info(
+            "Enforcement payload for %s (decision=%s, error=%s): %s",
+            request_id,
+            decision,
+            error,
+            lazy_json(event),
+        )
+        return
+    if not payload_logger.isEnabledFor(logging.DEBUG):
+        return
+    if enforcement_log_sampler.sample_payload():
+        payload_logger.debug(
+            "Enforcement payload for %s (decision=%s): %s",
+            request_id,
+            decision,
+            lazy_json(event),
+        )
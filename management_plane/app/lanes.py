@@ -0,0 +1,110 @@
+"""
+Execution lanes for enforcement traffic.
+
+Live agent enforcement and dry-run evaluations from the policy editor
+(``dry_run=true`` or ``dry_run_rule_ids``) are scheduled on separate lanes.
+Each lane has its own admission limiter and its own pool for blocking work,
+and is labelled separately in metrics. The dry-run lane has a small
+concurrency cap, a single encoder thread by default, and stops admitting
+work while live requests are queued, so live enforcement always gets
+capacity first. Within a lane, encoder threads are shared between tenants by
+app.encoder_scheduler.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, TypeVar
+
+from app.admission import (
+    AdaptiveConcurrencyLimiter,
+    UnlimitedLimiter,
+    dry_run_limiter,
+    enforcement_limiter,
+)
+from app.encoder_scheduler import FairEncoderScheduler, build_encoder_scheduler
+from app.models import IntentEvent
+from app.settings import config
+
+T = TypeVar("T")
+
+LIVE = "live"
+DRY_RUN = "dry_run"
+
+
+@dataclass
+class ExecutionLane:
+    """Admission limiter plus executors for one class of enforcement traffic."""
+
+    name: str
+    limiter: AdaptiveConcurrencyLimiter | UnlimitedLimiter
+    # None runs blocking calls on the default executor.
+    executor: ThreadPoolExecutor | None = None
+    # Pool for intent encoding; None encodes inline on the event loop.
+    encoder_executor: ThreadPoolExecutor | None = None
+    # Per-tenant fair queue in front of the encoder; takes precedence.
+    encoder: FairEncoderScheduler | None = None
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        """Run blocking ``fn`` on this lane's executor, keeping context vars."""
+        context = contextvars.copy_context()
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, context.run, fn, *args)
+
+    async def encode(self, tenant_id: str | None, fn: Callable[..., T], *args: Any) -> T:
+        if self.encoder is not None:
+            return await self.encoder.submit(tenant_id, fn, *args)
+        if self.encoder_executor is None:
+            return fn(*args)
+        context = contextvars.copy_context()
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.encoder_executor, context.run, fn, *args)
+
+
+def _build_encoder(
+    lane: str, workers: int, executor: ThreadPoolExecutor | None = None
+) -> FairEncoderScheduler | None:
+    if not config.ENCODER_FAIR_SCHEDULING_ENABLED:
+        return None
+    return build_encoder_scheduler(
+        lane=lane,
+        workers=workers,
+        max_queue_per_tenant=config.ENCODER_MAX_QUEUE_PER_TENANT,
+        executor=executor,
+    )
+
+
+LIVE_LANE = ExecutionLane(
+    name=LIVE,
+    limiter=enforcement_limiter,
+    encoder=_build_encoder(LIVE, config.ENCODER_WORKERS),
+)
+
+_dry_run_encoder_executor = ThreadPoolExecutor(
+    max_workers=max(1, config.ENFORCEMENT_DRY_RUN_ENCODER_WORKERS),
+    thread_name_prefix="prism-dry-run-encode",
+)
+
+DRY_RUN_LANE = ExecutionLane(
+    name=DRY_RUN,
+    limiter=dry_run_limiter,
+    executor=ThreadPoolExecutor(
+        max_workers=max(1, config.ENFORCEMENT_DRY_RUN_MAX_CONCURRENCY),
+        thread_name_prefix="prism-dry-run",
+    ),
+    encoder_executor=_dry_run_encoder_executor,
+    encoder=_build_encoder(
+        DRY_RUN, config.ENFORCEMENT_DRY_RUN_ENCODER_WORKERS, _dry_run_encoder_executor
+    ),
+)
+
+
+def is_dry_run(event: IntentEvent, dry_run: bool) -> bool:
+    return dry_run or bool(event.dry_run_rule_ids)
+
+
+def select_lane(event: IntentEvent, dry_run: bool) -> ExecutionLane:
+    return DRY_RUN_LANE if is_dry_run(event, dry_run) else LIVE_LANE
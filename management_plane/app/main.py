@@ -19,8 +19,10 @@ from fastapi.responses import JSONResponse
 from fastapi.staticfiles import StaticFiles
 
 from .settings import config
-from .endpoints import enforcement_v2, health, policies_v2, telemetry, network_policies
+from .endpoints import enforcement_v2, health, metrics, policies_v2, telemetry, network_policies
 from .services import session_store
+from .services.dataplane_channels import close_dataplane_pools, get_dataplane_pool
+from .services.dry_run_recorder import dry_run_recorder
 from mcp_server.app import mcp, initialize_tools
 
 logger = get_logger(__name__, service_name="prism")
@@ -86,6 +88,14 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
 
     logger.info(f"Management Plane ready on {config.HOST}:{config.PORT}")
 
+    # Connect the shared data plane channels before the first request needs them.
+    pool = get_dataplane_pool()
+    ready = await asyncio.to_thread(pool.wait_ready, config.DATA_PLANE_WARMUP_TIMEOUT_SECONDS)
+    if ready < pool.size:
+        logger.warning(
+            "data plane warmup: %d/%d channel(s) ready to %s", ready, pool.size, pool.target
+        )
+
     # Re-install active policies into the data plane to recover from a stale HashMap.
     try:
         from .rule_installer import sync_active_policies_to_dataplane
@@ -106,10 +116,44 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
 
     cleanup_task = asyncio.create_task(_session_cleanup_loop())
 
+    # Write buffered dry-run telemetry off the request path
+    async def _dry_run_flush_loop() -> None:
+        while True:
+            await asyncio.sleep(config.DRY_RUN_TELEMETRY_FLUSH_SECONDS)
+            try:
+                await asyncio.to_thread(dry_run_recorder.flush)
+            except Exception as e:
+                logger.error("dry-run telemetry flush failed: %s", e)
+
+    flush_task = asyncio.create_task(_dry_run_flush_loop())
+
+    # Repair drift between db_infra, Chroma and the data plane between restarts
+    async def _reconcile_loop() -> None:
+        from .rule_installer import reconcile_dataplane
+
+        while True:
+            await asyncio.sleep(config.RECONCILE_INTERVAL_SECONDS)
+            try:
+                await asyncio.to_thread(reconcile_dataplane)
+            except Exception as e:
+                logger.error("data plane reconciliation failed: %s", e)
+
+    reconcile_task = (
+        asyncio.create_task(_reconcile_loop()) if config.RECONCILE_ENABLED else None
+    )
+
     yield
 
     # Shutdown
     cleanup_task.cancel()
+    flush_task.cancel()
+    if reconcile_task is not None:
+        reconcile_task.cancel()
+    try:
+        await asyncio.to_thread(dry_run_recorder.flush)
+    except Exception as e:
+        logger.error("final dry-run telemetry flush failed: %s", e)
+    close_dataplane_pools()
     logger.info("Shutting down Management Plane")
 
 
@@ -134,6 +178,7 @@ app.add_middleware(
 
 # Register routers
 app.include_router(health.router)
+app.include_router(metrics.router)
 app.include_router(enforcement_v2.router, prefix=config.API_V2_PREFIX)
 app.include_router(policies_v2.router, prefix=config.API_V2_PREFIX)
 app.include_router(network_policies.router)  # Network policies (includes /api/v2 in router prefix)
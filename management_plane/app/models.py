@@ -6,7 +6,7 @@ All types must remain synchronized across Python, TypeScript, and Rust component
 """
 
 from pydantic import BaseModel, Field, ConfigDict, field_validator, model_validator
-from typing import Literal, Optional
+from typing import Any, Literal, Optional
 
 
 # ============================================================================
@@ -314,10 +314,41 @@ class PolicyClearResponse(BaseModel):
     message: str
 
 
+class PolicyBatchWriteRequest(BaseModel):
+    """
+    Create or update several policies in one call.
+
+    Policies whose id already exists for the tenant are updated (keeping
+    their created_at); the rest are created.
+    """
+    policies: list[PolicyWriteRequest]
+
+
+class PolicyBatchResult(BaseModel):
+    policy_id: str
+    status: Literal["created", "updated", "error"]
+    installed: bool = False
+    policy: Optional[DesignBoundary] = None
+    error: Optional[str] = None
+
+
+class PolicyBatchWriteResponse(BaseModel):
+    results: list[PolicyBatchResult]
+    created: int
+    updated: int
+    failed: int
+
+
 # ============================================================================
 # FFI Boundary Types — gRPC response mapping
 # ============================================================================
 
+# How much per-boundary evidence an enforcement response carries:
+# "decision" (none), "summary" (scores and thresholds, no condition or path
+# details) or "full".
+EvidenceLevel = Literal["decision", "summary", "full"]
+
+
 class BoundaryEvidence(BaseModel):
     """
     Evidence about a boundary's evaluation for debugging and audit purposes.
@@ -409,6 +440,8 @@ class EnforcementResponse(BaseModel):
     - drift_triggered: True when policy drift caused the enforcement outcome
     - slice_similarities: Per-slot cosine similarities [action, resource, data, risk]
     - evidence: Per-boundary evaluation details
+    - enforcement_latency_ms: Server-side enforcement latency for this request
+    - metadata: Request correlation data (request_id, per-stage timings in ms)
     """
     decision: Literal["ALLOW", "DENY", "MODIFY", "STEP_UP", "DEFER"]
     modified_params: Optional[dict] = Field(default=None)
@@ -427,3 +460,5 @@ class EnforcementResponse(BaseModel):
         "unknown",
     ] = Field(default="unknown")
     reason: Optional[str] = Field(default=None)
+    enforcement_latency_ms: Optional[float] = Field(default=None, ge=0.0)
+    metadata: dict[str, Any] = Field(default_factory=dict)
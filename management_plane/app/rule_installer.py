@@ -3,33 +3,178 @@ Rule Installer - Installs DesignBoundary policies into the Data Plane.
 
 Handles:
 1. Startup sync of active policies from db_infra + Chroma to the Rust data plane
-2. gRPC communication with Data Plane
-3. Proto conversion helpers for rule installation
+2. Periodic background reconciliation of the same stores
+3. gRPC communication with Data Plane
+4. Proto conversion helpers for rule installation
 """
 
 from fencio_logger import get_logger
 
 import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
 from typing import Optional
 from .settings import config
-from .chroma_client import upsert_rule_payload, fetch_rule_payload
+from .chroma_client import upsert_rule_payload, fetch_rule_payload, fetch_rule_payloads
+from .metrics import registry
 
 logger = get_logger(__name__, service_name="prism")
 
+RECONCILE_RUNS_TOTAL = registry.counter(
+    "prism_reconcile_runs_total",
+    "Background data plane reconciliation runs by outcome (clean, repaired, error).",
+    ("outcome",),
+)
+RECONCILE_REPAIRS_TOTAL = registry.counter(
+    "prism_reconcile_repairs_total",
+    "Policies repaired by background reconciliation (installed, removed, failed).",
+    ("action",),
+)
+RECONCILE_DRIFT_POLICIES = registry.gauge(
+    "prism_reconcile_drift_policies",
+    "Policies out of sync with the data plane at the start of the last reconciliation.",
+)
+RECONCILE_LAG_SECONDS = registry.gauge(
+    "prism_reconcile_lag_seconds",
+    "Seconds since the data plane was last confirmed in sync with db_infra.",
+)
+RECONCILE_DURATION_SECONDS = registry.histogram(
+    "prism_reconcile_duration_seconds",
+    "Wall time of one background reconciliation run.",
+)
 
-def sync_active_policies_to_dataplane() -> None:
+_last_in_sync: Optional[float] = None
+# Id of the last policy reinstalled by the current reconcile verification
+# pass (see _sync_with_client); None when no pass is in progress.
+_verify_cursor: Optional[str] = None
+
+
+@dataclass
+class SyncReport:
+    """Counts and timings from one startup sync or reconciliation run.
+
+    ``fetch_seconds`` and ``install_seconds`` are summed across workers, so
+    they can exceed ``duration_seconds`` when batches overlap.
+    """
+
+    mode: str = "full"
+    policies: int = 0
+    synced: int = 0
+    unchanged: int = 0
+    removed: int = 0
+    # Policies found missing, changed or stale; ``deferred`` of them were left
+    # for a later run by the repair budget.
+    drift: int = 0
+    deferred: int = 0
+    errors: int = 0
+    agents: int = 0
+    batches: int = 0
+    fetch_seconds: float = 0.0
+    install_seconds: float = 0.0
+    duration_seconds: float = 0.0
+
+
+def _rule_vector_from_anchors(anchors: dict):
+    """Reconstruct a RuleVector from anchor arrays stored in Chroma."""
+    from app.services.policy_encoder import RuleVector
+    from app.services.vector_codec import SLOTS, decode_anchor_slot
+
+    rv = RuleVector()
+    layers = rv.layers
+    for slot in SLOTS:
+        _, rv.anchor_counts[slot] = decode_anchor_slot(anchors, slot, out=layers[slot])
+    return rv
+
+
+def _sync_batch(client, tenant_id: str, boundaries: list) -> SyncReport:
+    """Fetch one batch of an agent's payloads in a single get and install them in one RPC."""
+    from app.services.dataplane_client import DataPlaneError
+    from app.services.dataplane_sync_state import sync_state
+
+    report = SyncReport(policies=len(boundaries), batches=1)
+    policy_ids = [boundary.id for boundary in boundaries]
+    rows_by_id = {boundary.id: boundary for boundary in boundaries}
+
+    started = time.perf_counter()
+    try:
+        payloads = fetch_rule_payloads(tenant_id, policy_ids)
+    except Exception as exc:
+        logger.warning("policy sync: Chroma fetch failed for tenant %s: %s", tenant_id, exc)
+        report.errors = len(boundaries)
+        return report
+    finally:
+        report.fetch_seconds = time.perf_counter() - started
+
+    # Boundaries come from the db_infra rows; Chroma only supplies anchors.
+    # Policy writes skip the Chroma upsert when the anchors are unchanged, so
+    # the boundary stored next to them can lag behind mode/status changes.
+    groups: dict[str, tuple[list, list]] = {}
+    for policy_id in policy_ids:
+        payload = payloads.get(policy_id)
+        if not payload:
+            logger.warning("policy sync: no Chroma payload for %s/%s, skipping", tenant_id, policy_id)
+            report.errors += 1
+            continue
+        boundary = rows_by_id[policy_id]
+        try:
+            rule_vector = _rule_vector_from_anchors(payload["anchors"])
+        except Exception as exc:
+            logger.warning("policy sync: bad payload for %s/%s: %s", tenant_id, policy_id, exc)
+            report.errors += 1
+            continue
+        group = groups.setdefault(boundary.agent_id or boundary.tenant_id, ([], []))
+        group[0].append(boundary)
+        group[1].append(rule_vector)
+
+    started = time.perf_counter()
+    for namespace, (group_boundaries, rule_vectors) in groups.items():
+        try:
+            result = client.install_policies(group_boundaries, rule_vectors)
+            failed = set(result.get("failed_policy_ids", ()))
+            if failed:
+                logger.warning(
+                    "policy sync: data plane rejected %d policies for %s/%s: %s",
+                    len(failed), tenant_id, namespace, result.get("message"),
+                )
+            installed = [boundary for boundary in group_boundaries if boundary.id not in failed]
+            report.synced += len(installed)
+            report.errors += len(failed)
+            sync_state.record_installed(
+                installed,
+                result.get("previous_bridge_version"),
+                result.get("bridge_version"),
+            )
+        except DataPlaneError as exc:
+            logger.warning("policy sync: data plane error for %s/%s: %s", tenant_id, namespace, exc)
+            report.errors += len(group_boundaries)
+        except Exception as exc:
+            logger.warning("policy sync: failed to sync %s/%s: %s", tenant_id, namespace, exc)
+            report.errors += len(group_boundaries)
+    report.install_seconds = time.perf_counter() - started
+    return report
+
+
+def sync_active_policies_to_dataplane() -> Optional[SyncReport]:
     """
     Re-install all active policies from db_infra + Chroma into the Rust data plane.
 
     Called at startup to ensure the data plane HashMap is not stale after a
     management plane restart.  Failures are logged as warnings; they do not
     prevent the app from starting (the data plane may not be available yet).
+
+    If the data plane is still the bridge instance and version recorded in the
+    sync state (see dataplane_sync_state), only policies that are missing or
+    whose content hash changed are installed, and recorded policies that are no
+    longer active are removed. Otherwise every active policy is reinstalled.
+
+    Policies are grouped by tenant and agent namespace and cut into batches of
+    STARTUP_SYNC_BATCH_SIZE. Each batch costs one Chroma get and one install
+    RPC, and up to STARTUP_SYNC_CONCURRENCY batches run at once.
     """
-    import numpy as np
-    from app.models import DesignBoundary
-    from app.services.policy_encoder import RuleVector
-    from app.services.dataplane_client import DataPlaneClient, DataPlaneError
-    from app.chroma_client import fetch_rule_payload as _fetch_payload
+    from app.services.dataplane_channels import get_dataplane_pool
+    from app.services.dataplane_client import DataPlaneClient
+
+    sync_started = time.perf_counter()
 
     # Fetch all active policy rows across all tenants.
     try:
@@ -38,54 +183,277 @@ def sync_active_policies_to_dataplane() -> None:
         boundaries = list_policy_records(None, status="active")
     except Exception as exc:
         logger.warning("startup sync: failed to query db_infra policies: %s", exc)
-        return
+        return None
+
+    client = DataPlaneClient(pool=get_dataplane_pool())
+    return _sync_with_client(
+        client,
+        boundaries,
+        sync_started,
+        incremental=config.STARTUP_SYNC_INCREMENTAL,
+        concurrency=config.STARTUP_SYNC_CONCURRENCY,
+    )
 
-    if not boundaries:
-        logger.info("startup sync: no active policies found in db_infra, nothing to sync")
-        return
 
-    dp_url = config.data_plane_url
-    client = DataPlaneClient(url=dp_url, insecure=True)
+def reconcile_dataplane() -> Optional[SyncReport]:
+    """
+    Repair drift between db_infra, Chroma and the data plane.
+
+    Run periodically by the app. The check is the same one the startup sync
+    uses (GetRuleStats against the sync state, content hashes against the
+    db_infra rows), so a clean pass costs one db_infra list and one RPC. At
+    most RECONCILE_MAX_REPAIRS_PER_CYCLE policies are installed or removed per
+    run; the rest are picked up by later runs.
+
+    When another writer moved the bridge version (e.g. a second management
+    plane replica), the recorded hashes can no longer be trusted on their own,
+    so reconcile runs a verification pass instead of a full sync: every active
+    policy is reinstalled in id order, one budget window per run, each run
+    resuming where the previous one stopped.
+    """
+    global _last_in_sync
+    from app.services.dataplane_channels import get_dataplane_pool
+    from app.services.dataplane_client import DataPlaneClient
 
-    synced = 0
-    errors = 0
-    for boundary in boundaries:
-        tenant_id = boundary.tenant_id
-        policy_id = boundary.id
+    started = time.perf_counter()
+    try:
+        from .services.policies import list_policy_records
+
+        boundaries = list_policy_records(None, status="active")
+        report = _sync_with_client(
+            DataPlaneClient(pool=get_dataplane_pool()),
+            boundaries,
+            started,
+            incremental=True,
+            concurrency=config.RECONCILE_CONCURRENCY,
+            max_repairs=config.RECONCILE_MAX_REPAIRS_PER_CYCLE,
+            label="reconcile",
+            quiet_when_clean=True,
+        )
+    except Exception as exc:
+        logger.warning("reconcile: run failed: %s", exc)
+        RECONCILE_RUNS_TOTAL.inc(outcome="error")
+        report = None
+    else:
+        RECONCILE_DRIFT_POLICIES.set(report.drift)
+        RECONCILE_REPAIRS_TOTAL.inc(report.synced, action="installed")
+        RECONCILE_REPAIRS_TOTAL.inc(report.removed, action="removed")
+        RECONCILE_REPAIRS_TOTAL.inc(report.errors, action="failed")
+        converged = report.deferred == 0 and report.errors == 0
+        repaired = report.synced + report.removed > 0
+        RECONCILE_RUNS_TOTAL.inc(outcome="repaired" if repaired else "clean")
+        if converged:
+            _last_in_sync = time.time()
+
+    duration = time.perf_counter() - started
+    RECONCILE_DURATION_SECONDS.observe(duration)
+    if _last_in_sync is not None:
+        RECONCILE_LAG_SECONDS.set(time.time() - _last_in_sync)
+    return report
+
+
+def _sync_with_client(
+    client,
+    boundaries: list,
+    sync_started: float,
+    *,
+    incremental: bool,
+    concurrency: int,
+    max_repairs: Optional[int] = None,
+    label: str = "startup sync",
+    quiet_when_clean: bool = False,
+) -> SyncReport:
+    global _verify_cursor
+    from app.services.dataplane_client import DataPlaneError
+    from app.services.dataplane_sync_state import policy_content_hash, sync_state
+
+    stats = None
+    if incremental:
         try:
-            payload = _fetch_payload(tenant_id, policy_id)
-            if not payload:
-                logger.warning("startup sync: no Chroma payload for %s/%s, skipping", tenant_id, policy_id)
-                errors += 1
-                continue
-
-            boundary = DesignBoundary.model_validate(payload["boundary"])
-            anchors = payload["anchors"]
-
-            # Reconstruct a RuleVector from stored anchor arrays.
-            rv = RuleVector()
-            for slot in ("action", "resource", "data", "risk"):
-                rows_data = anchors.get(f"{slot}_anchors") or []
-                if rows_data:
-                    rv.layers[slot] = np.array(rows_data, dtype=np.float32)
-                rv.anchor_counts[slot] = int(anchors.get(f"{slot}_count", 0))
-
-            client.install_policies([boundary], [rv])
-            synced += 1
+            stats = client.get_rule_stats()
         except DataPlaneError as exc:
-            logger.warning("startup sync: data plane error for %s/%s: %s", tenant_id, policy_id, exc)
-            errors += 1
-        except Exception as exc:
-            logger.warning("startup sync: failed to sync %s/%s: %s", tenant_id, policy_id, exc)
-            errors += 1
+            if max_repairs is not None:
+                # Nothing can be repaired while the data plane is unreachable.
+                raise
+            logger.warning("%s: GetRuleStats failed, doing a full sync: %s", label, exc)
+
+    active_ids = {boundary.id for boundary in boundaries}
+    installed = sync_state.installed()
+    stale = [
+        (policy_id, entry.agent_id)
+        for policy_id, entry in installed.items()
+        if policy_id not in active_ids
+    ]
+    report = SyncReport()
+    if stats is not None and sync_state.matches(
+        stats["bridge_created_at_ms"], stats["bridge_version"]
+    ):
+        report.mode = "incremental"
+        to_install = [
+            boundary
+            for boundary in boundaries
+            if boundary.id not in installed
+            or installed[boundary.id].content_hash != policy_content_hash(boundary)
+        ]
+        report.unchanged = len(boundaries) - len(to_install)
+        _verify_cursor = None
+    elif max_repairs is not None:
+        # Resetting here would make every run reinstall the same first budget
+        # window while the version keeps moving. Keep the recorded policies and
+        # walk the whole active set instead, resuming after the last run.
+        report.mode = "verify"
+        to_install = sorted(boundaries, key=lambda boundary: boundary.id)
+        if _verify_cursor is not None:
+            to_install = [boundary for boundary in to_install if boundary.id > _verify_cursor]
+    else:
+        to_install = list(boundaries)
+        _verify_cursor = None
+        if stats is not None:
+            sync_state.reset(stats["bridge_created_at_ms"], stats["bridge_version"])
+        else:
+            sync_state.reset(0, 0)
+
+    report.drift = len(to_install) + len(stale)
+    if max_repairs is not None:
+        budget = max(0, max_repairs)
+        stale = stale[:budget]
+        report.deferred = max(0, len(to_install) - (budget - len(stale)))
+        to_install = to_install[: budget - len(stale)]
+
+    # Recorded policies that are no longer active. In a full sync this is
+    # best effort: the data plane may have dropped them already.
+    for policy_id, agent_id in stale:
+        try:
+            result = client.remove_policy(policy_id, agent_id)
+        except DataPlaneError as exc:
+            logger.warning("%s: failed to remove stale policy %s: %s", label, policy_id, exc)
+            report.errors += 1
+            continue
+        if result.get("success"):
+            report.removed += 1
+        sync_state.record_removed(
+            [policy_id],
+            result.get("previous_bridge_version"),
+            result.get("bridge_version"),
+        )
+
+    if not to_install:
+        if report.mode == "verify":
+            _finish_verify_window(client, to_install, report, label)
+        report.duration_seconds = time.perf_counter() - sync_started
+        log = logger.debug if quiet_when_clean and not report.drift else logger.info
+        log(
+            "%s (%s): %d active policy(s) unchanged, %d stale removed in %.2fs",
+            label,
+            report.mode,
+            report.unchanged,
+            report.removed,
+            report.duration_seconds,
+        )
+        return report
+
+    by_agent: dict[tuple[str, str], list] = {}
+    for boundary in to_install:
+        key = (boundary.tenant_id, boundary.agent_id or boundary.tenant_id)
+        by_agent.setdefault(key, []).append(boundary)
+
+    batch_size = max(1, config.STARTUP_SYNC_BATCH_SIZE)
+    batches = [
+        (tenant_id, group[offset:offset + batch_size])
+        for (tenant_id, _), group in by_agent.items()
+        for offset in range(0, len(group), batch_size)
+    ]
+
+    report.agents = len(by_agent)
+    logger.info(
+        "%s (%s): installing %d of %d active policy(s) across %d agent(s) "
+        "in %d batch(es), %d deferred",
+        label,
+        report.mode,
+        len(to_install),
+        len(boundaries),
+        len(by_agent),
+        len(batches),
+        report.deferred,
+    )
+
+    workers = max(1, min(concurrency, len(batches)))
+    last_progress = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="policy-sync") as pool:
+        pending = {pool.submit(_sync_batch, client, tenant_id, batch) for tenant_id, batch in batches}
+        while pending:
+            done, pending = wait(
+                pending,
+                timeout=config.STARTUP_SYNC_PROGRESS_SECONDS,
+                return_when=FIRST_COMPLETED,
+            )
+            for future in done:
+                batch_report = future.result()
+                report.policies += batch_report.policies
+                report.synced += batch_report.synced
+                report.errors += batch_report.errors
+                report.batches += batch_report.batches
+                report.fetch_seconds += batch_report.fetch_seconds
+                report.install_seconds += batch_report.install_seconds
+            now = time.perf_counter()
+            if pending and now - last_progress >= config.STARTUP_SYNC_PROGRESS_SECONDS:
+                last_progress = now
+                logger.info(
+                    "%s: %d/%d policy(s) processed (%d error(s)) after %.1fs",
+                    label,
+                    report.policies,
+                    len(to_install),
+                    report.errors,
+                    now - sync_started,
+                )
+
+    if report.mode == "verify":
+        _finish_verify_window(client, to_install, report, label)
+
+    report.duration_seconds = time.perf_counter() - sync_started
+    logger.info(
+        "%s (%s): synced %d active policy(s) to data plane, %d unchanged, "
+        "%d stale removed (%d error(s)) in %.2fs [%d batch(es), fetch %.2fs, install %.2fs]",
+        label,
+        report.mode,
+        report.synced,
+        report.unchanged,
+        report.removed,
+        report.errors,
+        report.duration_seconds,
+        report.batches,
+        report.fetch_seconds,
+        report.install_seconds,
+    )
+    return report
+
+def _finish_verify_window(client, window: list, report: SyncReport, label: str) -> None:
+    """Advance the verification pass past ``window``; rebase the sync state once it completes."""
+    global _verify_cursor
+    from app.services.dataplane_client import DataPlaneError
+    from app.services.dataplane_sync_state import sync_state
+
+    if report.deferred:
+        if window:
+            _verify_cursor = window[-1].id
+        return
+    _verify_cursor = None
+    if report.errors:
+        return
+    # Every active policy was reinstalled during the pass, so the recorded
+    # hashes describe the data plane as of now.
+    try:
+        stats = client.get_rule_stats()
+    except DataPlaneError as exc:
+        logger.warning("%s: GetRuleStats failed after verification pass: %s", label, exc)
+        return
+    sync_state.rebase(stats["bridge_created_at_ms"], stats["bridge_version"])
 
-    logger.info("startup sync: synced %d active policy(s) to data plane (%d error(s))", synced, errors)
 
 # Import gRPC if available
 try:
     import grpc
     from app.generated.rule_installation_pb2 import (
-        AnchorVector,
         InstallRulesRequest,
         RemoveAgentRulesRequest,
         RuleAnchorsPayload,
@@ -156,24 +524,9 @@ class RuleInstaller:
 
     def _anchors_dict_to_proto(self, anchors: dict) -> RuleAnchorsPayload:
         """Convert stored anchor dict to RuleAnchorsPayload proto."""
+        from app.services.policy_converter import PolicyConverter
 
-        def _to_vectors(key: str) -> list[AnchorVector]:
-            rows = anchors.get(key) or []
-            vectors: list[AnchorVector] = []
-            for row in rows:
-                vectors.append(AnchorVector(values=[float(v) for v in row]))
-            return vectors
-
-        return RuleAnchorsPayload(
-            action_anchors=_to_vectors("action_anchors"),
-            action_count=int(anchors.get("action_count", 0)),
-            resource_anchors=_to_vectors("resource_anchors"),
-            resource_count=int(anchors.get("resource_count", 0)),
-            data_anchors=_to_vectors("data_anchors"),
-            data_count=int(anchors.get("data_count", 0)),
-            risk_anchors=_to_vectors("risk_anchors"),
-            risk_count=int(anchors.get("risk_count", 0)),
-        )
+        return PolicyConverter.rule_vector_to_anchor_payload(_rule_vector_from_anchors(anchors))
 
     async def persist_rule_payload(self, tenant_id: str, rule_dict: dict) -> Optional[dict]:
         """Encode anchors for rule_dict and store them in Chroma."""
@@ -0,0 +1,76 @@
+"""
+Content-addressed cache of encoded policy anchors.
+
+An anchor's 32-dim vector depends only on the encoder (model and slot
+projection), the slot and the canonical anchor text, so it is keyed by a
+hash of exactly those. Policy writes look anchors up here before running the
+embedding model, which means a mode or status change, or an edit that keeps
+most of a policy's text, only encodes the anchors whose text changed. The
+keys are also stored next to the packed rows in the Chroma anchor payload,
+so the cache can be seeded from what a policy already has stored.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Iterable, Optional
+
+import numpy as np
+
+from app.settings import config
+
+
+def anchor_key(fingerprint: str, slot: str, text: str) -> str:
+    """Content hash of (encoder fingerprint, slot, canonical anchor text)."""
+    return hashlib.sha256(f"{fingerprint}\x1f{slot}\x1f{text}".encode("utf-8")).hexdigest()
+
+
+class AnchorCache:
+    """Thread-safe LRU of anchor key -> read-only float32 vector."""
+
+    def __init__(self, max_entries: int):
+        self._max_entries = max(0, max_entries)
+        self._entries: OrderedDict[str, np.ndarray] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        with self._lock:
+            vector = self._entries.get(key)
+            if vector is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return vector
+
+    def put(self, key: str, vector: np.ndarray) -> None:
+        if not self._max_entries:
+            return
+        stored = np.array(vector, dtype=np.float32)
+        stored.flags.writeable = False
+        with self._lock:
+            self._entries[key] = stored
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def seed(self, keys: Iterable[str], vectors: Iterable[np.ndarray]) -> None:
+        """Add stored (key, vector) pairs, e.g. from a policy's Chroma payload."""
+        for key, vector in zip(keys, vectors):
+            self.put(key, vector)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+anchor_cache = AnchorCache(config.ANCHOR_CACHE_MAX_ENTRIES)
@@ -94,7 +94,50 @@ class DataIntelClient:
         payload: dict[str, Any],
         occurred_at_ms: int | None = None,
     ) -> None:
-        event = {
+        event = self.build_event(
+            event_id=event_id,
+            event_type=event_type,
+            tenant_id=tenant_id,
+            agent_id=agent_id,
+            aggregate_type=aggregate_type,
+            aggregate_id=aggregate_id,
+            payload=payload,
+            occurred_at_ms=occurred_at_ms,
+        )
+        try:
+            self._send_direct(event)
+            return
+        except Exception as exc:
+            logger.warning("data_intel direct emit failed for %s: %s", event_id, exc)
+
+        self._enqueue_outbox(event)
+
+    def emit_batch_best_effort(self, events: list[dict[str, Any]]) -> None:
+        """Send events built by ``build_event`` in one request, falling back per event."""
+        if not config.DATA_INTEL_ENABLED or not events:
+            return
+        try:
+            self._send_batch(events)
+            return
+        except Exception as exc:
+            logger.warning("data_intel batch emit of %d event(s) failed: %s", len(events), exc)
+
+        for event in events:
+            self._enqueue_outbox(event)
+
+    def build_event(
+        self,
+        *,
+        event_id: str,
+        event_type: PrismIntelEventType,
+        tenant_id: str,
+        agent_id: str,
+        aggregate_type: str,
+        aggregate_id: str,
+        payload: dict[str, Any],
+        occurred_at_ms: int | None = None,
+    ) -> dict[str, Any]:
+        return {
             "event_id": event_id,
             "event_type": event_type,
             "tenant_id": tenant_id,
@@ -105,29 +148,28 @@ class DataIntelClient:
             "schema_version": self._schema_version,
             "occurred_at_ms": occurred_at_ms or _now_ms(),
         }
-        try:
-            self._send_direct(event)
-            return
-        except Exception as exc:
-            logger.warning("data_intel direct emit failed for %s: %s", event_id, exc)
 
+    def _enqueue_outbox(self, event: dict[str, Any]) -> None:
         if not config.DATA_INTEL_FALLBACK_OUTBOX:
             return
 
         try:
             db_infra_client.enqueue_intel_outbox_event(
-                event_id=event_id,
-                tenant_id=tenant_id,
-                agent_id=agent_id,
-                event_type=event_type,
-                aggregate_type=aggregate_type,
-                aggregate_id=aggregate_id,
-                payload=payload,
+                event_id=event["event_id"],
+                tenant_id=event["tenant_id"],
+                agent_id=event["agent_id"],
+                event_type=event["event_type"],
+                aggregate_type=event["aggregate_type"],
+                aggregate_id=event["aggregate_id"],
+                payload=event["payload"],
             )
         except (DbInfraClientError, OSError) as exc:
-            logger.error("data_intel outbox enqueue failed for %s: %s", event_id, exc)
+            logger.error("data_intel outbox enqueue failed for %s: %s", event["event_id"], exc)
 
     def _send_direct(self, event: dict[str, Any]) -> None:
+        self._send_batch([event])
+
+    def _send_batch(self, events: list[dict[str, Any]]) -> None:
         with httpx.Client(
             base_url=self._base_url,
             timeout=self._timeout_seconds,
@@ -135,7 +177,7 @@ class DataIntelClient:
             response = client.post(
                 "/api/v1/prism/events/batch",
                 json={
-                    "events": [event],
+                    "events": events,
                     "normalize_on_ingest": True,
                 },
             )
@@ -149,7 +191,7 @@ data_intel_client = DataIntelClient(
 )
 
 
-def emit_enforcement_completed(
+def enforcement_completed_event(
     *,
     agent_id: str,
     event: IntentEvent,
@@ -157,12 +199,13 @@ def emit_enforcement_completed(
     decision_name: str,
     dry_run: bool,
     agent_call_id: str,
-) -> None:
+) -> dict[str, Any] | None:
+    """Keyword arguments for ``build_event``/``emit_event_*``, or None if unattributable."""
     tenant_id = event.tenant_id or ""
     resolved_agent_id = agent_id or event.identity.agent_id or ""
     if not tenant_id or not resolved_agent_id:
         logger.debug("Skipping data_intel enforcement event without tenant_id/agent_id")
-        return
+        return None
 
     event_type: PrismIntelEventType = (
         "prism.dry_run.completed" if dry_run else "prism.enforcement.completed"
@@ -193,37 +236,76 @@ def emit_enforcement_completed(
         "intent_event": event.model_dump(mode="json"),
         "enforcement_result": enforcement_response.model_dump(mode="json"),
     }
-    data_intel_client.emit_event_async_best_effort(
-        event_id=f"{event_type}:{event.id}",
-        event_type=event_type,
-        tenant_id=tenant_id,
-        agent_id=resolved_agent_id,
-        aggregate_type="dry_run" if dry_run else "enforcement_event",
-        aggregate_id=event.event_id or event.id,
-        payload=payload,
-        occurred_at_ms=int(event.ts * 1000),
+    return {
+        "event_id": f"{event_type}:{event.id}",
+        "event_type": event_type,
+        "tenant_id": tenant_id,
+        "agent_id": resolved_agent_id,
+        "aggregate_type": "dry_run" if dry_run else "enforcement_event",
+        "aggregate_id": event.event_id or event.id,
+        "payload": payload,
+        "occurred_at_ms": int(event.ts * 1000),
+    }
+
+
+def emit_enforcement_completed(
+    *,
+    agent_id: str,
+    event: IntentEvent,
+    enforcement_response: EnforcementResponse,
+    decision_name: str,
+    dry_run: bool,
+    agent_call_id: str,
+) -> None:
+    intel_event = enforcement_completed_event(
+        agent_id=agent_id,
+        event=event,
+        enforcement_response=enforcement_response,
+        decision_name=decision_name,
+        dry_run=dry_run,
+        agent_call_id=agent_call_id,
     )
+    if intel_event is not None:
+        data_intel_client.emit_event_async_best_effort(**intel_event)
 
 
-def emit_policy_event(
+def policy_event(
     *,
     event_type: PrismIntelEventType,
     tenant_id: str,
     boundary: DesignBoundary,
     payload_extra: dict[str, Any] | None = None,
-) -> None:
+) -> dict[str, Any]:
+    """Keyword arguments for ``build_event``/``emit_event_*`` describing a policy change."""
     agent_id = boundary.agent_id or tenant_id
     payload = boundary.model_dump(mode="json")
     if payload_extra:
         payload.update(payload_extra)
+    return {
+        "event_id": f"{event_type}:{tenant_id}:{boundary.id}:{int(time.time() * 1000)}",
+        "event_type": event_type,
+        "tenant_id": tenant_id,
+        "agent_id": agent_id,
+        "aggregate_type": "policy",
+        "aggregate_id": boundary.id,
+        "payload": payload,
+    }
+
+
+def emit_policy_event(
+    *,
+    event_type: PrismIntelEventType,
+    tenant_id: str,
+    boundary: DesignBoundary,
+    payload_extra: dict[str, Any] | None = None,
+) -> None:
     data_intel_client.emit_event_async_best_effort(
-        event_id=f"{event_type}:{tenant_id}:{boundary.id}:{int(time.time() * 1000)}",
-        event_type=event_type,
-        tenant_id=tenant_id,
-        agent_id=agent_id,
-        aggregate_type="policy",
-        aggregate_id=boundary.id,
-        payload=payload,
+        **policy_event(
+            event_type=event_type,
+            tenant_id=tenant_id,
+            boundary=boundary,
+            payload_extra=payload_extra,
+        )
     )
 
 
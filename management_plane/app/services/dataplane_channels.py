@@ -0,0 +1,192 @@
+"""
+Shared pool of gRPC channels to the Rust data plane.
+
+One HTTP/2 connection serialises every enforcement call onto a single TCP
+stream and a single I/O thread on each side. The pool keeps several channels
+(each with its own subchannel pool, so each gets its own connection) and
+sends each call to the channel with the fewest calls in flight, round-robin
+among ties. Keepalive pings keep idle connections from being silently
+dropped by proxies, and ``wait_ready`` lets the app connect everything during
+startup instead of on the first enforcement request.
+
+Clients get a ``PooledStub``, which exposes the same unary methods as
+``DataPlaneStub`` and picks a channel per call.
+"""
+
+from __future__ import annotations
+
+from fencio_logger import get_logger
+
+import itertools
+import threading
+import time
+from typing import Any, Callable, Optional
+
+import grpc
+
+from app.metrics import registry
+from app.settings import config
+
+logger = get_logger(__name__, service_name="prism")
+
+DATA_PLANE_CHANNEL_INFLIGHT = registry.gauge(
+    "prism_dataplane_channel_inflight",
+    "Data plane gRPC calls in flight, per pooled channel.",
+    ("channel",),
+)
+DATA_PLANE_CHANNEL_CALLS_TOTAL = registry.counter(
+    "prism_dataplane_channel_calls_total",
+    "Data plane gRPC calls issued, per pooled channel.",
+    ("channel",),
+)
+
+
+class _PooledChannel:
+    def __init__(self, index: int, channel: grpc.Channel) -> None:
+        # Imported here so importing the app does not need the generated stubs
+        # until a channel is actually opened.
+        from app.generated.rule_installation_pb2_grpc import DataPlaneStub
+
+        self.label = str(index)
+        self.channel = channel
+        self.stub = DataPlaneStub(channel)
+        self.inflight = 0
+
+
+class DataPlaneChannelPool:
+    """Fixed set of channels to one data plane target, least-loaded selection."""
+
+    def __init__(
+        self,
+        target: str,
+        *,
+        size: int,
+        insecure: bool = True,
+        keepalive_time_ms: int = 30_000,
+        keepalive_timeout_ms: int = 10_000,
+    ) -> None:
+        self.target = target
+        options = [
+            # A private subchannel pool per channel: otherwise channels with
+            # identical arguments share one connection.
+            ("grpc.use_local_subchannel_pool", 1),
+            ("grpc.keepalive_time_ms", keepalive_time_ms),
+            ("grpc.keepalive_timeout_ms", keepalive_timeout_ms),
+            ("grpc.keepalive_permit_without_calls", 1),
+            ("grpc.http2.max_pings_without_data", 0),
+        ]
+        credentials = None if insecure else grpc.ssl_channel_credentials()
+        self._channels = []
+        for index in range(max(1, size)):
+            if credentials is None:
+                channel = grpc.insecure_channel(target, options=options)
+            else:
+                channel = grpc.secure_channel(target, credentials, options=options)
+            self._channels.append(_PooledChannel(index, channel))
+        self._lock = threading.Lock()
+        self._rotation = itertools.count()
+        self._closed = False
+
+    @property
+    def size(self) -> int:
+        return len(self._channels)
+
+    def inflight(self) -> list[int]:
+        with self._lock:
+            return [pooled.inflight for pooled in self._channels]
+
+    def _acquire(self) -> _PooledChannel:
+        with self._lock:
+            if self._closed:
+                raise RuntimeError(f"data plane channel pool for {self.target} is closed")
+            count = len(self._channels)
+            start = next(self._rotation) % count
+            # min() keeps the first of equals, so ties rotate with ``start``.
+            pooled = min(
+                (self._channels[(start + offset) % count] for offset in range(count)),
+                key=lambda candidate: candidate.inflight,
+            )
+            pooled.inflight += 1
+            inflight = pooled.inflight
+        DATA_PLANE_CHANNEL_INFLIGHT.set(inflight, channel=pooled.label)
+        DATA_PLANE_CHANNEL_CALLS_TOTAL.inc(channel=pooled.label)
+        return pooled
+
+    def _release(self, pooled: _PooledChannel) -> None:
+        with self._lock:
+            pooled.inflight -= 1
+            inflight = pooled.inflight
+        DATA_PLANE_CHANNEL_INFLIGHT.set(inflight, channel=pooled.label)
+
+    def call(self, method: str, *args: Any, **kwargs: Any) -> Any:
+        """Invoke a unary DataPlane method on the least-loaded channel."""
+        pooled = self._acquire()
+        try:
+            return getattr(pooled.stub, method)(*args, **kwargs)
+        finally:
+            self._release(pooled)
+
+    def wait_ready(self, timeout: float) -> int:
+        """Connect every channel; returns how many became ready within ``timeout``."""
+        deadline = time.monotonic() + timeout
+        futures = [grpc.channel_ready_future(pooled.channel) for pooled in self._channels]
+        ready = 0
+        for future in futures:
+            try:
+                future.result(timeout=max(0.0, deadline - time.monotonic()))
+                ready += 1
+            except grpc.FutureTimeoutError:
+                future.cancel()
+        return ready
+
+    def close(self) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        for pooled in self._channels:
+            pooled.channel.close()
+
+
+class PooledStub:
+    """Drop-in for ``DataPlaneStub`` that spreads calls over a channel pool."""
+
+    def __init__(self, pool: DataPlaneChannelPool) -> None:
+        self._pool = pool
+
+    def __getattr__(self, method: str) -> Callable[..., Any]:
+        if method.startswith("_"):
+            raise AttributeError(method)
+
+        def invoke(*args: Any, **kwargs: Any) -> Any:
+            return self._pool.call(method, *args, **kwargs)
+
+        return invoke
+
+
+_pools: dict[str, DataPlaneChannelPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_dataplane_pool(target: Optional[str] = None) -> DataPlaneChannelPool:
+    """Shared pool for ``target`` (default: DATA_PLANE_URL), created on first use."""
+    target = target or config.data_plane_url
+    with _pools_lock:
+        pool = _pools.get(target)
+        if pool is None:
+            pool = _pools[target] = DataPlaneChannelPool(
+                target,
+                size=config.DATA_PLANE_CHANNELS,
+                keepalive_time_ms=config.DATA_PLANE_KEEPALIVE_TIME_MS,
+                keepalive_timeout_ms=config.DATA_PLANE_KEEPALIVE_TIMEOUT_MS,
+            )
+            logger.info("Data plane channel pool: %d channel(s) to %s", pool.size, target)
+        return pool
+
+
+def close_dataplane_pools() -> None:
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
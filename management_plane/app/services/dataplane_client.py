@@ -9,24 +9,49 @@ from fencio_logger import get_logger
 import os
 import grpc
 import json
-from typing import Optional, List
+from typing import Iterable, Optional, Sequence, Union
+
+import numpy as np
 from app.generated.rule_installation_pb2 import (
     EnforceRequest,
     EnforceResponse,
     InstallRulesRequest,
+    Intent,
+    IntentActor,
+    IntentData,
+    IntentResource,
+    IntentRisk,
     QueryTelemetryRequest,
+    GetRuleStatsRequest,
     GetSessionRequest,
     RefreshRulesRequest,
     RemoveAgentRulesRequest,
     RemovePolicyRequest,
+    ReplacePoliciesRequest,
 )
 from app.generated.rule_installation_pb2_grpc import DataPlaneStub
-from app.models import BoundaryEvidence, ComparisonResult, DesignBoundary, IntentEvent
+from app.deadline import DeadlineExceeded, current_deadline
+from app.services.dataplane_channels import DataPlaneChannelPool, PooledStub
+from app.models import (
+    BoundaryEvidence,
+    ComparisonResult,
+    DesignBoundary,
+    EvidenceLevel,
+    IntentEvent,
+)
 from app.services.policy_converter import PolicyConverter
 from app.services.policy_encoder import RuleVector
+from app.services.vector_codec import PROTO_ENCODINGS, pack_vectors
+from app.settings import config
 
 logger = get_logger(__name__, service_name="prism")
 
+
+def _present(**fields):
+    """Keyword arguments minus the ones that are None (unset proto fields)."""
+    return {name: value for name, value in fields.items() if value is not None}
+
+
 class DataPlaneError(Exception):
     """Error communicating with the Data Plane gRPC server."""
     def __init__(self, message: str, status_code: Optional[grpc.StatusCode] = None):
@@ -36,6 +61,9 @@ class DataPlaneError(Exception):
 class DataPlaneClient:
     """
     gRPC client for the Rust Data Plane enforcement engine.
+
+    With ``pool`` the client sends calls over a shared DataPlaneChannelPool
+    and ``close`` leaves the pool open; otherwise it owns a single channel.
     """
     def __init__(
         self,
@@ -43,11 +71,17 @@ class DataPlaneClient:
         timeout: float = 5.0,
         insecure: bool = True,
         token: Optional[str] = None,
+        pool: Optional[DataPlaneChannelPool] = None,
     ):
-        self.url = url
+        self.url = pool.target if pool is not None else url
         self.timeout = timeout
         self.insecure = insecure
         self.token = token
+        self.pool = pool
+
+        if pool is not None:
+            self.stub = PooledStub(pool)
+            return
 
         if insecure:
             self.channel = grpc.insecure_channel(url)
@@ -57,6 +91,54 @@ class DataPlaneClient:
 
         self.stub = DataPlaneStub(self.channel)
 
+    def _to_dataplane_intent(self, intent: IntentEvent) -> Intent:
+        """
+        Typed counterpart of ``_to_dataplane_payload``.
+
+        Raises TypeError or ValueError for values the message cannot hold
+        (e.g. a non-integer ``payload_bytes``); callers fall back to JSON.
+        """
+        identity = intent.identity
+        ctx = intent.ctx
+        params = intent.params or {}
+        context_payload = ctx.model_dump() if ctx else {}
+        if intent.dry_run_rule_ids:
+            context_payload["dry_run_rule_ids"] = intent.dry_run_rule_ids
+        tool_params = intent.tool_params or intent.params
+        return Intent(**_present(
+            id=intent.event_id or intent.id,
+            schema_version="v1.3",
+            tenant_id=intent.tenant_id or "",
+            timestamp=intent.ts,
+            actor=IntentActor(id=identity.agent_id, type=identity.actor_type),
+            action=intent.op,
+            source_agent=intent.source_agent,
+            source_layer=intent.source_layer,
+            destination_agent=intent.destination_agent,
+            destination_layer=intent.destination_layer,
+            layer=intent.destination_layer or intent.source_layer or "",
+            llm_tool_intent=intent.llm_tool_intent,
+            tool_call_count=intent.tool_call_count,
+            resource=IntentResource(type=intent.t),
+            data=IntentData(**_present(
+                sensitivity=(ctx.data_classifications or []) if ctx else [],
+                content=intent.payload_text,
+                size_bytes=params.get("payload_bytes"),
+                input_token_count=params.get("input_token_count"),
+                record_count=params.get("record_count"),
+            )),
+            risk=IntentRisk(**_present(authn="none", channel=params.get("output_channel"))),
+            context_json=json.dumps(context_payload) if context_payload else "",
+            tool_name=intent.tool_name,
+            tool_method=intent.tool_method,
+            tool_params_json=json.dumps(tool_params) if tool_params is not None else "",
+            rag_source_id=intent.rag_source_id,
+            rag_source_name=intent.rag_source_name,
+            resource_identity_type=intent.resource_identity_type,
+            resource_identity_key=intent.resource_identity_key,
+            resource_identity_name=intent.resource_identity_name,
+        ))
+
     def _to_dataplane_payload(self, intent: IntentEvent) -> str:
         """Map Python IntentEvent to the Rust data plane wire format (v1.3)."""
         identity = intent.identity
@@ -112,39 +194,86 @@ class DataPlaneClient:
     def enforce(
         self,
         intent: IntentEvent,
-        intent_vector: Optional[List[float]] = None,
+        intent_vector: Optional[Union[Sequence[float], np.ndarray]] = None,
         request_id: str = "",
         drift_score: float = 0.0,
         agent_call_id: str = "",
+        evidence_level: EvidenceLevel = "full",
     ) -> ComparisonResult:
-        """Enforce rules against an IntentEvent."""
-        try:
-            intent_json = self._to_dataplane_payload(intent)
-        except Exception as e:
-            raise ValueError(f"Failed to serialize IntentEvent: {e}")
+        """
+        Enforce rules against an IntentEvent.
+
+        The intent goes out as the typed ``Intent`` message unless
+        DATA_PLANE_TYPED_INTENT is off or a field does not fit it, in which
+        case the v1.3 JSON document is sent instead. ``intent_vector`` (a NumPy
+        array or float sequence) is packed into bytes unless
+        DATA_PLANE_PACKED_VECTORS is off. ``evidence_level`` is forwarded to
+        the data plane so lower levels skip building, sending and decoding the
+        evidence they would drop anyway.
+        """
+        typed_intent = None
+        if config.DATA_PLANE_TYPED_INTENT:
+            try:
+                typed_intent = self._to_dataplane_intent(intent)
+            except (TypeError, ValueError) as e:
+                logger.debug("Sending IntentEvent as JSON: %s", e)
+        if typed_intent is not None:
+            intent_fields = {"intent": typed_intent}
+        else:
+            try:
+                intent_fields = {"intent_event_json": self._to_dataplane_payload(intent)}
+            except Exception as e:
+                raise ValueError(f"Failed to serialize IntentEvent: {e}")
+
+        if intent_vector is None or len(intent_vector) == 0:
+            vector_fields = {}
+        elif config.DATA_PLANE_PACKED_VECTORS:
+            encoding = config.DATA_PLANE_VECTOR_ENCODING
+            vector_fields = {
+                "intent_vector_packed": pack_vectors(intent_vector, encoding),
+                "intent_vector_encoding": PROTO_ENCODINGS[encoding],
+            }
+        else:
+            vector_fields = {"intent_vector": np.asarray(intent_vector, dtype=np.float32).tolist()}
 
         request = EnforceRequest(
-            intent_event_json=intent_json,
-            intent_vector=intent_vector or [],
+            **intent_fields,
+            **vector_fields,
             request_id=request_id,
             drift_score=drift_score,
             session_id=agent_call_id,
+            evidence_level=evidence_level,
         )
 
         metadata = []
         if self.token:
             metadata.append(("authorization", f"Bearer {self.token}"))
 
+        # The gRPC deadline is the smaller of the client timeout and whatever is
+        # left of the enforcement request's budget.
+        deadline = current_deadline()
+        timeout = (
+            deadline.timeout(self.timeout, "data_plane Enforce")
+            if deadline is not None
+            else self.timeout
+        )
+
         try:
             response: EnforceResponse = self.stub.Enforce(
                 request,
-                timeout=self.timeout,
+                timeout=timeout,
                 metadata=metadata if metadata else None,
             )
-            return self._convert_response(response)
+            return self._convert_response(response, evidence_level)
         except grpc.RpcError as e:
             status_code = e.code()
             details = e.details()
+            if (
+                status_code == grpc.StatusCode.DEADLINE_EXCEEDED
+                and deadline is not None
+                and deadline.expired
+            ):
+                raise DeadlineExceeded("data_plane Enforce", deadline.budget_ms) from e
             # Fail-closed: treat all errors as BLOCK (Data Plane engine does this internally too)
             raise DataPlaneError(
                 f"Data Plane error [{status_code}]: {details}",
@@ -156,7 +285,90 @@ class DataPlaneClient:
         boundaries: list[DesignBoundary],
         rule_vectors: list[RuleVector],
     ) -> dict:
-        """Install policies on the Data Plane via gRPC."""
+        """
+        Install policies on the Data Plane via gRPC.
+
+        Re-installs overwrite rules with the same id in one ReplacePolicies
+        call. Data planes that predate that RPC get the old remove-then-install
+        sequence instead.
+        """
+        try:
+            return self.replace_policies(boundaries, rule_vectors)
+        except DataPlaneError as e:
+            if e.status_code != grpc.StatusCode.UNIMPLEMENTED:
+                raise
+        logger.info("Data Plane lacks ReplacePolicies; falling back to InstallRules")
+        return self._install_policies_legacy(boundaries, rule_vectors)
+
+    def replace_policies(
+        self,
+        boundaries: list[DesignBoundary],
+        rule_vectors: list[RuleVector],
+        *,
+        remove_policy_ids: Iterable[str] = (),
+        replace_all: bool = False,
+        expected_bridge_version: int = 0,
+    ) -> dict:
+        """
+        Swap an agent's rules on the Data Plane as one bridge version.
+
+        ``boundaries`` are upserted and ``remove_policy_ids`` dropped in the same
+        bridge update; ``replace_all`` also drops every other rule scoped to the
+        agent. A non-zero ``expected_bridge_version`` makes the call fail with
+        ABORTED if another writer got there first.
+
+        A rule the Data Plane cannot convert is skipped, and any version of it
+        already installed kept; its id is listed in ``failed_policy_ids``.
+        """
+        if len(boundaries) != len(rule_vectors):
+            raise ValueError("Boundaries and rule vectors must be aligned")
+        if not boundaries:
+            raise ValueError("At least one boundary is required to identify the agent")
+
+        agent_id = boundaries[0].agent_id or boundaries[0].tenant_id
+        rules = [
+            PolicyConverter.boundary_to_rule_instance(boundary, vector, agent_id)
+            for boundary, vector in zip(boundaries, rule_vectors)
+        ]
+        request = ReplacePoliciesRequest(
+            agent_id=agent_id,
+            rules=rules,
+            config_id="design_boundary_v2",
+            owner="management_plane",
+            remove_rule_ids=list(remove_policy_ids),
+            replace_all=replace_all,
+            expected_bridge_version=expected_bridge_version,
+        )
+
+        metadata = []
+        if self.token:
+            metadata.append(("authorization", f"Bearer {self.token}"))
+
+        try:
+            response = self.stub.ReplacePolicies(
+                request,
+                timeout=self.timeout,
+                metadata=metadata if metadata else None,
+            )
+            return {
+                "success": response.success,
+                "message": response.message,
+                "rules_installed": response.rules_installed,
+                "rules_removed": response.rules_removed,
+                "rules_by_layer": dict(response.rules_by_layer),
+                "bridge_version": response.bridge_version,
+                "previous_bridge_version": response.previous_bridge_version,
+                "failed_policy_ids": list(response.failed_rule_ids),
+            }
+        except grpc.RpcError as e:
+            raise DataPlaneError(f"ReplacePolicies failed: {e.details()}", e.code())
+
+    def _install_policies_legacy(
+        self,
+        boundaries: list[DesignBoundary],
+        rule_vectors: list[RuleVector],
+    ) -> dict:
+        """Per-boundary RemovePolicy calls followed by InstallRules."""
 
         if not boundaries or len(boundaries) != len(rule_vectors):
             raise ValueError("Boundaries and rule vectors must be non-empty and aligned")
@@ -242,12 +454,23 @@ class DataPlaneClient:
                 "success": response.success,
                 "message": response.message,
                 "rules_removed": response.rules_removed,
+                "bridge_version": response.bridge_version,
+                "previous_bridge_version": response.previous_bridge_version,
             }
         except grpc.RpcError as e:
             raise DataPlaneError(f"RemovePolicy failed: {e.details()}", e.code())
 
-    def _convert_response(self, response: EnforceResponse) -> ComparisonResult:
-        """Convert gRPC EnforceResponse to ComparisonResult."""
+    def _convert_response(
+        self, response: EnforceResponse, evidence_level: EvidenceLevel = "full"
+    ) -> ComparisonResult:
+        """
+        Convert gRPC EnforceResponse to ComparisonResult.
+
+        Policy mode, type and drift scores are aggregated at every level. They
+        come from the typed ``policy`` message when the data plane sets it, and
+        otherwise from the connection result JSON. At "decision" level no
+        evidence is kept; JSON details are only decoded at "full" level.
+        """
         def _decode_json_field(raw: str, default):
             if not raw:
                 return default
@@ -261,23 +484,40 @@ class DataPlaneClient:
         policy_similarity_scores = []
         baseline_drift_scores = []
 
+        full = evidence_level == "full"
         for ev in response.evidence:
-            connection_result = _decode_json_field(
-                getattr(ev, "connection_result_json", ""),
-                None,
-            )
-            connection_result_dict = connection_result if isinstance(connection_result, dict) else {}
-            if isinstance(connection_result, dict):
-                policy_drift = connection_result.get("policy_drift_score")
-                policy_similarity = connection_result.get("policy_similarity_score")
-                baseline_drift = connection_result.get("baseline_drift_score")
+            if ev.HasField("policy"):
+                policy = ev.policy
+                connection_result = (
+                    _decode_json_field(ev.connection_result_json, None) if full else None
+                )
+                policy_mode = policy.policy_mode or "Enforce"
+                policy_type = policy.policy_type or None
+                if policy.HasField("policy_drift_score"):
+                    policy_drift_scores.append(policy.policy_drift_score)
+                if policy.HasField("policy_similarity_score"):
+                    policy_similarity_scores.append(policy.policy_similarity_score)
+                if policy.HasField("baseline_drift_score"):
+                    baseline_drift_scores.append(policy.baseline_drift_score)
+            else:
+                connection_result = _decode_json_field(ev.connection_result_json, None)
+                connection_result_dict = (
+                    connection_result if isinstance(connection_result, dict) else {}
+                )
+                policy_drift = connection_result_dict.get("policy_drift_score")
+                policy_similarity = connection_result_dict.get("policy_similarity_score")
+                baseline_drift = connection_result_dict.get("baseline_drift_score")
                 if isinstance(policy_drift, (int, float)):
                     policy_drift_scores.append(float(policy_drift))
                 if isinstance(policy_similarity, (int, float)):
                     policy_similarity_scores.append(float(policy_similarity))
                 if isinstance(baseline_drift, (int, float)):
                     baseline_drift_scores.append(float(baseline_drift))
+                policy_mode = connection_result_dict.get("policy_mode", "Enforce")
+                policy_type = connection_result_dict.get("policy_type")
 
+            if evidence_level == "decision":
+                continue
             evidence.append(
                 BoundaryEvidence(
                     boundary_id=ev.rule_id,
@@ -290,17 +530,17 @@ class DataPlaneClient:
                     thresholds=list(ev.thresholds) if ev.thresholds else [0.0, 0.0, 0.0, 0.0],
                     scoring_mode=ev.scoring_mode,
                     evaluation_mode=ev.evaluation_mode or "semantic",
-                    policy_mode=connection_result_dict.get("policy_mode", "Enforce"),
-                    policy_type=connection_result_dict.get("policy_type"),
-                    connection_result=connection_result,
+                    policy_mode=policy_mode,
+                    policy_type=policy_type,
+                    connection_result=connection_result if full else None,
                     deterministic_results=_decode_json_field(
-                        getattr(ev, "deterministic_results_json", ""),
+                        ev.deterministic_results_json,
                         [],
-                    ),
+                    ) if full else [],
                     semantic_results=_decode_json_field(
-                        getattr(ev, "semantic_results_json", ""),
+                        ev.semantic_results_json,
                         [],
-                    ),
+                    ) if full else [],
                 )
             )
 
@@ -367,6 +607,28 @@ class DataPlaneClient:
         except grpc.RpcError as e:
             raise DataPlaneError(f"GetSession failed: {e.details()}", e.code())
 
+    def get_rule_stats(self) -> dict:
+        """Bridge version, instance creation time and rule counts."""
+        metadata = []
+        if self.token:
+            metadata.append(("authorization", f"Bearer {self.token}"))
+
+        try:
+            response = self.stub.GetRuleStats(
+                GetRuleStatsRequest(),
+                timeout=self.timeout,
+                metadata=metadata if metadata else None,
+            )
+        except grpc.RpcError as e:
+            raise DataPlaneError(f"GetRuleStats failed: {e.details()}", e.code())
+        return {
+            "bridge_version": response.bridge_version,
+            "bridge_created_at_ms": response.bridge_created_at_ms,
+            "total_rules": response.total_rules,
+            "total_global_rules": response.total_global_rules,
+            "total_scoped_rules": response.total_scoped_rules,
+        }
+
     def refresh_rules(self):
         request = RefreshRulesRequest()
         try:
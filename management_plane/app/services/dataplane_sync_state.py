@@ -0,0 +1,284 @@
+"""
+What the management plane last installed in the data plane.
+
+The state is kept in a small JSON file: the bridge instance (its creation time)
+and version it describes, plus the content hash and agent of every installed
+policy. On startup, if the data plane still reports the same instance and
+version, nothing else has written to it since, so only policies whose hash
+changed (or that disappeared) need RPCs.
+
+Every recorded write is a ``previous -> new`` bridge version transition. The
+state only advances when the transitions chain up from its current version, so
+a write it never saw (another replica, a manual refresh, a data plane restart)
+leaves it behind and the next startup falls back to a full sync.
+
+Changes are appended to a journal next to the snapshot (``<path>.journal``),
+one JSON line per recorded write holding only the policies it touched. The
+snapshot is rewritten, and the journal emptied, on reset and rebase and once
+the journal has grown past the size of the policy set, so each write costs
+O(policies changed) and compaction stays amortized.
+"""
+
+from __future__ import annotations
+
+from fencio_logger import get_logger
+
+import hashlib
+import json
+import os
+import threading
+from dataclasses import asdict, dataclass
+from typing import Iterable, Optional
+
+from app.models import DesignBoundary
+from app.settings import config
+
+logger = get_logger(__name__, service_name="prism")
+
+_FORMAT_VERSION = 1
+# The journal is compacted into the snapshot once it holds more policy changes
+# than this or than the policy set itself, whichever is larger.
+_MIN_JOURNAL_COMPACT_CHANGES = 1024
+
+
+def policy_content_hash(boundary: DesignBoundary) -> str:
+    """Stable hash of everything that goes into a policy's installed rule."""
+    document = json.dumps(boundary.model_dump(mode="json"), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(document.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class InstalledPolicy:
+    agent_id: str
+    content_hash: str
+    bridge_version: int
+
+
+class DataPlaneSyncState:
+    """Thread-safe, file-backed record of installed policies and bridge version."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.journal_path = f"{path}.journal"
+        self.bridge_created_at_ms = 0
+        self.bridge_version = 0
+        self.policies: dict[str, InstalledPolicy] = {}
+        # Transitions that arrived before the one they follow.
+        self._transitions: dict[int, int] = {}
+        # Policy changes appended to the journal since the last compaction.
+        self._journal_changes = 0
+        # Bumped on every snapshot; journal entries of older generations (left
+        # behind by a crash between snapshot and truncation) are ignored.
+        self._generation = 0
+        # Set when the files on disk could not be used as-is; the next write
+        # then rewrites the snapshot instead of appending to the journal.
+        self._snapshot_stale = False
+        self._lock = threading.Lock()
+        self._loaded = False
+
+    def _load_locked(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        try:
+            with open(self.path, "r", encoding="utf-8") as handle:
+                data = json.load(handle)
+        except FileNotFoundError:
+            data = {"format": _FORMAT_VERSION}
+        except (OSError, ValueError) as exc:
+            logger.warning("data plane sync state unreadable (%s): %s", self.path, exc)
+            self._snapshot_stale = True
+            return
+        if data.get("format") != _FORMAT_VERSION:
+            self._snapshot_stale = True
+            return
+        self.bridge_created_at_ms = int(data.get("bridge_created_at_ms", 0))
+        self.bridge_version = int(data.get("bridge_version", 0))
+        self._generation = int(data.get("generation", 0))
+        self.policies = {
+            policy_id: InstalledPolicy(**entry)
+            for policy_id, entry in (data.get("policies") or {}).items()
+        }
+        self._replay_journal_locked()
+
+    def _replay_journal_locked(self) -> None:
+        try:
+            with open(self.journal_path, "r", encoding="utf-8") as handle:
+                lines = handle.readlines()
+        except FileNotFoundError:
+            return
+        except OSError as exc:
+            logger.warning(
+                "data plane sync journal unreadable (%s): %s", self.journal_path, exc
+            )
+            return
+        for line in lines:
+            try:
+                entry = json.loads(line)
+                changed = {
+                    policy_id: InstalledPolicy(**fields)
+                    for policy_id, fields in entry.get("set", {}).items()
+                }
+            except (TypeError, ValueError):
+                # A torn last line from a crash mid-append; what follows is unusable.
+                logger.warning(
+                    "data plane sync journal truncated at a bad entry (%s)", self.journal_path
+                )
+                self._snapshot_stale = True
+                break
+            if entry.get("generation", 0) != self._generation:
+                continue
+            self.policies.update(changed)
+            for policy_id in entry.get("drop", []):
+                self.policies.pop(policy_id, None)
+            self.bridge_created_at_ms = int(entry.get("bridge_created_at_ms", 0))
+            self.bridge_version = int(entry.get("bridge_version", 0))
+            self._journal_changes += len(changed) + len(entry.get("drop", []))
+
+    def _save_locked(self) -> None:
+        """Write the full snapshot and empty the journal."""
+        generation = self._generation + 1
+        data = {
+            "format": _FORMAT_VERSION,
+            "generation": generation,
+            "bridge_created_at_ms": self.bridge_created_at_ms,
+            "bridge_version": self.bridge_version,
+            "policies": {policy_id: asdict(entry) for policy_id, entry in self.policies.items()},
+        }
+        tmp_path = f"{self.path}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as handle:
+                json.dump(data, handle, separators=(",", ":"))
+            os.replace(tmp_path, self.path)
+            self._generation = generation
+            with open(self.journal_path, "w", encoding="utf-8"):
+                pass
+            self._journal_changes = 0
+            self._snapshot_stale = False
+        except OSError as exc:
+            logger.warning("failed to write data plane sync state (%s): %s", self.path, exc)
+
+    def _journal_locked(self, changed: Iterable[str] = (), dropped: Iterable[str] = ()) -> None:
+        """Append one recorded write, compacting once the journal outgrows the snapshot."""
+        changed = [policy_id for policy_id in changed if policy_id in self.policies]
+        dropped = list(dropped)
+        self._journal_changes += len(changed) + len(dropped)
+        if self._snapshot_stale or self._journal_changes > max(
+            _MIN_JOURNAL_COMPACT_CHANGES, len(self.policies)
+        ):
+            self._save_locked()
+            return
+        entry = {
+            "generation": self._generation,
+            "bridge_created_at_ms": self.bridge_created_at_ms,
+            "bridge_version": self.bridge_version,
+            "set": {policy_id: asdict(self.policies[policy_id]) for policy_id in changed},
+            "drop": dropped,
+        }
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(self.journal_path, "a", encoding="utf-8") as handle:
+                handle.write(json.dumps(entry, separators=(",", ":")) + "\n")
+        except OSError as exc:
+            logger.warning(
+                "failed to append data plane sync journal (%s): %s", self.journal_path, exc
+            )
+            self._snapshot_stale = True
+
+    def _advance_locked(self, previous: Optional[int], version: Optional[int]) -> None:
+        if previous is None or version is None:
+            # Unknown transition: the recorded version can no longer be trusted.
+            self.bridge_created_at_ms = 0
+            self._transitions.clear()
+            return
+        if previous == version:
+            return
+        self._transitions[previous] = version
+        while self.bridge_version in self._transitions:
+            self.bridge_version = self._transitions.pop(self.bridge_version)
+
+    def matches(self, bridge_created_at_ms: int, bridge_version: int) -> bool:
+        """True if the data plane is exactly the instance and version recorded here."""
+        with self._lock:
+            self._load_locked()
+            return (
+                bridge_created_at_ms != 0
+                and self.bridge_created_at_ms == bridge_created_at_ms
+                and self.bridge_version == bridge_version
+            )
+
+    def installed(self) -> dict[str, InstalledPolicy]:
+        with self._lock:
+            self._load_locked()
+            return dict(self.policies)
+
+    def reset(self, bridge_created_at_ms: int, bridge_version: int) -> None:
+        """Forget every policy and start tracking from the given bridge state."""
+        with self._lock:
+            self._loaded = True
+            self.bridge_created_at_ms = bridge_created_at_ms
+            self.bridge_version = bridge_version
+            self.policies = {}
+            self._transitions.clear()
+            self._save_locked()
+
+    def rebase(self, bridge_created_at_ms: int, bridge_version: int) -> None:
+        """Track from the given bridge state, keeping the recorded policies."""
+        with self._lock:
+            self._load_locked()
+            self.bridge_created_at_ms = bridge_created_at_ms
+            self.bridge_version = bridge_version
+            self._transitions.clear()
+            self._save_locked()
+
+    def record_installed(
+        self,
+        boundaries: Iterable[DesignBoundary],
+        previous_version: Optional[int],
+        version: Optional[int],
+    ) -> None:
+        with self._lock:
+            self._load_locked()
+            changed = []
+            for boundary in boundaries:
+                self.policies[boundary.id] = InstalledPolicy(
+                    agent_id=boundary.agent_id or boundary.tenant_id,
+                    content_hash=policy_content_hash(boundary),
+                    bridge_version=int(version or 0),
+                )
+                changed.append(boundary.id)
+            self._advance_locked(previous_version, version)
+            self._journal_locked(changed=changed)
+
+    def record_removed(
+        self,
+        policy_ids: Iterable[str],
+        previous_version: Optional[int],
+        version: Optional[int],
+    ) -> None:
+        with self._lock:
+            self._load_locked()
+            dropped = [
+                policy_id for policy_id in policy_ids
+                if self.policies.pop(policy_id, None) is not None
+            ]
+            self._advance_locked(previous_version, version)
+            self._journal_locked(dropped=dropped)
+
+    def record_agent_cleared(self, agent_id: str) -> None:
+        """An agent's rules were wiped without a version transition to follow."""
+        with self._lock:
+            self._load_locked()
+            dropped = [
+                policy_id
+                for policy_id, entry in self.policies.items()
+                if entry.agent_id == agent_id
+            ]
+            for policy_id in dropped:
+                del self.policies[policy_id]
+            self._advance_locked(None, None)
+            self._journal_locked(dropped=dropped)
+
+
+sync_state = DataPlaneSyncState(config.DATAPLANE_SYNC_STATE_PATH)
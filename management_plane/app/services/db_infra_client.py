@@ -5,11 +5,14 @@ from typing import Any
 
 import httpx
 
+from app.deadline import DeadlineExceeded, current_deadline
 from app.settings import config
 
 
 class DbInfraClientError(RuntimeError):
-    pass
+    def __init__(self, message: str, status_code: int | None = None) -> None:
+        super().__init__(message)
+        self.status_code = status_code
 
 
 class DbInfraClient:
@@ -31,14 +34,26 @@ class DbInfraClient:
             "X-DB-Infra-Service": service_scope,
             "Accept": "application/json",
         }
-        with httpx.Client(base_url=self._base_url, timeout=self._timeout_seconds) as client:
-            response = client.request(
-                method,
-                path,
-                json=payload,
-                params=params,
-                headers=headers,
-            )
+        deadline = current_deadline()
+        stage = f"db_infra {method} {path}"
+        timeout = (
+            deadline.timeout(self._timeout_seconds, stage)
+            if deadline is not None
+            else self._timeout_seconds
+        )
+        try:
+            with httpx.Client(base_url=self._base_url, timeout=timeout) as client:
+                response = client.request(
+                    method,
+                    path,
+                    json=payload,
+                    params=params,
+                    headers=headers,
+                )
+        except httpx.TimeoutException as exc:
+            if deadline is not None and deadline.expired:
+                raise DeadlineExceeded(stage, deadline.budget_ms) from exc
+            raise
         if allow_not_found and response.status_code == 404:
             return {}
         if response.is_error:
@@ -48,7 +63,8 @@ class DbInfraClient:
             except ValueError:
                 pass
             raise DbInfraClientError(
-                f"db_infra {method} {path} failed: {response.status_code} {detail}"
+                f"db_infra {method} {path} failed: {response.status_code} {detail}",
+                status_code=response.status_code,
             )
         if not response.content:
             return {}
@@ -0,0 +1,100 @@
+"""
+Batched telemetry for dry-run evaluations.
+
+Dry runs skip the PENDING row and never touch session drift state. Their call
+rows and intel events are buffered here and written by a background flush
+(started from the app lifespan), so bulk policy testing does not pay the
+db_infra and data_intel round trips on the request path. Intel events go out
+as one data_intel batch per chunk; call rows are inserted one by one because
+db_infra has no batch route for them.
+"""
+
+from __future__ import annotations
+
+from fencio_logger import get_logger
+
+import threading
+from collections import deque
+from typing import Any
+
+from app.metrics import registry
+from app.services import session_store
+from app.services.data_intel_client import data_intel_client
+from app.settings import config
+
+logger = get_logger(__name__, service_name="prism")
+
+DRY_RUN_TELEMETRY_PENDING = registry.gauge(
+    "prism_dry_run_telemetry_pending",
+    "Dry-run call records buffered for the next flush.",
+)
+DRY_RUN_TELEMETRY_TOTAL = registry.counter(
+    "prism_dry_run_telemetry_total",
+    "Dry-run call records by outcome (flushed, dropped, skipped).",
+    ("outcome",),
+)
+
+
+class DryRunRecorder:
+    """Thread-safe buffer of dry-run call rows and intel events."""
+
+    def __init__(self, *, max_buffer: int, batch_size: int) -> None:
+        self.max_buffer = max(1, max_buffer)
+        self.batch_size = max(1, batch_size)
+        self._records: deque[tuple[dict[str, Any], dict[str, Any] | None]] = deque()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+
+    @property
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._records)
+
+    def record(self, *, call: dict[str, Any], intel_event: dict[str, Any] | None) -> None:
+        """Buffer ``call`` (insert_call kwargs) and its intel event (build_event kwargs)."""
+        with self._lock:
+            if len(self._records) >= self.max_buffer:
+                self._records.popleft()
+                DRY_RUN_TELEMETRY_TOTAL.inc(outcome="dropped")
+            self._records.append((call, intel_event))
+            DRY_RUN_TELEMETRY_PENDING.set(len(self._records))
+
+    def skip(self) -> None:
+        DRY_RUN_TELEMETRY_TOTAL.inc(outcome="skipped")
+
+    def _take(self) -> list[tuple[dict[str, Any], dict[str, Any] | None]]:
+        with self._lock:
+            batch = [
+                self._records.popleft()
+                for _ in range(min(self.batch_size, len(self._records)))
+            ]
+            DRY_RUN_TELEMETRY_PENDING.set(len(self._records))
+        return batch
+
+    def flush(self) -> int:
+        """Write everything buffered so far; returns the number of records written."""
+        written = 0
+        with self._flush_lock:
+            while True:
+                batch = self._take()
+                if not batch:
+                    return written
+                for call, _ in batch:
+                    session_store.insert_call(**call)
+                events = [
+                    data_intel_client.build_event(**intel_event)
+                    for _, intel_event in batch
+                    if intel_event is not None
+                ]
+                try:
+                    data_intel_client.emit_batch_best_effort(events)
+                except Exception as exc:
+                    logger.error("dry-run intel batch failed: %s", exc)
+                written += len(batch)
+                DRY_RUN_TELEMETRY_TOTAL.inc(len(batch), outcome="flushed")
+
+
+dry_run_recorder = DryRunRecorder(
+    max_buffer=config.DRY_RUN_TELEMETRY_MAX_BUFFER,
+    batch_size=config.DRY_RUN_TELEMETRY_BATCH_SIZE,
+)
@@ -0,0 +1,131 @@
+"""
+Path-segment trie for wildcard network whitelist rules.
+
+A rule URL is split on "/" and inserted segment by segment. ``*`` keeps its
+original meaning (regex ``.*``, so it may cross "/"):
+
+- a segment that is only stars (``/users/*/orders``) matches a run of one or
+  more request segments, and is walked as a looping trie edge;
+- a segment that mixes stars with text (``/api/v*``) cannot be split on
+  segment boundaries, so the rule is parked at the node for its prefix and
+  checked with its full regex when a lookup passes that node.
+
+Lookups walk the request path once, keeping the set of live trie nodes, so the
+cost grows with path depth (and the number of star edges in play), not with the
+number of rules. Results match the regex of every rule exactly.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from typing import Generic, Iterable, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+def compile_wildcard(url: str) -> re.Pattern[str]:
+    """Anchored regex for a whitelist URL with ``*`` wildcards."""
+    return re.compile("^" + re.escape(url).replace(r"\*", ".*") + "$")
+
+
+@dataclass
+class _Entry(Generic[T]):
+    order: tuple[int, ...]
+    value: T
+    pattern: Optional[re.Pattern[str]] = None
+
+
+@dataclass
+class _Node(Generic[T]):
+    children: dict[str, "_Node[T]"] = field(default_factory=dict)
+    # Child for a segment made only of stars; it loops on itself.
+    star: Optional["_Node[T]"] = None
+    is_star: bool = False
+    # Rules that end at this node, and rules parked here for a regex check.
+    terminal: list[_Entry[T]] = field(default_factory=list)
+    residual: list[_Entry[T]] = field(default_factory=list)
+
+
+class PathTrie(Generic[T]):
+    """
+    Wildcard URL rules indexed by path segment.
+
+    ``order`` decides which match wins (lowest first), so callers can keep
+    first-match-in-list semantics.
+    """
+
+    def __init__(self) -> None:
+        self._root: _Node[T] = _Node()
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def insert(self, url: str, order: tuple[int, ...], value: T) -> None:
+        node = self._root
+        for segment in url.split("/"):
+            if "*" not in segment:
+                child = node.children.get(segment)
+                if child is None:
+                    child = node.children[segment] = _Node()
+                node = child
+            elif segment.strip("*") == "":
+                if node.star is None:
+                    node.star = _Node(is_star=True)
+                node = node.star
+            else:
+                node.residual.append(_Entry(order, value, compile_wildcard(url)))
+                self._size += 1
+                return
+        node.terminal.append(_Entry(order, value))
+        self._size += 1
+
+    def freeze(self) -> None:
+        """Sort per-node entries by order; call once after the last insert."""
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            node.terminal.sort(key=lambda entry: entry.order)
+            node.residual.sort(key=lambda entry: entry.order)
+            stack.extend(node.children.values())
+            if node.star is not None and node.star is not node:
+                stack.append(node.star)
+
+    def match(
+        self, url: str, before: Optional[tuple[int, ...]] = None
+    ) -> Optional[tuple[tuple[int, ...], T]]:
+        """Lowest-order ``(order, value)`` matching ``url``, if below ``before``."""
+        best: Optional[_Entry[T]] = None
+
+        def consider(entries: Iterable[_Entry[T]]) -> None:
+            nonlocal best
+            for entry in entries:
+                limit = best.order if best is not None else before
+                if limit is not None and entry.order >= limit:
+                    return
+                if entry.pattern is None or entry.pattern.match(url):
+                    best = entry
+                    return
+
+        states: list[_Node[T]] = [self._root]
+        for segment in url.split("/"):
+            following: dict[int, _Node[T]] = {}
+            for node in states:
+                consider(node.residual)
+                child = node.children.get(segment)
+                if child is not None:
+                    following[id(child)] = child
+                if node.star is not None:
+                    following[id(node.star)] = node.star
+                if node.is_star:
+                    following[id(node)] = node
+            states = list(following.values())
+            if not states:
+                break
+        else:
+            for node in states:
+                consider(node.residual)
+                consider(node.terminal)
+
+        return (best.order, best.value) if best is not None else None
@@ -5,10 +5,12 @@ from __future__ import annotations
 from fencio_logger import get_logger
 
 import json
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
 from app.models import NetworkEndpointRule, NetworkPolicy
-from app.services.db_infra_client import db_infra_client
+from app.services.db_infra_client import DbInfraClientError, db_infra_client
+from app.settings import config
 
 logger = get_logger(__name__, service_name="prism")
 
@@ -57,6 +59,40 @@ def create_network_policy(policy: NetworkPolicy) -> NetworkPolicy:
     return policy
 
 
+def create_network_policies(policies: list[NetworkPolicy]) -> list[NetworkPolicy]:
+    """
+    Upsert many policies, NETWORK_POLICY_IMPORT_BATCH_SIZE rows per request.
+
+    Falls back to concurrent single-row writes when db_infra does not expose
+    the batch route (404/405).
+    """
+    batch_size = max(1, config.NETWORK_POLICY_IMPORT_BATCH_SIZE)
+    for start in range(0, len(policies), batch_size):
+        chunk = policies[start:start + batch_size]
+        try:
+            db_infra_client._request_json(
+                "POST",
+                "/api/v1/prism-management/network-policies/batch",
+                payload={"policies": [_payload(policy) for policy in chunk]},
+            )
+        except DbInfraClientError as exc:
+            if exc.status_code not in (404, 405):
+                raise
+            logger.info("db_infra has no network-policy batch route; writing rows individually")
+            _create_individually(policies[start:])
+            break
+    return policies
+
+
+def _create_individually(policies: list[NetworkPolicy]) -> None:
+    with ThreadPoolExecutor(
+        max_workers=max(1, config.NETWORK_POLICY_IMPORT_WRITE_CONCURRENCY),
+        thread_name_prefix="prism-network-import",
+    ) as executor:
+        # list() surfaces the first failed write.
+        list(executor.map(create_network_policy, policies))
+
+
 def get_network_policy(tenant_id: str, policy_id: str) -> Optional[NetworkPolicy]:
     row = db_infra_client._request_json(
         "GET",
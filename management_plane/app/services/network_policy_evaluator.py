@@ -3,17 +3,27 @@ Network policy evaluation service.
 
 Provides deterministic pattern matching against network policy whitelists.
 Evaluated BEFORE semantic policies for fast, fail-closed enforcement.
+
+An agent's active policies are compiled once into a NetworkPolicyMatcher and
+cached per (tenant, agent) for NETWORK_POLICY_CACHE_SECONDS. The CRUD
+endpoints invalidate the cache on every change, and the TTL covers changes
+made through another replica. Cached checks are in-memory lookups.
 """
 
 from fencio_logger import get_logger
 
-import re
+import threading
+import time
+from dataclasses import dataclass
+from functools import lru_cache
 from typing import Optional
 
 from pydantic import BaseModel
 
 from app.models import NetworkContext, NetworkEndpointRule, NetworkPolicy
 from app.services import network_policies as network_policy_service
+from app.services.network_path_trie import PathTrie, compile_wildcard
+from app.settings import config
 
 logger = get_logger(__name__, service_name="prism")
 
@@ -62,20 +72,19 @@ def evaluate_network_policies(
     Returns:
         NetworkPolicyResult with decision and details
     """
-    logger.info(
-        f"Evaluating network policies for agent {agent_id}: "
-        f"{network_ctx.method} {network_ctx.protocol}://{network_ctx.url}"
+    logger.debug(
+        "Evaluating network policies for agent %s: %s %s://%s",
+        agent_id,
+        network_ctx.method,
+        network_ctx.protocol,
+        network_ctx.url,
     )
 
-    # Fetch all active network policies for this agent
+    # Fetch (or reuse) the compiled matcher for this agent
     try:
-        policies = network_policy_service.list_network_policies(
-            tenant_id=tenant_id,
-            agent_id=agent_id,
-            status="active",
-        )
+        matcher = get_network_policy_matcher(tenant_id, agent_id)
     except Exception as e:
-        logger.error(f"Failed to fetch network policies: {e}", exc_info=True)
+        logger.error("Failed to fetch network policies: %s", e, exc_info=True)
         # On error, fail open with warning
         return NetworkPolicyResult(
             decision="ALLOW",
@@ -83,13 +92,9 @@ def evaluate_network_policies(
         )
 
     if selected_policy_ids:
-        selected_policy_set = set(selected_policy_ids)
-        policies = [
-            policy for policy in policies
-            if policy.policy_id in selected_policy_set
-        ]
+        matcher = matcher.restricted_to(selected_policy_ids)
 
-        if not policies:
+        if not matcher.policies:
             logger.debug(
                 "No selected network policies apply to this dry run, allowing"
             )
@@ -98,47 +103,40 @@ def evaluate_network_policies(
                 reason="No selected network policies to evaluate",
             )
 
+    policies = matcher.policies
     if not policies:
         # No network policies defined = implicit allow
         logger.debug(
-            f"No network policies defined for agent {agent_id}, allowing"
+            "No network policies defined for agent %s, allowing",
+            agent_id,
         )
         return NetworkPolicyResult(
             decision="ALLOW",
             reason="No network policies defined (implicit allow)",
         )
 
-    logger.info(
-        f"Found {len(policies)} active network policies for agent {agent_id}"
-    )
-
-    # Check each policy's whitelist
-    for policy in policies:
+    match = matcher.match(network_ctx)
+    if match is not None:
+        policy, rule = match
         logger.debug(
-            f"Checking policy {policy.name} ({policy.policy_id}) "
-            f"with {len(policy.whitelist)} rules"
+            "Network policy ALLOW: %s matched %s %s",
+            policy.name,
+            network_ctx.method,
+            network_ctx.url,
         )
 
-        for rule in policy.whitelist:
-            if matches_endpoint_rule(rule, network_ctx):
-                # Rule matched - allow
-                logger.info(
-                    f"Network policy ALLOW: {policy.name} matched "
-                    f"{network_ctx.method} {network_ctx.url}"
-                )
-
-                return NetworkPolicyResult(
-                    decision="ALLOW",
-                    policy_id=policy.policy_id,
-                    policy_name=policy.name,
-                    matched_rule={
-                        "protocol": rule.protocol,
-                        "method": rule.method,
-                        "url": rule.url,
-                    },
-                    mode=policy.mode,
-                    reason=f"Matched whitelist rule: {rule.method} {rule.url}",
-                )
+        return NetworkPolicyResult(
+            decision="ALLOW",
+            policy_id=policy.policy_id,
+            policy_name=policy.name,
+            matched_rule={
+                "protocol": rule.protocol,
+                "method": rule.method,
+                "url": rule.url,
+            },
+            mode=policy.mode,
+            reason=f"Matched whitelist rule: {rule.method} {rule.url}",
+        )
 
     # No rules matched - fail closed. Prism should still surface the raw
     # verdict independent of mode so the proxy can decide whether to enforce.
@@ -147,8 +145,10 @@ def evaluate_network_policies(
     )
 
     logger.warning(
-        f"Network policy DENY: {network_ctx.method} {network_ctx.url} "
-        f"not in any whitelist (raw verdict, mode={effective_mode})"
+        "Network policy DENY: %s %s not in any whitelist (raw verdict, mode=%s)",
+        network_ctx.method,
+        network_ctx.url,
+        effective_mode,
     )
 
     return NetworkPolicyResult(
@@ -163,6 +163,117 @@ def evaluate_network_policies(
     )
 
 
+_compile_wildcard = lru_cache(maxsize=4096)(compile_wildcard)
+
+
+@dataclass(frozen=True)
+class _CompiledRule:
+    # (policy index, rule index): the first match in list order wins, as in
+    # the original per-rule loop.
+    order: tuple[int, int]
+    policy: NetworkPolicy
+    rule: NetworkEndpointRule
+
+
+class NetworkPolicyMatcher:
+    """
+    Whitelist rules of a set of network policies, compiled for lookup.
+
+    Exact URLs go in a dict keyed by (protocol, method, url); wildcard rules
+    go in a path-segment trie per (protocol, method), so a lookup costs
+    roughly the path depth regardless of how many rules there are.
+    """
+
+    def __init__(self, policies: list[NetworkPolicy]) -> None:
+        self.policies = list(policies)
+        self._exact: dict[tuple[str, str, str], _CompiledRule] = {}
+        self._wildcards: dict[tuple[str, str], PathTrie[_CompiledRule]] = {}
+        for policy_index, policy in enumerate(self.policies):
+            for rule_index, rule in enumerate(policy.whitelist):
+                compiled = _CompiledRule((policy_index, rule_index), policy, rule)
+                method = rule.method.upper()
+                self._exact.setdefault((rule.protocol, method, rule.url), compiled)
+                if "*" in rule.url:
+                    trie = self._wildcards.get((rule.protocol, method))
+                    if trie is None:
+                        trie = self._wildcards[(rule.protocol, method)] = PathTrie()
+                    trie.insert(rule.url, compiled.order, compiled)
+        for trie in self._wildcards.values():
+            trie.freeze()
+
+    @property
+    def rule_count(self) -> int:
+        return sum(len(policy.whitelist) for policy in self.policies)
+
+    def restricted_to(self, policy_ids: list[str]) -> "NetworkPolicyMatcher":
+        """Matcher over just ``policy_ids`` (dry runs of selected policies)."""
+        selected = set(policy_ids)
+        return NetworkPolicyMatcher(
+            [policy for policy in self.policies if policy.policy_id in selected]
+        )
+
+    def match(
+        self, ctx: NetworkContext
+    ) -> Optional[tuple[NetworkPolicy, NetworkEndpointRule]]:
+        """First (policy, rule) in list order whose rule matches ``ctx``."""
+        method = ctx.method.upper()
+        best = self._exact.get((ctx.protocol, method, ctx.url))
+        trie = self._wildcards.get((ctx.protocol, method))
+        if trie is not None:
+            found = trie.match(ctx.url, before=best.order if best is not None else None)
+            if found is not None:
+                best = found[1]
+                logger.debug("Wildcard match: rule %s matches %s", best.rule.url, ctx.url)
+        return (best.policy, best.rule) if best is not None else None
+
+
+_matcher_cache: dict[tuple[str, str], tuple[float, NetworkPolicyMatcher]] = {}
+_matcher_cache_lock = threading.Lock()
+# Bumped on every invalidation so a build that raced one is not cached.
+_matcher_generation = 0
+
+
+def get_network_policy_matcher(tenant_id: str, agent_id: str) -> NetworkPolicyMatcher:
+    """Cached matcher for the agent's active network policies."""
+    key = (tenant_id, agent_id)
+    now = time.monotonic()
+    with _matcher_cache_lock:
+        cached = _matcher_cache.get(key)
+        generation = _matcher_generation
+    if cached is not None and now - cached[0] < config.NETWORK_POLICY_CACHE_SECONDS:
+        return cached[1]
+
+    matcher = NetworkPolicyMatcher(
+        network_policy_service.list_network_policies(
+            tenant_id=tenant_id,
+            agent_id=agent_id,
+            status="active",
+        )
+    )
+    logger.debug(
+        "Compiled %d network policies (%d rules) for agent %s",
+        len(matcher.policies),
+        matcher.rule_count,
+        agent_id,
+    )
+    with _matcher_cache_lock:
+        if generation == _matcher_generation:
+            if len(_matcher_cache) >= config.NETWORK_POLICY_CACHE_MAX_AGENTS:
+                _matcher_cache.clear()
+            _matcher_cache[key] = (now, matcher)
+    return matcher
+
+
+def invalidate_network_policy_matchers(tenant_id: str, agent_id: Optional[str] = None) -> None:
+    """Drop cached matchers for one agent, or for the whole tenant."""
+    global _matcher_generation
+    with _matcher_cache_lock:
+        _matcher_generation += 1
+        for key in list(_matcher_cache):
+            if key[0] == tenant_id and (agent_id is None or key[1] == agent_id):
+                del _matcher_cache[key]
+
+
 def matches_endpoint_rule(
     rule: NetworkEndpointRule,
     ctx: NetworkContext
@@ -196,17 +307,8 @@ def matches_endpoint_rule(
 
     # Wildcard matching
     if "*" in rule.url:
-        # Convert wildcard pattern to regex
-        # Escape special regex characters except *
-        pattern = re.escape(rule.url).replace(r"\*", ".*")
-
-        # Anchor to start and end
-        pattern = f"^{pattern}$"
-
-        if re.match(pattern, ctx.url):
-            logger.debug(
-                f"Wildcard match: rule {rule.url} matches {ctx.url}"
-            )
+        if _compile_wildcard(rule.url).match(ctx.url):
+            logger.debug("Wildcard match: rule %s matches %s", rule.url, ctx.url)
             return True
 
     return False
@@ -0,0 +1,97 @@
+"""
+Derive network whitelist rules from an OpenAPI (or Swagger 2.0) document.
+
+Every operation becomes one rule. Path templates such as ``/users/{id}`` turn
+into ``/users/*``, and the server (or ``basePath``) path is prefixed so rules
+match the request paths the proxy sees. Only methods a NetworkEndpointRule can
+express (GET, POST, PUT, DELETE, PATCH) are imported; the rest are counted as
+skipped.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from typing import Any, Literal, Optional
+from urllib.parse import urlparse
+
+from app.models import NetworkEndpointRule
+
+SUPPORTED_METHODS = ("get", "post", "put", "delete", "patch")
+_OTHER_METHODS = ("head", "options", "trace")
+_PATH_PARAM = re.compile(r"\{[^/{}]*\}")
+
+
+class OpenAPIImportError(ValueError):
+    """The document is not an OpenAPI/Swagger description we can import."""
+
+
+@dataclass
+class OpenAPIWhitelist:
+    rules: list[NetworkEndpointRule] = field(default_factory=list)
+    skipped_operations: int = 0
+
+
+def _server_defaults(document: dict[str, Any]) -> tuple[Optional[str], str]:
+    """(protocol, base path) from ``servers`` (3.x) or ``schemes``/``basePath`` (2.0)."""
+    if "swagger" in document:
+        schemes = [str(scheme).upper() for scheme in document.get("schemes") or []]
+        protocol = "HTTPS" if "HTTPS" in schemes else ("HTTP" if "HTTP" in schemes else None)
+        return protocol, str(document.get("basePath") or "")
+
+    servers = document.get("servers") or []
+    url = str(servers[0].get("url") or "") if servers and isinstance(servers[0], dict) else ""
+    parsed = urlparse(url)
+    protocol = {"https": "HTTPS", "http": "HTTP"}.get(parsed.scheme.lower())
+    # Relative server URLs ("/v1") are just a base path.
+    return protocol, parsed.path if parsed.scheme else url
+
+
+def whitelist_from_openapi(
+    document: dict[str, Any],
+    *,
+    protocol: Optional[Literal["HTTP", "HTTPS"]] = None,
+    base_path: Optional[str] = None,
+) -> OpenAPIWhitelist:
+    """
+    Build whitelist rules for every operation in ``document``.
+
+    ``protocol`` and ``base_path`` override what the document's servers say;
+    the protocol defaults to HTTPS when neither gives one.
+    """
+    if not isinstance(document, dict) or not (
+        "openapi" in document or "swagger" in document
+    ):
+        raise OpenAPIImportError("Document has no 'openapi' or 'swagger' version field")
+    paths = document.get("paths")
+    if not isinstance(paths, dict):
+        raise OpenAPIImportError("Document has no 'paths' object")
+
+    server_protocol, server_path = _server_defaults(document)
+    rule_protocol = protocol or server_protocol or "HTTPS"
+    prefix = _PATH_PARAM.sub("*", server_path if base_path is None else base_path).rstrip("/")
+    if prefix and not prefix.startswith("/"):
+        prefix = "/" + prefix
+
+    result = OpenAPIWhitelist()
+    seen: set[tuple[str, str]] = set()
+    for path, operations in paths.items():
+        if not isinstance(operations, dict):
+            continue
+        url = prefix + _PATH_PARAM.sub("*", "/" + str(path).lstrip("/"))
+        for method in operations:
+            lowered = str(method).lower()
+            if lowered in _OTHER_METHODS:
+                result.skipped_operations += 1
+                continue
+            if lowered not in SUPPORTED_METHODS:
+                # Path-level keys such as "parameters" or "summary".
+                continue
+            key = (lowered, url)
+            if key in seen:
+                continue
+            seen.add(key)
+            result.rules.append(
+                NetworkEndpointRule(protocol=rule_protocol, method=lowered.upper(), url=url)
+            )
+    return result
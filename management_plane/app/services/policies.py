@@ -5,12 +5,21 @@ from __future__ import annotations
 from fencio_logger import get_logger
 
 import json
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
-from app.chroma_client import get_rules_collection, upsert_rule_payload
+from app.chroma_client import (
+    fetch_rule_payloads,
+    get_rules_collection,
+    upsert_rule_payload,
+    upsert_rule_payloads,
+)
 from app.models import DesignBoundary
-from app.services.db_infra_client import db_infra_client
+from app.services.db_infra_client import DbInfraClientError, db_infra_client
 from app.services.policy_encoder import RuleVector
+from app.services.anchor_cache import anchor_cache
+from app.services.vector_codec import SLOTS, decode_anchor_slot, encode_anchor_payload
+from app.settings import config
 
 logger = get_logger(__name__, service_name="prism")
 
@@ -125,10 +134,8 @@ def list_policy_records(
     return [_row_to_boundary(row) for row in response.get("policies", [])]
 
 
-def create_policy_record(boundary: DesignBoundary, tenant_id: str) -> DesignBoundary:
-    existing = fetch_policy_record(tenant_id, boundary.id)
-    if existing:
-        raise ValueError("Policy already exists")
+def write_policy_record(boundary: DesignBoundary) -> DesignBoundary:
+    """Create or overwrite a policy row without an existence check."""
     db_infra_client._request_json(
         "POST",
         "/api/v1/prism-management/policies",
@@ -137,16 +144,66 @@ def create_policy_record(boundary: DesignBoundary, tenant_id: str) -> DesignBoun
     return boundary
 
 
+def write_policy_records(boundaries: list[DesignBoundary]) -> dict[str, str]:
+    """
+    Create or overwrite many policy rows, POLICY_BATCH_DB_CHUNK_SIZE per request.
+
+    Falls back to concurrent single-row writes when db_infra does not expose
+    the batch route (404/405). Returns an error message per policy id that
+    was not written.
+    """
+    failed: dict[str, str] = {}
+    chunk_size = max(1, config.POLICY_BATCH_DB_CHUNK_SIZE)
+    for start in range(0, len(boundaries), chunk_size):
+        chunk = boundaries[start:start + chunk_size]
+        try:
+            db_infra_client._request_json(
+                "POST",
+                "/api/v1/prism-management/policies/batch",
+                payload={"policies": [_boundary_payload(boundary) for boundary in chunk]},
+            )
+        except DbInfraClientError as exc:
+            if exc.status_code not in (404, 405):
+                failed.update((boundary.id, str(exc)) for boundary in chunk)
+                continue
+            logger.info("db_infra has no policy batch route; writing rows individually")
+            failed.update(_write_individually(boundaries[start:]))
+            break
+    return failed
+
+
+def _write_individually(boundaries: list[DesignBoundary]) -> dict[str, str]:
+    def write(boundary: DesignBoundary) -> Optional[str]:
+        try:
+            write_policy_record(boundary)
+        except Exception as exc:
+            return str(exc)
+        return None
+
+    with ThreadPoolExecutor(
+        max_workers=max(1, config.POLICY_BATCH_WRITE_CONCURRENCY),
+        thread_name_prefix="prism-policy-batch",
+    ) as executor:
+        errors = list(executor.map(write, boundaries))
+    return {
+        boundary.id: error
+        for boundary, error in zip(boundaries, errors)
+        if error is not None
+    }
+
+
+def create_policy_record(boundary: DesignBoundary, tenant_id: str) -> DesignBoundary:
+    existing = fetch_policy_record(tenant_id, boundary.id)
+    if existing:
+        raise ValueError("Policy already exists")
+    return write_policy_record(boundary)
+
+
 def update_policy_record(boundary: DesignBoundary, tenant_id: str) -> DesignBoundary:
     existing = fetch_policy_record(tenant_id, boundary.id)
     if not existing:
         raise ValueError("Policy not found")
-    db_infra_client._request_json(
-        "POST",
-        "/api/v1/prism-management/policies",
-        payload=_boundary_payload(boundary),
-    )
-    return boundary
+    return write_policy_record(boundary)
 
 
 def delete_policy_record(tenant_id: str, policy_id: str) -> bool:
@@ -167,15 +224,26 @@ def delete_all_policy_records(tenant_id: str) -> int:
 
 
 def build_anchor_payload(rule_vector: RuleVector) -> dict[str, object]:
+    return encode_anchor_payload(
+        rule_vector.layers, rule_vector.anchor_counts, rule_vector.anchor_keys
+    )
+
+
+def seed_anchor_cache(anchors: dict) -> None:
+    """Put the keyed anchor rows of a stored anchor payload into the anchor cache."""
+    for slot in SLOTS:
+        keys = anchors.get(f"{slot}_keys")
+        if keys:
+            block, count = decode_anchor_slot(anchors, slot)
+            anchor_cache.seed(keys[:count], block[:count])
+
+
+def fetch_policy_anchors(tenant_id: str, policy_ids: list[str]) -> dict[str, dict]:
+    """Stored anchor payloads by policy id; policies without one are left out."""
     return {
-        "action_anchors": rule_vector.layers["action"].tolist(),
-        "action_count": rule_vector.anchor_counts["action"],
-        "resource_anchors": rule_vector.layers["resource"].tolist(),
-        "resource_count": rule_vector.anchor_counts["resource"],
-        "data_anchors": rule_vector.layers["data"].tolist(),
-        "data_count": rule_vector.anchor_counts["data"],
-        "risk_anchors": rule_vector.layers["risk"].tolist(),
-        "risk_count": rule_vector.anchor_counts["risk"],
+        policy_id: payload["anchors"]
+        for policy_id, payload in fetch_rule_payloads(tenant_id, policy_ids).items()
+        if isinstance(payload.get("anchors"), dict)
     }
 
 
@@ -188,6 +256,13 @@ def upsert_policy_payload(
     upsert_rule_payload(tenant_id, policy_id, payload, metadata)
 
 
+def upsert_policy_payloads(
+    tenant_id: str,
+    entries: list[tuple[str, dict[str, object], Optional[dict[str, object]]]],
+) -> None:
+    upsert_rule_payloads(tenant_id, entries)
+
+
 def delete_policy_payload(tenant_id: str, policy_id: str) -> None:
     collection = get_rules_collection(tenant_id)
     try:
@@ -11,6 +11,8 @@ from app.generated.rule_installation_pb2 import (
 )
 from app.models import DesignBoundary
 from app.services.policy_encoder import RuleVector
+from app.services.vector_codec import PROTO_ENCODINGS, SLOTS, pack_vectors
+from app.settings import config
 
 
 class PolicyConverter:
@@ -130,8 +132,22 @@ class PolicyConverter:
 
     @staticmethod
     def rule_vector_to_anchor_payload(rule_vector: RuleVector) -> RuleAnchorsPayload:
+        if config.DATA_PLANE_PACKED_VECTORS:
+            # Populated rows only, as packed little-endian bytes.
+            encoding = config.DATA_PLANE_VECTOR_ENCODING
+            payload = RuleAnchorsPayload(encoding=PROTO_ENCODINGS[encoding])
+            for slot in SLOTS:
+                count = rule_vector.anchor_counts[slot]
+                setattr(
+                    payload,
+                    f"{slot}_packed",
+                    pack_vectors(rule_vector.layers[slot][:count], encoding),
+                )
+                setattr(payload, f"{slot}_count", count)
+            return payload
+
         payload = RuleAnchorsPayload()
-        for slot in ["action", "resource", "data", "risk"]:
+        for slot in SLOTS:
             anchor_field = f"{slot}_anchors"
             count_field = f"{slot}_count"
             anchors = PolicyConverter._anchor_vectors(rule_vector.layers[slot])
@@ -28,17 +28,61 @@ Example:
 
 from fencio_logger import get_logger
 
-from typing import Tuple
+from typing import Iterator, Mapping, Optional, Sequence, Tuple
 
 import numpy as np
 
 from app.models import DesignBoundary
+from app.services.anchor_cache import anchor_cache, anchor_key
 from app.services.param_canonicalizer import canonicalize_params
 from app.services.semantic_encoder import SemanticEncoder
 
 logger = get_logger(__name__, service_name="prism")
 
 
+_LAYER_NAMES = ("action", "resource", "data", "risk")
+_LAYER_INDEX = {name: index for index, name in enumerate(_LAYER_NAMES)}
+
+
+class _LayerViews(Mapping[str, np.ndarray]):
+    """Read-only name -> (16, 32) view mapping over a RuleVector buffer."""
+
+    __slots__ = ("_data",)
+
+    def __init__(self, data: np.ndarray):
+        self._data = data
+
+    def __getitem__(self, layer_name: str) -> np.ndarray:
+        return self._data[_LAYER_INDEX[layer_name]]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(_LAYER_NAMES)
+
+    def __len__(self) -> int:
+        return len(_LAYER_NAMES)
+
+
+class _AnchorCounts(Mapping[str, int]):
+    """Name -> anchor count mapping over a RuleVector count array."""
+
+    __slots__ = ("_counts",)
+
+    def __init__(self, counts: np.ndarray):
+        self._counts = counts
+
+    def __getitem__(self, layer_name: str) -> int:
+        return int(self._counts[_LAYER_INDEX[layer_name]])
+
+    def __setitem__(self, layer_name: str, count: int) -> None:
+        self._counts[_LAYER_INDEX[layer_name]] = count
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(_LAYER_NAMES)
+
+    def __len__(self) -> int:
+        return len(_LAYER_NAMES)
+
+
 class RuleVector:
     """
     4×16×32 tensor representation of policy boundaries.
@@ -48,23 +92,46 @@ class RuleVector:
     - Each layer has 16 anchor slots (padded with zeros if fewer anchors)
     - Each anchor is 32-dimensional
 
-    Flattened shape: (4, 16, 32) → can be reshaped to (2048,) for comparison
+    All four layers live in one contiguous float32 buffer (``data``) with a
+    4-element ``counts`` array alongside it. ``layers[name]`` is a view into
+    that buffer, so encoding, Chroma payloads and the data plane proto read
+    and write it without per-layer copies. ``anchor_keys`` holds each
+    layer's anchor content hashes when known (see app.services.anchor_cache).
     """
 
+    LAYER_NAMES = _LAYER_NAMES
+    SHAPE = (len(_LAYER_NAMES), 16, 32)
+
+    __slots__ = ("data", "counts", "anchor_keys")
+
     def __init__(self):
         """Initialize empty RuleVector."""
-        self.layers = {
-            "action": np.zeros((16, 32), dtype=np.float32),
-            "resource": np.zeros((16, 32), dtype=np.float32),
-            "data": np.zeros((16, 32), dtype=np.float32),
-            "risk": np.zeros((16, 32), dtype=np.float32),
-        }
-        self.anchor_counts = {
-            "action": 0,
-            "resource": 0,
-            "data": 0,
-            "risk": 0,
-        }
+        self.data = np.zeros(self.SHAPE, dtype=np.float32)
+        self.counts = np.zeros(len(_LAYER_NAMES), dtype=np.int32)
+        self.anchor_keys: Optional[dict[str, list[str]]] = None
+
+    @classmethod
+    def from_buffer(cls, buffer: bytes, counts: Sequence[int]) -> "RuleVector":
+        """
+        Wrap packed little-endian float32 bytes (as from ``to_bytes``) without copying.
+
+        The layers of the result are read-only views of ``buffer``.
+        """
+        rule_vector = cls.__new__(cls)
+        rule_vector.data = np.frombuffer(buffer, dtype="<f4").reshape(cls.SHAPE)
+        rule_vector.counts = np.asarray(counts, dtype=np.int32).reshape(len(_LAYER_NAMES))
+        rule_vector.anchor_keys = None
+        return rule_vector
+
+    @property
+    def layers(self) -> Mapping[str, np.ndarray]:
+        """Layer name -> (16, 32) view into ``data``."""
+        return _LayerViews(self.data)
+
+    @property
+    def anchor_counts(self) -> _AnchorCounts:
+        """Layer name -> number of populated anchor rows."""
+        return _AnchorCounts(self.counts)
 
     def set_layer(self, layer_name: str, anchor_vectors: np.ndarray, count: int) -> None:
         """
@@ -72,21 +139,30 @@ class RuleVector:
 
         Args:
             layer_name: Name of layer (action, resource, data, risk)
-            anchor_vectors: Array of shape (16, 32) with encoded anchors
+            anchor_vectors: Array of up to (16, 32) encoded anchors; copied into
+                the layer's rows and the remainder zeroed
             count: Actual number of anchors (before padding)
         """
-        self.layers[layer_name] = anchor_vectors
-        self.anchor_counts[layer_name] = count
+        index = _LAYER_INDEX[layer_name]
+        layer = self.data[index]
+        rows = np.asarray(anchor_vectors, dtype=np.float32).reshape(-1, layer.shape[1])
+        rows = rows[: layer.shape[0]]
+        layer[: len(rows)] = rows
+        layer[len(rows):] = 0.0
+        self.counts[index] = count
 
     def to_numpy(self) -> np.ndarray:
         """
-        Convert to flattened numpy array.
+        Flattened view of the buffer.
 
         Returns:
-            Flattened array of shape (2048,) = 4 × 16 × 32
+            Array of shape (2048,) = 4 × 16 × 32 sharing memory with this vector
         """
-        stacked = np.stack([self.layers[name] for name in ["action", "resource", "data", "risk"]])
-        return stacked.flatten()
+        return self.data.reshape(-1)
+
+    def to_bytes(self) -> bytes:
+        """Little-endian float32 bytes of the whole 4×16×32 buffer."""
+        return self.data.astype("<f4", copy=False).tobytes()
 
     def to_dict(self) -> dict:
         """
@@ -97,7 +173,7 @@ class RuleVector:
         """
         return {
             "layers": {name: vec.tolist() for name, vec in self.layers.items()},
-            "anchor_counts": self.anchor_counts,
+            "anchor_counts": dict(self.anchor_counts),
         }
 
 
@@ -187,39 +263,56 @@ class PolicyEncoder(SemanticEncoder):
             return [canonicalize_params(boundary.match.ctx)]
         return []
 
-    def _encode_anchors(self, anchor_texts: list[str], layer_name: str) -> Tuple[np.ndarray, int]:
+    def _truncate_anchors(self, anchor_texts: list[str], layer_name: str) -> list[str]:
+        """Cap a layer's anchors at MAX_ANCHORS_PER_LAYER, warning when any are dropped."""
+        if len(anchor_texts) > self.MAX_ANCHORS_PER_LAYER:
+            logger.warning(
+                f"Layer {layer_name} has {len(anchor_texts)} anchors, "
+                f"truncating to {self.MAX_ANCHORS_PER_LAYER}"
+            )
+            return anchor_texts[: self.MAX_ANCHORS_PER_LAYER]
+        return anchor_texts
+
+    def _encode_anchors(
+        self,
+        anchor_texts: list[str],
+        layer_name: str,
+        out: Optional[np.ndarray] = None,
+    ) -> Tuple[np.ndarray, list[str]]:
         """
         Encode list of anchors to padded array.
 
+        Anchors already in the anchor cache are not re-encoded.
+
         Args:
             anchor_texts: List of anchor strings to encode
             layer_name: Name of layer (for logging and seed lookup)
+            out: Optional zeroed (16, 32) array (e.g. a RuleVector layer view)
+                to encode into instead of allocating one
 
         Returns:
-            Tuple of (anchor_array, count) where:
+            Tuple of (anchor_array, keys) where:
             - anchor_array: (16, 32) array with encoded anchors (padded with zeros)
-            - count: Actual number of anchors before padding
+            - keys: Content hash of each encoded anchor; its length is the
+              number of anchors before padding
         """
-        # Truncate if exceeds max
-        if len(anchor_texts) > self.MAX_ANCHORS_PER_LAYER:
-            logger.warning(
-                f"Layer {layer_name} has {len(anchor_texts)} anchors, "
-                f"truncating to {self.MAX_ANCHORS_PER_LAYER}"
-            )
-            anchor_texts = anchor_texts[: self.MAX_ANCHORS_PER_LAYER]
-
-        # Encode each anchor
-        anchor_vecs = []
-        for text in anchor_texts:
-            vec = self.encode_slot(text, layer_name)
-            anchor_vecs.append(vec)
-
-        # Pad to 16×32
-        anchor_array = np.zeros((self.MAX_ANCHORS_PER_LAYER, 32), dtype=np.float32)
-        for i, vec in enumerate(anchor_vecs):
-            anchor_array[i] = vec
-
-        return anchor_array, len(anchor_texts)
+        anchor_texts = self._truncate_anchors(anchor_texts, layer_name)
+
+        # Encode each anchor into its row; unused rows stay zero as padding
+        anchor_array = out
+        if anchor_array is None:
+            anchor_array = np.zeros((self.MAX_ANCHORS_PER_LAYER, 32), dtype=np.float32)
+        keys = []
+        for i, text in enumerate(anchor_texts):
+            key = anchor_key(self.model_fingerprint, layer_name, text)
+            vector = anchor_cache.get(key)
+            if vector is None:
+                vector = self.encode_slot(text, layer_name)
+                anchor_cache.put(key, vector)
+            anchor_array[i] = vector
+            keys.append(key)
+
+        return anchor_array, keys
 
     def encode_condition_anchors(
         self,
@@ -233,8 +326,8 @@ class PolicyEncoder(SemanticEncoder):
         without padding so the data plane evaluates only configured guards or
         allow anchors.
         """
-        anchor_array, count = self._encode_anchors(anchor_texts, layer_name)
-        return anchor_array[:count].tolist(), count
+        anchor_array, keys = self._encode_anchors(anchor_texts, layer_name)
+        return anchor_array[: len(keys)].tolist(), len(keys)
 
     def encode(self, boundary: DesignBoundary) -> RuleVector:
         """
@@ -253,31 +346,153 @@ class PolicyEncoder(SemanticEncoder):
             RuleVector with 4 layers of 16×32 anchor vectors
         """
         rule_vector = RuleVector()
+        layers = rule_vector.layers
+        counts = rule_vector.anchor_counts
+        keys = rule_vector.anchor_keys = {}
 
-        # Action layer
-        action_anchors = self._extract_action_anchors(boundary)
-        action_array, action_count = self._encode_anchors(action_anchors, "action")
-        rule_vector.set_layer("action", action_array, action_count)
+        # Anchors are encoded straight into the rule vector's layer views.
+        _, keys["action"] = self._encode_anchors(
+            self._extract_action_anchors(boundary), "action", out=layers["action"]
+        )
+        _, keys["resource"] = self._encode_anchors(
+            self._extract_resource_anchors(boundary), "resource", out=layers["resource"]
+        )
+        _, keys["data"] = self._encode_anchors(
+            self._extract_data_anchors(boundary), "data", out=layers["data"]
+        )
+        _, keys["risk"] = self._encode_anchors(
+            self._extract_risk_anchors(boundary), "risk", out=layers["risk"]
+        )
+        for layer_name, layer_keys in keys.items():
+            counts[layer_name] = len(layer_keys)
 
-        # Resource layer
-        resource_anchors = self._extract_resource_anchors(boundary)
-        resource_array, resource_count = self._encode_anchors(resource_anchors, "resource")
-        rule_vector.set_layer("resource", resource_array, resource_count)
+        logger.debug(
+            f"Encoded boundary {boundary.id}: "
+            f"action={counts['action']}, resource={counts['resource']}, "
+            f"data={counts['data']}, risk={counts['risk']}"
+        )
+
+        return rule_vector
+
+    def _encode_anchor_sets(
+        self,
+        anchor_sets: list[tuple[str, list[str], np.ndarray]],
+    ) -> list[list[str]]:
+        """
+        Encode several anchor lists into their arrays with one model call.
+
+        Cached anchors are copied in; every distinct uncached anchor text is
+        embedded once, and each layer is projected as one matrix product.
 
-        # Data layer
-        data_anchors = self._extract_data_anchors(boundary)
-        data_array, data_count = self._encode_anchors(data_anchors, "data")
-        rule_vector.set_layer("data", data_array, data_count)
+        Args:
+            anchor_sets: (layer_name, anchor_texts, out) entries, where out is
+                a zeroed (16, 32) array to encode into
 
-        # Risk layer
-        risk_anchors = self._extract_risk_anchors(boundary)
-        risk_array, risk_count = self._encode_anchors(risk_anchors, "risk")
-        rule_vector.set_layer("risk", risk_array, risk_count)
+        Returns:
+            Content hash of each encoded anchor, per entry
+        """
+        set_keys: list[list[str]] = []
+        # (set index, anchor row, text index, anchor key) per layer
+        placements: dict[str, list[tuple[int, int, int, str]]] = {}
+        text_index: dict[str, int] = {}
+        for index, (layer_name, anchor_texts, out) in enumerate(anchor_sets):
+            anchors = self._truncate_anchors(anchor_texts, layer_name)
+            keys = [anchor_key(self.model_fingerprint, layer_name, text) for text in anchors]
+            set_keys.append(keys)
+            for row, (text, key) in enumerate(zip(anchors, keys)):
+                cached = anchor_cache.get(key)
+                if cached is not None:
+                    out[row] = cached
+                    continue
+                position = text_index.setdefault(text, len(text_index))
+                placements.setdefault(layer_name, []).append((index, row, position, key))
+
+        embeddings = self.encode_texts(list(text_index))
+
+        for layer_name, entries in placements.items():
+            projection = self.get_projection_matrix(
+                slot_name=layer_name,
+                seed=self.projection_seeds[layer_name],
+            )
+            projected = embeddings[[position for _, _, position, _ in entries]] @ projection.T
+            norms = np.linalg.norm(projected, axis=1, keepdims=True)
+            np.divide(projected, norms, out=projected, where=norms > 0)
+            for (index, row, _, key), vector in zip(entries, projected):
+                anchor_sets[index][2][row] = vector
+                anchor_cache.put(key, vector)
 
         logger.debug(
-            f"Encoded boundary {boundary.id}: "
-            f"action={action_count}, resource={resource_count}, "
-            f"data={data_count}, risk={risk_count}"
+            f"Encoded {len(anchor_sets)} anchor sets with {len(text_index)} uncached anchors"
         )
+        return set_keys
 
-        return rule_vector
+    def encode_many(self, boundaries: list[DesignBoundary]) -> list[RuleVector]:
+        """
+        Encode several canonical DesignBoundaries to RuleVectors at once.
+
+        Gives the same result as calling ``encode`` per boundary, but every
+        distinct uncached anchor text across the batch is embedded once in a
+        single model call, and each layer is projected as one matrix product.
+
+        Args:
+            boundaries: Canonical DesignBoundaries
+
+        Returns:
+            RuleVectors aligned with ``boundaries``
+        """
+        rule_vectors, _ = self.encode_many_with_conditions(boundaries, [])
+        return rule_vectors
+
+    def encode_many_with_conditions(
+        self,
+        boundaries: list[DesignBoundary],
+        condition_anchors: list[tuple[list[str], str]],
+    ) -> tuple[list[RuleVector], list[tuple[list[list[float]], int]]]:
+        """
+        Encode RuleVectors and semantic condition anchors in one model call.
+
+        Args:
+            boundaries: Canonical DesignBoundaries
+            condition_anchors: (anchor_texts, layer_name) per semantic condition
+
+        Returns:
+            Tuple of (rule_vectors, conditions) where rule_vectors are aligned
+            with ``boundaries`` and conditions hold, per entry of
+            ``condition_anchors``, what ``encode_condition_anchors`` returns
+        """
+        rule_vectors = [RuleVector() for _ in boundaries]
+        extractors = {
+            "action": self._extract_action_anchors,
+            "resource": self._extract_resource_anchors,
+            "data": self._extract_data_anchors,
+            "risk": self._extract_risk_anchors,
+        }
+
+        anchor_sets = [
+            (layer_name, extract(boundary), rule_vector.layers[layer_name])
+            for layer_name, extract in extractors.items()
+            for boundary, rule_vector in zip(boundaries, rule_vectors)
+        ]
+        condition_arrays = [
+            np.zeros((self.MAX_ANCHORS_PER_LAYER, 32), dtype=np.float32)
+            for _ in condition_anchors
+        ]
+        anchor_sets.extend(
+            (layer_name, anchor_texts, out)
+            for (anchor_texts, layer_name), out in zip(condition_anchors, condition_arrays)
+        )
+        set_keys = iter(self._encode_anchor_sets(anchor_sets))
+
+        for rule_vector in rule_vectors:
+            rule_vector.anchor_keys = {}
+        for layer_name in extractors:
+            for rule_vector in rule_vectors:
+                keys = next(set_keys)
+                rule_vector.anchor_counts[layer_name] = len(keys)
+                rule_vector.anchor_keys[layer_name] = keys
+
+        conditions = [
+            (out[: len(keys)].tolist(), len(keys))
+            for out, keys in zip(condition_arrays, set_keys)
+        ]
+        return rule_vectors, conditions
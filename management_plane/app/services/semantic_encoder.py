@@ -37,6 +37,8 @@ Performance Targets:
 
 from fencio_logger import get_logger
 
+import hashlib
+import json
 from functools import lru_cache
 from pathlib import Path
 from typing import Optional
@@ -84,6 +86,12 @@ class SemanticEncoder:
             "data": 44,
             "risk": 45,
         }
+        # Identifies everything a slot vector depends on besides its text.
+        self.model_fingerprint = hashlib.sha256(
+            json.dumps(
+                [embedding_model, self.MODEL_DIM, self.SLOT_DIM, sorted(self.projection_seeds.items())]
+            ).encode("utf-8")
+        ).hexdigest()[:16]
 
     @staticmethod
     def get_encoder_model(model_name: str = MODEL_NAME) -> SentenceTransformer:
@@ -207,6 +215,30 @@ class SemanticEncoder:
         )
         return embedding.astype(np.float32)
 
+    def encode_texts(self, texts: list[str]) -> np.ndarray:
+        """
+        Encode several texts to 384-dimensional vectors in one model call.
+
+        Used for bulk work (e.g. batch policy writes) where one batched
+        forward pass is much cheaper than per-text calls. Bypasses the LRU
+        cache.
+
+        Args:
+            texts: Input text strings
+
+        Returns:
+            (len(texts), 384) float32 array of embeddings (not normalized)
+        """
+        if not texts:
+            return np.zeros((0, self.MODEL_DIM), dtype=np.float32)
+        model = self.get_encoder_model(self.embedding_model)
+        embeddings = model.encode(
+            texts,
+            convert_to_numpy=True,
+            show_progress_bar=False,
+        )
+        return np.asarray(embeddings, dtype=np.float32).reshape(len(texts), self.MODEL_DIM)
+
     def project_and_normalize(
         self,
         embedding_384: np.ndarray,
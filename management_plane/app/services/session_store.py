@@ -4,9 +4,11 @@ from __future__ import annotations
 
 from fencio_logger import get_logger
 
+import math
 import time
 
 from app.services.db_infra_client import db_infra_client
+from app.settings import config
 
 logger = get_logger(__name__, service_name="prism")
 
@@ -190,6 +192,44 @@ def get_session_drift(agent_id: str) -> float:
         return 0.0
 
 
+# Baselines read by dry runs, keyed by agent: (fetched_at, initial_vector).
+_BASELINE_CACHE_MAX_AGENTS = 4096
+_baseline_cache: dict[str, tuple[float, list[float] | None]] = {}
+
+
+def _cosine_drift(baseline: list[float], current: list[float]) -> float:
+    if not baseline or len(baseline) != len(current):
+        return 0.0
+    dot = sum(a * b for a, b in zip(baseline, current))
+    norm = math.sqrt(sum(a * a for a in baseline)) * math.sqrt(sum(b * b for b in current))
+    if norm == 0:
+        return 0.0
+    return max(0.0, 1.0 - dot / norm)
+
+
+def peek_drift(agent_id: str, current_vector: list[float]) -> float:
+    """
+    Drift of ``current_vector`` from the agent's session baseline, read-only.
+
+    Used by dry runs: the session row is neither created nor updated. The
+    baseline is cached for SESSION_BASELINE_CACHE_SECONDS so a batch of dry
+    runs against one agent costs a single db_infra read.
+    """
+    now = time.monotonic()
+    cached = _baseline_cache.get(agent_id)
+    if cached is None or now - cached[0] > config.SESSION_BASELINE_CACHE_SECONDS:
+        session = get_session(agent_id) or {}
+        baseline = session.get("initial_vector")
+        cached = (now, list(baseline) if baseline else None)
+        if len(_baseline_cache) >= _BASELINE_CACHE_MAX_AGENTS:
+            _baseline_cache.clear()
+        _baseline_cache[agent_id] = cached
+    baseline = cached[1]
+    if baseline is None:
+        return 0.0
+    return _cosine_drift(baseline, current_vector)
+
+
 def list_sessions(
     limit: int = 50,
     offset: int = 0,
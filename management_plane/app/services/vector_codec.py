@@ -0,0 +1,111 @@
+"""
+Packed little-endian encodings for embedding vectors.
+
+Intent vectors and rule anchors cross the gRPC boundary, and anchors are
+stored in Chroma, as raw little-endian float32 (or float16) bytes instead of
+lists of Python floats. Packing is one contiguous copy out of a NumPy array;
+unpacking float32 is a zero-copy ``np.frombuffer`` view. Anchor blocks only
+carry their populated rows, never the zero padding up to 16.
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+from typing import Any, Literal, Mapping, Optional, Sequence
+
+import numpy as np
+
+from app.generated.rule_installation_pb2 import (
+    VECTOR_ENCODING_FLOAT16,
+    VECTOR_ENCODING_FLOAT32,
+)
+
+VectorEncoding = Literal["float32", "float16"]
+
+_DTYPES: dict[str, np.dtype] = {
+    "float32": np.dtype("<f4"),
+    "float16": np.dtype("<f2"),
+}
+PROTO_ENCODINGS: dict[str, int] = {
+    "float32": VECTOR_ENCODING_FLOAT32,
+    "float16": VECTOR_ENCODING_FLOAT16,
+}
+
+SLOTS = ("action", "resource", "data", "risk")
+SLOT_WIDTH = 32
+MAX_ANCHORS_PER_SLOT = 16
+
+
+def pack_vectors(vectors: Any, encoding: VectorEncoding = "float32") -> bytes:
+    """Row-major little-endian bytes of ``vectors`` (any shape)."""
+    return np.ascontiguousarray(vectors, dtype=_DTYPES[encoding]).tobytes()
+
+
+def unpack_vectors(
+    data: bytes, encoding: VectorEncoding = "float32", width: Optional[int] = None
+) -> np.ndarray:
+    """
+    float32 array from packed bytes, reshaped to rows of ``width`` if given.
+
+    float32 input is returned as a read-only view of ``data``; float16 is
+    widened into a new array.
+    """
+    values = np.frombuffer(data, dtype=_DTYPES[encoding])
+    if encoding != "float32":
+        values = values.astype(np.float32)
+    return values.reshape(-1, width) if width else values
+
+
+def encode_anchor_payload(
+    layers: Mapping[str, np.ndarray],
+    counts: Mapping[str, int],
+    keys: Optional[Mapping[str, Sequence[str]]] = None,
+) -> dict[str, object]:
+    """
+    Stored (JSON-safe) form of a rule's anchors: base64 float32 populated rows.
+
+    Each slot also carries its anchor content keys when ``keys`` is given,
+    and ``hash`` is a digest of the packed rows, so a writer can tell whether
+    the stored payload already holds these anchors.
+    """
+    payload: dict[str, object] = {"encoding": "float32"}
+    digest = hashlib.sha256()
+    for slot in SLOTS:
+        count = int(counts[slot])
+        packed = pack_vectors(layers[slot][:count])
+        digest.update(f"{slot}:{count}:".encode("ascii"))
+        digest.update(packed)
+        payload[f"{slot}_packed"] = base64.b64encode(packed).decode("ascii")
+        payload[f"{slot}_count"] = count
+        if keys is not None:
+            payload[f"{slot}_keys"] = list(keys[slot])
+    payload["hash"] = digest.hexdigest()
+    return payload
+
+
+def decode_anchor_slot(
+    anchors: dict[str, Any], slot: str, out: Optional[np.ndarray] = None
+) -> tuple[np.ndarray, int]:
+    """
+    ``(16 x 32 block, count)`` for one slot of a stored anchor payload.
+
+    Reads the packed form and the older ``{slot}_anchors`` float lists. Rows
+    are written into ``out`` (a zeroed block, e.g. a RuleVector layer view)
+    when given.
+    """
+    count = int(anchors.get(f"{slot}_count", 0))
+    block = out
+    if block is None:
+        block = np.zeros((MAX_ANCHORS_PER_SLOT, SLOT_WIDTH), dtype=np.float32)
+    packed = anchors.get(f"{slot}_packed")
+    if packed is not None:
+        rows = unpack_vectors(
+            base64.b64decode(packed), anchors.get("encoding", "float32"), SLOT_WIDTH
+        )
+    else:
+        rows = np.asarray(anchors.get(f"{slot}_anchors") or [], dtype=np.float32)
+    if rows.size:
+        rows = rows.reshape(-1, SLOT_WIDTH)[:MAX_ANCHORS_PER_SLOT]
+        block[: len(rows)] = rows
+    return block, count
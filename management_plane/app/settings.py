@@ -45,6 +45,158 @@ class Config:
         "LOG_LEVEL", "INFO"
     )  # type: ignore
 
+    # Enforcement hot-path logging
+    # "full" logs every enforcement; "hot_path" samples per-request INFO lines
+    # using the per-tenant rates below ("tenant-a=0.05,tenant-b=1.0").
+    ENFORCEMENT_LOG_MODE: Literal["full", "hot_path"] = os.getenv(
+        "ENFORCEMENT_LOG_MODE", "full"
+    )  # type: ignore
+    ENFORCEMENT_LOG_SAMPLE_RATE: float = float(
+        os.getenv("ENFORCEMENT_LOG_SAMPLE_RATE", "0.01")
+    )
+    ENFORCEMENT_LOG_TENANT_SAMPLE_RATES: str = os.getenv(
+        "ENFORCEMENT_LOG_TENANT_SAMPLE_RATES", ""
+    )
+    # Full intent payload dumps go to a separate DEBUG channel; DENY and error
+    # outcomes are always logged regardless of sampling.
+    ENFORCEMENT_PAYLOAD_LOG_SAMPLE_RATE: float = float(
+        os.getenv("ENFORCEMENT_PAYLOAD_LOG_SAMPLE_RATE", "0.01")
+    )
+
+    # Persistent WebSocket enforcement channel: frames enforced concurrently
+    # per connection before the reader stops pulling new frames.
+    ENFORCEMENT_WS_MAX_INFLIGHT: int = int(
+        os.getenv("ENFORCEMENT_WS_MAX_INFLIGHT", "32")
+    )
+
+    # Evidence returned when a request does not ask for a level ("decision",
+    # "summary" or "full"). With PERSIST_FULL_EVIDENCE the data plane always
+    # returns full evidence so persisted telemetry keeps it; the response is
+    # trimmed afterwards.
+    ENFORCEMENT_EVIDENCE_DEFAULT_LEVEL: Literal["decision", "summary", "full"] = os.getenv(
+        "ENFORCEMENT_EVIDENCE_DEFAULT_LEVEL", "full"
+    )  # type: ignore
+    ENFORCEMENT_PERSIST_FULL_EVIDENCE: bool = (
+        os.getenv("ENFORCEMENT_PERSIST_FULL_EVIDENCE", "false").lower() == "true"
+    )
+
+    # End-to-end enforcement budget. Every downstream call made while serving
+    # one enforcement shares it; per-tenant overrides use "tenant-a=500,...".
+    # Optional stages (PENDING write, baseline drift, intel emit) are skipped
+    # once less than the reserve remains.
+    ENFORCEMENT_DEADLINE_MS: float = float(os.getenv("ENFORCEMENT_DEADLINE_MS", "3000"))
+    ENFORCEMENT_TENANT_DEADLINES_MS: str = os.getenv("ENFORCEMENT_TENANT_DEADLINES_MS", "")
+    ENFORCEMENT_DEADLINE_RESERVE_MS: float = float(
+        os.getenv("ENFORCEMENT_DEADLINE_RESERVE_MS", "250")
+    )
+
+    # Adaptive admission control in front of the enforcement pipeline (AIMD
+    # on pipeline latency). Requests over the limit queue briefly and are
+    # shed with 503 + Retry-After once the queue or the wait is exhausted.
+    ENFORCEMENT_ADMISSION_ENABLED: bool = (
+        os.getenv("ENFORCEMENT_ADMISSION_ENABLED", "true").lower() == "true"
+    )
+    ENFORCEMENT_ADMISSION_INITIAL_LIMIT: int = int(
+        os.getenv("ENFORCEMENT_ADMISSION_INITIAL_LIMIT", "32")
+    )
+    ENFORCEMENT_ADMISSION_MIN_LIMIT: int = int(os.getenv("ENFORCEMENT_ADMISSION_MIN_LIMIT", "4"))
+    ENFORCEMENT_ADMISSION_MAX_LIMIT: int = int(os.getenv("ENFORCEMENT_ADMISSION_MAX_LIMIT", "512"))
+    ENFORCEMENT_ADMISSION_TARGET_LATENCY_MS: float = float(
+        os.getenv("ENFORCEMENT_ADMISSION_TARGET_LATENCY_MS", "250")
+    )
+    ENFORCEMENT_ADMISSION_BACKOFF: float = float(
+        os.getenv("ENFORCEMENT_ADMISSION_BACKOFF", "0.9")
+    )
+    ENFORCEMENT_ADMISSION_MAX_QUEUE: int = int(os.getenv("ENFORCEMENT_ADMISSION_MAX_QUEUE", "128"))
+    ENFORCEMENT_ADMISSION_MAX_QUEUE_WAIT_MS: float = float(
+        os.getenv("ENFORCEMENT_ADMISSION_MAX_QUEUE_WAIT_MS", "500")
+    )
+    ENFORCEMENT_ADMISSION_RETRY_AFTER_SECONDS: float = float(
+        os.getenv("ENFORCEMENT_ADMISSION_RETRY_AFTER_SECONDS", "1")
+    )
+
+    # Dry-run lane (dry_run=true or dry_run_rule_ids): its own concurrency
+    # cap, queue and encoder threads; it stops admitting while live requests
+    # are queued.
+    ENFORCEMENT_DRY_RUN_MAX_CONCURRENCY: int = int(
+        os.getenv("ENFORCEMENT_DRY_RUN_MAX_CONCURRENCY", "4")
+    )
+    ENFORCEMENT_DRY_RUN_MAX_QUEUE: int = int(os.getenv("ENFORCEMENT_DRY_RUN_MAX_QUEUE", "32"))
+    ENFORCEMENT_DRY_RUN_MAX_QUEUE_WAIT_MS: float = float(
+        os.getenv("ENFORCEMENT_DRY_RUN_MAX_QUEUE_WAIT_MS", "2000")
+    )
+    ENFORCEMENT_DRY_RUN_ENCODER_WORKERS: int = int(
+        os.getenv("ENFORCEMENT_DRY_RUN_ENCODER_WORKERS", "1")
+    )
+
+    # Fair scheduling of the shared encoder: per-tenant queues served by
+    # deficit round robin on encoder CPU ms. Weights use "tenant-a=2,...";
+    # a CPU ms/s rate above 0 adds a per-tenant token bucket (scaled by weight).
+    ENCODER_FAIR_SCHEDULING_ENABLED: bool = (
+        os.getenv("ENCODER_FAIR_SCHEDULING_ENABLED", "true").lower() == "true"
+    )
+    ENCODER_WORKERS: int = int(os.getenv("ENCODER_WORKERS", "2"))
+    ENCODER_DRR_QUANTUM_MS: float = float(os.getenv("ENCODER_DRR_QUANTUM_MS", "5"))
+    ENCODER_TENANT_WEIGHTS: str = os.getenv("ENCODER_TENANT_WEIGHTS", "")
+    ENCODER_DEFAULT_WEIGHT: float = float(os.getenv("ENCODER_DEFAULT_WEIGHT", "1.0"))
+    ENCODER_TENANT_CPU_MS_PER_SECOND: float = float(
+        os.getenv("ENCODER_TENANT_CPU_MS_PER_SECOND", "0")
+    )
+    ENCODER_TENANT_BURST_MS: float = float(os.getenv("ENCODER_TENANT_BURST_MS", "1000"))
+    ENCODER_MAX_QUEUE_PER_TENANT: int = int(os.getenv("ENCODER_MAX_QUEUE_PER_TENANT", "64"))
+
+    # Lightweight dry-run path: drift is read against a cached session
+    # baseline, and call rows/intel events are buffered and flushed in the
+    # background (callers may also opt out with dry_run_telemetry=false).
+    SESSION_BASELINE_CACHE_SECONDS: float = float(
+        os.getenv("SESSION_BASELINE_CACHE_SECONDS", "30")
+    )
+    DRY_RUN_TELEMETRY_FLUSH_SECONDS: float = float(
+        os.getenv("DRY_RUN_TELEMETRY_FLUSH_SECONDS", "2.0")
+    )
+    DRY_RUN_TELEMETRY_BATCH_SIZE: int = int(os.getenv("DRY_RUN_TELEMETRY_BATCH_SIZE", "100"))
+    DRY_RUN_TELEMETRY_MAX_BUFFER: int = int(
+        os.getenv("DRY_RUN_TELEMETRY_MAX_BUFFER", "10000")
+    )
+
+    # Compiled network-policy matchers are cached per (tenant, agent). The
+    # CRUD endpoints invalidate them; the TTL bounds staleness for changes
+    # made through another replica.
+    NETWORK_POLICY_CACHE_SECONDS: float = float(
+        os.getenv("NETWORK_POLICY_CACHE_SECONDS", "60")
+    )
+    NETWORK_POLICY_CACHE_MAX_AGENTS: int = int(
+        os.getenv("NETWORK_POLICY_CACHE_MAX_AGENTS", "4096")
+    )
+
+    # Bulk network-policy import: rows per db_infra batch request, and the
+    # write concurrency used when db_infra has no batch route.
+    NETWORK_POLICY_IMPORT_BATCH_SIZE: int = int(
+        os.getenv("NETWORK_POLICY_IMPORT_BATCH_SIZE", "500")
+    )
+    NETWORK_POLICY_IMPORT_WRITE_CONCURRENCY: int = int(
+        os.getenv("NETWORK_POLICY_IMPORT_WRITE_CONCURRENCY", "8")
+    )
+    NETWORK_POLICY_IMPORT_MAX_POLICIES: int = int(
+        os.getenv("NETWORK_POLICY_IMPORT_MAX_POLICIES", "10000")
+    )
+
+    # Threads that encode policy anchors for the CRUD endpoints, separate from
+    # the enforcement encoder pools.
+    POLICY_ENCODER_WORKERS: int = int(os.getenv("POLICY_ENCODER_WORKERS", "1"))
+    # Encoded policy anchors kept in memory, keyed by a content hash of
+    # (encoder fingerprint, slot, anchor text); 0 disables the cache.
+    ANCHOR_CACHE_MAX_ENTRIES: int = int(os.getenv("ANCHOR_CACHE_MAX_ENTRIES", "20000"))
+
+    # Bulk policy create/update (POST /api/v2/policies/batch): policies per
+    # call, rows per db_infra batch request, and the write concurrency used
+    # when db_infra has no batch route.
+    POLICY_BATCH_MAX_POLICIES: int = int(os.getenv("POLICY_BATCH_MAX_POLICIES", "1000"))
+    POLICY_BATCH_DB_CHUNK_SIZE: int = int(os.getenv("POLICY_BATCH_DB_CHUNK_SIZE", "500"))
+    POLICY_BATCH_WRITE_CONCURRENCY: int = int(
+        os.getenv("POLICY_BATCH_WRITE_CONCURRENCY", "8")
+    )
+
     # Application Metadata
     APP_NAME: str = "Management Plane"
     VERSION: str = "0.1.0"
@@ -76,6 +228,56 @@ class Config:
 
     # Data Plane Configuration
     data_plane_url: str = os.getenv("DATA_PLANE_URL", f"localhost:{os.getenv('DATA_PLANE_PORT', '50051')}")
+    # Shared channel pool: calls go to the least-loaded of DATA_PLANE_CHANNELS
+    # connections, each kept alive with HTTP/2 pings and warmed at startup.
+    DATA_PLANE_CHANNELS: int = int(os.getenv("DATA_PLANE_CHANNELS", "4"))
+    DATA_PLANE_KEEPALIVE_TIME_MS: int = int(os.getenv("DATA_PLANE_KEEPALIVE_TIME_MS", "30000"))
+    DATA_PLANE_KEEPALIVE_TIMEOUT_MS: int = int(
+        os.getenv("DATA_PLANE_KEEPALIVE_TIMEOUT_MS", "10000")
+    )
+    DATA_PLANE_WARMUP_TIMEOUT_SECONDS: float = float(
+        os.getenv("DATA_PLANE_WARMUP_TIMEOUT_SECONDS", "5.0")
+    )
+    # Send Enforce intents as the typed protobuf message instead of v1.3 JSON.
+    # Turn off while data planes that only read intent_event_json are deployed.
+    DATA_PLANE_TYPED_INTENT: bool = (
+        os.getenv("DATA_PLANE_TYPED_INTENT", "true").lower() == "true"
+    )
+    # Send intent vectors and rule anchors as packed little-endian bytes
+    # (float32, or float16 for half the bytes) instead of repeated floats.
+    # Turn off while data planes that only read the float lists are deployed.
+    DATA_PLANE_PACKED_VECTORS: bool = (
+        os.getenv("DATA_PLANE_PACKED_VECTORS", "true").lower() == "true"
+    )
+    DATA_PLANE_VECTOR_ENCODING: Literal["float32", "float16"] = os.getenv(
+        "DATA_PLANE_VECTOR_ENCODING", "float32"
+    )  # type: ignore
+
+    # Startup sync of active policies: each batch of one agent's policies is a
+    # single Chroma get plus a single install RPC; batches run concurrently.
+    STARTUP_SYNC_BATCH_SIZE: int = int(os.getenv("STARTUP_SYNC_BATCH_SIZE", "256"))
+    STARTUP_SYNC_CONCURRENCY: int = int(os.getenv("STARTUP_SYNC_CONCURRENCY", "8"))
+    STARTUP_SYNC_PROGRESS_SECONDS: float = float(
+        os.getenv("STARTUP_SYNC_PROGRESS_SECONDS", "5.0")
+    )
+    # Skip unchanged policies when the data plane is still the instance and
+    # version recorded in the sync state file at the last install.
+    STARTUP_SYNC_INCREMENTAL: bool = (
+        os.getenv("STARTUP_SYNC_INCREMENTAL", "true").lower() == "true"
+    )
+    DATAPLANE_SYNC_STATE_PATH: str = os.getenv(
+        "DATAPLANE_SYNC_STATE_PATH",
+        str(PROJECT_ROOT / "data" / "dataplane_sync_state.json"),
+    )
+
+    # Background reconciliation: re-runs the incremental sync periodically and
+    # repairs at most RECONCILE_MAX_REPAIRS_PER_CYCLE policies per run.
+    RECONCILE_ENABLED: bool = os.getenv("RECONCILE_ENABLED", "true").lower() == "true"
+    RECONCILE_INTERVAL_SECONDS: float = float(os.getenv("RECONCILE_INTERVAL_SECONDS", "30"))
+    RECONCILE_MAX_REPAIRS_PER_CYCLE: int = int(
+        os.getenv("RECONCILE_MAX_REPAIRS_PER_CYCLE", "200")
+    )
+    RECONCILE_CONCURRENCY: int = int(os.getenv("RECONCILE_CONCURRENCY", "2"))
 
     # Chroma Configuration
     CHROMA_URL: str = os.getenv("CHROMA_URL", str(PROJECT_ROOT / "data" / "chroma_data"))
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""Benchmark network whitelist matching from 10 to 100k rules.
+
+Compares the compiled NetworkPolicyMatcher (hash set + path-segment trie)
+against the per-rule ``matches_endpoint_rule`` loop, and checks on every query
+that both return the same (policy, rule).
+
+Usage (from management_plane/):
+  python -m benchmarks.network_matcher_bench
+  python -m benchmarks.network_matcher_bench --sizes 10,1000,100000 --queries 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+
+from app.models import NetworkContext, NetworkEndpointRule, NetworkPolicy
+from app.services.network_policy_evaluator import NetworkPolicyMatcher, matches_endpoint_rule
+
+METHODS = ("GET", "POST", "PUT", "DELETE", "PATCH")
+RULES_PER_POLICY = 1000
+
+
+def _rule_url(rng: random.Random, index: int) -> str:
+    """OpenAPI-shaped paths: mostly exact, some path params and prefixes."""
+    resource = f"/api/v{index % 3 + 1}/resource{index}"
+    kind = rng.random()
+    if kind < 0.5:
+        return resource
+    if kind < 0.8:
+        return f"{resource}/*/items"
+    if kind < 0.95:
+        return f"{resource}/*"
+    return f"{resource}/v*/export"
+
+
+def build_policies(size: int, seed: int = 7) -> list[NetworkPolicy]:
+    rng = random.Random(seed)
+    policies = []
+    now = time.time()
+    for start in range(0, size, RULES_PER_POLICY):
+        rules = [
+            NetworkEndpointRule(
+                protocol=rng.choice(("HTTP", "HTTPS")),
+                method=rng.choice(METHODS),
+                url=_rule_url(rng, index),
+            )
+            for index in range(start, min(start + RULES_PER_POLICY, size))
+        ]
+        policies.append(
+            NetworkPolicy(
+                policy_id=f"policy-{start}",
+                tenant_id="bench",
+                agent_id="bench-agent",
+                name=f"policy-{start}",
+                status="active",
+                mode="Enforce",
+                whitelist=rules,
+                created_at=now,
+                updated_at=now,
+            )
+        )
+    return policies
+
+
+def build_queries(policies: list[NetworkPolicy], count: int, seed: int = 11) -> list[NetworkContext]:
+    rng = random.Random(seed)
+    rules = [rule for policy in policies for rule in policy.whitelist]
+    queries = []
+    for _ in range(count):
+        rule = rng.choice(rules)
+        url = rule.url.replace("v*", "v2").replace("*", rng.choice(("42", "a/b", "")))
+        if rng.random() < 0.3:
+            url += "/unknown"
+        queries.append(
+            NetworkContext(
+                protocol=rule.protocol,
+                method=rule.method if rng.random() < 0.9 else rng.choice(METHODS),
+                url=url,
+            )
+        )
+    return queries
+
+
+def linear_match(policies: list[NetworkPolicy], ctx: NetworkContext):
+    for policy in policies:
+        for rule in policy.whitelist:
+            if matches_endpoint_rule(rule, ctx):
+                return policy, rule
+    return None
+
+
+def _per_query_us(fn, queries: list[NetworkContext]) -> tuple[float, list]:
+    started = time.perf_counter()
+    results = [fn(ctx) for ctx in queries]
+    return (time.perf_counter() - started) / len(queries) * 1e6, results
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="10,100,1000,10000,100000")
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument(
+        "--linear-queries",
+        type=int,
+        default=200,
+        help="queries also run through the per-rule loop (it is slow at 100k)",
+    )
+    args = parser.parse_args(argv)
+
+    print(f"{'rules':>8} {'build ms':>10} {'trie us/q':>10} {'linear us/q':>12} {'speedup':>8}")
+    mismatches = 0
+    for size in (int(value) for value in args.sizes.split(",")):
+        policies = build_policies(size)
+        queries = build_queries(policies, args.queries)
+
+        started = time.perf_counter()
+        matcher = NetworkPolicyMatcher(policies)
+        build_ms = (time.perf_counter() - started) * 1000
+
+        trie_us, trie_results = _per_query_us(matcher.match, queries)
+        checked = queries[: args.linear_queries]
+        linear_us, linear_results = _per_query_us(
+            lambda ctx: linear_match(policies, ctx), checked
+        )
+
+        for ctx, got, expected in zip(checked, trie_results, linear_results):
+            if (got and (got[0].policy_id, got[1])) != (expected and (expected[0].policy_id, expected[1])):
+                mismatches += 1
+                print(f"MISMATCH {ctx.method} {ctx.protocol} {ctx.url}: {got} != {expected}")
+
+        print(
+            f"{size:>8} {build_ms:>10.1f} {trie_us:>10.2f} {linear_us:>12.2f} "
+            f"{linear_us / trie_us:>7.0f}x"
+        )
+
+    if mismatches:
+        print(f"{mismatches} mismatching results")
+        return 1
+    print("all results match the per-rule matcher")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
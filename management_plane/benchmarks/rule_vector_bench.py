@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""Benchmark RuleVector memory and build cost, old layout against the new one.
+
+The old layout (a dict of four separate (16, 32) arrays plus a dict of counts,
+reproduced below as ``DictRuleVector``) is compared with the current RuleVector
+(one contiguous (4, 16, 32) buffer plus an int32 count array) on the startup
+sync path: decoding stored anchor payloads into rule vectors and flattening
+them. Per rule it reports the bytes still held with all rules kept alive
+(tracemalloc), the build time and the ``to_numpy`` time, and checks that both
+layouts hold the same values.
+
+Usage (from management_plane/):
+  python -m benchmarks.rule_vector_bench
+  python -m benchmarks.rule_vector_bench --rules 20000 --anchors 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from app.rule_installer import _rule_vector_from_anchors
+from app.services.vector_codec import SLOTS, decode_anchor_slot, encode_anchor_payload
+
+
+class DictRuleVector:
+    """RuleVector as it was before the contiguous buffer."""
+
+    def __init__(self):
+        self.layers = {slot: np.zeros((16, 32), dtype=np.float32) for slot in SLOTS}
+        self.anchor_counts = {slot: 0 for slot in SLOTS}
+
+    def set_layer(self, layer_name: str, anchor_vectors: np.ndarray, count: int) -> None:
+        self.layers[layer_name] = anchor_vectors
+        self.anchor_counts[layer_name] = count
+
+    def to_numpy(self) -> np.ndarray:
+        return np.stack([self.layers[slot] for slot in SLOTS]).flatten()
+
+
+def dict_rule_vector_from_anchors(anchors: dict) -> DictRuleVector:
+    rv = DictRuleVector()
+    for slot in SLOTS:
+        rv.set_layer(slot, *decode_anchor_slot(anchors, slot))
+    return rv
+
+
+def build_payloads(count: int, anchors: int, seed: int = 7) -> list[dict]:
+    rng = np.random.default_rng(seed)
+    payloads = []
+    for _ in range(count):
+        layers = {slot: rng.standard_normal((16, 32)).astype(np.float32) for slot in SLOTS}
+        payloads.append(encode_anchor_payload(layers, {slot: anchors for slot in SLOTS}))
+    return payloads
+
+
+def _retained_bytes_per_rule(build, payloads: list[dict]) -> float:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    vectors = [build(payload) for payload in payloads]
+    retained = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del vectors
+    return retained / len(payloads)
+
+
+def _per_rule_us(fn, items: list) -> tuple[float, list]:
+    started = time.perf_counter()
+    results = [fn(item) for item in items]
+    return (time.perf_counter() - started) / len(items) * 1e6, results
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rules", type=int, default=10000)
+    parser.add_argument("--anchors", type=int, default=3, help="populated anchors per slot")
+    args = parser.parse_args(argv)
+
+    payloads = build_payloads(args.rules, args.anchors)
+    layouts = {
+        "dict": dict_rule_vector_from_anchors,
+        "contiguous": _rule_vector_from_anchors,
+    }
+
+    print(f"{args.rules} rules, {args.anchors} anchors per slot")
+    print(f"{'layout':>12} {'bytes/rule':>11} {'build us':>9} {'to_numpy us':>12}")
+    flattened = {}
+    for name, build in layouts.items():
+        retained = _retained_bytes_per_rule(build, payloads)
+        build_us, vectors = _per_rule_us(build, payloads)
+        flat_us, flattened[name] = _per_rule_us(lambda rv: rv.to_numpy(), vectors)
+        print(f"{name:>12} {retained:>11.0f} {build_us:>9.2f} {flat_us:>12.2f}")
+
+    mismatches = sum(
+        not np.array_equal(old, new)
+        for old, new in zip(flattened["dict"], flattened["contiguous"])
+    )
+    if mismatches:
+        print(f"{mismatches} rules differ between layouts")
+        return 1
+    print("both layouts hold the same values")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
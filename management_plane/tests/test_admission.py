@@ -0,0 +1,159 @@
+"""Tests for adaptive admission control on the enforcement endpoint."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from unittest.mock import MagicMock, patch
+
+from app.admission import ADMISSION_SHED_TOTAL, AdaptiveConcurrencyLimiter, Overloaded
+from app import lanes
+from app.endpoints import enforcement_v2
+from app.metrics import ENFORCEMENT_REQUEST_SECONDS
+from app.models import IntentEvent
+
+
+def _limiter(**overrides) -> AdaptiveConcurrencyLimiter:
+    settings = {
+        "initial_limit": 4,
+        "min_limit": 1,
+        "max_limit": 8,
+        "target_latency_ms": 100.0,
+        "backoff": 0.5,
+        "max_queue": 2,
+        "max_queue_wait_ms": 50.0,
+        "retry_after_seconds": 2,
+    }
+    settings.update(overrides)
+    return AdaptiveConcurrencyLimiter(**settings)
+
+
+def test_limit_decreases_on_slow_samples_and_recovers_under_load():
+    limiter = _limiter()
+
+    async def run() -> None:
+        await limiter.acquire()
+        limiter.release(latency_ms=500.0)
+        assert limiter.limit == 2
+
+        for _ in range(2):
+            await limiter.acquire()
+        for _ in range(8):
+            limiter.release(latency_ms=5.0)
+            await limiter.acquire()
+        # Growth stops once the limit is more than twice what is in use.
+        assert limiter.limit == 4
+
+    asyncio.run(run())
+
+
+def test_full_queue_is_shed_immediately():
+    limiter = _limiter(initial_limit=1, max_queue=0)
+    before = ADMISSION_SHED_TOTAL.value(lane="live", reason="queue_full")
+
+    async def run() -> None:
+        await limiter.acquire()
+        with pytest.raises(Overloaded) as excinfo:
+            await limiter.acquire()
+        assert excinfo.value.detail()["retry_after_seconds"] == 2
+
+    asyncio.run(run())
+    assert ADMISSION_SHED_TOTAL.value(lane="live", reason="queue_full") == before + 1
+
+
+def test_queued_request_gets_released_slot_or_times_out():
+    limiter = _limiter(initial_limit=1, max_limit=1)
+
+    async def run() -> None:
+        await limiter.acquire()
+        waiter = asyncio.create_task(limiter.acquire(max_wait_ms=1000.0))
+        await asyncio.sleep(0)
+        assert limiter.queue_depth == 1
+        limiter.release(latency_ms=1.0)
+        await waiter
+        assert limiter.inflight == 1
+
+        with pytest.raises(Overloaded, match="queue_timeout"):
+            await limiter.acquire(max_wait_ms=10.0)
+        assert limiter.queue_depth == 0
+
+    asyncio.run(run())
+
+
+def test_enforce_returns_503_with_retry_after_when_shed():
+    limiter = _limiter(initial_limit=1, max_queue=0)
+    asyncio.run(limiter.acquire())
+    app = FastAPI()
+    app.include_router(enforcement_v2.router, prefix="/api/v2")
+
+    with patch.object(lanes.LIVE_LANE, "limiter", limiter), TestClient(app) as client:
+        response = client.post(
+            "/api/v2/enforce",
+            json={
+                "event_type": "tool_call",
+                "id": "evt-1",
+                "ts": 1700000000.0,
+                "identity": {"agent_id": "agent-1", "actor_type": "agent"},
+                "t": "customer database",
+                "op": "read records",
+            },
+        )
+
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "2"
+    assert response.json()["detail"] == {
+        "code": "overloaded",
+        "reason": "queue_full",
+        "retry_after_seconds": 2,
+    }
+
+
+def test_dry_run_lane_yields_while_live_requests_are_queued():
+    live = _limiter(initial_limit=1, max_limit=1)
+    dry_run = _limiter(lane="dry_run", yields_to=live)
+    before = ADMISSION_SHED_TOTAL.value(lane="dry_run", reason="yielding")
+
+    async def run() -> None:
+        await live.acquire()
+        queued = asyncio.create_task(live.acquire(max_wait_ms=1000.0))
+        await asyncio.sleep(0)
+        with pytest.raises(Overloaded, match="yielding"):
+            await dry_run.acquire()
+        live.release(latency_ms=1.0)
+        await queued
+        await dry_run.acquire()
+        assert dry_run.inflight == 1
+
+    asyncio.run(run())
+    assert ADMISSION_SHED_TOTAL.value(lane="dry_run", reason="yielding") == before + 1
+
+
+def test_dry_run_traffic_is_scheduled_and_measured_on_its_own_lane():
+    event = {
+        "event_type": "tool_call",
+        "id": "evt-1",
+        "ts": 1700000000.0,
+        "identity": {"agent_id": "agent-1", "actor_type": "agent"},
+        "t": "customer database",
+        "op": "read records",
+        "dry_run_rule_ids": ["policy-1"],
+    }
+    app = FastAPI()
+    app.include_router(enforcement_v2.router, prefix="/api/v2")
+    db_infra = MagicMock()
+    db_infra.get_module_enablement.return_value = {"enabled": False}
+    before = ENFORCEMENT_REQUEST_SECONDS.count(lane="dry_run", decision="ALLOW")
+    live = MagicMock()
+
+    with patch.object(enforcement_v2, "db_infra_client", db_infra), \
+         patch.object(lanes.LIVE_LANE, "limiter", live), \
+         TestClient(app) as client:
+        response = client.post("/api/v2/enforce", json=event)
+
+    assert response.status_code == 200
+    assert lanes.select_lane(IntentEvent.model_validate(event), False) is lanes.DRY_RUN_LANE
+    assert ENFORCEMENT_REQUEST_SECONDS.count(lane="dry_run", decision="ALLOW") == before + 1
+    live.admit.assert_not_called()
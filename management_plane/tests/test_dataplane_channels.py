@@ -0,0 +1,58 @@
+"""Tests for the shared data plane gRPC channel pool."""
+
+from __future__ import annotations
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.services.dataplane_channels import (
+    DATA_PLANE_CHANNEL_CALLS_TOTAL,
+    DATA_PLANE_CHANNEL_INFLIGHT,
+    DataPlaneChannelPool,
+)
+from app.services.dataplane_client import DataPlaneClient
+from tests_support.fake_data_plane_server import FakeDataPlaneServer
+
+
+def test_pool_warms_up_and_spreads_concurrent_calls():
+    with FakeDataPlaneServer(latency_ms=50.0) as server:
+        pool = DataPlaneChannelPool(server.address, size=3)
+        client = DataPlaneClient(pool=pool)
+        before = [DATA_PLANE_CHANNEL_CALLS_TOTAL.value(channel=str(i)) for i in range(3)]
+        try:
+            assert pool.wait_ready(timeout=5.0) == 3
+            with ThreadPoolExecutor(max_workers=3) as executor:
+                results = list(executor.map(lambda _: client.get_rule_stats(), range(3)))
+        finally:
+            client.close()
+            assert pool.inflight() == [0, 0, 0]
+            pool.close()
+
+    assert all(result["bridge_version"] == 0 for result in results)
+    # Three overlapping calls land on three different channels.
+    after = [DATA_PLANE_CHANNEL_CALLS_TOTAL.value(channel=str(i)) for i in range(3)]
+    assert [a - b for a, b in zip(after, before)] == [1, 1, 1]
+    assert all(DATA_PLANE_CHANNEL_INFLIGHT.value(channel=str(i)) == 0 for i in range(3))
+
+
+def test_closed_pool_rejects_calls():
+    pool = DataPlaneChannelPool("127.0.0.1:1", size=1)
+    pool.close()
+
+    with pytest.raises(RuntimeError):
+        DataPlaneClient(pool=pool).get_rule_stats()
+
+
+def test_wait_ready_shares_one_deadline_across_channels():
+    pool = DataPlaneChannelPool("127.0.0.1:1", size=3)
+    try:
+        started = time.perf_counter()
+        ready = pool.wait_ready(timeout=0.3)
+        elapsed = time.perf_counter() - started
+    finally:
+        pool.close()
+
+    assert ready == 0
+    assert elapsed < 0.6
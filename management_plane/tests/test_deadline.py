@@ -0,0 +1,155 @@
+"""Tests for per-request enforcement deadlines."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+from app.deadline import Deadline, DeadlineExceeded, deadline_scope, parse_tenant_budgets
+from app.endpoints import enforcement_v2
+from app.metrics import StageTimer
+from app.models import AgentIdentity, EnforcementResponse, IntentEvent
+from app.services.db_infra_client import DbInfraClient
+from tests_support import FakeDbInfraServer
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_parse_tenant_budgets_skips_invalid_entries():
+    budgets = parse_tenant_budgets("tenant-a=500, tenant-b=0,bad,tenant-c=nope,=50")
+    assert budgets == {"tenant-a": 500.0}
+
+
+def test_deadline_caps_timeouts_and_skips_optional_stages():
+    clock = _Clock()
+    deadline = Deadline(1000, reserve_ms=200, clock=clock)
+
+    assert deadline.timeout(5.0, "db_infra") == pytest.approx(1.0)
+    assert deadline.skip("pending_write") is False
+
+    clock.now += 0.9
+    assert deadline.timeout(5.0, "db_infra") == pytest.approx(0.1)
+    assert deadline.skip("baseline_drift") is True
+    assert deadline.skipped_stages == ["baseline_drift"]
+
+    clock.now += 0.2
+    with pytest.raises(DeadlineExceeded, match="during grpc"):
+        deadline.check("grpc")
+
+
+def test_db_infra_client_shrinks_timeout_to_remaining_budget():
+    with FakeDbInfraServer(latency_ms=500) as server:
+        client = DbInfraClient(server.base_url, timeout_seconds=5.0)
+        started = time.perf_counter()
+        with deadline_scope(Deadline(100, reserve_ms=0)):
+            with pytest.raises(DeadlineExceeded, match="module-enablement"):
+                client.get_module_enablement("prism")
+        elapsed = time.perf_counter() - started
+
+    assert elapsed < 0.5
+
+
+def test_exhausted_budget_fails_closed_and_keeps_the_audit_record():
+    event = IntentEvent(
+        event_type="tool_call",
+        id="evt-1",
+        event_id="evt-1",
+        agent_call_id="call-1",
+        tenant_id="tenant-1",
+        ts=1700000000.0,
+        identity=AgentIdentity(agent_id="agent-1", actor_type="agent"),
+        t="customer database",
+        op="read records",
+    )
+    clock = _Clock()
+    deadline = Deadline(50, reserve_ms=10, clock=clock)
+    store = MagicMock()
+
+    def slow_integration(agent_id):
+        clock.now += 0.1
+        return {"enabled": True}
+
+    db_infra = MagicMock()
+    db_infra.get_prism_agent_integration.side_effect = slow_integration
+
+    with patch.object(enforcement_v2, "db_infra_client", db_infra), \
+         patch.object(enforcement_v2, "session_store", store), \
+         patch.object(enforcement_v2, "emit_enforcement_completed") as emit, \
+         patch.object(enforcement_v2, "get_intent_encoder", return_value=MagicMock()):
+        with deadline_scope(deadline):
+            response = asyncio.run(
+                enforcement_v2._enforce_for_agent(
+                    event,
+                    current_user=MagicMock(id="tenant-1"),
+                    agent_id="agent-1",
+                    dry_run=False,
+                    request_id="req-1",
+                    timer=StageTimer(),
+                    deadline=deadline,
+                )
+            )
+
+    assert response.decision == "DENY"
+    assert "exceeded during encode" in response.reason
+    store.write_call.assert_not_called()
+    # No PENDING row was written, so there is none to settle.
+    store.update_call_decision.assert_not_called()
+    store.insert_call.assert_called_once()
+    emit.assert_not_called()
+    assert deadline.skipped_stages == ["pending_write", "intel_emit"]
+
+
+def test_exhausted_budget_still_settles_the_pending_row():
+    event = IntentEvent(
+        event_type="tool_call",
+        id="evt-1",
+        event_id="evt-1",
+        agent_call_id="call-1",
+        tenant_id="tenant-1",
+        ts=1700000000.0,
+        identity=AgentIdentity(agent_id="agent-1", actor_type="agent"),
+        t="customer database",
+        op="read records",
+    )
+    clock = _Clock()
+    deadline = Deadline(50, reserve_ms=10, clock=clock)
+    assert deadline.skip("pending_write") is False
+    clock.now += 0.1
+
+    deadlines_seen = []
+    store = MagicMock()
+    store.update_call_decision.side_effect = (
+        lambda *args: deadlines_seen.append(enforcement_v2.current_deadline())
+    )
+
+    with patch.object(enforcement_v2, "session_store", store), \
+         patch.object(enforcement_v2, "emit_enforcement_completed"):
+        with deadline_scope(deadline):
+            enforcement_v2._write_enforcement_record(
+                agent_id="agent-1",
+                event=event,
+                enforcement_response=EnforcementResponse(
+                    decision="DENY",
+                    drift_score=0.0,
+                    drift_triggered=False,
+                    slice_similarities=[0.0, 0.0, 0.0, 0.0],
+                ),
+                decision_name="DENY",
+                dry_run=False,
+                agent_call_id="call-1",
+                request_id="req-1",
+            )
+
+    store.update_call_decision.assert_called_once_with("agent-1", "evt-1", "DENY", "DENY")
+    # Run on the client's own timeout, not the exhausted request budget.
+    assert deadlines_seen == [None]
+    assert deadline.skipped_stages == ["intel_emit"]
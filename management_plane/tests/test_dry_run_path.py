@@ -0,0 +1,143 @@
+"""Tests for the lightweight dry-run path: read-only drift and batched telemetry."""
+
+from __future__ import annotations
+
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.endpoints import enforcement_v2
+from app.metrics import StageTimer
+from app.models import AgentIdentity, EnforcementResponse, IntentEvent
+from app.services import dry_run_recorder as recorder_module
+from app.services import session_store
+from app.services.data_intel_client import DataIntelClient
+from app.services.db_infra_client import DbInfraClient
+from app.services.dry_run_recorder import DryRunRecorder
+from tests_support import FakeDataIntelServer, FakeDbInfraServer
+
+
+@pytest.fixture
+def db_infra():
+    with FakeDbInfraServer() as server:
+        client = DbInfraClient(server.base_url)
+        with patch.object(session_store, "db_infra_client", client):
+            session_store._baseline_cache.clear()
+            yield server
+            session_store._baseline_cache.clear()
+
+
+def _event(event_id: str) -> IntentEvent:
+    return IntentEvent(
+        event_type="tool_call",
+        id=event_id,
+        tenant_id="tenant-1",
+        ts=time.time(),
+        identity=AgentIdentity(agent_id="agent-1", actor_type="agent"),
+        op="read",
+        t="db",
+    )
+
+
+def _response() -> EnforcementResponse:
+    return EnforcementResponse(
+        decision="ALLOW",
+        drift_score=0.1,
+        drift_triggered=False,
+        slice_similarities=[0.1, 0.1, 0.1, 0.1],
+    )
+
+
+def test_peek_drift_does_not_touch_the_session(db_infra: FakeDbInfraServer):
+    session_store.initialize_session_vector("agent-1", [1.0, 0.0])
+
+    drift = session_store.peek_drift("agent-1", [0.0, 1.0])
+    session_store.peek_drift("agent-1", [0.0, 1.0])
+
+    session = db_infra.sessions["agent-1"]
+    assert drift == pytest.approx(1.0)
+    assert session["drift"] == 0.0
+    assert session["last_vector"] is None
+    assert session["call_count"] == 0
+    # The baseline is cached: one read for both peeks.
+    assert db_infra.request_count == 2
+
+
+def test_peek_drift_without_baseline_creates_no_session(db_infra: FakeDbInfraServer):
+    assert session_store.peek_drift("agent-2", [0.0, 1.0]) == 0.0
+    assert "agent-2" not in db_infra.sessions
+
+
+def test_dry_run_persist_buffers_instead_of_writing():
+    recorder = DryRunRecorder(max_buffer=10, batch_size=10)
+    with patch.object(enforcement_v2, "dry_run_recorder", recorder), \
+         patch.object(enforcement_v2, "_write_enforcement_record") as write:
+        for telemetry in (True, False):
+            enforcement_v2._persist_enforcement_record(
+                agent_id="agent-1",
+                event=_event(f"evt-{telemetry}"),
+                enforcement_response=_response(),
+                decision_name="ALLOW",
+                dry_run=True,
+                agent_call_id="call-1",
+                request_id="req-1",
+                timer=StageTimer(lane="dry_run"),
+                dry_run_telemetry=telemetry,
+            )
+
+    write.assert_not_called()
+    assert recorder.pending == 1
+
+
+def test_flush_inserts_calls_and_sends_one_intel_batch(db_infra: FakeDbInfraServer):
+    recorder = DryRunRecorder(max_buffer=10, batch_size=10)
+    for index in range(3):
+        event = _event(f"evt-{index}")
+        recorder.record(
+            call={
+                "event_id": event.id,
+                "agent_id": "agent-1",
+                "agent_call_id": f"call-{index}",
+                "ts_ms": int(event.ts * 1000),
+                "prism_decision": "ALLOW",
+                "enforced_decision": "ALLOW",
+                "op": event.op,
+                "t": event.t,
+                "enforcement_result_json": "{}",
+                "is_dry_run": True,
+            },
+            intel_event=enforcement_v2.enforcement_completed_event(
+                agent_id="agent-1",
+                event=event,
+                enforcement_response=_response(),
+                decision_name="ALLOW",
+                dry_run=True,
+                agent_call_id=f"call-{index}",
+            ),
+        )
+
+    with FakeDataIntelServer() as intel:
+        intel_client = DataIntelClient(intel.base_url, 2.0, "prism-intel-v1")
+        with patch.object(recorder_module, "data_intel_client", intel_client), \
+             patch.object(intel_client, "_enqueue_outbox", MagicMock()), \
+             patch("app.services.data_intel_client.config.DATA_INTEL_ENABLED", True):
+            written = recorder.flush()
+        received = intel.events
+        batches = intel.request_count
+
+    assert written == 3
+    assert recorder.pending == 0
+    assert sorted(db_infra.calls) == ["evt-0", "evt-1", "evt-2"]
+    assert db_infra.sessions == {}
+    assert len(received) == 3
+    assert batches == 1
+
+
+def test_recorder_drops_oldest_when_full():
+    recorder = DryRunRecorder(max_buffer=2, batch_size=10)
+    for index in range(3):
+        recorder.record(call={"event_id": f"evt-{index}"}, intel_event=None)
+
+    assert recorder.pending == 2
+    assert [call["event_id"] for call, _ in recorder._take()] == ["evt-1", "evt-2"]
@@ -0,0 +1,141 @@
+"""Tests for per-tenant fair scheduling of intent encoding."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+
+import pytest
+
+from app.admission import Overloaded
+from app.deadline import Deadline, DeadlineExceeded, deadline_scope
+from app.encoder_scheduler import ENCODER_CPU_MS_TOTAL, FairEncoderScheduler
+
+
+class _FakeCpu:
+    """Per-job CPU cost without burning real CPU: jobs advance a shared clock."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.order: list[str] = []
+        self._lock = threading.Lock()
+
+    def clock(self) -> float:
+        return self.now
+
+    def job(self, tenant: str, cost_ms: float) -> str:
+        with self._lock:
+            self.now += cost_ms / 1000.0
+            self.order.append(tenant)
+        return tenant
+
+
+def _scheduler(cpu: _FakeCpu, **overrides) -> FairEncoderScheduler:
+    settings = {
+        "lane": "test",
+        "workers": 1,
+        "quantum_ms": 5.0,
+        "max_queue_per_tenant": 32,
+        "retry_after_seconds": 1,
+        "cpu_clock": cpu.clock,
+    }
+    settings.update(overrides)
+    return FairEncoderScheduler(**settings)
+
+
+def test_expensive_tenant_does_not_starve_cheap_tenant():
+    cpu = _FakeCpu()
+    scheduler = _scheduler(cpu)
+
+    async def run() -> None:
+        noisy = [scheduler.submit("noisy", cpu.job, "noisy", 40.0) for _ in range(8)]
+        quiet = [scheduler.submit("quiet", cpu.job, "quiet", 2.0) for _ in range(4)]
+        await asyncio.gather(*noisy, *quiet)
+
+    asyncio.run(run())
+
+    # FIFO would finish all eight noisy encodes first.
+    last_quiet = max(index for index, tenant in enumerate(cpu.order) if tenant == "quiet")
+    assert last_quiet <= 5
+    assert ENCODER_CPU_MS_TOTAL.value(lane="test", tenant="noisy") >= 320.0
+    assert scheduler.queue_depth() == 0
+
+
+def test_weights_split_encoder_capacity():
+    cpu = _FakeCpu()
+    scheduler = _scheduler(cpu, weights={"gold": 3.0})
+
+    async def run() -> None:
+        jobs = [
+            scheduler.submit(tenant, cpu.job, tenant, 5.0)
+            for _ in range(12)
+            for tenant in ("gold", "bronze")
+        ]
+        await asyncio.gather(*jobs)
+
+    asyncio.run(run())
+
+    first = cpu.order[:12]
+    assert first.count("gold") >= 8
+
+
+def test_full_tenant_queue_is_shed_without_affecting_others():
+    cpu = _FakeCpu()
+    release = threading.Event()
+    scheduler = _scheduler(cpu, max_queue_per_tenant=1)
+
+    def blocked() -> str:
+        release.wait(timeout=5)
+        return "done"
+
+    async def run() -> None:
+        running = asyncio.ensure_future(scheduler.submit("busy", blocked))
+        await asyncio.sleep(0.01)
+        queued = asyncio.ensure_future(scheduler.submit("busy", cpu.job, "busy", 1.0))
+        await asyncio.sleep(0)
+        with pytest.raises(Overloaded) as exc_info:
+            await scheduler.submit("busy", cpu.job, "busy", 1.0)
+        assert exc_info.value.reason == "tenant_encoder_queue_full"
+        other = asyncio.ensure_future(scheduler.submit("other", cpu.job, "other", 1.0))
+        await asyncio.sleep(0)
+        release.set()
+        assert await asyncio.gather(running, queued, other) == ["done", "busy", "other"]
+
+    asyncio.run(run())
+
+
+def test_deadline_expiring_in_queue_withdraws_the_encode():
+    cpu = _FakeCpu()
+    release = threading.Event()
+    scheduler = _scheduler(cpu)
+
+    def blocked() -> None:
+        release.wait(timeout=5)
+
+    async def run() -> None:
+        running = asyncio.ensure_future(scheduler.submit("a", blocked))
+        await asyncio.sleep(0.01)
+        with deadline_scope(Deadline(30.0, reserve_ms=0.0)):
+            with pytest.raises(DeadlineExceeded):
+                await scheduler.submit("b", cpu.job, "b", 1.0)
+        assert scheduler.queue_depth("b") == 0
+        release.set()
+        await running
+
+    asyncio.run(run())
+
+    assert cpu.order == []
+
+
+def test_token_bucket_delays_a_tenant_over_its_rate():
+    cpu = _FakeCpu()
+    scheduler = _scheduler(cpu, tenant_cpu_ms_per_second=1000.0, burst_ms=10.0)
+
+    async def run() -> float:
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        await asyncio.gather(*[scheduler.submit("a", cpu.job, "a", 30.0) for _ in range(3)])
+        return loop.time() - started
+
+    # Each encode overdraws the 10 ms bucket by 20 ms, refilled at 1 ms/ms.
+    assert asyncio.run(run()) >= 0.035
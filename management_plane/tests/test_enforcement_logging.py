@@ -0,0 +1,102 @@
+"""Tests for sampled enforcement hot-path logging."""
+
+from __future__ import annotations
+
+import logging
+
+import pytest
+
+from app import enforcement_logging
+from app.enforcement_logging import (
+    EnforcementLog,
+    EnforcementLogSampler,
+    Lazy,
+    log_enforcement_payload,
+    parse_tenant_rates,
+)
+from app.models import AgentIdentity, IntentEvent
+
+
+def _event() -> IntentEvent:
+    return IntentEvent(
+        event_type="tool_call",
+        id="evt-1",
+        ts=1700000000.0,
+        identity=AgentIdentity(agent_id="agent-1", actor_type="agent"),
+        t="customer database",
+        op="read records",
+    )
+
+
+def test_parse_tenant_rates_clamps_and_skips_invalid_entries():
+    rates = parse_tenant_rates("tenant-a=0.25, tenant-b=4,bad,tenant-c=nope,=0.5")
+    assert rates == {"tenant-a": 0.25, "tenant-b": 1.0}
+
+
+def test_full_mode_always_samples():
+    sampler = EnforcementLogSampler(
+        mode="full",
+        default_rate=0.0,
+        tenant_rates={},
+        payload_rate=0.0,
+        rng=lambda: 0.99,
+    )
+    assert sampler.sample("tenant-a") is True
+
+
+def test_hot_path_mode_uses_tenant_rate_override():
+    sampler = EnforcementLogSampler(
+        mode="hot_path",
+        default_rate=0.0,
+        tenant_rates={"noisy": 0.5},
+        payload_rate=0.0,
+        rng=lambda: 0.4,
+    )
+    assert sampler.sample("noisy") is True
+    assert sampler.sample("quiet") is False
+
+
+def test_lazy_defers_until_formatted():
+    calls = []
+
+    def build() -> str:
+        calls.append(1)
+        return "built"
+
+    value = Lazy(build)
+    assert calls == []
+    assert str(value) == "built"
+    assert calls == [1]
+
+
+def test_unsampled_request_log_skips_info():
+    captured = []
+
+    class _Logger:
+        def info(self, msg, *args):
+            captured.append(msg % args)
+
+    request_log = EnforcementLog(_Logger(), "req-1", sampled=False)
+    request_log.info("hello %s", "world")
+    assert captured == []
+
+
+def test_deny_payload_is_always_logged(caplog: pytest.LogCaptureFixture, monkeypatch):
+    monkeypatch.setattr(
+        enforcement_logging,
+        "enforcement_log_sampler",
+        EnforcementLogSampler(
+            mode="hot_path",
+            default_rate=0.0,
+            tenant_rates={},
+            payload_rate=0.0,
+        ),
+    )
+    with caplog.at_level(logging.INFO, logger="app.enforcement.payload"):
+        log_enforcement_payload(_event(), request_id="req-1", decision="ALLOW")
+        log_enforcement_payload(_event(), request_id="req-2", decision="DENY")
+
+    messages = [record.getMessage() for record in caplog.records]
+    assert len(messages) == 1
+    assert "req-2" in messages[0]
+    assert '"op": "read records"' in messages[0]
@@ -0,0 +1,133 @@
+"""Tests for the persistent WebSocket enforcement channel."""
+
+from __future__ import annotations
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+from unittest.mock import MagicMock, patch
+
+from app.endpoints import enforcement_v2
+from app.models import EnforcementResponse
+
+
+def _event(event_id: str) -> dict:
+    return {
+        "event_type": "tool_call",
+        "id": event_id,
+        "ts": 1700000000.0,
+        "identity": {"agent_id": "agent-1", "actor_type": "agent"},
+        "t": "customer database",
+        "op": "read records",
+    }
+
+
+def _response(reason: str) -> EnforcementResponse:
+    return EnforcementResponse(
+        decision="ALLOW",
+        drift_score=0.0,
+        drift_triggered=False,
+        slice_similarities=[1.0, 1.0, 1.0, 1.0],
+        evidence=[],
+        reason=reason,
+    )
+
+
+@pytest.fixture
+def client() -> TestClient:
+    app = FastAPI()
+    app.include_router(enforcement_v2.router, prefix="/api/v2")
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+def test_frames_are_correlated_and_resolution_is_pinned(client: TestClient):
+    calls = []
+
+    async def fake_enforce(event, *, current_user, agent_id, dry_run, **_):
+        calls.append((current_user.id, agent_id, dry_run))
+        return _response(event.id)
+
+    db_infra = MagicMock()
+    db_infra.get_module_enablement.return_value = {"enabled": True}
+    db_infra.validate_runtime_credential.return_value = {"tenant_id": "tenant-1"}
+    db_infra.resolve_runtime_agent.return_value = {
+        "status": "resolved",
+        "platform_agent_id": "platform-agent",
+    }
+
+    with patch.object(enforcement_v2, "db_infra_client", db_infra), \
+         patch.object(enforcement_v2, "_enforce_for_agent", fake_enforce):
+        with client.websocket_connect(
+            "/api/v2/enforce/ws",
+            headers={"Authorization": "Bearer runtime-key"},
+        ) as ws:
+            ws.send_json({"event": _event("evt-1")})
+            ws.send_json({"event": _event("evt-2"), "dry_run": True})
+            frames = {frame["event_id"]: frame for frame in (ws.receive_json(), ws.receive_json())}
+
+    assert frames["evt-1"]["status"] == 200
+    assert frames["evt-1"]["response"]["reason"] == "evt-1"
+    assert frames["evt-2"]["response"]["reason"] == "evt-2"
+    assert frames["evt-1"]["response"]["enforcement_latency_ms"] >= 0.0
+    assert frames["evt-1"]["response"]["metadata"]["request_id"]
+    assert sorted(calls) == [
+        ("tenant-1", "platform-agent", False),
+        ("tenant-1", "platform-agent", True),
+    ]
+    db_infra.validate_runtime_credential.assert_called_once()
+    db_infra.resolve_runtime_agent.assert_called_once()
+
+
+def test_invalid_frame_returns_error_without_closing(client: TestClient):
+    db_infra = MagicMock()
+    db_infra.get_module_enablement.return_value = {"enabled": False}
+
+    with patch.object(enforcement_v2, "db_infra_client", db_infra):
+        with client.websocket_connect(
+            "/api/v2/enforce/ws",
+            headers={"X-Tenant-Id": "tenant-1"},
+        ) as ws:
+            ws.send_json({"event": {"id": "evt-bad"}})
+            error = ws.receive_json()
+            ws.send_json({"event": _event("evt-ok")})
+            ok = ws.receive_json()
+
+    assert error["event_id"] == "evt-bad"
+    assert error["status"] == 422
+    assert ok["status"] == 200
+    assert ok["response"]["reason"] == "Prism module is disabled"
+
+
+def test_binary_frame_returns_error_without_closing(client: TestClient):
+    db_infra = MagicMock()
+    db_infra.get_module_enablement.return_value = {"enabled": False}
+
+    with patch.object(enforcement_v2, "db_infra_client", db_infra):
+        with client.websocket_connect(
+            "/api/v2/enforce/ws",
+            headers={"X-Tenant-Id": "tenant-1"},
+        ) as ws:
+            ws.send_bytes(b'{"event": {}}')
+            error = ws.receive_json()
+            ws.send_json({"event": _event("evt-ok")})
+            ok = ws.receive_json()
+
+    assert error == {"event_id": None, "status": 400, "error": "invalid_frame"}
+    assert ok["status"] == 200
+
+
+def test_failed_authentication_closes_channel(client: TestClient):
+    db_infra = MagicMock()
+    db_infra.get_module_enablement.return_value = {"enabled": True}
+
+    with patch.object(enforcement_v2, "db_infra_client", db_infra):
+        with client.websocket_connect("/api/v2/enforce/ws") as ws:
+            ws.send_json({"event": _event("evt-1")})
+            error = ws.receive_json()
+            with pytest.raises(WebSocketDisconnect) as exc:
+                ws.receive_json()
+
+    assert error["status"] == 401
+    assert exc.value.code == 1008
@@ -0,0 +1,206 @@
+"""Tests for enforcement evidence verbosity levels."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+
+import numpy as np
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from unittest.mock import MagicMock, patch
+
+from app.endpoints import enforcement_v2
+from app.deadline import Deadline, deadline_scope
+from app.generated.rule_installation_pb2 import EnforceResponse, PolicyEvaluation, RuleEvidence
+from app.metrics import StageTimer
+from app.models import AgentIdentity, BoundaryEvidence, EnforcementResponse, IntentEvent
+from app.services.dataplane_client import DataPlaneClient
+
+
+def _grpc_response() -> EnforceResponse:
+    return EnforceResponse(
+        decision=0,
+        slice_similarities=[0.9, 0.8, 0.7, 0.6],
+        rules_evaluated=1,
+        decision_name="DENY",
+        evidence=[
+            RuleEvidence(
+                rule_id="policy-1",
+                rule_name="No exports",
+                decision=0,
+                similarities=[0.9, 0.8, 0.7, 0.6],
+                scoring_mode="min",
+                connection_result_json=json.dumps(
+                    {"policy_drift_score": 0.25, "policy_mode": "Monitor"}
+                ),
+                deterministic_results_json=json.dumps([{"field": "tool_name", "passed": False}]),
+                semantic_results_json=json.dumps([{"slice": "action", "score": 0.9}]),
+            )
+        ],
+    )
+
+
+def test_convert_response_decodes_only_what_the_level_keeps():
+    client = DataPlaneClient.__new__(DataPlaneClient)
+
+    full = client._convert_response(_grpc_response(), "full")
+    assert full.evidence[0].deterministic_results == [{"field": "tool_name", "passed": False}]
+    assert full.evidence[0].connection_result["policy_mode"] == "Monitor"
+
+    summary = client._convert_response(_grpc_response(), "summary")
+    (evidence,) = summary.evidence
+    assert evidence.policy_mode == "Monitor"
+    assert evidence.connection_result is None
+    assert evidence.deterministic_results == []
+    assert evidence.semantic_results == []
+    assert summary.policy_drift_score == 0.25
+
+    decision = client._convert_response(_grpc_response(), "decision")
+    assert decision.evidence == []
+    assert decision.decision_name == "DENY"
+    assert decision.policy_drift_score == 0.25
+
+
+def _decision_level_response() -> EnforceResponse:
+    # What the data plane sends at "decision": rule id, decision and the typed
+    # policy evaluation only.
+    return EnforceResponse(
+        decision=0,
+        slice_similarities=[0.9, 0.8, 0.7, 0.6],
+        rules_evaluated=1,
+        decision_name="DENY",
+        evidence=[
+            RuleEvidence(
+                rule_id="policy-1",
+                decision=0,
+                policy=PolicyEvaluation(
+                    policy_mode="Enforce",
+                    policy_type="forbidden",
+                    policy_drift_score=0.25,
+                ),
+            )
+        ],
+    )
+
+
+def test_decision_level_keeps_policy_drift():
+    converter = DataPlaneClient.__new__(DataPlaneClient)
+    levels = []
+
+    def fake_enforce(event, vector, request_id, baseline, agent_call_id, evidence_level):
+        levels.append(evidence_level)
+        return converter._convert_response(_decision_level_response(), evidence_level)
+
+    data_plane = MagicMock()
+    data_plane.enforce.side_effect = fake_enforce
+    encoder = MagicMock()
+    encoder.encode.return_value = np.zeros(128, dtype=np.float32)
+    db_infra = MagicMock()
+    db_infra.get_prism_agent_integration.return_value = {"enabled": True}
+    store = MagicMock()
+    store.compute_and_update_drift.return_value = 0.9
+    event = IntentEvent(
+        event_type="tool_call",
+        id="evt-1",
+        event_id="evt-1",
+        agent_call_id="call-1",
+        tenant_id="tenant-1",
+        ts=1700000000.0,
+        identity=AgentIdentity(agent_id="agent-1", actor_type="agent"),
+        t="customer database",
+        op="export records",
+    )
+    deadline = Deadline(5000)
+
+    with patch.object(enforcement_v2, "db_infra_client", db_infra), \
+         patch.object(enforcement_v2, "session_store", store), \
+         patch.object(enforcement_v2, "emit_enforcement_completed"), \
+         patch.object(enforcement_v2, "list_policy_records", return_value=[]), \
+         patch.object(enforcement_v2, "get_intent_encoder", return_value=encoder), \
+         patch.object(enforcement_v2, "get_data_plane_client", return_value=data_plane):
+        with deadline_scope(deadline):
+            response = asyncio.run(
+                enforcement_v2._enforce_for_agent(
+                    event,
+                    current_user=MagicMock(id="tenant-1"),
+                    agent_id="agent-1",
+                    dry_run=False,
+                    request_id="req-1",
+                    timer=StageTimer(),
+                    deadline=deadline,
+                    evidence_level="decision",
+                )
+            )
+
+    assert levels == ["decision"]
+    assert response.decision == "DENY"
+    assert response.evidence == []
+    assert response.drift_score == 0.25
+    assert response.drift_source == "policy"
+    assert response.baseline_drift_score == 0.9
+
+
+def test_ws_frames_trim_evidence_after_enforcement():
+    levels = []
+
+    async def fake_enforce(event, *, evidence_level, **_):
+        levels.append(evidence_level)
+        return EnforcementResponse(
+            decision="DENY",
+            drift_score=0.0,
+            drift_triggered=False,
+            slice_similarities=[1.0, 1.0, 1.0, 1.0],
+            evidence=[
+                BoundaryEvidence(
+                    boundary_id="policy-1",
+                    boundary_name="No exports",
+                    effect="deny",
+                    decision=0,
+                    similarities=[0.9, 0.8, 0.7, 0.6],
+                    scoring_mode="min",
+                    connection_result={"policy_mode": "Enforce"},
+                    deterministic_results=[{"passed": False}],
+                )
+            ],
+        )
+
+    db_infra = MagicMock()
+    db_infra.get_module_enablement.return_value = {"enabled": True}
+    db_infra.validate_runtime_credential.return_value = {"tenant_id": "tenant-1"}
+    db_infra.resolve_runtime_agent.return_value = {
+        "status": "resolved",
+        "platform_agent_id": "platform-agent",
+    }
+    event = {
+        "event_type": "tool_call",
+        "id": "evt-1",
+        "ts": 1700000000.0,
+        "identity": {"agent_id": "agent-1", "actor_type": "agent"},
+        "t": "customer database",
+        "op": "read records",
+    }
+
+    app = FastAPI()
+    app.include_router(enforcement_v2.router, prefix="/api/v2")
+    with patch.object(enforcement_v2, "db_infra_client", db_infra), \
+         patch.object(enforcement_v2, "_enforce_for_agent", fake_enforce), \
+         TestClient(app) as client:
+        with client.websocket_connect(
+            "/api/v2/enforce/ws",
+            headers={"Authorization": "Bearer runtime-key"},
+        ) as ws:
+            ws.send_json({"event": event, "evidence": "summary"})
+            summary = ws.receive_json()
+            ws.send_json({"event": event, "evidence": "decision"})
+            decision = ws.receive_json()
+            ws.send_json({"event": event, "evidence": "everything"})
+            invalid = ws.receive_json()
+
+    (evidence,) = summary["response"]["evidence"]
+    assert evidence["boundary_id"] == "policy-1"
+    assert evidence["connection_result"] is None
+    assert evidence["deterministic_results"] == []
+    assert decision["response"]["evidence"] == []
+    assert invalid["status"] == 422
+    assert levels == ["summary", "decision"]
@@ -0,0 +1,116 @@
+"""Tests for enforcement metrics and Server-Timing rendering."""
+
+from __future__ import annotations
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from unittest.mock import MagicMock, patch
+
+from app.endpoints import enforcement_v2, metrics as metrics_endpoint
+from app.metrics import ENFORCEMENT_STAGE_SECONDS, MetricsRegistry, StageTimer
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = MetricsRegistry()
+    histogram = registry.histogram(
+        "test_latency_seconds",
+        "Test latency.",
+        ("stage",),
+        buckets=(0.01, 0.1),
+    )
+    histogram.observe(0.005, stage="encode")
+    histogram.observe(0.05, stage="encode")
+    histogram.observe(1.0, stage="encode")
+
+    text = registry.render()
+
+    assert "# TYPE test_latency_seconds histogram" in text
+    assert 'test_latency_seconds_bucket{stage="encode",le="0.01"} 1' in text
+    assert 'test_latency_seconds_bucket{stage="encode",le="0.1"} 2' in text
+    assert 'test_latency_seconds_bucket{stage="encode",le="+Inf"} 3' in text
+    assert 'test_latency_seconds_count{stage="encode"} 3' in text
+
+
+def test_counter_rejects_unknown_labels():
+    registry = MetricsRegistry()
+    counter = registry.counter("test_total", "Test counter.", ("decision",))
+    counter.inc(decision="ALLOW")
+    with pytest.raises(ValueError):
+        counter.inc(stage="encode")
+    assert counter.value(decision="ALLOW") == 1.0
+
+
+def test_stage_timer_accumulates_and_formats_server_timing():
+    before = ENFORCEMENT_STAGE_SECONDS.count(lane="live", stage="enablement")
+    timer = StageTimer()
+    with timer.stage("enablement"):
+        pass
+    with timer.stage("enablement"):
+        pass
+    with timer.stage("grpc"):
+        pass
+
+    header = timer.server_timing(total_ms=1.5)
+
+    assert ENFORCEMENT_STAGE_SECONDS.count(lane="live", stage="enablement") == before + 2
+    assert header.startswith("enablement;dur=")
+    assert "grpc;dur=" in header
+    assert header.endswith("total;dur=1.500")
+
+
+def test_metrics_endpoint_serves_prometheus_text():
+    app = FastAPI()
+    app.include_router(metrics_endpoint.router)
+    StageTimer().finish("ALLOW")
+
+    with TestClient(app) as client:
+        response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert "prism_enforcement_request_seconds_bucket" in response.text
+
+
+def test_enforce_sets_server_timing_and_latency():
+    app = FastAPI()
+    app.include_router(enforcement_v2.router, prefix="/api/v2")
+    db_infra = MagicMock()
+    db_infra.get_module_enablement.return_value = {"enabled": False}
+
+    with patch.object(enforcement_v2, "db_infra_client", db_infra), TestClient(app) as client:
+        response = client.post(
+            "/api/v2/enforce",
+            json={
+                "event_type": "tool_call",
+                "id": "evt-1",
+                "ts": 1700000000.0,
+                "identity": {"agent_id": "agent-1", "actor_type": "agent"},
+                "t": "customer database",
+                "op": "read records",
+            },
+        )
+
+    body = response.json()
+    assert response.status_code == 200
+    assert "enablement;dur=" in response.headers["server-timing"]
+    assert body["enforcement_latency_ms"] >= 0.0
+    assert body["metadata"]["request_id"]
+
+
+def test_persist_is_timed_as_its_own_stage():
+    timer = StageTimer()
+    with patch.object(enforcement_v2, "_write_enforcement_record") as write:
+        enforcement_v2._persist_enforcement_record(
+            agent_id="agent-1",
+            event=MagicMock(),
+            enforcement_response=MagicMock(),
+            decision_name="ALLOW",
+            dry_run=False,
+            agent_call_id="call-1",
+            request_id="req-1",
+            timer=timer,
+        )
+
+    assert "timer" not in write.call_args.kwargs
+    assert "persist" in timer.stage_ms()
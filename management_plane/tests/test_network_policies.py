@@ -0,0 +1,266 @@
+"""Tests for network policy matching, caching and bulk import."""
+
+from __future__ import annotations
+
+import random
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from unittest.mock import patch
+
+from app.endpoints import network_policies as network_policy_endpoints
+from app.models import NetworkContext, NetworkEndpointRule, NetworkPolicy
+from app.services import network_policies as network_policy_service
+from app.services import network_policy_evaluator
+from app.services.db_infra_client import DbInfraClient, DbInfraClientError
+from app.services.network_path_trie import PathTrie, compile_wildcard
+from app.services.network_policy_evaluator import (
+    NetworkPolicyMatcher,
+    evaluate_network_policies,
+    matches_endpoint_rule,
+)
+from app.services.openapi_whitelist import whitelist_from_openapi
+from tests_support import FakeDbInfraServer
+
+
+def _policy(policy_id: str, rules: list[tuple[str, str]], mode: str = "Enforce") -> NetworkPolicy:
+    now = time.time()
+    return NetworkPolicy(
+        policy_id=policy_id,
+        tenant_id="tenant-1",
+        agent_id="agent-1",
+        name=policy_id,
+        status="active",
+        mode=mode,
+        whitelist=[
+            NetworkEndpointRule(protocol="HTTPS", method=method, url=url)
+            for method, url in rules
+        ],
+        created_at=now,
+        updated_at=now,
+    )
+
+
+def _ctx(method: str, url: str, protocol: str = "HTTPS") -> NetworkContext:
+    return NetworkContext(protocol=protocol, method=method, url=url)
+
+
+def _first_match_by_loop(policies: list[NetworkPolicy], ctx: NetworkContext):
+    for policy in policies:
+        for rule in policy.whitelist:
+            if matches_endpoint_rule(rule, ctx):
+                return policy.policy_id, rule.url
+    return None
+
+
+@pytest.fixture(autouse=True)
+def _clear_matchers():
+    network_policy_evaluator._matcher_cache.clear()
+    yield
+    network_policy_evaluator._matcher_cache.clear()
+
+
+def test_matcher_agrees_with_the_per_rule_loop():
+    policies = [
+        _policy("wild", [("GET", "/api/users/*"), ("POST", "/api/*/profile")]),
+        _policy("exact", [("GET", "/api/users/42"), ("GET", "/api/health")], mode="Monitor"),
+        _policy("literal", [("GET", "/api/a.b/*")]),
+    ]
+    matcher = NetworkPolicyMatcher(policies)
+    contexts = [
+        _ctx("GET", "/api/users/42"),
+        _ctx("get", "/api/health"),
+        _ctx("POST", "/api/v1/profile"),
+        _ctx("POST", "/api/users/42"),
+        _ctx("GET", "/api/health", protocol="HTTP"),
+        _ctx("GET", "/api/aXb/c"),
+        _ctx("GET", "/api/a.b/c"),
+    ]
+
+    for ctx in contexts:
+        match = matcher.match(ctx)
+        got = (match[0].policy_id, match[1].url) if match else None
+        assert got == _first_match_by_loop(policies, ctx), ctx
+
+
+def test_matcher_is_cached_until_invalidated():
+    policies = [_policy("p1", [("GET", "/api/health")])]
+    with patch.object(
+        network_policy_service, "list_network_policies", return_value=policies
+    ) as list_policies:
+        for _ in range(3):
+            result = evaluate_network_policies("tenant-1", "agent-1", _ctx("GET", "/api/health"))
+            assert result.decision == "ALLOW"
+        assert list_policies.call_count == 1
+
+        network_policy_evaluator.invalidate_network_policy_matchers("tenant-1")
+        evaluate_network_policies("tenant-1", "agent-1", _ctx("GET", "/api/health"))
+        assert list_policies.call_count == 2
+
+
+def test_selected_policies_restrict_a_cached_matcher():
+    policies = [_policy("p1", [("GET", "/api/health")]), _policy("p2", [("GET", "/api/*")])]
+    with patch.object(network_policy_service, "list_network_policies", return_value=policies):
+        result = evaluate_network_policies(
+            "tenant-1", "agent-1", _ctx("GET", "/api/health"), selected_policy_ids=["p2"]
+        )
+
+    assert result.policy_id == "p2"
+
+
+def test_crud_endpoints_invalidate_cached_matchers():
+    app = FastAPI()
+    app.include_router(network_policy_endpoints.router)
+
+    with FakeDbInfraServer() as db_infra, patch.object(
+        network_policy_service, "db_infra_client", DbInfraClient(db_infra.base_url)
+    ):
+        client = TestClient(app)
+        denied = evaluate_network_policies("tenant-1", "agent-1", _ctx("GET", "/api/health"))
+        created = client.post(
+            "/api/v2/network-policies",
+            json={
+                "tenant_id": "tenant-1",
+                "agent_id": "agent-1",
+                "name": "health",
+                "whitelist": [{"protocol": "HTTPS", "method": "GET", "url": "/api/health"}],
+            },
+        )
+        allowed = evaluate_network_policies("tenant-1", "agent-1", _ctx("GET", "/api/health"))
+        client.delete(
+            f"/api/v2/network-policies/{created.json()['policy_id']}",
+            params={"tenant_id": "tenant-1"},
+        )
+        after_delete = evaluate_network_policies("tenant-1", "agent-1", _ctx("GET", "/api/health"))
+
+    assert denied.reason.startswith("No network policies defined")
+    assert allowed.decision == "ALLOW" and allowed.policy_name == "health"
+    assert after_delete.reason.startswith("No network policies defined")
+
+
+def test_path_trie_matches_wildcard_regex_exactly():
+    rng = random.Random(3)
+    pieces = ["api", "v1", "users", "42", "", "*", "**", "v*", "*.json", "a*b*c", "x"]
+    rules = [
+        "/".join(rng.choice(pieces) for _ in range(rng.randint(1, 5)))
+        for _ in range(300)
+    ]
+    urls = [
+        "/".join(rng.choice(["api", "v1", "v2", "users", "42", "", "a.json", "abxc", "x"])
+                 for _ in range(rng.randint(1, 6)))
+        for _ in range(500)
+    ]
+    trie: PathTrie[str] = PathTrie()
+    for index, rule in enumerate(rules):
+        trie.insert(rule, (index,), rule)
+    trie.freeze()
+
+    for url in urls:
+        expected = next(
+            (rule for rule in rules if compile_wildcard(rule).match(url)),
+            None,
+        )
+        found = trie.match(url)
+        assert (found[1] if found else None) == expected, url
+
+
+def _openapi_document(operation_count: int) -> dict:
+    paths = {
+        f"/resources{index}/{{id}}": {"get": {}, "delete": {}, "parameters": []}
+        for index in range(operation_count // 2)
+    }
+    paths["/health"] = {"get": {}, "head": {}}
+    return {
+        "openapi": "3.0.3",
+        "servers": [{"url": "https://api.example.com/v1"}],
+        "paths": paths,
+    }
+
+
+def test_openapi_document_becomes_whitelist_rules():
+    derived = whitelist_from_openapi(_openapi_document(4))
+
+    assert [(rule.method, rule.url) for rule in derived.rules] == [
+        ("GET", "/v1/resources0/*"),
+        ("DELETE", "/v1/resources0/*"),
+        ("GET", "/v1/resources1/*"),
+        ("DELETE", "/v1/resources1/*"),
+        ("GET", "/v1/health"),
+    ]
+    assert {rule.protocol for rule in derived.rules} == {"HTTPS"}
+    assert derived.skipped_operations == 1
+
+
+def test_bulk_import_writes_in_batches_and_serves_new_rules():
+    app = FastAPI()
+    app.include_router(network_policy_endpoints.router)
+
+    with FakeDbInfraServer() as db_infra, patch.object(
+        network_policy_service, "db_infra_client", DbInfraClient(db_infra.base_url)
+    ), patch.object(network_policy_service.config, "NETWORK_POLICY_IMPORT_BATCH_SIZE", 2):
+        client = TestClient(app)
+        evaluate_network_policies("tenant-1", "agent-1", _ctx("GET", "/v1/resources7/9"))
+        response = client.post(
+            "/api/v2/network-policies/import",
+            json={
+                "tenant_id": "tenant-1",
+                "policies": [
+                    {
+                        "agent_id": "agent-2",
+                        "name": "other agent",
+                        "whitelist": [{"protocol": "HTTPS", "method": "GET", "url": "/x"}] * 2,
+                    }
+                ],
+                "openapi": [
+                    {"agent_id": "agent-1", "name": "api", "document": _openapi_document(10_000)}
+                ],
+            },
+        )
+        writes = db_infra.request_count
+        allowed = evaluate_network_policies("tenant-1", "agent-1", _ctx("GET", "/v1/resources7/9"))
+        stored = len(db_infra.network_policies)
+
+    body = response.json()
+    assert response.status_code == 201, body
+    assert body["rule_count"] == 10_002
+    assert body["skipped_operations"] == 1
+    assert stored == 2
+    # One listing before, one batch write, one matcher rebuild per agent.
+    assert writes == 4
+    assert allowed.decision == "ALLOW" and allowed.policy_name == "api"
+
+
+def test_bulk_import_rejects_bad_documents_before_writing():
+    app = FastAPI()
+    app.include_router(network_policy_endpoints.router)
+    client = TestClient(app)
+
+    with patch.object(network_policy_service, "create_network_policies") as create:
+        response = client.post(
+            "/api/v2/network-policies/import",
+            json={
+                "tenant_id": "tenant-1",
+                "openapi": [{"agent_id": "agent-1", "name": "bad", "document": {"paths": {}}}],
+            },
+        )
+
+    assert response.status_code == 400
+    create.assert_not_called()
+
+
+def test_batch_write_falls_back_to_single_rows_without_batch_route():
+    policies = [_policy(f"p{index}", [("GET", "/api/health")]) for index in range(3)]
+    calls = []
+
+    def request_json(method, path, **kwargs):
+        calls.append(path)
+        if path.endswith("/batch"):
+            raise DbInfraClientError("not found", status_code=404)
+        return {}
+
+    with patch.object(network_policy_service.db_infra_client, "_request_json", side_effect=request_json):
+        network_policy_service.create_network_policies(policies)
+
+    assert calls.count("/api/v1/prism-management/network-policies") == 3
@@ -0,0 +1,296 @@
+"""Tests for bulk and single policy writes and their anchor encoding."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+import time
+import zlib
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+from app.auth import User
+from app.endpoints import policies_v2
+from app.models import PolicyBatchWriteRequest, PolicyWriteRequest, SemanticCondition
+from app.services import policies
+from app.services.anchor_cache import anchor_cache
+from app.services.db_infra_client import DbInfraClientError
+from app.services.policy_encoder import PolicyEncoder, RuleVector
+from app.services.semantic_encoder import SemanticEncoder
+from app.settings import config
+
+
+class _FakeModel:
+    """Deterministic stand-in for the sentence-transformers model."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def encode(self, texts, **kwargs):
+        self.calls += 1
+        batch = [texts] if isinstance(texts, str) else texts
+        rows = np.stack([
+            np.random.default_rng(zlib.crc32(text.encode())).standard_normal(384)
+            for text in batch
+        ]).astype(np.float32)
+        return rows[0] if isinstance(texts, str) else rows
+
+
+@pytest.fixture(autouse=True)
+def empty_anchor_cache():
+    anchor_cache.clear()
+    yield
+    anchor_cache.clear()
+
+
+@pytest.fixture
+def model():
+    fake = _FakeModel()
+    with patch.object(SemanticEncoder, "get_encoder_model", staticmethod(lambda *args: fake)):
+        yield fake
+
+
+def _run_batch(request: PolicyBatchWriteRequest):
+    """Run the batch endpoint and wait for its background data_intel send."""
+
+    async def run():
+        response = await policies_v2.batch_write_policies(
+            request, current_user=User(id="tenant-1")
+        )
+        await asyncio.gather(*policies_v2._intel_tasks)
+        return response
+
+    return asyncio.run(run())
+
+
+def _request(policy_id: str, agent_id: str, op: str = "export") -> PolicyWriteRequest:
+    return PolicyWriteRequest(
+        id=policy_id,
+        name=policy_id,
+        tenant_id="tenant-1",
+        agent_id=agent_id,
+        status="active",
+        policy_type="forbidden",
+        priority=10,
+        match={"op": op, "t": "customer records", "ctx": "production"},
+        thresholds={"action": 0.9, "resource": 0.9, "data": 0.9, "risk": 0.9},
+        scoring_mode="min",
+    )
+
+
+def test_encode_many_matches_per_boundary_encoding(model):
+    encoder = PolicyEncoder()
+    boundaries = [
+        policies_v2._boundary_from_request(_request(f"p{i}", "agent-a", op), "tenant-1", 0.0, 0.0)
+        for i, op in enumerate(("export", "delete", "export"))
+    ]
+
+    batched = encoder.encode_many(boundaries)
+
+    assert model.calls == 1
+    for boundary, rule_vector in zip(boundaries, batched):
+        single = encoder.encode(boundary)
+        np.testing.assert_allclose(rule_vector.to_numpy(), single.to_numpy(), atol=1e-6)
+        assert dict(rule_vector.anchor_counts) == dict(single.anchor_counts)
+
+
+def test_batch_write_reports_per_policy_results_and_installs_per_agent(model, tmp_path):
+    created_at = time.time() - 3600
+    existing = policies_v2._boundary_from_request(
+        _request("p2", "agent-a"), "tenant-1", created_at, created_at
+    )
+    written, stored = [], []
+
+    def fake_request_json(method, path, payload=None, **kwargs):
+        if path.endswith("/policies/batch"):
+            raise DbInfraClientError("not found", status_code=404)
+        if payload["policy_id"] == "p4":
+            raise DbInfraClientError("db_infra unavailable", status_code=503)
+        written.append(payload["policy_id"])
+        return {}
+
+    client = MagicMock()
+    client.install_policies.return_value = {"bridge_version": 2, "previous_bridge_version": 1}
+    request = PolicyBatchWriteRequest(policies=[
+        _request("p1", "agent-a"),
+        _request("p2", "agent-a", "delete"),
+        _request("p3", "agent-b"),
+        _request("p1", "agent-b"),
+        _request("p4", "agent-b"),
+    ])
+
+    with patch.object(policies_v2, "list_policy_records", return_value=[existing]), \
+         patch.object(policies_v2, "fetch_policy_anchors", return_value={}), \
+         patch.object(policies.db_infra_client, "_request_json", side_effect=fake_request_json), \
+         patch.object(policies, "upsert_rule_payloads", side_effect=lambda t, e: stored.extend(e)), \
+         patch.object(policies_v2, "get_policy_encoder", return_value=PolicyEncoder()), \
+         patch.object(policies_v2, "get_data_plane_client", return_value=client), \
+         patch.object(policies_v2, "sync_state", MagicMock()), \
+         patch.object(policies_v2, "emit_policy_event") as emit_single, \
+         patch.object(policies_v2.data_intel_client, "emit_batch_best_effort") as emit_batch, \
+         patch.object(config, "POLICY_AUDIT_LOG_DIR", str(tmp_path)):
+        response = _run_batch(request)
+
+    statuses = [(result.policy_id, result.status) for result in response.results]
+    assert statuses == [
+        ("p1", "created"),
+        ("p2", "updated"),
+        ("p3", "created"),
+        ("p1", "error"),
+        ("p4", "error"),
+    ]
+    assert (response.created, response.updated, response.failed) == (2, 1, 2)
+    assert response.results[1].policy.created_at == created_at
+    assert all(result.installed for result in response.results[:3])
+    assert response.results[4].error == "Policy record write failed"
+
+    assert model.calls == 1
+    assert sorted(written) == ["p1", "p2", "p3"]
+    assert [rule_id for rule_id, _, _ in stored] == ["p1", "p2", "p3"]
+    installs = {
+        call.args[0][0].agent_id: [boundary.id for boundary in call.args[0]]
+        for call in client.install_policies.call_args_list
+    }
+    assert installs == {"agent-a": ["p1", "p2"], "agent-b": ["p3"]}
+    (audit_log,) = tmp_path.iterdir()
+    assert len(audit_log.read_text().splitlines()) == 3
+
+    # Upserted, anchors encoded and installed for each written policy, sent as
+    # one data_intel batch instead of one request per event.
+    emit_single.assert_not_called()
+    (call,) = emit_batch.call_args_list
+    (events,) = call.args
+    assert len(events) == 9
+    assert {event["aggregate_id"] for event in events} == {"p1", "p2", "p3"}
+    assert all(event["schema_version"] for event in events)
+
+
+def test_single_policy_save_encodes_off_the_event_loop(tmp_path):
+    encode_threads = []
+
+    class _SlowEncoder:
+        def encode(self, boundary):
+            encode_threads.append(threading.current_thread().name)
+            time.sleep(0.2)
+            return RuleVector()
+
+    async def save_while_ticking():
+        ticks = 0
+
+        async def tick():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        ticker = asyncio.create_task(tick())
+        boundary = await policies_v2.create_policy(
+            _request("p1", "agent-a"), current_user=User(id="tenant-1")
+        )
+        ticker.cancel()
+        return boundary, ticks
+
+    with patch.object(policies_v2, "get_policy_encoder", return_value=_SlowEncoder()), \
+         patch.object(policies_v2, "create_policy_record"), \
+         patch.object(policies_v2, "upsert_policy_payload"), \
+         patch.object(policies_v2, "_install_to_dataplane", return_value=True), \
+         patch.object(policies_v2, "emit_policy_event"), \
+         patch.object(config, "POLICY_AUDIT_LOG_DIR", str(tmp_path)):
+        boundary, ticks = asyncio.run(save_while_ticking())
+
+    assert boundary.id == "p1"
+    assert encode_threads[0].startswith("prism-policy-encode")
+    assert ticks >= 10
+
+
+def test_mode_change_reuses_stored_anchors_and_skips_the_chroma_upsert(model, tmp_path):
+    encoder = PolicyEncoder()
+    existing = policies_v2._boundary_from_request(_request("p1", "agent-a"), "tenant-1", 0.0, 0.0)
+    stored = json.loads(json.dumps(policies.build_anchor_payload(encoder.encode(existing))))
+    anchor_cache.clear()
+    model.calls = 0
+
+    def save(handler, *args):
+        upsert = MagicMock()
+        with patch.object(policies_v2, "fetch_policy_record", return_value=existing), \
+             patch.object(policies_v2, "fetch_policy_anchors", return_value={"p1": stored}), \
+             patch.object(policies_v2, "get_policy_encoder", return_value=PolicyEncoder()), \
+             patch.object(policies_v2, "update_policy_record"), \
+             patch.object(policies_v2, "upsert_policy_payload", upsert), \
+             patch.object(policies_v2, "_install_to_dataplane", return_value=True), \
+             patch.object(policies_v2, "emit_policy_event"), \
+             patch.object(config, "POLICY_AUDIT_LOG_DIR", str(tmp_path)):
+            asyncio.run(handler(*args, current_user=User(id="tenant-1")))
+        return upsert
+
+    upsert = save(policies_v2.toggle_policy_status, "p1")
+    assert model.calls == 0
+    upsert.assert_not_called()
+
+    upsert = save(policies_v2.update_policy, "p1", _request("p1", "agent-a", "delete"))
+    assert model.calls == 1
+    (call,) = upsert.call_args_list
+    assert call.args[2]["anchors"]["hash"] != stored["hash"]
+    assert call.args[2]["anchors"]["resource_keys"] == stored["resource_keys"]
+
+
+def test_batch_write_encodes_semantic_conditions_with_the_rules_on_the_encoder_pool(
+    model, tmp_path
+):
+    encoder = PolicyEncoder()
+    encode_threads = []
+    real_encode = encoder.encode_many_with_conditions
+
+    def encode_many_with_conditions(*args):
+        encode_threads.append(threading.current_thread().name)
+        return real_encode(*args)
+
+    def with_conditions(policy_id: str, **parameters) -> PolicyWriteRequest:
+        return _request(policy_id, "agent-a").model_copy(update={
+            "semantic_conditions": [
+                SemanticCondition(
+                    condition_type="data_sensitivity",
+                    operator="not_similar_to",
+                    parameters=parameters,
+                )
+            ],
+        })
+
+    request = PolicyBatchWriteRequest(policies=[
+        with_conditions("p1", anchors=["credit card numbers", "passwords"]),
+        with_conditions("p2", anchors=["passwords"], target_slot="risk"),
+        with_conditions("p3", anchors=["passwords"], target_slot="nowhere"),
+    ])
+    client = MagicMock()
+    client.install_policies.return_value = {"bridge_version": 1, "previous_bridge_version": 0}
+
+    with patch.object(policies_v2, "list_policy_records", return_value=[]), \
+         patch.object(policies_v2, "write_policy_records", return_value={}), \
+         patch.object(policies_v2, "upsert_policy_payloads"), \
+         patch.object(encoder, "encode_many_with_conditions", encode_many_with_conditions), \
+         patch.object(policies_v2, "get_policy_encoder", return_value=encoder), \
+         patch.object(policies_v2, "get_data_plane_client", return_value=client), \
+         patch.object(policies_v2, "sync_state", MagicMock()), \
+         patch.object(policies_v2, "emit_policy_event") as emit_single, \
+         patch.object(policies_v2.data_intel_client, "emit_batch_best_effort") as emit_batch, \
+         patch.object(config, "POLICY_AUDIT_LOG_DIR", str(tmp_path)):
+        response = _run_batch(request)
+
+    assert [result.status for result in response.results] == ["created", "created", "error"]
+    assert "target_slot" in response.results[2].error
+    assert model.calls == 1
+    assert encode_threads == [encode_threads[0]]
+    assert encode_threads[0].startswith("prism-policy-encode")
+
+    (condition,) = response.results[0].policy.semantic_conditions
+    assert condition.parameters["anchor_count"] == 2
+    assert condition.parameters["condition_role"] == "guard"
+    anchor_cache.clear()
+    expected, _ = encoder.encode_condition_anchors(["credit card numbers", "passwords"], "data")
+    np.testing.assert_allclose(condition.parameters["anchor_vectors"], expected, atol=1e-6)
+    (condition,) = response.results[1].policy.semantic_conditions
+    assert condition.parameters["anchor_count"] == 1
+    assert condition.parameters["target_slot"] == "risk"
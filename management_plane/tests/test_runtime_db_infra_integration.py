@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import os
 import sys
+import tempfile
 import types
 from pathlib import Path
 import unittest
@@ -105,6 +106,8 @@ fake_rule_installation_pb2.AnchorVector = AnchorVector
 fake_rule_installation_pb2.ParamValue = ParamValue
 fake_rule_installation_pb2.RuleAnchorsPayload = RuleAnchorsPayload
 fake_rule_installation_pb2.RuleInstance = RuleInstance
+fake_rule_installation_pb2.VECTOR_ENCODING_FLOAT32 = 0
+fake_rule_installation_pb2.VECTOR_ENCODING_FLOAT16 = 1
 fake_generated_pkg.rule_installation_pb2 = fake_rule_installation_pb2
 sys.modules.setdefault("app.generated", fake_generated_pkg)
 sys.modules.setdefault(
@@ -113,6 +116,9 @@ sys.modules.setdefault(
 )
 
 from app.main import app
+from app.services.db_infra_client import db_infra_client
+from app.services.policy_encoder import RuleVector
+from app.settings import config
 from tests_support.fake_db_infra_server import FakeDbInfraServer
 
 
@@ -161,14 +167,25 @@ class PrismManagementRuntimeIntegrationTest(unittest.TestCase):
 
         mock_future = MagicMock()
         mock_future.result.return_value = None
+        audit_dir = tempfile.TemporaryDirectory()
 
         try:
-            with patch("app.endpoints.health.grpc.channel_ready_future", return_value=mock_future), \
+            # db_infra_client is built from the environment at import, before
+            # DB_INFRA_BASE_URL above is set.
+            with patch.object(db_infra_client, "_base_url", server.base_url), \
+                 patch("app.endpoints.health.grpc.channel_ready_future", return_value=mock_future), \
                  patch("app.endpoints.health.grpc.insecure_channel"), \
-                 patch("app.endpoints.policies_v2._persist_anchor_payload", return_value=object()), \
+                 patch(
+                     "app.endpoints.policies_v2._encode_policy",
+                     side_effect=lambda boundary, stored_anchors=None: (boundary, RuleVector()),
+                 ), \
+                 patch("app.endpoints.policies_v2._stored_anchors", return_value=None), \
+                 patch("app.endpoints.policies_v2._persist_anchor_payload"), \
                  patch("app.endpoints.policies_v2._install_to_dataplane"), \
                  patch("app.endpoints.policies_v2.get_data_plane_client") as get_dp_client, \
-                 patch("app.endpoints.policies_v2.delete_policy_payload"):
+                 patch("app.endpoints.policies_v2.delete_policy_payload"), \
+                 patch("app.endpoints.policies_v2.sync_state"), \
+                 patch.object(config, "POLICY_AUDIT_LOG_DIR", audit_dir.name):
 
                 get_dp_client.return_value.remove_policy.return_value = {
                     "success": True,
@@ -219,3 +236,4 @@ class PrismManagementRuntimeIntegrationTest(unittest.TestCase):
             os.environ.pop("DB_INFRA_BASE_URL", None)
             os.environ.pop("DB_INFRA_TIMEOUT_SECONDS", None)
             server.stop()
+            audit_dir.cleanup()
@@ -0,0 +1,178 @@
+"""Tests for the hermetic db_infra, data_intel and data plane stand-ins."""
+
+from __future__ import annotations
+
+import time
+
+import httpx
+import numpy as np
+import pytest
+from unittest.mock import patch
+
+from app.models import AgentIdentity, DesignBoundary, IntentEvent
+from app.services import session_store
+from app.services.db_infra_client import DbInfraClient
+from app.services.dataplane_client import DataPlaneClient
+from app.services.policy_encoder import RuleVector
+from tests_support import FakeDataIntelServer, FakeDbInfraServer
+from tests_support.fake_data_plane_server import FakeDataPlaneServer
+
+
+@pytest.fixture
+def db_infra():
+    with FakeDbInfraServer() as server:
+        yield server
+
+
+def test_db_infra_standin_serves_session_store(db_infra: FakeDbInfraServer):
+    client = DbInfraClient(db_infra.base_url)
+    with patch.object(session_store, "db_infra_client", client):
+        session_store.write_call("agent-1", "evt-1", "read", "PENDING", "PENDING")
+        session_store.initialize_session_vector("agent-1", [1.0, 0.0])
+        drift = session_store.compute_and_update_drift("agent-1", [0.0, 1.0])
+        session_store.insert_call(
+            event_id="evt-1",
+            agent_id="agent-1",
+            agent_call_id="call-1",
+            ts_ms=1700000000000,
+            prism_decision="DENY",
+            enforced_decision="DENY",
+            op="read",
+            t="db",
+            enforcement_result_json="{}",
+        )
+        calls, total = session_store.list_calls(agent_id="agent-1")
+        runs, _ = session_store.list_call_runs()
+
+    assert drift == pytest.approx(1.0)
+    assert total == 1
+    assert calls[0]["decision"] == "DENY"
+    assert runs[0]["deny_count"] == 1
+    assert client.get_module_enablement("prism")["enabled"] is True
+    assert client.validate_runtime_credential("any-key")["tenant_id"] == "standin-tenant"
+
+
+def test_db_infra_standin_injects_latency(db_infra: FakeDbInfraServer):
+    db_infra.latency.latency_ms = 50
+    client = DbInfraClient(db_infra.base_url)
+
+    started = time.perf_counter()
+    client.get_module_enablement("prism")
+
+    assert time.perf_counter() - started >= 0.05
+    assert db_infra.request_count == 1
+
+
+def test_data_intel_standin_accepts_batches():
+    with FakeDataIntelServer() as server:
+        response = httpx.post(
+            f"{server.base_url}/api/v1/prism/events/batch",
+            json={"events": [{"event_id": "e1"}, {"event_id": "e2"}]},
+        )
+
+    assert response.json()["accepted"] == 2
+    assert [event["event_id"] for event in server.events] == ["e1", "e2"]
+
+
+def _boundary() -> DesignBoundary:
+    now = time.time()
+    return DesignBoundary(
+        id="block-export",
+        name="Block export",
+        tenant_id="tenant-1",
+        agent_id="agent-1",
+        status="active",
+        policy_type="forbidden",
+        priority=10,
+        match={"op": "export", "t": "customer records"},
+        thresholds={"action": 0.9, "resource": 0.9, "data": 0.9, "risk": 0.9},
+        scoring_mode="min",
+        created_at=now,
+        updated_at=now,
+    )
+
+
+def test_data_plane_standin_installs_and_enforces():
+    anchor = np.zeros(32, dtype=np.float32)
+    anchor[0] = 1.0
+    rule_vector = RuleVector()
+    for layer in ("action", "resource", "data", "risk"):
+        rule_vector.set_layer(layer, anchor.reshape(1, 32), 1)
+
+    intent = IntentEvent(
+        event_type="tool_call",
+        id="evt-1",
+        tenant_id="tenant-1",
+        ts=time.time(),
+        identity=AgentIdentity(agent_id="agent-1", actor_type="agent"),
+        op="export",
+        t="customer records",
+    )
+    matching = np.tile(anchor, 4).tolist()
+    orthogonal = np.roll(np.tile(anchor, 4), 1).tolist()
+
+    with FakeDataPlaneServer() as server:
+        client = DataPlaneClient(url=server.address)
+        client.install_policies([_boundary()], [rule_vector])
+        denied = client.enforce(intent, matching, "req-1")
+        allowed = client.enforce(intent, orthogonal, "req-2")
+
+    assert denied.decision_name == "DENY"
+    assert allowed.decision_name == "ALLOW"
+    assert server.servicer.enforce_count == 2
+
+
+def test_data_plane_reinstall_is_one_replace():
+    anchor = np.zeros(32, dtype=np.float32)
+    anchor[0] = 1.0
+    rule_vector = RuleVector()
+    for layer in ("action", "resource", "data", "risk"):
+        rule_vector.set_layer(layer, anchor.reshape(1, 32), 1)
+
+    with FakeDataPlaneServer() as server:
+        client = DataPlaneClient(url=server.address)
+        first = client.install_policies([_boundary()], [rule_vector])
+        second = client.install_policies([_boundary()], [rule_vector])
+
+    # One bridge update per install, no RemovePolicy round trips in between.
+    assert first["bridge_version"] == 1
+    assert second["previous_bridge_version"] == 1
+    assert second["bridge_version"] == 2
+    assert sum(len(rules) for rules in server.servicer.rules.values()) == 1
+
+
+def test_replace_skips_a_bad_rule_and_installs_the_rest(tmp_path):
+    from app.endpoints import policies_v2
+    from app.services.dataplane_sync_state import DataPlaneSyncState
+
+    anchor = np.zeros(32, dtype=np.float32)
+    anchor[0] = 1.0
+    good = RuleVector()
+    for layer in ("action", "resource", "data", "risk"):
+        good.set_layer(layer, anchor.reshape(1, 32), 1)
+    bad = RuleVector()
+    for layer in ("action", "resource", "data", "risk"):
+        bad.set_layer(layer, anchor.reshape(1, 32), 1)
+    bad.anchor_counts["action"] = 17
+
+    boundaries = [
+        _boundary().model_copy(update={"id": policy_id}) for policy_id in ("p0", "p1", "p2")
+    ]
+    state = DataPlaneSyncState(str(tmp_path / "sync_state.json"))
+    with FakeDataPlaneServer() as server:
+        client = DataPlaneClient(url=server.address)
+        client.install_policies([boundaries[1]], [good])
+        before = server.servicer.rules["agent-1"]["p1"]
+
+        with patch.object(policies_v2, "get_data_plane_client", return_value=client), \
+             patch.object(policies_v2, "sync_state", state):
+            installed = policies_v2._install_batch_to_dataplane(
+                [boundaries[0], boundaries[1].model_copy(update={"priority": 99}), boundaries[2]],
+                [good, bad, good],
+            )
+
+    # The valid rules land in the same swap; the bad one keeps its old version.
+    assert installed == {"p0", "p2"}
+    assert sorted(server.servicer.rules["agent-1"]) == ["p0", "p1", "p2"]
+    assert server.servicer.rules["agent-1"]["p1"] == before
+    assert sorted(state.installed()) == ["p0", "p2"]
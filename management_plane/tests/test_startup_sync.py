@@ -0,0 +1,247 @@
+"""Tests for the batched startup sync of active policies into the data plane."""
+
+from __future__ import annotations
+
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from app import rule_installer
+from app.models import DesignBoundary
+from app.services import dataplane_sync_state, policies
+from app.services.dataplane_sync_state import DataPlaneSyncState
+from app.settings import config
+from tests_support.fake_data_plane_server import FakeDataPlaneServer
+
+_ANCHORS = {
+    f"{slot}_{suffix}": value
+    for slot in ("action", "resource", "data", "risk")
+    for suffix, value in (("anchors", [[1.0] + [0.0] * 31]), ("count", 1))
+}
+
+
+def _boundary(policy_id: str, tenant_id: str, agent_id: str) -> DesignBoundary:
+    now = time.time()
+    return DesignBoundary(
+        id=policy_id,
+        name=policy_id,
+        tenant_id=tenant_id,
+        agent_id=agent_id,
+        status="active",
+        policy_type="forbidden",
+        priority=10,
+        match={"op": "export", "t": "customer records"},
+        thresholds={"action": 0.9, "resource": 0.9, "data": 0.9, "risk": 0.9},
+        scoring_mode="min",
+        created_at=now,
+        updated_at=now,
+    )
+
+
+@pytest.fixture(autouse=True)
+def state_path(tmp_path):
+    path = str(tmp_path / "sync_state.json")
+    with patch.object(dataplane_sync_state, "sync_state", DataPlaneSyncState(path)), \
+         patch.object(rule_installer, "_verify_cursor", None):
+        yield path
+
+
+def _run_sync(server: FakeDataPlaneServer, boundaries: list[DesignBoundary], fetches: list):
+    stored = {boundary.id: boundary for boundary in boundaries}
+
+    def fake_fetch(tenant_id: str, rule_ids: list[str]) -> dict:
+        fetches.extend(rule_ids)
+        return {
+            rule_id: {"boundary": stored[rule_id].model_dump(), "anchors": _ANCHORS}
+            for rule_id in rule_ids
+        }
+
+    with patch.object(
+        policies, "list_policy_records", return_value=boundaries
+    ), patch.object(rule_installer, "fetch_rule_payloads", side_effect=fake_fetch), patch.object(
+        config, "data_plane_url", server.address
+    ):
+        return rule_installer.sync_active_policies_to_dataplane()
+
+
+def test_startup_sync_batches_fetches_and_installs_per_agent():
+    boundaries = [
+        _boundary(f"{agent}-p{index}", tenant, agent)
+        for tenant, agent, count in (("t1", "a1", 5), ("t1", "a2", 2), ("t2", "a3", 1))
+        for index in range(count)
+    ]
+    stored = {boundary.id: boundary for boundary in boundaries}
+    missing = "a1-p4"
+    fetches: list[tuple[str, list[str]]] = []
+    lock = threading.Lock()
+
+    def fake_fetch(tenant_id: str, rule_ids: list[str]) -> dict:
+        with lock:
+            fetches.append((tenant_id, list(rule_ids)))
+        return {
+            rule_id: {"boundary": stored[rule_id].model_dump(), "anchors": _ANCHORS}
+            for rule_id in rule_ids
+            if rule_id != missing
+        }
+
+    with FakeDataPlaneServer() as server, patch.object(
+        policies, "list_policy_records", return_value=boundaries
+    ), patch.object(rule_installer, "fetch_rule_payloads", side_effect=fake_fetch), patch.object(
+        config, "data_plane_url", server.address
+    ), patch.object(config, "STARTUP_SYNC_BATCH_SIZE", 3), patch.object(
+        config, "STARTUP_SYNC_CONCURRENCY", 4
+    ):
+        report = rule_installer.sync_active_policies_to_dataplane()
+
+    assert report is not None
+    assert (report.policies, report.synced, report.errors) == (8, 7, 1)
+    assert (report.agents, report.batches) == (3, 4)
+    # One Chroma get per batch, each batch from a single tenant and agent.
+    assert sorted(len(ids) for _, ids in fetches) == [1, 2, 2, 3]
+    assert all(len({rule_id.split("-")[0] for rule_id in ids}) == 1 for _, ids in fetches)
+    # One install RPC per batch.
+    assert server.servicer.bridge_version == 4
+    assert {agent: len(rules) for agent, rules in server.servicer.rules.items()} == {
+        "a1": 4,
+        "a2": 2,
+        "a3": 1,
+    }
+
+
+def test_restart_installs_only_changed_policies(state_path: str):
+    boundaries = [_boundary(f"p{index}", "t1", "a1") for index in range(3)]
+
+    with FakeDataPlaneServer() as server:
+        first = _run_sync(server, boundaries, [])
+        assert (first.mode, first.synced) == ("full", 3)
+
+        # A restarted management plane reloads the state from disk.
+        fetches: list[str] = []
+        with patch.object(dataplane_sync_state, "sync_state", DataPlaneSyncState(state_path)):
+            second = _run_sync(server, boundaries, fetches)
+        assert (second.mode, second.synced, second.unchanged) == ("incremental", 0, 3)
+        assert fetches == []
+        assert server.servicer.bridge_version == 1
+
+        changed = boundaries[0].model_copy(update={"priority": 99})
+        active = [changed, boundaries[1], _boundary("p3", "t1", "a1")]
+        third = _run_sync(server, active, fetches)
+
+    assert third.mode == "incremental"
+    assert (third.synced, third.unchanged, third.removed) == (2, 1, 1)
+    assert sorted(fetches) == ["p0", "p3"]
+    assert sorted(server.servicer.rules["a1"]) == ["p0", "p1", "p3"]
+    assert server.servicer.rules["a1"]["p0"].priority == 99
+
+
+def test_recorded_writes_append_to_journal_and_replay(state_path: str):
+    state = DataPlaneSyncState(state_path)
+    state.reset(1234, 0)
+    with open(state_path, "rb") as handle:
+        snapshot = handle.read()
+
+    state.record_installed([_boundary("p0", "t1", "a1"), _boundary("p1", "t1", "a1")], 0, 1)
+    state.record_removed(["p1"], 1, 2)
+    state.record_installed([_boundary("p2", "t1", "a2")], 2, 3)
+
+    # Writes only append; the snapshot is left alone until compaction.
+    with open(state_path, "rb") as handle:
+        assert handle.read() == snapshot
+    with open(f"{state_path}.journal", encoding="utf-8") as handle:
+        assert len(handle.readlines()) == 3
+
+    reloaded = DataPlaneSyncState(state_path)
+    assert reloaded.matches(1234, 3)
+    assert reloaded.installed() == state.installed()
+    assert sorted(reloaded.installed()) == ["p0", "p2"]
+
+    # Journal lines from before the last snapshot are ignored, e.g. after a
+    # crash between writing the snapshot and emptying the journal.
+    with open(f"{state_path}.journal", encoding="utf-8") as handle:
+        stale = handle.read()
+    state.rebase(1234, 3)
+    with open(f"{state_path}.journal", "w", encoding="utf-8") as handle:
+        handle.write(stale)
+    assert sorted(DataPlaneSyncState(state_path).installed()) == ["p0", "p2"]
+
+
+def test_unrecorded_write_forces_full_sync():
+    boundaries = [_boundary("p0", "t1", "a1")]
+
+    with FakeDataPlaneServer() as server:
+        _run_sync(server, boundaries, [])
+        # Someone else bumps the bridge version behind our back.
+        server.servicer.bridge_version += 1
+        report = _run_sync(server, boundaries, [])
+
+    assert (report.mode, report.synced) == ("full", 1)
+
+
+def _reconcile(server: FakeDataPlaneServer, active: list[DesignBoundary]):
+    fetches: list[str] = []
+    stored = {boundary.id: boundary for boundary in active}
+
+    def fake_fetch(tenant_id: str, rule_ids: list[str]) -> dict:
+        fetches.extend(rule_ids)
+        return {
+            rule_id: {"boundary": stored[rule_id].model_dump(), "anchors": _ANCHORS}
+            for rule_id in rule_ids
+        }
+
+    with patch.object(policies, "list_policy_records", return_value=active), patch.object(
+        rule_installer, "fetch_rule_payloads", side_effect=fake_fetch
+    ), patch.object(config, "data_plane_url", server.address), patch.object(
+        config, "RECONCILE_MAX_REPAIRS_PER_CYCLE", 1
+    ):
+        return rule_installer.reconcile_dataplane(), fetches
+
+
+def test_reconcile_repairs_drift_within_budget():
+    boundaries = [_boundary("p0", "t1", "a1")]
+    installed_before = rule_installer.RECONCILE_REPAIRS_TOTAL.value(action="installed")
+    reconcile = _reconcile
+
+    with FakeDataPlaneServer() as server:
+        _run_sync(server, boundaries, [])
+        # Two writes whose data plane installs failed.
+        active = boundaries + [_boundary("p1", "t1", "a1"), _boundary("p2", "t1", "a2")]
+
+        first, first_fetches = reconcile(server, active)
+        assert (first.drift, first.synced, first.deferred) == (2, 1, 1)
+        assert rule_installer.RECONCILE_DRIFT_POLICIES.value() == 2
+
+        second, _ = reconcile(server, active)
+        assert (second.drift, second.synced, second.deferred) == (1, 1, 0)
+
+        clean, clean_fetches = reconcile(server, active)
+
+    assert (clean.mode, clean.drift, clean.synced) == ("incremental", 0, 0)
+    assert len(first_fetches) == 1 and clean_fetches == []
+    assert sum(len(rules) for rules in server.servicer.rules.values()) == 3
+    assert rule_installer.RECONCILE_REPAIRS_TOTAL.value(action="installed") == installed_before + 2
+    assert 0 <= rule_installer.RECONCILE_LAG_SECONDS.value() < 5
+
+
+def test_reconcile_walks_every_policy_when_another_writer_moves_the_version():
+    boundaries = [_boundary(f"p{i}", "t1", "a1") for i in range(3)]
+
+    with FakeDataPlaneServer() as server:
+        _run_sync(server, boundaries, [])
+        windows = []
+        for _ in range(3):
+            # Another replica writes between every run.
+            server.servicer.bridge_version += 1
+            report, fetches = _reconcile(server, boundaries)
+            windows.append((report.mode, report.synced, report.deferred, fetches))
+        caught_up, fetches = _reconcile(server, boundaries)
+
+    assert windows == [
+        ("verify", 1, 2, ["p0"]),
+        ("verify", 1, 1, ["p1"]),
+        ("verify", 1, 0, ["p2"]),
+    ]
+    assert 0 <= rule_installer.RECONCILE_LAG_SECONDS.value() < 5
+    # The completed pass rebased the sync state, so the recorded hashes count again.
+    assert (caught_up.mode, caught_up.drift, fetches) == ("incremental", 0, [])
@@ -0,0 +1,104 @@
+"""Tests for the typed protobuf intent and policy evaluation on the Enforce RPC."""
+
+from __future__ import annotations
+
+import json
+from unittest.mock import MagicMock
+
+from app.generated.rule_installation_pb2 import (
+    EnforceResponse,
+    PolicyEvaluation,
+    RuleEvidence,
+)
+from app.models import AgentIdentity, IntentEvent, SessionContext
+from app.services.dataplane_client import DataPlaneClient
+
+
+def _intent(**overrides) -> IntentEvent:
+    fields = dict(
+        event_type="tool_call",
+        id="evt-1",
+        tenant_id="tenant-1",
+        ts=1700000000.0,
+        identity=AgentIdentity(agent_id="agent-1", actor_type="agent"),
+        op="export",
+        t="customer records",
+        source_layer="llm",
+        destination_layer="tool",
+        tool_name="db_export",
+        params={"payload_bytes": 2048, "output_channel": "email"},
+        ctx=SessionContext(data_classifications=["pii"]),
+        dry_run_rule_ids=["policy-1"],
+    )
+    fields.update(overrides)
+    return IntentEvent(**fields)
+
+
+def _enforce_request(intent: IntentEvent):
+    client = DataPlaneClient.__new__(DataPlaneClient)
+    client.token = None
+    client.timeout = 1.0
+    client.stub = MagicMock()
+    client.stub.Enforce.return_value = EnforceResponse(
+        decision=1, decision_name="ALLOW", slice_similarities=[1.0, 1.0, 1.0, 1.0]
+    )
+    client.enforce(intent, [], "req-1")
+    return client.stub.Enforce.call_args.args[0]
+
+
+def test_intent_is_sent_typed_and_matches_the_json_payload():
+    intent = _intent()
+    request = _enforce_request(intent)
+
+    assert request.HasField("intent")
+    assert request.intent_event_json == ""
+    typed = request.intent
+    document = json.loads(DataPlaneClient._to_dataplane_payload(None, intent))
+    assert typed.id == document["id"]
+    assert typed.tenant_id == document["tenantId"]
+    assert typed.actor.id == document["actor"]["id"]
+    assert typed.layer == document["layer"] == "tool"
+    assert typed.data.size_bytes == document["data"]["size_bytes"]
+    assert list(typed.data.sensitivity) == document["data"]["sensitivity"]
+    assert typed.risk.channel == document["risk"]["channel"]
+    assert json.loads(typed.context_json) == document["context"]
+    assert json.loads(typed.tool_params_json) == document["tool_params"]
+    assert not typed.HasField("rag_source_id")
+
+
+def test_values_the_message_cannot_hold_fall_back_to_json():
+    request = _enforce_request(_intent(params={"payload_bytes": "2kb"}))
+
+    assert not request.HasField("intent")
+    assert json.loads(request.intent_event_json)["data"]["size_bytes"] == "2kb"
+
+
+def test_typed_policy_evaluation_replaces_connection_result_json():
+    response = EnforceResponse(
+        decision=0,
+        decision_name="DENY",
+        slice_similarities=[0.9, 0.8, 0.7, 0.6],
+        evidence=[
+            RuleEvidence(
+                rule_id="policy-1",
+                rule_name="No exports",
+                decision=0,
+                similarities=[0.9, 0.8, 0.7, 0.6],
+                scoring_mode="min",
+                policy=PolicyEvaluation(
+                    policy_mode="Monitor",
+                    policy_type="forbidden",
+                    policy_drift_score=0.25,
+                ),
+            )
+        ],
+    )
+    client = DataPlaneClient.__new__(DataPlaneClient)
+
+    result = client._convert_response(response, "summary")
+
+    (evidence,) = result.evidence
+    assert evidence.policy_mode == "Monitor"
+    assert evidence.policy_type == "forbidden"
+    assert result.policy_drift_score == 0.25
+    assert result.policy_similarity_score is None
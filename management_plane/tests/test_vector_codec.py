@@ -0,0 +1,88 @@
+"""Tests for packed vector encodings on the wire and in stored anchor payloads."""
+
+from __future__ import annotations
+
+import json
+
+import numpy as np
+
+from app.rule_installer import _rule_vector_from_anchors
+from app.services.policies import build_anchor_payload
+from app.services.policy_converter import PolicyConverter
+from app.services.policy_encoder import RuleVector
+from app.services.vector_codec import pack_vectors, unpack_vectors
+
+
+def _rule_vector() -> RuleVector:
+    rule_vector = RuleVector()
+    rng = np.random.default_rng(7)
+    for slot, count in (("action", 2), ("resource", 1), ("data", 0), ("risk", 3)):
+        block = np.zeros((16, 32), dtype=np.float32)
+        block[:count] = rng.standard_normal((count, 32))
+        rule_vector.set_layer(slot, block, count)
+    return rule_vector
+
+
+def test_pack_round_trips_float32_as_a_view_and_float16_approximately():
+    vector = np.linspace(-1.0, 1.0, 128, dtype=np.float32)
+
+    packed = pack_vectors(vector)
+    assert len(packed) == 128 * 4
+    restored = unpack_vectors(packed)
+    assert not restored.flags.writeable
+    np.testing.assert_array_equal(restored, vector)
+
+    half = pack_vectors(vector, "float16")
+    assert len(half) == 128 * 2
+    np.testing.assert_allclose(unpack_vectors(half, "float16"), vector, atol=1e-3)
+
+
+def test_anchor_payload_ships_only_populated_rows():
+    rule_vector = _rule_vector()
+
+    payload = PolicyConverter.rule_vector_to_anchor_payload(rule_vector)
+
+    assert len(payload.action_anchors) == 0
+    assert len(payload.action_packed) == 2 * 32 * 4
+    assert payload.data_packed == b""
+    np.testing.assert_array_equal(
+        unpack_vectors(payload.risk_packed, width=32), rule_vector.layers["risk"][:3]
+    )
+    assert payload.risk_count == 3
+
+
+def test_stored_anchor_payload_round_trips_and_reads_legacy_lists():
+    rule_vector = _rule_vector()
+
+    stored = json.loads(json.dumps(build_anchor_payload(rule_vector)))
+    legacy = {
+        f"{slot}_{key}": value
+        for slot in ("action", "resource", "data", "risk")
+        for key, value in (
+            ("anchors", rule_vector.layers[slot].tolist()),
+            ("count", rule_vector.anchor_counts[slot]),
+        )
+    }
+
+    for anchors in (stored, legacy):
+        restored = _rule_vector_from_anchors(anchors)
+        for slot in ("action", "resource", "data", "risk"):
+            np.testing.assert_array_equal(restored.layers[slot], rule_vector.layers[slot])
+            assert restored.anchor_counts[slot] == rule_vector.anchor_counts[slot]
+
+
+def test_rule_vector_layers_are_views_of_one_buffer():
+    rule_vector = _rule_vector()
+
+    assert rule_vector.data.shape == (4, 16, 32)
+    assert np.shares_memory(rule_vector.layers["risk"], rule_vector.to_numpy())
+    assert dict(rule_vector.anchor_counts) == {"action": 2, "resource": 1, "data": 0, "risk": 3}
+
+    rule_vector.set_layer("action", np.ones((1, 32), dtype=np.float32), 1)
+    assert rule_vector.layers["action"][0].sum() == 32
+    assert not rule_vector.layers["action"][1:].any()
+
+    restored = RuleVector.from_buffer(rule_vector.to_bytes(), rule_vector.counts)
+    assert not restored.data.flags.writeable
+    np.testing.assert_array_equal(restored.to_numpy(), rule_vector.to_numpy())
+    assert restored.anchor_counts["risk"] == 3
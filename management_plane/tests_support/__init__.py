@@ -0,0 +1,28 @@
+"""
+Hermetic local stand-ins for the services the management plane depends on.
+
+- FakeDbInfraServer: the db_infra HTTP routes used by session_store, policies,
+  network_policies, runtime auth and module enablement
+- FakeDataIntelServer: the data_intel batch ingest endpoint
+- FakeDataPlaneServer: the DataPlane gRPC service from rule_installation.proto
+  with a simple anchor-similarity evaluator
+
+Every stand-in runs in-process on an ephemeral local port and accepts an
+injected per-request latency so management-plane overhead can be measured on
+its own. ``python -m tests_support`` starts all three and prints the
+environment variables that point the management plane at them.
+
+FakeDataPlaneServer lives in ``tests_support.fake_data_plane_server`` and is
+not re-exported here because it needs the generated gRPC stubs
+(``make generate-proto``).
+"""
+
+from tests_support.fake_data_intel_server import FakeDataIntelServer
+from tests_support.fake_db_infra_server import FakeDbInfraServer
+from tests_support.latency import InjectedLatency
+
+__all__ = [
+    "FakeDataIntelServer",
+    "FakeDbInfraServer",
+    "InjectedLatency",
+]
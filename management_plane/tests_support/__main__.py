@@ -0,0 +1,79 @@
+"""
+Run all local stand-ins until interrupted.
+
+    python -m tests_support --latency-ms 2 --data-plane-latency-ms 1
+
+Prints the environment variables that point a management plane (or the
+``prism load`` tool's target) at the stand-ins.
+"""
+
+from __future__ import annotations
+
+import argparse
+import signal
+import threading
+
+from tests_support.fake_data_intel_server import FakeDataIntelServer
+from tests_support.fake_db_infra_server import FakeDbInfraServer
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m tests_support", description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--db-infra-port", type=int, default=0)
+    parser.add_argument("--data-intel-port", type=int, default=0)
+    parser.add_argument("--data-plane-port", type=int, default=0)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Injected db_infra latency per request")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Uniform jitter added to every stand-in")
+    parser.add_argument("--data-intel-latency-ms", type=float, default=0.0)
+    parser.add_argument("--data-plane-latency-ms", type=float, default=0.0)
+    parser.add_argument("--no-data-plane", action="store_true", help="Do not start the gRPC stand-in")
+    args = parser.parse_args()
+
+    db_infra = FakeDbInfraServer(
+        host=args.host, port=args.db_infra_port, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms
+    )
+    data_intel = FakeDataIntelServer(
+        host=args.host,
+        port=args.data_intel_port,
+        latency_ms=args.data_intel_latency_ms,
+        jitter_ms=args.jitter_ms,
+    )
+    servers = [db_infra, data_intel]
+    data_plane = None
+    if not args.no_data_plane:
+        from tests_support.fake_data_plane_server import FakeDataPlaneServer
+
+        data_plane = FakeDataPlaneServer(
+            host=args.host,
+            port=args.data_plane_port,
+            latency_ms=args.data_plane_latency_ms,
+            jitter_ms=args.jitter_ms,
+        )
+        servers.append(data_plane)
+
+    for server in servers:
+        server.start()
+    env = {
+        "DB_INFRA_BASE_URL": db_infra.base_url,
+        "DATA_INTEL_BASE_URL": data_intel.base_url,
+    }
+    if data_plane is not None:
+        env["DATA_PLANE_URL"] = data_plane.address
+
+    for key, value in env.items():
+        print(f"export {key}={value}")
+    print("# stand-ins running; Ctrl-C to stop", flush=True)
+
+    stopped = threading.Event()
+    signal.signal(signal.SIGINT, lambda *_: stopped.set())
+    signal.signal(signal.SIGTERM, lambda *_: stopped.set())
+    try:
+        stopped.wait()
+    finally:
+        for server in reversed(servers):
+            server.stop()
+
+
+if __name__ == "__main__":
+    main()
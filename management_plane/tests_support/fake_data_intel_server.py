@@ -0,0 +1,41 @@
+"""In-memory stand-in for the data_intel ingest API."""
+
+from __future__ import annotations
+
+import threading
+from typing import Any
+
+from tests_support.http_server import StandinHTTPServer
+
+
+class FakeDataIntelServer(StandinHTTPServer):
+    """Accepts POST /api/v1/prism/events/batch and keeps the events in memory."""
+
+    def __init__(
+        self,
+        *,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        max_events: int = 10_000,
+    ) -> None:
+        super().__init__(host=host, port=port, latency_ms=latency_ms, jitter_ms=jitter_ms)
+        self.max_events = max_events
+        self.events: list[dict[str, Any]] = []
+        self.accepted_count = 0
+        self._events_lock = threading.Lock()
+        self.route("GET", "/health", lambda p, q, b: (200, {"status": "ok"}))
+        self.route("POST", "/api/v1/prism/events/batch", self._ingest_batch)
+
+    def _ingest_batch(self, params, query, body):
+        events = (body or {}).get("events")
+        if not isinstance(events, list):
+            return 422, {"detail": "events must be a list"}
+        with self._events_lock:
+            self.accepted_count += len(events)
+            self.events.extend(events)
+            overflow = len(self.events) - self.max_events
+            if overflow > 0:
+                del self.events[:overflow]
+        return 200, {"accepted": len(events), "rejected": 0}
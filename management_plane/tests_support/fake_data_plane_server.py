@@ -0,0 +1,374 @@
+"""
+In-process stand-in for the Rust DataPlane gRPC service.
+
+Implements the rule_installation.proto service with a simple evaluator:
+each rule's per-slot similarity is the best cosine similarity between the
+intent's 32-dim slot and the rule's anchors, compared to the rule's
+thresholds. It is meant for measuring management-plane overhead, not for
+reproducing the Rust engine's decisions exactly.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import threading
+import time
+from concurrent import futures
+from typing import Any
+
+import grpc
+
+from app.generated import rule_installation_pb2 as pb2
+from app.generated import rule_installation_pb2_grpc as pb2_grpc
+from app.services.vector_codec import PROTO_ENCODINGS, unpack_vectors
+from tests_support.latency import InjectedLatency
+
+SLOTS = ("action", "resource", "data", "risk")
+SLOT_DIM = 32
+MAX_ANCHORS_PER_SLOT = 16
+_ENCODINGS = {value: name for name, value in PROTO_ENCODINGS.items()}
+
+# Policy types that decide the outcome when they match, in precedence order.
+_MATCH_DECISIONS = {
+    "forbidden": "DENY",
+    "context_deny": "DENY",
+    "context_defer": "DEFER",
+}
+
+
+def _cosine(a: list[float], b: list[float]) -> float:
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
+
+
+def _param_json(rule: pb2.RuleInstance, key: str, default: Any) -> Any:
+    if key not in rule.params:
+        return default
+    try:
+        return json.loads(rule.params[key].string_value)
+    except ValueError:
+        return default
+
+
+def _param_str(rule: pb2.RuleInstance, key: str, default: str = "") -> str:
+    if key not in rule.params:
+        return default
+    return rule.params[key].string_value or default
+
+
+class FakeDataPlaneServicer(pb2_grpc.DataPlaneServicer):
+    """Keeps installed rules per agent in memory and evaluates Enforce calls."""
+
+    def __init__(self, latency: InjectedLatency) -> None:
+        self.latency = latency
+        self.rules: dict[str, dict[str, pb2.RuleInstance]] = {}
+        self.bridge_version = 0
+        self.created_at_ms = int(time.time() * 1000)
+        self.enforce_count = 0
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Rule management
+    # ------------------------------------------------------------------
+
+    def InstallRules(self, request, context):
+        self.latency.sleep()
+        by_layer: dict[str, int] = {}
+        with self._lock:
+            agent_rules = self.rules.setdefault(request.agent_id, {})
+            for rule in request.rules:
+                agent_rules[rule.rule_id] = rule
+                by_layer[rule.layer] = by_layer.get(rule.layer, 0) + 1
+            self.bridge_version += 1
+            version = self.bridge_version
+        return pb2.InstallRulesResponse(
+            success=True,
+            message=f"Installed {len(request.rules)} rule(s)",
+            rules_installed=len(request.rules),
+            rules_by_layer=by_layer,
+            bridge_version=version,
+        )
+
+    def RemoveAgentRules(self, request, context):
+        self.latency.sleep()
+        with self._lock:
+            removed = len(self.rules.pop(request.agent_id, {}))
+            self.bridge_version += 1
+        return pb2.RemoveAgentRulesResponse(
+            success=True, message=f"Removed {removed} rule(s)", rules_removed=removed
+        )
+
+    def RemovePolicy(self, request, context):
+        self.latency.sleep()
+        with self._lock:
+            previous = self.bridge_version
+            removed = 1 if self.rules.get(request.agent_id, {}).pop(request.policy_id, None) else 0
+            self.bridge_version += removed
+            version = self.bridge_version
+        return pb2.RemovePolicyResponse(
+            success=bool(removed),
+            message=f"Removed {removed} rule(s)",
+            rules_removed=removed,
+            bridge_version=version,
+            previous_bridge_version=previous,
+        )
+
+    def ReplacePolicies(self, request, context):
+        self.latency.sleep()
+        by_layer: dict[str, int] = {}
+        with self._lock:
+            previous = self.bridge_version
+            if request.expected_bridge_version and request.expected_bridge_version != previous:
+                context.abort(
+                    grpc.StatusCode.ABORTED,
+                    f"Bridge version conflict: expected {request.expected_bridge_version}, "
+                    f"current {previous}",
+                )
+            # Like the bridge, skip rules that fail conversion and leave any
+            # installed version of them in place.
+            failed = [rule.rule_id for rule in request.rules if self._anchor_error(rule)]
+            upserts = [rule for rule in request.rules if rule.rule_id not in failed]
+            agent_rules = self.rules.setdefault(request.agent_id, {})
+            keep = {rule.rule_id for rule in request.rules}
+            drop = set(agent_rules) if request.replace_all else set(request.remove_rule_ids)
+            drop = {rule_id for rule_id in drop - keep if rule_id in agent_rules}
+            for rule_id in drop:
+                del agent_rules[rule_id]
+            for rule in upserts:
+                agent_rules[rule.rule_id] = rule
+                by_layer[rule.layer] = by_layer.get(rule.layer, 0) + 1
+            self.bridge_version += 1
+            version = self.bridge_version
+        return pb2.ReplacePoliciesResponse(
+            success=not failed,
+            message=f"Replaced {len(upserts)} rule(s), removed {len(drop)}, failed {len(failed)}",
+            rules_installed=len(upserts),
+            rules_removed=len(drop),
+            rules_by_layer=by_layer,
+            bridge_version=version,
+            previous_bridge_version=previous,
+            failed_rule_ids=failed,
+        )
+
+    @staticmethod
+    def _anchor_error(rule: pb2.RuleInstance) -> str:
+        """Why the bridge would refuse this rule's anchors, or "" if it would not."""
+        for slot in SLOTS:
+            count = getattr(rule.anchors, f"{slot}_count")
+            if not 0 <= count <= MAX_ANCHORS_PER_SLOT:
+                return f"slot {slot!r} count {count} out of range"
+            packed = getattr(rule.anchors, f"{slot}_packed")
+            values = unpack_vectors(packed, _ENCODINGS[rule.anchors.encoding])
+            if packed and len(values) != count * SLOT_DIM:
+                return f"slot {slot!r} packed anchors do not hold {count} rows"
+        return ""
+
+    def GetRuleStats(self, request, context):
+        self.latency.sleep()
+        with self._lock:
+            total = sum(len(rules) for rules in self.rules.values())
+            version = self.bridge_version
+        return pb2.GetRuleStatsResponse(
+            bridge_version=version,
+            total_tables=len(self.rules),
+            total_rules=total,
+            total_global_rules=0,
+            total_scoped_rules=total,
+            bridge_created_at_ms=self.created_at_ms,
+        )
+
+    def RefreshRules(self, request, context):
+        self.latency.sleep()
+        with self._lock:
+            total = sum(len(rules) for rules in self.rules.values())
+        return pb2.RefreshRulesResponse(
+            success=True, message="refreshed", rules_refreshed=total, duration_ms=0
+        )
+
+    def QueryTelemetry(self, request, context):
+        self.latency.sleep()
+        return pb2.QueryTelemetryResponse(sessions=[], total_count=0)
+
+    def GetSession(self, request, context):
+        self.latency.sleep()
+        context.abort(grpc.StatusCode.NOT_FOUND, "session not found")
+
+    # ------------------------------------------------------------------
+    # Enforcement
+    # ------------------------------------------------------------------
+
+    def _candidate_rules(self, intent: dict[str, Any]) -> list[pb2.RuleInstance]:
+        actor_id = (intent.get("actor") or {}).get("id") or ""
+        tenant_id = intent.get("tenantId") or ""
+        with self._lock:
+            rules = self.rules.get(actor_id) or self.rules.get(tenant_id) or {}
+            candidates = [rule for rule in rules.values() if rule.enabled]
+        selected = (intent.get("context") or {}).get("dry_run_rule_ids")
+        if selected:
+            candidates = [rule for rule in candidates if rule.rule_id in set(selected)]
+        return sorted(candidates, key=lambda rule: rule.priority, reverse=True)
+
+    @staticmethod
+    def _slot_similarities(rule: pb2.RuleInstance, vector: list[float]) -> list[float]:
+        sims: list[float] = []
+        for index, slot in enumerate(SLOTS):
+            anchors = [list(anchor.values) for anchor in getattr(rule.anchors, f"{slot}_anchors")]
+            if not anchors:
+                anchors = unpack_vectors(
+                    getattr(rule.anchors, f"{slot}_packed"),
+                    _ENCODINGS[rule.anchors.encoding],
+                    SLOT_DIM,
+                ).tolist()
+            count = getattr(rule.anchors, f"{slot}_count") or len(anchors)
+            segment = vector[index * SLOT_DIM:(index + 1) * SLOT_DIM]
+            if not count or len(segment) < SLOT_DIM:
+                sims.append(1.0)
+                continue
+            sims.append(max(_cosine(segment, anchor) for anchor in anchors[:count]))
+        return sims
+
+    @staticmethod
+    def _matches(rule: pb2.RuleInstance, sims: list[float], thresholds: list[float]) -> bool:
+        if _param_str(rule, "rule_decision", "min") == "weighted-avg":
+            weights = list(rule.slice_weights) or [1.0] * len(SLOTS)
+            total = sum(weights) or 1.0
+            score = sum(w * s for w, s in zip(weights, sims)) / total
+            threshold = sum(w * t for w, t in zip(weights, thresholds)) / total
+            return score >= threshold
+        return all(s >= t for s, t in zip(sims, thresholds))
+
+    def Enforce(self, request, context):
+        self.latency.sleep()
+        with self._lock:
+            self.enforce_count += 1
+        if request.HasField("intent"):
+            typed = request.intent
+            intent = {
+                "actor": {"id": typed.actor.id},
+                "tenantId": typed.tenant_id,
+                "context": json.loads(typed.context_json) if typed.context_json else None,
+            }
+        else:
+            try:
+                intent = json.loads(request.intent_event_json)
+            except ValueError:
+                context.abort(
+                    grpc.StatusCode.INVALID_ARGUMENT, "intent_event_json is not valid JSON"
+                )
+        if request.intent_vector_packed:
+            vector = unpack_vectors(
+                request.intent_vector_packed, _ENCODINGS[request.intent_vector_encoding]
+            ).tolist()
+        else:
+            vector = list(request.intent_vector)
+        full = request.evidence_level in ("", "full")
+
+        decision_name = "ALLOW"
+        reason = "No matching policy"
+        best_sims = [0.0] * len(SLOTS)
+        evidence: list[pb2.RuleEvidence] = []
+        allow_rules = 0
+        allow_matched = False
+
+        for rule in self._candidate_rules(intent):
+            sims = self._slot_similarities(rule, vector)
+            threshold_map = _param_json(rule, "thresholds", {})
+            thresholds = [float(threshold_map.get(slot, 0.0)) for slot in SLOTS]
+            matched = self._matches(rule, sims, thresholds)
+            policy_type = rule.policy_type or _param_str(rule, "policy_type")
+            mode = _param_str(rule, "policy_mode", "Enforce")
+            outcome = _MATCH_DECISIONS.get(policy_type) if matched else None
+            if policy_type == "context_allow":
+                allow_rules += 1
+                allow_matched = allow_matched or matched
+            evidence.append(
+                pb2.RuleEvidence(
+                    rule_id=rule.rule_id,
+                    rule_name=_param_str(rule, "boundary_name", rule.rule_id),
+                    decision=0 if outcome in ("DENY", "DEFER") else 1,
+                    similarities=sims,
+                    triggering_slice=SLOTS[min(range(len(SLOTS)), key=lambda i: sims[i])],
+                    thresholds=thresholds,
+                    scoring_mode=_param_str(rule, "rule_decision", "min"),
+                    evaluation_mode="semantic",
+                    connection_result_json=json.dumps(
+                        {"policy_type": policy_type, "policy_mode": mode, "matched": matched}
+                    ) if full else "",
+                    policy=pb2.PolicyEvaluation(policy_type=policy_type, policy_mode=mode),
+                )
+            )
+            if outcome and mode == "Enforce" and decision_name == "ALLOW":
+                decision_name = outcome
+                reason = f"Matched {policy_type} policy {rule.rule_id}"
+                best_sims = sims
+
+        if decision_name == "ALLOW" and allow_rules and not allow_matched:
+            decision_name = "DENY"
+            reason = "No context_allow policy matched"
+
+        return pb2.EnforceResponse(
+            decision=1 if decision_name == "ALLOW" else 0,
+            decision_name=decision_name,
+            slice_similarities=best_sims,
+            rules_evaluated=len(evidence),
+            evidence=evidence if request.evidence_level != "decision" else [
+                pb2.RuleEvidence(rule_id=ev.rule_id, decision=ev.decision, policy=ev.policy)
+                for ev in evidence
+            ],
+            request_id=request.request_id or request.session_id,
+            evaluation_mode="semantic" if evidence else "unknown",
+            reason=reason,
+        )
+
+
+class FakeDataPlaneServer:
+    """Runs FakeDataPlaneServicer on a local port; ``address`` is host:port."""
+
+    def __init__(
+        self,
+        *,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        max_workers: int = 16,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.max_workers = max_workers
+        self.latency = InjectedLatency(latency_ms=latency_ms, jitter_ms=jitter_ms)
+        self.servicer = FakeDataPlaneServicer(self.latency)
+        self._server: grpc.Server | None = None
+
+    @property
+    def address(self) -> str:
+        return f"{self.host}:{self.port}"
+
+    def start(self) -> None:
+        self._server = grpc.server(futures.ThreadPoolExecutor(max_workers=self.max_workers))
+        pb2_grpc.add_DataPlaneServicer_to_server(self.servicer, self._server)
+        self.port = self._server.add_insecure_port(f"{self.host}:{self.port}")
+        self._server.start()
+
+    def stop(self, grace: float = 0.5) -> None:
+        if self._server is not None:
+            self._server.stop(grace).wait()
+            self._server = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+
+def wait_until_serving(address: str, timeout: float = 5.0) -> None:
+    """Block until a gRPC server accepts connections at ``address``."""
+    channel = grpc.insecure_channel(address)
+    try:
+        grpc.channel_ready_future(channel).result(timeout=timeout)
+    finally:
+        channel.close()
@@ -0,0 +1,425 @@
+"""In-memory stand-in for the db_infra HTTP API."""
+
+from __future__ import annotations
+
+import hashlib
+import math
+import threading
+import time
+from typing import Any
+
+from tests_support.http_server import StandinHTTPServer
+
+PREFIX = "/api/v1/prism-management"
+
+_DECISIONS = ("ALLOW", "DENY", "MODIFY", "STEP_UP", "DEFER")
+
+
+def _now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+def _cosine_drift(baseline: list[float], current: list[float]) -> float:
+    if not baseline or not current or len(baseline) != len(current):
+        return 0.0
+    dot = sum(a * b for a, b in zip(baseline, current))
+    norm = math.sqrt(sum(a * a for a in baseline)) * math.sqrt(sum(b * b for b in current))
+    if norm == 0:
+        return 0.0
+    return max(0.0, 1.0 - dot / norm)
+
+
+def _page(rows: list[dict], query: dict[str, str]) -> tuple[list[dict], int, int, int]:
+    limit = int(query.get("limit", 50))
+    offset = int(query.get("offset", 0))
+    return rows[offset:offset + limit], len(rows), limit, offset
+
+
+def _as_bool(value: str | None) -> bool | None:
+    if value is None:
+        return None
+    return value.lower() in ("1", "true", "yes")
+
+
+class FakeDbInfraServer(StandinHTTPServer):
+    """
+    db_infra stand-in covering every route the management plane calls.
+
+    State lives in memory for the lifetime of the server. Prism is enabled,
+    every agent has an enabled integration and every runtime key maps to
+    ``default_tenant_id`` unless configured otherwise.
+    """
+
+    def __init__(
+        self,
+        *,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        default_tenant_id: str | None = "standin-tenant",
+    ) -> None:
+        super().__init__(host=host, port=port, latency_ms=latency_ms, jitter_ms=jitter_ms)
+        self.default_tenant_id = default_tenant_id
+        self.module_enablement: dict[str, bool] = {}
+        self.integrations: dict[str, dict[str, Any]] = {}
+        self.api_keys: dict[str, str] = {}
+        self.sessions: dict[str, dict[str, Any]] = {}
+        self.calls: dict[str, dict[str, Any]] = {}
+        self.policies: dict[tuple[str, str], dict[str, Any]] = {}
+        self.network_policies: dict[tuple[str, str], dict[str, Any]] = {}
+        self.outbox: list[dict[str, Any]] = []
+        self._state_lock = threading.Lock()
+        self._register_routes()
+
+    # ------------------------------------------------------------------
+    # Routes
+    # ------------------------------------------------------------------
+
+    def _register_routes(self) -> None:
+        self.route("GET", "/health", lambda p, q, b: (200, {"status": "ok"}))
+        self.route("GET", "/api/v1/platform/module-enablement/{module}", self._module_enablement)
+        self.route(
+            "GET",
+            "/api/v1/policy-engine/prism-integrations/{agent_id}",
+            self._prism_integration,
+        )
+        self.route("POST", "/api/v1/intel/outbox", self._enqueue_outbox)
+
+        self.route("POST", f"{PREFIX}/runtime-auth/validate", self._validate_runtime_key)
+        self.route("POST", f"{PREFIX}/runtime-agent/resolve", self._resolve_runtime_agent)
+
+        self.route("GET", f"{PREFIX}/sessions", self._list_sessions)
+        self.route("POST", f"{PREFIX}/sessions/write-call", self._write_call)
+        self.route("POST", f"{PREFIX}/sessions/cleanup", lambda p, q, b: (200, {"deleted": 0}))
+        self.route("GET", f"{PREFIX}/sessions/{{agent_id}}", self._get_session)
+        self.route("GET", f"{PREFIX}/sessions/{{agent_id}}/drift", self._get_drift)
+        self.route(
+            "PATCH", f"{PREFIX}/sessions/{{agent_id}}/call-decision", self._update_call_decision
+        )
+        self.route(
+            "POST",
+            f"{PREFIX}/sessions/{{agent_id}}/initialize-vector",
+            self._initialize_vector,
+        )
+        self.route("POST", f"{PREFIX}/sessions/{{agent_id}}/compute-drift", self._compute_drift)
+
+        self.route("GET", f"{PREFIX}/calls", self._list_calls)
+        self.route("POST", f"{PREFIX}/calls", self._insert_call)
+        self.route("DELETE", f"{PREFIX}/calls", self._delete_calls)
+        self.route("GET", f"{PREFIX}/calls/{{event_id}}", self._get_call)
+        self.route(
+            "PATCH",
+            f"{PREFIX}/calls/{{event_id}}/enforced-decision",
+            self._update_enforced_decision,
+        )
+        self.route("GET", f"{PREFIX}/call-runs", self._list_call_runs)
+
+        self.route("GET", f"{PREFIX}/policies", self._list_rows(self.policies))
+        self.route("POST", f"{PREFIX}/policies", self._upsert_row(self.policies))
+        self.route("GET", f"{PREFIX}/policies/{{tenant_id}}/{{policy_id}}", self._get_row(self.policies))
+        self.route(
+            "DELETE", f"{PREFIX}/policies/{{tenant_id}}/{{policy_id}}", self._delete_row(self.policies)
+        )
+        self.route("DELETE", f"{PREFIX}/policies/{{tenant_id}}", self._delete_tenant_policies)
+
+        self.route("GET", f"{PREFIX}/network-policies", self._list_rows(self.network_policies))
+        self.route("POST", f"{PREFIX}/network-policies", self._upsert_row(self.network_policies))
+        self.route(
+            "POST",
+            f"{PREFIX}/network-policies/batch",
+            self._upsert_rows(self.network_policies),
+        )
+        self.route(
+            "GET",
+            f"{PREFIX}/network-policies/{{tenant_id}}/{{policy_id}}",
+            self._get_row(self.network_policies),
+        )
+        self.route(
+            "DELETE",
+            f"{PREFIX}/network-policies/{{tenant_id}}/{{policy_id}}",
+            self._delete_row(self.network_policies),
+        )
+
+    # ------------------------------------------------------------------
+    # Platform / runtime identity
+    # ------------------------------------------------------------------
+
+    def _module_enablement(self, params, query, body):
+        module = params["module"]
+        return 200, {"module": module, "enabled": self.module_enablement.get(module, True)}
+
+    def _prism_integration(self, params, query, body):
+        agent_id = params["agent_id"]
+        integration = self.integrations.get(agent_id)
+        if integration is None:
+            integration = {"platform_agent_id": agent_id, "enabled": True}
+        return 200, integration
+
+    def _enqueue_outbox(self, params, query, body):
+        with self._state_lock:
+            self.outbox.append(body or {})
+        return 200, {"id": (body or {}).get("id"), "queued": True}
+
+    def _validate_runtime_key(self, params, query, body):
+        api_key = (body or {}).get("api_key") or ""
+        tenant_id = self.api_keys.get(api_key, self.default_tenant_id)
+        if not api_key or not tenant_id:
+            return 401, {"detail": "invalid_runtime_key"}
+        return 200, {"tenant_id": tenant_id, "valid": True}
+
+    def _resolve_runtime_agent(self, params, query, body):
+        body = body or {}
+        ref = (
+            body.get("integration_agent_ref")
+            or body.get("runtime_instance_id")
+            or body.get("endpoint_fingerprint")
+        )
+        if not ref:
+            digest = hashlib.sha256(
+                f"{body.get('tenant_id')}:{body.get('integration_type')}".encode()
+            ).hexdigest()[:12]
+            ref = f"agent-{digest}"
+        return 200, {"status": "resolved", "platform_agent_id": ref, "binding": None}
+
+    # ------------------------------------------------------------------
+    # Sessions and calls
+    # ------------------------------------------------------------------
+
+    def _session(self, agent_id: str) -> dict[str, Any]:
+        session = self.sessions.get(agent_id)
+        if session is None:
+            now = _now_ms()
+            session = {
+                "session_id": agent_id,
+                "agent_id": agent_id,
+                "call_count": 0,
+                "final_decision": "",
+                "created_at_ms": now,
+                "last_seen_at_ms": now,
+                "drift": 0.0,
+                "initial_vector": None,
+                "last_vector": None,
+                "calls": [],
+            }
+            self.sessions[agent_id] = session
+        return session
+
+    def _list_sessions(self, params, query, body):
+        with self._state_lock:
+            rows = [
+                {key: value for key, value in session.items() if key not in ("initial_vector", "last_vector")}
+                for session in self.sessions.values()
+            ]
+        if "agent_id" in query:
+            rows = [row for row in rows if row["agent_id"] == query["agent_id"]]
+        if "decision" in query:
+            rows = [row for row in rows if row["final_decision"] == query["decision"]]
+        rows.sort(key=lambda row: row["last_seen_at_ms"], reverse=True)
+        page, total, limit, offset = _page(rows, query)
+        return 200, {"sessions": page, "total_count": total, "limit": limit, "offset": offset}
+
+    def _write_call(self, params, query, body):
+        body = body or {}
+        with self._state_lock:
+            session = self._session(body.get("agent_id") or "")
+            session["call_count"] += 1
+            session["final_decision"] = body.get("enforced_decision") or ""
+            session["last_seen_at_ms"] = int(float(body.get("ts") or time.time()) * 1000)
+            session["calls"].append(
+                {
+                    "event_id": body.get("event_id"),
+                    "action": body.get("action"),
+                    "prism_decision": body.get("prism_decision"),
+                    "enforced_decision": body.get("enforced_decision"),
+                }
+            )
+        return 200, {"ok": True}
+
+    def _get_session(self, params, query, body):
+        with self._state_lock:
+            session = self.sessions.get(params["agent_id"])
+            if session is None:
+                return 404, {"detail": "Session not found"}
+            return 200, dict(session, calls=list(session["calls"]))
+
+    def _get_drift(self, params, query, body):
+        with self._state_lock:
+            session = self.sessions.get(params["agent_id"])
+            if session is None:
+                return 404, {"detail": "Session not found"}
+            return 200, {"drift": session["drift"]}
+
+    def _update_call_decision(self, params, query, body):
+        body = body or {}
+        with self._state_lock:
+            session = self._session(params["agent_id"])
+            for call in session["calls"]:
+                if call["event_id"] == body.get("event_id"):
+                    call["prism_decision"] = body.get("prism_decision")
+                    call["enforced_decision"] = body.get("enforced_decision")
+            session["final_decision"] = body.get("enforced_decision") or session["final_decision"]
+        return 200, {"ok": True}
+
+    def _initialize_vector(self, params, query, body):
+        with self._state_lock:
+            session = self._session(params["agent_id"])
+            if session["initial_vector"] is None:
+                session["initial_vector"] = list((body or {}).get("vector") or [])
+        return 200, {"ok": True}
+
+    def _compute_drift(self, params, query, body):
+        body = body or {}
+        vector = list(body.get("vector") or [])
+        with self._state_lock:
+            session = self._session(params["agent_id"])
+            if session["initial_vector"] is None:
+                session["initial_vector"] = vector
+            drift = _cosine_drift(session["initial_vector"], vector)
+            session["drift"] = drift
+            session["last_vector"] = vector
+            session["last_seen_at_ms"] = int(float(body.get("last_seen_at") or time.time()) * 1000)
+        return 200, {"drift": drift}
+
+    def _insert_call(self, params, query, body):
+        body = dict(body or {})
+        body["decision"] = body.get("enforced_decision")
+        with self._state_lock:
+            self.calls[body.get("event_id") or ""] = body
+        return 200, {"ok": True}
+
+    def _filtered_calls(self, query: dict[str, str]) -> list[dict[str, Any]]:
+        with self._state_lock:
+            rows = list(self.calls.values())
+        for key in ("agent_id", "agent_call_id"):
+            if key in query:
+                rows = [row for row in rows if row.get(key) == query[key]]
+        if "decision" in query:
+            rows = [row for row in rows if row.get("enforced_decision") == query["decision"]]
+        if "start_ms" in query:
+            rows = [row for row in rows if row.get("ts_ms", 0) >= int(query["start_ms"])]
+        if "end_ms" in query:
+            rows = [row for row in rows if row.get("ts_ms", 0) <= int(query["end_ms"])]
+        is_dry_run = _as_bool(query.get("is_dry_run"))
+        if is_dry_run is not None:
+            rows = [row for row in rows if bool(row.get("is_dry_run")) == is_dry_run]
+        rows.sort(key=lambda row: row.get("ts_ms", 0), reverse=True)
+        return rows
+
+    def _list_calls(self, params, query, body):
+        rows = [
+            {key: value for key, value in row.items() if key not in ("enforcement_result", "intent_event")}
+            for row in self._filtered_calls(query)
+        ]
+        page, total, limit, offset = _page(rows, query)
+        return 200, {"calls": page, "total_count": total, "limit": limit, "offset": offset}
+
+    def _get_call(self, params, query, body):
+        with self._state_lock:
+            row = self.calls.get(params["event_id"])
+        if row is None:
+            return 404, {"detail": "Call not found"}
+        return 200, row
+
+    def _delete_calls(self, params, query, body):
+        with self._state_lock:
+            deleted = len(self.calls)
+            self.calls.clear()
+        return 200, {"deleted_count": deleted}
+
+    def _update_enforced_decision(self, params, query, body):
+        with self._state_lock:
+            row = self.calls.get(params["event_id"])
+            if row is None:
+                return 404, {"detail": "Call not found"}
+            row["enforced_decision"] = (body or {}).get("enforced_decision")
+            row["decision"] = row["enforced_decision"]
+        return 200, {"ok": True}
+
+    def _list_call_runs(self, params, query, body):
+        runs: dict[str, dict[str, Any]] = {}
+        for row in sorted(self._filtered_calls(query), key=lambda r: r.get("ts_ms", 0)):
+            run = runs.setdefault(
+                row.get("agent_call_id") or "",
+                {
+                    "agent_call_id": row.get("agent_call_id") or "",
+                    "agent_id": row.get("agent_id") or "",
+                    "started_at_ms": row.get("ts_ms", 0),
+                    "total_calls": 0,
+                    **{f"{decision.lower()}_count": 0 for decision in _DECISIONS},
+                },
+            )
+            run["total_calls"] += 1
+            decision = row.get("enforced_decision") or ""
+            if decision in _DECISIONS:
+                run[f"{decision.lower()}_count"] += 1
+            run["last_seen_at_ms"] = row.get("ts_ms", 0)
+            run["final_decision"] = decision
+            run["prism_final_decision"] = row.get("prism_decision") or ""
+            run["last_op"] = row.get("op")
+            run["last_target"] = row.get("t")
+        rows = sorted(runs.values(), key=lambda run: run["last_seen_at_ms"], reverse=True)
+        page, total, limit, offset = _page(rows, query)
+        return 200, {"runs": page, "total_count": total, "limit": limit, "offset": offset}
+
+    # ------------------------------------------------------------------
+    # Policies and network policies
+    # ------------------------------------------------------------------
+
+    def _list_rows(self, table: dict[tuple[str, str], dict[str, Any]]):
+        def handler(params, query, body):
+            with self._state_lock:
+                rows = list(table.values())
+            for key in ("tenant_id", "agent_id", "status"):
+                if key in query:
+                    rows = [row for row in rows if (row.get(key) or "") == query[key]]
+            return 200, {"policies": rows}
+
+        return handler
+
+    def _upsert_row(self, table: dict[tuple[str, str], dict[str, Any]]):
+        def handler(params, query, body):
+            row = dict(body or {})
+            with self._state_lock:
+                table[(row.get("tenant_id") or "", row.get("policy_id") or "")] = row
+            return 200, row
+
+        return handler
+
+    def _upsert_rows(self, table: dict[tuple[str, str], dict[str, Any]]):
+        def handler(params, query, body):
+            rows = [dict(row) for row in (body or {}).get("policies") or []]
+            with self._state_lock:
+                for row in rows:
+                    table[(row.get("tenant_id") or "", row.get("policy_id") or "")] = row
+            return 200, {"upserted": len(rows)}
+
+        return handler
+
+    def _get_row(self, table: dict[tuple[str, str], dict[str, Any]]):
+        def handler(params, query, body):
+            with self._state_lock:
+                row = table.get((params["tenant_id"], params["policy_id"]))
+            if row is None:
+                return 404, {"detail": "Policy not found"}
+            return 200, row
+
+        return handler
+
+    def _delete_row(self, table: dict[tuple[str, str], dict[str, Any]]):
+        def handler(params, query, body):
+            with self._state_lock:
+                row = table.pop((params["tenant_id"], params["policy_id"]), None)
+            if row is None:
+                return 404, {"detail": "Policy not found"}
+            return 200, {"deleted": True}
+
+        return handler
+
+    def _delete_tenant_policies(self, params, query, body):
+        tenant_id = params["tenant_id"]
+        with self._state_lock:
+            keys = [key for key in self.policies if key[0] == tenant_id]
+            for key in keys:
+                del self.policies[key]
+        return 200, {"deleted_count": len(keys)}
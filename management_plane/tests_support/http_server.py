@@ -0,0 +1,126 @@
+"""Minimal threaded JSON HTTP server shared by the HTTP stand-ins."""
+
+from __future__ import annotations
+
+import json
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable
+from urllib.parse import parse_qs, urlsplit
+
+from tests_support.latency import InjectedLatency
+
+# handler(params, query, body) -> (status, json body)
+RouteHandler = Callable[[dict[str, str], dict[str, str], Any], tuple[int, Any]]
+
+
+class StandinHTTPServer:
+    """
+    Route table plus a ThreadingHTTPServer running on a daemon thread.
+
+    Subclasses register routes with ``self.route(method, pattern, handler)``;
+    ``{name}`` segments in the pattern become handler params.
+    """
+
+    def __init__(
+        self,
+        *,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.latency = InjectedLatency(latency_ms=latency_ms, jitter_ms=jitter_ms)
+        self.request_count = 0
+        self._routes: list[tuple[str, re.Pattern[str], RouteHandler]] = []
+        self._lock = threading.Lock()
+        self._server: ThreadingHTTPServer | None = None
+        self._thread: threading.Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def route(self, method: str, pattern: str, handler: RouteHandler) -> None:
+        regex = re.compile(
+            "^" + re.sub(r"\{(\w+)\}", r"(?P<\1>[^/]+)", pattern) + "$"
+        )
+        self._routes.append((method.upper(), regex, handler))
+
+    def dispatch(self, method: str, raw_path: str, body: Any) -> tuple[int, Any]:
+        with self._lock:
+            self.request_count += 1
+        self.latency.sleep()
+        parts = urlsplit(raw_path)
+        query = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+        path_matched = False
+        for route_method, regex, handler in self._routes:
+            match = regex.match(parts.path)
+            if match is None:
+                continue
+            path_matched = True
+            if route_method != method:
+                continue
+            return handler(match.groupdict(), query, body)
+        if path_matched:
+            return 405, {"detail": "Method Not Allowed"}
+        return 404, {"detail": "Not Found"}
+
+    def start(self) -> None:
+        standin = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _handle(self) -> None:
+                length = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(length) if length else b""
+                try:
+                    body = json.loads(raw) if raw else None
+                except ValueError:
+                    self._write(400, {"detail": "invalid JSON body"})
+                    return
+                status, payload = standin.dispatch(self.command, self.path, body)
+                self._write(status, payload)
+
+            def _write(self, status: int, payload: Any) -> None:
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = _handle
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        self._server = ThreadingHTTPServer((self.host, self.port), _Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(
+            target=self._server.serve_forever,
+            name=f"{type(self).__name__}:{self.port}",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
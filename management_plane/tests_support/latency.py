@@ -0,0 +1,32 @@
+"""Injected per-request latency for the local stand-in servers."""
+
+from __future__ import annotations
+
+import random
+import time
+from dataclasses import dataclass, field
+
+
+@dataclass
+class InjectedLatency:
+    """
+    Fixed latency plus uniform jitter, in milliseconds.
+
+    Mutable at runtime so a benchmark can change it between phases without
+    restarting the stand-in.
+    """
+
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    rng: random.Random = field(default_factory=random.Random, repr=False)
+
+    def delay_seconds(self) -> float:
+        delay_ms = self.latency_ms
+        if self.jitter_ms > 0:
+            delay_ms += self.rng.uniform(0.0, self.jitter_ms)
+        return max(delay_ms, 0.0) / 1000.0
+
+    def sleep(self) -> None:
+        delay = self.delay_seconds()
+        if delay > 0:
+            time.sleep(delay)
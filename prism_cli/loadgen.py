@@ -0,0 +1,487 @@
+"""
+Traffic replay and load generation for the Prism enforcement API.
+
+Replays recorded IntentEvent streams against POST /api/v2/enforce or the MCP
+``send_intent`` tool using either arrival model:
+
+- open loop: requests are issued on a fixed or Poisson schedule at a target
+  QPS, independent of how fast responses come back. Latency is measured from
+  the scheduled send time so a stalled server is not hidden (no coordinated
+  omission).
+- closed loop: a fixed number of workers each send, wait for the response,
+  optionally think, then send again.
+
+Recordings are JSONL. Each line may be a bare IntentEvent, a WebSocket-style
+frame (``{"event": {...}}``) or a telemetry call detail exported from
+/api/v2/telemetry/calls (``{"intent_event": {...}}`` or
+``{"call": {"intent_event": {...}}}``).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import copy
+import json
+import math
+import random
+import time
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterable, Optional, Protocol
+
+import httpx
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Recordings
+# ──────────────────────────────────────────────────────────────────────────────
+
+
+def _extract_event(record: Any) -> Optional[dict]:
+    if not isinstance(record, dict):
+        return None
+    for key in ("event", "intent_event"):
+        value = record.get(key)
+        if isinstance(value, str):
+            try:
+                value = json.loads(value)
+            except ValueError:
+                return None
+        if isinstance(value, dict):
+            return value
+    call = record.get("call")
+    if isinstance(call, dict):
+        return _extract_event(call)
+    if "op" in record or "identity" in record:
+        return record
+    return None
+
+
+def load_recording(path: Path) -> list[dict]:
+    """Load intent events from a JSONL recording, skipping lines without one."""
+    events: list[dict] = []
+    with open(path, encoding="utf-8") as fh:
+        for line in fh:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            event = _extract_event(record)
+            if event is not None:
+                events.append(event)
+    return events
+
+
+def export_recording(
+    base_url: str,
+    path: Path,
+    *,
+    headers: Optional[dict[str, str]] = None,
+    agent_id: Optional[str] = None,
+    limit: int = 1000,
+    page_size: int = 200,
+) -> int:
+    """
+    Export recorded intent events from /api/v2/telemetry/calls to JSONL.
+
+    The list endpoint only returns summaries, so each call's intent_event is
+    fetched from the detail endpoint. Returns the number of events written.
+    """
+    written = 0
+    offset = 0
+    with httpx.Client(base_url=base_url.rstrip("/"), headers=headers or {}, timeout=10.0) as client, \
+            open(path, "w", encoding="utf-8") as fh:
+        while written < limit:
+            params: dict[str, Any] = {"limit": min(page_size, 200), "offset": offset}
+            if agent_id:
+                params["agent_id"] = agent_id
+            response = client.get("/api/v2/telemetry/calls", params=params)
+            response.raise_for_status()
+            calls = response.json().get("calls", [])
+            if not calls:
+                break
+            offset += len(calls)
+            for call in calls:
+                detail = client.get(f"/api/v2/telemetry/calls/{call['event_id']}")
+                if detail.status_code != 200:
+                    continue
+                event = _extract_event(detail.json())
+                if event is None:
+                    continue
+                fh.write(json.dumps({"intent_event": event}) + "\n")
+                written += 1
+                if written >= limit:
+                    break
+    return written
+
+
+def _fresh_event(event: dict) -> dict:
+    """Copy an event with new ids and timestamp so replays are not deduplicated."""
+    replay = copy.deepcopy(event)
+    replay["id"] = str(uuid.uuid4())
+    replay.pop("event_id", None)
+    replay["ts"] = time.time()
+    return replay
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Targets
+# ──────────────────────────────────────────────────────────────────────────────
+
+
+class LoadTargetError(Exception):
+    """A request failed; ``kind`` is the label used in the report."""
+
+    def __init__(self, kind: str, message: str = "") -> None:
+        super().__init__(message or kind)
+        self.kind = kind
+
+
+class LoadTarget(Protocol):
+    async def start(self) -> None: ...
+
+    async def send(self, event: dict) -> tuple[str, Optional[float]]:
+        """Send one event; return (decision, server-reported latency in ms)."""
+        ...
+
+    async def close(self) -> None: ...
+
+
+class EnforceTarget:
+    """POST /api/v2/enforce."""
+
+    def __init__(
+        self,
+        base_url: str,
+        *,
+        headers: Optional[dict[str, str]] = None,
+        dry_run: bool = False,
+        timeout: float = 10.0,
+        max_connections: int = 256,
+    ) -> None:
+        self._base_url = base_url.rstrip("/")
+        self._headers = headers or {}
+        self._params = {"dry_run": "true"} if dry_run else {}
+        self._timeout = timeout
+        self._max_connections = max_connections
+        self._client: Optional[httpx.AsyncClient] = None
+
+    async def start(self) -> None:
+        self._client = httpx.AsyncClient(
+            base_url=self._base_url,
+            headers=self._headers,
+            timeout=self._timeout,
+            limits=httpx.Limits(
+                max_connections=self._max_connections,
+                max_keepalive_connections=self._max_connections,
+            ),
+        )
+
+    async def send(self, event: dict) -> tuple[str, Optional[float]]:
+        assert self._client is not None, "target not started"
+        try:
+            response = await self._client.post("/api/v2/enforce", json=event, params=self._params)
+        except httpx.TimeoutException as exc:
+            raise LoadTargetError("timeout") from exc
+        except httpx.RequestError as exc:
+            raise LoadTargetError("connection") from exc
+        if response.status_code != 200:
+            raise LoadTargetError(f"http_{response.status_code}")
+        body = response.json()
+        return str(body.get("decision") or "UNKNOWN"), body.get("enforcement_latency_ms")
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+
+
+def _event_to_send_intent_args(event: dict) -> dict[str, Any]:
+    identity = event.get("identity") or {}
+    params = event.get("params") if isinstance(event.get("params"), dict) else {}
+    context: dict[str, Any] = {"agent_id": identity.get("agent_id") or "mcp-agent"}
+    for key in ("tool_name", "tool_method", "tool_params"):
+        if key in params:
+            context[key] = params[key]
+    return {
+        "action": event.get("op") or "",
+        "resource": {"name": event.get("t") or ""},
+        "data": {"description": event.get("p")} if event.get("p") else {},
+        "risk": {},
+        "context": context,
+    }
+
+
+class McpSendIntentTarget:
+    """The MCP ``send_intent`` tool, over streamable HTTP (requires fastmcp)."""
+
+    def __init__(self, url: str, *, headers: Optional[dict[str, str]] = None) -> None:
+        self._url = url
+        self._headers = headers or {}
+        self._client: Any = None
+
+    async def start(self) -> None:
+        try:
+            from fastmcp import Client
+            from fastmcp.client.transports import StreamableHttpTransport
+        except ImportError as exc:  # pragma: no cover - depends on install
+            raise RuntimeError("The MCP target requires the 'fastmcp' package") from exc
+        self._client = Client(StreamableHttpTransport(self._url, headers=self._headers))
+        await self._client.__aenter__()
+
+    async def send(self, event: dict) -> tuple[str, Optional[float]]:
+        assert self._client is not None, "target not started"
+        try:
+            result = await self._client.call_tool(
+                "send_intent", _event_to_send_intent_args(event), raise_on_error=False
+            )
+        except Exception as exc:
+            raise LoadTargetError("mcp_transport") from exc
+        if getattr(result, "is_error", False):
+            raise LoadTargetError("mcp_tool_error")
+        payload = getattr(result, "structured_content", None) or {}
+        if not payload:
+            for block in getattr(result, "content", []) or []:
+                text = getattr(block, "text", None)
+                if text:
+                    try:
+                        payload = json.loads(text)
+                    except ValueError:
+                        pass
+                    break
+        return str(payload.get("decision") or "UNKNOWN"), payload.get("enforcement_latency_ms")
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.__aexit__(None, None, None)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Report
+# ──────────────────────────────────────────────────────────────────────────────
+
+
+def _percentile(sorted_values: list[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    rank = math.ceil(pct / 100.0 * len(sorted_values)) - 1
+    return sorted_values[max(0, min(rank, len(sorted_values) - 1))]
+
+
+@dataclass
+class LoadReport:
+    """Outcome counts and latency samples collected during a run."""
+
+    model: str
+    latencies_ms: list[float] = field(default_factory=list)
+    server_latencies_ms: list[float] = field(default_factory=list)
+    decisions: dict[str, int] = field(default_factory=dict)
+    errors: dict[str, int] = field(default_factory=dict)
+    dropped: int = 0
+    started_at: float = 0.0
+    finished_at: float = 0.0
+
+    def record(self, latency_ms: float, decision: str, server_latency_ms: Optional[float]) -> None:
+        self.latencies_ms.append(latency_ms)
+        self.decisions[decision] = self.decisions.get(decision, 0) + 1
+        if server_latency_ms is not None:
+            self.server_latencies_ms.append(float(server_latency_ms))
+
+    def record_error(self, latency_ms: float, kind: str) -> None:
+        self.latencies_ms.append(latency_ms)
+        self.errors[kind] = self.errors.get(kind, 0) + 1
+
+    @property
+    def total(self) -> int:
+        return sum(self.decisions.values()) + sum(self.errors.values())
+
+    @property
+    def duration_s(self) -> float:
+        return max(self.finished_at - self.started_at, 1e-9)
+
+    def summary(self) -> dict[str, Any]:
+        latencies = sorted(self.latencies_ms)
+        server = sorted(self.server_latencies_ms)
+        total = self.total
+        outcomes = {**self.decisions, **{f"error:{k}": v for k, v in self.errors.items()}}
+        return {
+            "model": self.model,
+            "requests": total,
+            "dropped": self.dropped,
+            "duration_s": round(self.duration_s, 3),
+            "throughput_rps": round(total / self.duration_s, 2),
+            "latency_ms": {
+                "p50": round(_percentile(latencies, 50), 3),
+                "p90": round(_percentile(latencies, 90), 3),
+                "p99": round(_percentile(latencies, 99), 3),
+                "max": round(latencies[-1], 3) if latencies else 0.0,
+            },
+            "server_latency_ms": {
+                "p50": round(_percentile(server, 50), 3),
+                "p99": round(_percentile(server, 99), 3),
+            },
+            "outcomes": {
+                name: {"count": count, "rate": round(count / total, 4) if total else 0.0}
+                for name, count in sorted(outcomes.items())
+            },
+            "error_rate": round(sum(self.errors.values()) / total, 4) if total else 0.0,
+        }
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Arrival models
+# ──────────────────────────────────────────────────────────────────────────────
+
+
+def _cycle(events: list[dict]) -> Iterable[dict]:
+    while True:
+        yield from events
+
+
+async def _send_one(target: LoadTarget, event: dict, report: LoadReport, t0: float) -> None:
+    try:
+        decision, server_ms = await target.send(_fresh_event(event))
+    except LoadTargetError as exc:
+        report.record_error((time.perf_counter() - t0) * 1000.0, exc.kind)
+    except Exception:
+        report.record_error((time.perf_counter() - t0) * 1000.0, "client")
+    else:
+        report.record((time.perf_counter() - t0) * 1000.0, decision, server_ms)
+
+
+async def run_open_loop(
+    target: LoadTarget,
+    events: list[dict],
+    *,
+    qps: float,
+    duration_s: Optional[float] = None,
+    count: Optional[int] = None,
+    poisson: bool = True,
+    max_inflight: int = 1024,
+    rng: Optional[random.Random] = None,
+) -> LoadReport:
+    """
+    Issue requests at ``qps`` regardless of completions.
+
+    Arrivals that would exceed ``max_inflight`` outstanding requests are
+    counted as dropped rather than queued, so the schedule never stretches.
+    """
+    if not events:
+        raise ValueError("recording contains no events")
+    if qps <= 0:
+        raise ValueError("qps must be positive")
+    if duration_s is None and count is None:
+        count = len(events)
+    rng = rng or random.Random()
+    report = LoadReport(model="open-poisson" if poisson else "open-uniform")
+    pending: set[asyncio.Task] = set()
+    source = _cycle(events)
+
+    report.started_at = time.perf_counter()
+    next_at = report.started_at
+    issued = 0
+    while True:
+        if count is not None and issued >= count:
+            break
+        if duration_s is not None and next_at - report.started_at >= duration_s:
+            break
+        delay = next_at - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        event = next(source)
+        issued += 1
+        if len(pending) >= max_inflight:
+            report.dropped += 1
+        else:
+            task = asyncio.create_task(_send_one(target, event, report, next_at))
+            pending.add(task)
+            task.add_done_callback(pending.discard)
+        next_at += rng.expovariate(qps) if poisson else 1.0 / qps
+
+    if pending:
+        await asyncio.gather(*pending)
+    report.finished_at = time.perf_counter()
+    return report
+
+
+async def run_closed_loop(
+    target: LoadTarget,
+    events: list[dict],
+    *,
+    concurrency: int,
+    duration_s: Optional[float] = None,
+    count: Optional[int] = None,
+    think_time_s: float = 0.0,
+) -> LoadReport:
+    """Run ``concurrency`` workers that each wait for a response before sending again."""
+    if not events:
+        raise ValueError("recording contains no events")
+    if concurrency <= 0:
+        raise ValueError("concurrency must be positive")
+    if duration_s is None and count is None:
+        count = len(events)
+    report = LoadReport(model="closed")
+    source = _cycle(events)
+    issued = 0
+
+    report.started_at = time.perf_counter()
+    deadline = report.started_at + duration_s if duration_s is not None else None
+
+    async def worker() -> None:
+        nonlocal issued
+        while True:
+            if count is not None and issued >= count:
+                return
+            if deadline is not None and time.perf_counter() >= deadline:
+                return
+            issued += 1
+            await _send_one(target, next(source), report, time.perf_counter())
+            if think_time_s > 0:
+                await asyncio.sleep(think_time_s)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    report.finished_at = time.perf_counter()
+    return report
+
+
+async def run_load(
+    target: LoadTarget,
+    events: list[dict],
+    *,
+    model: str,
+    qps: float = 10.0,
+    concurrency: int = 8,
+    duration_s: Optional[float] = None,
+    count: Optional[int] = None,
+    poisson: bool = True,
+    think_time_s: float = 0.0,
+    max_inflight: int = 1024,
+) -> LoadReport:
+    """Start the target, run the chosen arrival model and close the target."""
+    await target.start()
+    try:
+        if model == "open":
+            return await run_open_loop(
+                target,
+                events,
+                qps=qps,
+                duration_s=duration_s,
+                count=count,
+                poisson=poisson,
+                max_inflight=max_inflight,
+            )
+        if model == "closed":
+            return await run_closed_loop(
+                target,
+                events,
+                concurrency=concurrency,
+                duration_s=duration_s,
+                count=count,
+                think_time_s=think_time_s,
+            )
+        raise ValueError(f"unknown arrival model: {model}")
+    finally:
+        await target.close()
@@ -9,6 +9,7 @@ Usage:
   prism logs       Tail service logs
   prism tenant     Show current tenant ID
   prism policies   List installed policies
+  prism load       Replay recorded traffic against the enforcement API
 """
 
 import os
@@ -76,8 +77,10 @@ def find_free_port(candidates: list[int]) -> int:
 app = typer.Typer(help="Prism — local LLM security policy enforcement", add_completion=False)
 agents_app = typer.Typer(help="Manage agents registered with the Fencio Proxy.")
 cert_app = typer.Typer(help="Manage the Fencio Proxy CA certificate.")
+load_app = typer.Typer(help="Replay recorded intent traffic against the enforcement API.")
 app.add_typer(agents_app, name="agents")
 app.add_typer(cert_app, name="cert")
+app.add_typer(load_app, name="load")
 console = Console()
 
 
@@ -1415,6 +1418,133 @@ def health():
         raise typer.Exit(code=1)
 
 
+# ──────────────────────────────────────────────────────────────────────────────
+# load commands
+# ──────────────────────────────────────────────────────────────────────────────
+
+def _load_headers(tenant: Optional[str], api_key: Optional[str]) -> dict[str, str]:
+    headers = {"X-Tenant-Id": tenant or _tenant_id()}
+    if api_key:
+        headers["Authorization"] = f"Bearer {api_key}"
+    return headers
+
+
+@load_app.command("run")
+def load_run(
+    recording: Path = typer.Argument(..., exists=True, dir_okay=False, help="JSONL recording of intent events"),
+    target: str = typer.Option("enforce", "--target", help="enforce (POST /api/v2/enforce) or mcp (send_intent tool)"),
+    model: str = typer.Option("open", "--model", help="Arrival model: open (fixed QPS) or closed (fixed concurrency)"),
+    qps: float = typer.Option(10.0, "--qps", help="Open loop: target requests per second"),
+    uniform: bool = typer.Option(False, "--uniform", help="Open loop: evenly spaced arrivals instead of Poisson"),
+    concurrency: int = typer.Option(8, "--concurrency", help="Closed loop: number of workers"),
+    think_ms: float = typer.Option(0.0, "--think-ms", help="Closed loop: pause after each response"),
+    duration: Optional[float] = typer.Option(None, "--duration", help="Run for this many seconds"),
+    count: Optional[int] = typer.Option(None, "--count", help="Send this many requests (default: one pass over the recording)"),
+    max_inflight: int = typer.Option(1024, "--max-inflight", help="Open loop: drop arrivals beyond this many outstanding requests"),
+    url: Optional[str] = typer.Option(None, "--url", help="Management plane URL (default: local Prism)"),
+    mcp_url: Optional[str] = typer.Option(None, "--mcp-url", help="MCP endpoint for --target mcp (default: <url>/mcp)"),
+    tenant: Optional[str] = typer.Option(None, "--tenant", help="Tenant ID header (default: current tenant)"),
+    api_key: Optional[str] = typer.Option(None, "--api-key", help="Runtime API key sent as a bearer token"),
+    dry_run: bool = typer.Option(False, "--dry-run", help="Enforce in dry-run mode"),
+    as_json: bool = typer.Option(False, "--json", help="Print the report as JSON"),
+):
+    """Replay a recording at a target QPS or concurrency and report latency and outcomes."""
+    import asyncio
+    import json as _json
+    from loadgen import EnforceTarget, McpSendIntentTarget, load_recording, run_load
+
+    events = load_recording(recording)
+    if not events:
+        console.print(f"[red]No intent events found in {recording}.[/red]")
+        raise typer.Exit(1)
+
+    base_url = (url or _prism_url()).rstrip("/")
+    headers = _load_headers(tenant, api_key)
+    if target == "enforce":
+        load_target = EnforceTarget(base_url, headers=headers, dry_run=dry_run)
+    elif target == "mcp":
+        load_target = McpSendIntentTarget(mcp_url or f"{base_url}/mcp", headers=headers)
+    else:
+        console.print(f"[red]Unknown target: {target}[/red]")
+        raise typer.Exit(1)
+    if model not in ("open", "closed"):
+        console.print(f"[red]Unknown arrival model: {model}[/red]")
+        raise typer.Exit(1)
+
+    console.print(
+        f"Replaying {len(events)} event(s) against [bold]{target}[/bold] "
+        f"({model} loop) at {base_url}"
+    )
+    report = asyncio.run(
+        run_load(
+            load_target,
+            events,
+            model=model,
+            qps=qps,
+            concurrency=concurrency,
+            duration_s=duration,
+            count=count,
+            poisson=not uniform,
+            think_time_s=think_ms / 1000.0,
+            max_inflight=max_inflight,
+        )
+    )
+    summary = report.summary()
+
+    if as_json:
+        console.print_json(_json.dumps(summary))
+        return
+
+    console.print(
+        f"[bold]{summary['requests']}[/bold] requests in {summary['duration_s']}s "
+        f"([bold]{summary['throughput_rps']}[/bold] req/s), "
+        f"{summary['dropped']} dropped, error rate {summary['error_rate']:.2%}"
+    )
+
+    latency = Table(show_header=True, header_style="bold", title="Latency (ms)")
+    for column in ("", "p50", "p90", "p99", "max"):
+        latency.add_column(column)
+    client_ms = summary["latency_ms"]
+    latency.add_row("client", *(str(client_ms[key]) for key in ("p50", "p90", "p99", "max")))
+    server_ms = summary["server_latency_ms"]
+    latency.add_row("server", str(server_ms["p50"]), "", str(server_ms["p99"]), "")
+    console.print(latency)
+
+    outcomes = Table(show_header=True, header_style="bold", title="Outcomes")
+    outcomes.add_column("Outcome")
+    outcomes.add_column("Count", justify="right")
+    outcomes.add_column("Rate", justify="right")
+    for name, values in summary["outcomes"].items():
+        style = "red" if name.startswith("error:") else ""
+        outcomes.add_row(f"[{style}]{name}[/{style}]" if style else name, str(values["count"]), f"{values['rate']:.2%}")
+    console.print(outcomes)
+
+
+@load_app.command("export")
+def load_export(
+    output: Path = typer.Argument(..., dir_okay=False, help="JSONL file to write"),
+    agent: Optional[str] = typer.Option(None, "--agent", help="Only export calls for this agent ID"),
+    limit: int = typer.Option(1000, "--limit", help="Maximum number of events to export"),
+    url: Optional[str] = typer.Option(None, "--url", help="Management plane URL (default: local Prism)"),
+    tenant: Optional[str] = typer.Option(None, "--tenant", help="Tenant ID header (default: current tenant)"),
+):
+    """Export recorded intent events from /api/v2/telemetry/calls for replay."""
+    from loadgen import export_recording
+
+    try:
+        written = export_recording(
+            (url or _prism_url()).rstrip("/"),
+            output,
+            headers=_load_headers(tenant, None),
+            agent_id=agent,
+            limit=limit,
+        )
+    except httpx.HTTPError as exc:
+        console.print(f"[red]Export failed: {exc}[/red]")
+        raise typer.Exit(1)
+    console.print(f"Wrote {written} event(s) to {output}")
+
+
 # ──────────────────────────────────────────────────────────────────────────────
 # Helpers
 # ──────────────────────────────────────────────────────────────────────────────